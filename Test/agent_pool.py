@@ -0,0 +1,150 @@
+# agent_pool.py
+"""
+Warm agent pool for CrewAI crews.
+
+Building a crew's agents (prompt templates, tool wiring, LLM client setup) is
+repeated on every request. The pool keeps idle agent sets keyed by
+(crew_type, region, product_type) and hands them out again after resetting
+their per-run state, so only the Crew and Tasks are rebuilt per request.
+
+Usage:
+    from agent_pool import agent_pool
+
+    with agent_pool.lease("analysis", create_analysis_agents,
+                          region=region, product_type=product_type) as agents:
+        crew = Crew(agents=[...], tasks=create_analysis_tasks(agents, ...))
+        return crew.kickoff()
+
+A leased agent set is owned by a single caller until the block exits, so
+concurrent requests for the same key simply build (and later return) another
+set. If the block raises, the agents are discarded rather than reused.
+"""
+
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Crews whose agents must never be reused across executions.
+# AML: each case is unique and compliance requires fresh state.
+NON_POOLED_CREWS = frozenset({"aml"})
+
+DEFAULT_MAX_IDLE_PER_KEY = 4
+
+# Per-run attributes CrewAI sets on an Agent while it executes a crew
+_AGENT_RUN_STATE_DEFAULTS = {
+    "crew": None,
+    "agent_executor": None,
+    "tools_results": [],
+    "_times_executed": 0,
+}
+
+PoolKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def reset_agent_state(agent: Any):
+    """Clear state left on an Agent by a previous crew run."""
+    for attr, default in _AGENT_RUN_STATE_DEFAULTS.items():
+        if hasattr(agent, attr):
+            try:
+                setattr(agent, attr, list(default) if isinstance(default, list) else default)
+            except Exception:
+                # Pydantic may reject assignment on frozen/private fields
+                pass
+
+
+class AgentPool:
+    """
+    Thread-safe pool of idle agent dicts keyed by (crew_type, region, product_type).
+
+    Args:
+        max_idle_per_key: Idle agent sets kept per key; extras are dropped on release.
+    """
+
+    def __init__(self, max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY):
+        self.max_idle_per_key = max_idle_per_key
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, deque] = {}
+        self._counters = {"hits": 0, "misses": 0, "released": 0, "discarded": 0, "bypassed": 0}
+
+    @staticmethod
+    def make_key(crew_type: str, region: Optional[str] = None, product_type: Optional[str] = None) -> PoolKey:
+        return (crew_type, region.upper() if region else None, product_type.upper() if product_type else None)
+
+    def acquire(self, crew_type: str, factory: Callable[..., Dict[str, Any]], **factory_kwargs) -> Dict[str, Any]:
+        """
+        Take an idle agent set for this key, or build one with ``factory(**factory_kwargs)``.
+
+        ``region`` and ``product_type`` in ``factory_kwargs`` form part of the key.
+        """
+        if crew_type in NON_POOLED_CREWS:
+            with self._lock:
+                self._counters["bypassed"] += 1
+            return factory(**factory_kwargs)
+
+        key = self.make_key(crew_type, factory_kwargs.get("region"), factory_kwargs.get("product_type"))
+        with self._lock:
+            idle = self._idle.get(key)
+            agents = idle.pop() if idle else None
+            self._counters["hits" if agents is not None else "misses"] += 1
+
+        if agents is None:
+            logger.debug(f"Agent pool miss for {key}; building agents")
+            agents = factory(**factory_kwargs)
+        return agents
+
+    def release(self, crew_type: str, agents: Dict[str, Any], region: Optional[str] = None,
+                product_type: Optional[str] = None):
+        """Reset an agent set and return it to the pool."""
+        if crew_type in NON_POOLED_CREWS or not agents:
+            return
+        for agent in agents.values():
+            reset_agent_state(agent)
+
+        key = self.make_key(crew_type, region, product_type)
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_idle_per_key:
+                idle.append(agents)
+                self._counters["released"] += 1
+            else:
+                self._counters["discarded"] += 1
+
+    @contextmanager
+    def lease(self, crew_type: str, factory: Callable[..., Dict[str, Any]], **factory_kwargs):
+        """Context manager around acquire/release; agents are discarded on error."""
+        agents = self.acquire(crew_type, factory, **factory_kwargs)
+        try:
+            yield agents
+        except BaseException:
+            with self._lock:
+                self._counters["discarded"] += 1
+            raise
+        self.release(
+            crew_type,
+            agents,
+            region=factory_kwargs.get("region"),
+            product_type=factory_kwargs.get("product_type"),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and idle set counts per key."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "idle": {"/".join(str(p) for p in key): len(idle) for key, idle in self._idle.items()},
+            }
+
+    def clear(self):
+        """Drop all idle agents (e.g. after changing LLM or tool configuration)."""
+        with self._lock:
+            self._idle.clear()
+
+
+# Process-wide pool shared by crews.py and the crew API views
+agent_pool = AgentPool()
@@ -1,6 +1,7 @@
 # agents.py - OPTIMIZED VERSION (merged agents, reduced tool calls)
 
 import os
+import threading
 from datetime import datetime
 from crewai import Agent
 from langchain_nvidia_ai_endpoints import ChatNVIDIA
@@ -62,13 +63,27 @@ langfuse = get_langfuse_client()
 _lf_callbacks = [cb for cb in [get_langfuse_callback_handler()] if cb is not None]
 
 
+# Shared LLM clients, one per tier. ChatNVIDIA keeps an HTTP session per
+# instance, so reusing the client keeps TLS connections alive across crews.
+_llm_clients = {}
+_llm_lock = threading.Lock()
+
+
 def get_llm(powerful: bool = False):
-    return ChatNVIDIA(
-        model ="meta/llama-3.3-70b-instruct",
-        #model="qwen/qwen3-next-80b-a3b-instruct",
-        max_completion_tokens=32768 if powerful else 16384,
-        callbacks=_lf_callbacks,
-    )
+    """Return the process-wide ChatNVIDIA client for the requested tier."""
+    client = _llm_clients.get(powerful)
+    if client is None:
+        with _llm_lock:
+            client = _llm_clients.get(powerful)
+            if client is None:
+                client = ChatNVIDIA(
+                    model ="meta/llama-3.3-70b-instruct",
+                    #model="qwen/qwen3-next-80b-a3b-instruct",
+                    max_completion_tokens=32768 if powerful else 16384,
+                    callbacks=_lf_callbacks,
+                )
+                _llm_clients[powerful] = client
+    return client
 
 
 # Backward compatibility aliases
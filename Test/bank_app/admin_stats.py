@@ -0,0 +1,206 @@
+"""
+Precomputed aggregates for the admin analytics page.
+
+admin_analytics used to run eight scans per render over loan_applications
+and fixed_deposit: separate counts per status and per date window (with
+DATE(created_at) on the column, so no index could help) and a
+loan_applications -> users -> address join for the regional breakdown.
+
+Here each source table is aggregated in ONE grouped pass into the
+admin_stats_rollup table of the legacy database, one row per
+(status, country, created day). Every number on the page is a sum over a
+few hundred rollup rows:
+
+    - totals and status breakdowns: group the rollup by status
+    - last 7/30 days: rollup rows whose day >= the cutoff date
+    - regional breakdown: group the rollup by country
+
+A source is recomputed when it is read and either marked dirty (db_utils
+write helpers call mark_stale after touching it) or older than
+ADMIN_STATS_MAX_AGE_SECONDS, which bounds staleness for rows written
+outside db_utils (the crews' tools). Refresh from cron with:
+
+    python manage.py refresh_admin_stats
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from . import db_utils
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rollup may be served after its last refresh (0 = always refresh)
+ADMIN_STATS_MAX_AGE_SECONDS = float(os.environ.get("ADMIN_STATS_MAX_AGE", "300"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS admin_stats_rollup (
+    source  TEXT    NOT NULL,
+    status  TEXT    NOT NULL,
+    country TEXT    NOT NULL,
+    day     TEXT    NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (source, status, country, day)
+);
+CREATE TABLE IF NOT EXISTS admin_stats_meta (
+    source       TEXT    PRIMARY KEY,
+    refreshed_at REAL    NOT NULL,
+    dirty        INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# One grouped pass per source table. substr(created_at, 1, 10) is the
+# created day for both datetime('now') and ISO timestamps. A user's
+# country is that of their first address.
+_ROLLUP_QUERIES = {
+    'loan_applications': """
+        INSERT INTO admin_stats_rollup (source, status, country, day, count)
+        SELECT 'loan_applications', COALESCE(la.loan_decision, ''), COALESCE(a.country_code, ''),
+               substr(la.created_at, 1, 10), COUNT(*)
+        FROM loan_applications la
+        LEFT JOIN (
+            SELECT user_id, country_code FROM address
+            WHERE address_id IN (SELECT MIN(address_id) FROM address GROUP BY user_id)
+        ) a ON a.user_id = la.user_id
+        GROUP BY 2, 3, 4
+    """,
+    'fixed_deposit': """
+        INSERT INTO admin_stats_rollup (source, status, country, day, count)
+        SELECT 'fixed_deposit', COALESCE(fd_status, ''), COALESCE(region, ''),
+               substr(created_at, 1, 10), COUNT(*)
+        FROM fixed_deposit
+        GROUP BY 2, 3, 4
+    """,
+}
+
+STATS_TABLES = frozenset(db_utils.STATS_TABLES)
+
+_initialized = set()
+_refresh_lock = threading.Lock()
+
+
+def _ensure_schema():
+    path = str(db_utils.LEGACY_DB_PATH)
+    if path in _initialized:
+        return
+    with db_utils.get_legacy_connection() as conn:
+        conn.executescript(_SCHEMA)
+    _initialized.add(path)
+
+
+# =============================================================================
+# REFRESH
+# =============================================================================
+
+def refresh(sources: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Recompute the rollup of ``sources`` (default: all) in one transaction each.
+
+    Returns:
+        Milliseconds spent per source
+    """
+    _ensure_schema()
+    timings = {}
+    for source in sources or sorted(STATS_TABLES):
+        start = time.perf_counter()
+        with _refresh_lock, db_utils.get_legacy_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM admin_stats_rollup WHERE source = ?", (source,))
+            conn.execute(_ROLLUP_QUERIES[source])
+            conn.execute(
+                "INSERT OR REPLACE INTO admin_stats_meta (source, refreshed_at, dirty) VALUES (?, ?, 0)",
+                (source, time.time()),
+            )
+            conn.commit()
+        timings[source] = round((time.perf_counter() - start) * 1000, 2)
+        logger.debug(f"Refreshed admin stats rollup for {source} in {timings[source]}ms")
+    return timings
+
+
+def mark_stale(table_name: str):
+    """Write hook: the next read recomputes ``table_name``'s rollup."""
+    if table_name not in STATS_TABLES:
+        return
+    _ensure_schema()
+    with db_utils.get_legacy_connection() as conn:
+        conn.execute("UPDATE admin_stats_meta SET dirty = 1 WHERE source = ?", (table_name,))
+        conn.commit()
+
+
+def _stale_sources() -> List[str]:
+    _ensure_schema()
+    rows = db_utils.execute_raw_sql("SELECT source, refreshed_at, dirty FROM admin_stats_meta")
+    fresh_after = time.time() - ADMIN_STATS_MAX_AGE_SECONDS
+    fresh = {r['source'] for r in rows if not r['dirty'] and r['refreshed_at'] > fresh_after}
+    return sorted(STATS_TABLES - fresh)
+
+
+def ensure_fresh() -> List[str]:
+    """Refresh the sources that are dirty or too old; returns their names."""
+    stale = _stale_sources()
+    if stale:
+        refresh(stale)
+    return stale
+
+
+# =============================================================================
+# READS
+# =============================================================================
+
+def _rollup(source: str, group_by: str = "", since: str = "", where: str = "", params=()) -> List[Dict[str, Any]]:
+    conditions = ["source = ?"]
+    values = [source]
+    if since:
+        conditions.append("day >= ?")
+        values.append(since)
+    if where:
+        conditions.append(where)
+        values.extend(params)
+    columns = f"{group_by}, " if group_by else ""
+    query = f"SELECT {columns}COALESCE(SUM(count), 0) AS count FROM admin_stats_rollup WHERE {' AND '.join(conditions)}"
+    if group_by:
+        query += f" GROUP BY {group_by} ORDER BY count DESC"
+    return db_utils.execute_raw_sql(query, tuple(values))
+
+
+def _total(source: str, since: str = "", where: str = "", params=()) -> int:
+    return _rollup(source, since=since, where=where, params=params)[0]['count']
+
+
+def get_analytics_stats(today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Every aggregate on the admin analytics page, read from the rollup.
+
+    Keys match the template context: totals, 7/30-day counts, approval rate,
+    status and regional breakdowns (regions as raw country codes).
+    """
+    ensure_fresh()
+    today = today or date.today()
+    last_7_days = (today - timedelta(days=7)).isoformat()
+    last_30_days = (today - timedelta(days=30)).isoformat()
+
+    total_loans = _total('loan_applications')
+    approved = _total('loan_applications', where="status = ?", params=('APPROVED',))
+    return {
+        'total_loans': total_loans,
+        'loans_last_7_days': _total('loan_applications', since=last_7_days),
+        'loans_last_30_days': _total('loan_applications', since=last_30_days),
+        'approval_rate': round((approved / total_loans * 100) if total_loans > 0 else 0, 1),
+        'status_breakdown': [
+            {'loan_decision': r['status'], 'count': r['count']}
+            for r in _rollup('loan_applications', group_by='status')
+        ],
+        'regional_loans': [
+            {'country_code': r['country'], 'count': r['count']}
+            for r in _rollup('loan_applications', group_by='country')
+        ],
+        'total_fds': _total('fixed_deposit'),
+        'fds_last_7_days': _total('fixed_deposit', since=last_7_days),
+        'fd_status_breakdown': [
+            {'fd_status': r['status'], 'count': r['count']}
+            for r in _rollup('fixed_deposit', group_by='status')
+        ],
+    }
@@ -27,6 +27,7 @@ from .db_utils import (
     get_transactions,
     LEGACY_DB_PATH,
 )
+from .admin_stats import get_analytics_stats
 from utils.geolocation import get_all_countries
 
 logger = logging.getLogger(__name__)
@@ -418,49 +419,17 @@ def admin_reject_transaction(request, application_id):
 
 @admin_login_required
 def admin_analytics(request):
-    """Analytics dashboard with detailed metrics from legacy database."""
-    now = timezone.now()
-    last_7_days = now - timedelta(days=7)
-    last_30_days = now - timedelta(days=30)
-
-    # Loan statistics
-    total_loans = count_records('loan_applications')
-    loans_last_7_days = count_records(
-        'loan_applications',
-        "DATE(created_at) >= DATE(?)",
-        (last_7_days.isoformat(),)
-    )
-    loans_last_30_days = count_records(
-        'loan_applications',
-        "DATE(created_at) >= DATE(?)",
-        (last_30_days.isoformat(),)
-    )
-
-    # Approval rate
-    approved = count_records('loan_applications', "loan_decision = 'APPROVED'")
-    approval_rate = (approved / total_loans * 100) if total_loans > 0 else 0
+    """Analytics dashboard with detailed metrics from legacy database.
 
-    # Status breakdown - use loan_decision directly
-    status_breakdown = execute_raw_sql("""
-        SELECT loan_decision, COUNT(*) as count
-        FROM loan_applications
-        GROUP BY loan_decision
-    """, fetch="all")
-
-    # Regional breakdown - format for template
-    regional_loans_raw = execute_raw_sql("""
-        SELECT a.country_code, COUNT(*) as count
-        FROM loan_applications la
-        LEFT JOIN users u ON la.user_id = u.user_id
-        LEFT JOIN address a ON u.user_id = a.user_id
-        GROUP BY a.country_code
-        ORDER BY count DESC
-    """, fetch="all")
+    Every number comes from the precomputed rollup (see admin_stats), which
+    is recomputed only when loans / FDs changed or it is too old.
+    """
+    stats = get_analytics_stats(today=timezone.now().date())
 
     # Convert to template-friendly format with country names
     all_countries = get_all_countries()
     regional_loans = []
-    for region in regional_loans_raw:
+    for region in stats['regional_loans']:
         country_code = region.get('country_code', '')
         country_name = all_countries.get(country_code, {}).get('name', country_code) if country_code else 'Unknown'
         regional_loans.append({
@@ -469,31 +438,16 @@ def admin_analytics(request):
             'count': region['count']
         })
 
-    # FD statistics
-    total_fds = count_records('fixed_deposit')
-    fds_last_7_days = count_records(
-        'fixed_deposit',
-        "DATE(created_at) >= DATE(?)",
-        (last_7_days.isoformat(),)
-    )
-
-    # FD status breakdown
-    fd_status_breakdown = execute_raw_sql("""
-        SELECT fd_status, COUNT(*) as count
-        FROM fixed_deposit
-        GROUP BY fd_status
-    """, fetch="all")
-
     context = {
-        'total_loans': total_loans,
-        'loans_last_7_days': loans_last_7_days,
-        'loans_last_30_days': loans_last_30_days,
-        'approval_rate': round(approval_rate, 1),
-        'status_breakdown': status_breakdown,
+        'total_loans': stats['total_loans'],
+        'loans_last_7_days': stats['loans_last_7_days'],
+        'loans_last_30_days': stats['loans_last_30_days'],
+        'approval_rate': stats['approval_rate'],
+        'status_breakdown': stats['status_breakdown'],
         'regional_loans': regional_loans,
-        'total_fds': total_fds,
-        'fds_last_7_days': fds_last_7_days,
-        'fd_status_breakdown': fd_status_breakdown,
+        'total_fds': stats['total_fds'],
+        'fds_last_7_days': stats['fds_last_7_days'],
+        'fd_status_breakdown': stats['fd_status_breakdown'],
     }
 
     return render(request, 'bank_app/admin/admin_analytics.html', context)
@@ -7,13 +7,17 @@ import logging
 from datetime import datetime
 from decimal import Decimal
 
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, JsonResponse
 from django.views.decorators.http import require_http_methods, require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Count, Sum
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.http import parse_etags
 
+from . import dashboard_stats
+from .event_outbox import publish
+from .loan_transitions import bulk_transition
 from .models import LoanApplication, AuditLog, CrewAIReasoningLog
 
 logger = logging.getLogger(__name__)
@@ -457,10 +461,9 @@ def bulk_loan_approve_api(request):
         else:
             queryset = LoanApplication.objects.filter(id__in=loan_ids)
         
-        loans = list(queryset)
-        
         if not confirm:
             # Return preview summary
+            loans = list(queryset)
             preview = {
                 'count': len(loans),
                 'loans': [{
@@ -477,21 +480,17 @@ def bulk_loan_approve_api(request):
             }
             return JsonResponse({'preview': preview})
         
-        # Execute bulk approval
-        approved_count = 0
-        for loan in loans:
-            if loan.status in ['SUBMITTED', 'UNDER_REVIEW']:
-                loan.status = 'APPROVED'
-                loan.save()  # Triggers individual audit entry
-                approved_count += 1
+        # Execute bulk approval: one UPDATE + bulk audit insert, one broadcast
+        total_count = queryset.count()
+        result = bulk_transition(queryset, 'APPROVED')
         
         # Broadcast via WebSocket
-        _broadcast_admin_action('BULK_APPROVE', [loan.id for loan in loans])
+        _broadcast_admin_action('BULK_APPROVE', result['loan_ids'])
         
         return JsonResponse({
             'success': True,
-            'approved_count': approved_count,
-            'total_count': len(loans)
+            'approved_count': result['updated_count'],
+            'total_count': total_count
         })
         
     except json.JSONDecodeError:
@@ -518,9 +517,8 @@ def bulk_loan_reject_api(request):
         else:
             queryset = LoanApplication.objects.filter(id__in=loan_ids)
         
-        loans = list(queryset)
-        
         if not confirm:
+            loans = list(queryset)
             preview = {
                 'count': len(loans),
                 'loans': [{
@@ -536,19 +534,15 @@ def bulk_loan_reject_api(request):
             }
             return JsonResponse({'preview': preview})
         
-        rejected_count = 0
-        for loan in loans:
-            if loan.status in ['SUBMITTED', 'UNDER_REVIEW']:
-                loan.status = 'REJECTED'
-                loan.save()
-                rejected_count += 1
+        total_count = queryset.count()
+        result = bulk_transition(queryset, 'REJECTED')
         
-        _broadcast_admin_action('BULK_REJECT', [loan.id for loan in loans])
+        _broadcast_admin_action('BULK_REJECT', result['loan_ids'])
         
         return JsonResponse({
             'success': True,
-            'rejected_count': rejected_count,
-            'total_count': len(loans)
+            'rejected_count': result['updated_count'],
+            'total_count': total_count
         })
         
     except json.JSONDecodeError:
@@ -562,12 +556,32 @@ def bulk_loan_reject_api(request):
 # DASHBOARD DATA ENDPOINTS
 # =============================================================================
 
+def _etag_response(request, payload, etag):
+    """JsonResponse with an ETag, or 304 if the client already has it."""
+    quoted = f'"{etag}"'
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        client_etags = parse_etags(if_none_match)
+        if '*' in client_etags or quoted in client_etags or f'W/{quoted}' in client_etags:
+            response = HttpResponseNotModified()
+            response['ETag'] = quoted
+            return response
+    response = JsonResponse(payload)
+    response['ETag'] = quoted
+    # Always revalidate: the ETag makes an unchanged poll a cheap 304
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @csrf_exempt
 @require_http_methods(["GET"])
 def dashboard_stats_api(request):
     """
     Get dashboard statistics.
     
+    Served from dashboard_stats' cache; send If-None-Match with the last
+    ETag to get 304 when nothing changed.
+    
     Returns:
     {
         'total_loans': int,
@@ -578,42 +592,8 @@ def dashboard_stats_api(request):
     }
     """
     try:
-        # Total loans
-        total_loans = LoanApplication.objects.count()
-        
-        # By status
-        by_status = {}
-        for status, label in LoanApplication.STATUS_CHOICES:
-            count = LoanApplication.objects.filter(status=status).count()
-            by_status[status] = {'count': count, 'label': label}
-        
-        # Total loan amount
-        total_amount = LoanApplication.objects.aggregate(
-            total=Sum('loan_amount')
-        )['total'] or Decimal('0')
-        
-        # Pending approvals
-        pending_approvals = LoanApplication.objects.filter(
-            status__in=['SUBMITTED', 'UNDER_REVIEW']
-        ).count()
-        
-        # Recent loans
-        recent_loans = [{
-            'id': loan.id,
-            'application_id': loan.application_id,
-            'applicant_name': loan.applicant_name,
-            'loan_amount': str(loan.loan_amount),
-            'status': loan.status,
-            'created_at': loan.created_at.isoformat()
-        } for loan in LoanApplication.objects.all()[:10]]
-        
-        return JsonResponse({
-            'total_loans': total_loans,
-            'by_status': by_status,
-            'total_amount': str(total_amount),
-            'pending_approvals': pending_approvals,
-            'recent_loans': recent_loans
-        })
+        payload, etag = dashboard_stats.get_stats()
+        return _etag_response(request, payload, etag)
         
     except Exception as e:
         logger.error(f"Dashboard stats API error: {e}")
@@ -626,6 +606,9 @@ def dashboard_charts_api(request):
     """
     Get chart data for dashboard visualizations.
     
+    Served from dashboard_stats' cache, with the same ETag handling as
+    dashboard_stats_api.
+    
     Returns:
     {
         'status_distribution': [...],
@@ -634,45 +617,8 @@ def dashboard_charts_api(request):
     }
     """
     try:
-        # Status distribution
-        status_data = []
-        for status, label in LoanApplication.STATUS_CHOICES:
-            count = LoanApplication.objects.filter(status=status).count()
-            if count > 0:
-                status_data.append({'status': status, 'label': label, 'count': count})
-        
-        # Monthly trend (loans created per month)
-        from django.db.models import TruncMonth
-        monthly = LoanApplication.objects.annotate(
-            month=TruncMonth('created_at')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
-        
-        monthly_trend = [{
-            'month': m['month'].isoformat(),
-            'count': m['count']
-        } for m in monthly]
-        
-        # Region performance
-        region_data = []
-        for region, label in LoanApplication.REGION_CHOICES:
-            total = LoanApplication.objects.filter(region=region).count()
-            approved = LoanApplication.objects.filter(region=region, status='APPROVED').count()
-            if total > 0:
-                region_data.append({
-                    'region': region,
-                    'label': label,
-                    'total': total,
-                    'approved': approved,
-                    'approval_rate': round(approved / total * 100, 2) if total > 0 else 0
-                })
-        
-        return JsonResponse({
-            'status_distribution': status_data,
-            'monthly_trend': monthly_trend,
-            'region_performance': region_data
-        })
+        payload, etag = dashboard_stats.get_charts()
+        return _etag_response(request, payload, etag)
         
     except Exception as e:
         logger.error(f"Dashboard charts API error: {e}")
@@ -727,20 +673,10 @@ def dashboard_charts_api(request):
     # =============================================================================
 
 def _broadcast_admin_action(action, affected_loans):
-    """Broadcast admin action via WebSocket."""
-    try:
-        from channels.layers import get_channel_layer
-        from asgiref.sync import async_to_sync
-        
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            'dashboard_updates',
-            {
-                'type': 'admin_action',
-                'action': action,
-                'affected_loans': affected_loans,
-                'timestamp': timezone.now().isoformat()
-            }
-        )
-    except Exception as e:
-        logger.warning(f"WebSocket broadcast failed: {e}")
+    """Queue an admin action for dashboard WebSockets (bank_app.event_outbox)."""
+    publish('dashboard_updates', {
+        'type': 'admin_action',
+        'action': action,
+        'affected_loans': affected_loans,
+        'timestamp': timezone.now().isoformat()
+    })
@@ -1,5 +1,28 @@
+import logging
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class BankAppConfig(AppConfig):
     name = "bank_app"
+
+    def ready(self):
+        if getattr(settings, "MODEL_REGISTRY_WARM_ON_STARTUP", False):
+            threading.Thread(target=_warm_models, name="model-warmup", daemon=True).start()
+
+
+def _warm_models():
+    from model_registry import model_registry
+
+    # Load every artifact and push one synthetic prediction through it so the
+    # first user request after a deploy does not pay for either;
+    # /healthz/ready reports ready once this has finished cleanly
+    failures = {name: error for name, error in model_registry.warm(probe=True).items() if error}
+    if failures:
+        logger.warning(f"Model warm-up finished with failures: {failures}")
+    else:
+        logger.info("Model warm-up finished")
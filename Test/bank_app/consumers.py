@@ -5,6 +5,8 @@ WebSocket Consumers for real-time dashboard updates
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 
+from .event_outbox import start_dispatcher
+
 
 class DashboardConsumer(AsyncWebsocketConsumer):
     """
@@ -14,6 +16,7 @@ class DashboardConsumer(AsyncWebsocketConsumer):
     - Loan status changes
     - Admin actions (bulk operations)
     - CrewAI decisions
+    - Async crew job progress
     """
 
     async def connect(self):
@@ -28,6 +31,9 @@ class DashboardConsumer(AsyncWebsocketConsumer):
         
         await self.accept()
         
+        # This process now serves dashboards: dispatch queued events to them
+        start_dispatcher()
+        
         # Send welcome message
         await self.send(text_data=json.dumps({
             'type': 'connection_established',
@@ -44,25 +50,37 @@ class DashboardConsumer(AsyncWebsocketConsumer):
 
     async def loan_status_update(self, event):
         """
-        Send loan status update to connected clients.
+        Send loan status updates to connected clients.
         
-        Event format:
+        The event outbox delivers them batched, one entry per loan:
         {
             'type': 'loan_status_update',
-            'loan_id': int,
-            'application_id': str,
-            'old_status': str,
-            'new_status': str,
+            'updates': [
+                {'loan_id': int, 'application_id': str, 'old_status': str,
+                 'new_status': str, 'timestamp': str},
+                ...
+            ],
+            'count': int,
             'timestamp': str
         }
+        
+        A single update sent straight to the group (loan_id, old_status, ...
+        at the top level) is forwarded as a batch of one.
         """
+        updates = event.get('updates')
+        if updates is None:
+            updates = [{
+                'loan_id': event['loan_id'],
+                'application_id': event.get('application_id'),
+                'old_status': event['old_status'],
+                'new_status': event['new_status'],
+                'timestamp': event['timestamp']
+            }]
         await self.send(text_data=json.dumps({
             'type': 'loan_status_update',
-            'loan_id': event['loan_id'],
-            'application_id': event.get('application_id'),
-            'old_status': event['old_status'],
-            'new_status': event['new_status'],
-            'timestamp': event['timestamp']
+            'updates': updates,
+            'count': len(updates),
+            'timestamp': event.get('timestamp') or updates[-1]['timestamp']
         }))
 
     async def admin_action(self, event):
@@ -104,3 +122,28 @@ class DashboardConsumer(AsyncWebsocketConsumer):
             'confidence': event['confidence'],
             'reasoning': event.get('reasoning', {})
         }))
+
+    async def crew_job_update(self, event):
+        """
+        Send async crew job progress to connected clients.
+        
+        Event format:
+        {
+            'type': 'crew_job_update',
+            'job_id': str,
+            'crew_type': str,
+            'status': str,  # PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED
+            'queue_position': int | None,
+            'error': str | None,
+            'timestamp': str
+        }
+        """
+        await self.send(text_data=json.dumps({
+            'type': 'crew_job_update',
+            'job_id': event['job_id'],
+            'crew_type': event['crew_type'],
+            'status': event['status'],
+            'queue_position': event.get('queue_position'),
+            'error': event.get('error'),
+            'timestamp': event['timestamp']
+        }))
@@ -0,0 +1,370 @@
+"""
+Asynchronous CrewAI job queue.
+
+Crew runs can take minutes (AML, analysis), so instead of calling
+``crew.kickoff()`` inside the Django request the API submits a job here and
+returns a job ID straight away. Jobs run on a bounded worker pool; each
+``crew_type`` has its own concurrency limit so that a burst of slow AML cases
+cannot starve quick FD rate lookups.
+
+Job lifecycle:
+    PENDING -> RUNNING -> SUCCEEDED | FAILED | CANCELLED
+
+Every state change is pushed to the ``dashboard_updates`` channel group as a
+``crew_job_update`` event (handled by ``DashboardConsumer``).
+
+Configuration (settings.py, all optional):
+    CREW_JOB_MAX_WORKERS          total worker threads (default 4)
+    CREW_JOB_CONCURRENCY          {crew_type: max running jobs}
+    CREW_JOB_DEFAULT_CONCURRENCY  limit for crew types not listed (default 2)
+    CREW_JOB_RETENTION_SECONDS    how long finished jobs stay pollable (default 3600)
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# JOB STATES
+# =============================================================================
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+SUCCEEDED = "SUCCEEDED"
+FAILED = "FAILED"
+CANCELLED = "CANCELLED"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# =============================================================================
+# DEFAULTS
+# =============================================================================
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TYPE_CONCURRENCY = 2
+DEFAULT_RETENTION_SECONDS = 3600
+
+# Slow, side-effecting crews get a single slot by default
+DEFAULT_CONCURRENCY = {
+    "aml": 1,
+    "loan_creation": 1,
+    "mortgage_analytics": 2,
+    "credit_risk": 2,
+}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class CrewJob:
+    """A single crew execution request and its outcome."""
+
+    def __init__(self, crew_type: str, payload: Dict[str, Any]):
+        self.job_id = uuid.uuid4().hex
+        self.crew_type = crew_type
+        self.payload = payload
+        self.status = PENDING
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.http_status: Optional[int] = None
+        self.cancel_requested = False
+        self.created_at = _now_iso()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._finished_monotonic: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """Serialize job metadata (and optionally the result) for JSON responses."""
+        data = {
+            "job_id": self.job_id,
+            "crew_type": self.crew_type,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class CrewJobQueue:
+    """
+    Bounded, per-crew-type rate limited executor for crew jobs.
+
+    Pending jobs wait in per-type FIFO queues and are only handed to the
+    thread pool when both a global worker slot and a slot for their crew type
+    are free. Waiting jobs therefore never occupy a worker thread, and remain
+    cancellable until they start.
+
+    Args:
+        runner: Callable ``(payload) -> (body_dict, http_status)`` that executes the crew.
+        max_workers: Maximum number of crews running at once across all types.
+        concurrency: Per crew_type running limits.
+        default_concurrency: Limit for crew types missing from ``concurrency``.
+        notifier: Optional callable ``(job_dict)`` invoked on every state change.
+        retention_seconds: How long finished jobs are kept for polling.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Dict[str, Any]], Tuple[Dict[str, Any], int]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = DEFAULT_TYPE_CONCURRENCY,
+        notifier: Optional[Callable[[Dict[str, Any]], None]] = None,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+    ):
+        self._runner = runner
+        self._notifier = notifier
+        self.max_workers = max(1, int(max_workers))
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = max(1, int(default_concurrency))
+        self.retention_seconds = retention_seconds
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, CrewJob] = {}
+        self._pending: Dict[str, deque] = {}
+        self._running: Dict[str, int] = {}
+        self._running_total = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="crew-job"
+        )
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def limit_for(self, crew_type: str) -> int:
+        """Return the running-job limit for a crew type."""
+        return max(1, int(self.concurrency.get(crew_type, self.default_concurrency)))
+
+    def submit(self, crew_type: str, payload: Dict[str, Any]) -> CrewJob:
+        """Queue a crew job and return it immediately."""
+        job = CrewJob(crew_type, payload)
+        with self._lock:
+            self._purge_expired()
+            self._jobs[job.job_id] = job
+            self._pending.setdefault(crew_type, deque()).append(job)
+        logger.info(f"Crew job {job.job_id} queued (crew_type={crew_type})")
+        self._notify(job)
+        self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Optional[CrewJob]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[CrewJob]:
+        """
+        Cancel a job.
+
+        Pending jobs are removed from the queue at once. A running crew cannot
+        be interrupted mid-kickoff, so it is flagged and its result discarded
+        when it finishes.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return job
+            job.cancel_requested = True
+            if job.status == PENDING:
+                queue = self._pending.get(job.crew_type)
+                if queue is not None and job in queue:
+                    queue.remove(job)
+                self._mark_finished(job, CANCELLED)
+        self._notify(job)
+        return job
+
+    def position(self, job: CrewJob) -> Optional[int]:
+        """Return the 1-based queue position of a pending job, or None."""
+        with self._lock:
+            queue = self._pending.get(job.crew_type)
+            if job.status != PENDING or not queue:
+                return None
+            try:
+                return list(queue).index(job) + 1
+            except ValueError:
+                return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and running counts per crew type."""
+        with self._lock:
+            crew_types = set(self._pending) | set(self._running)
+            by_type = {
+                crew_type: {
+                    "pending": len(self._pending.get(crew_type, ())),
+                    "running": self._running.get(crew_type, 0),
+                    "limit": self.limit_for(crew_type),
+                }
+                for crew_type in sorted(crew_types)
+            }
+            by_status: Dict[str, int] = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+            return {
+                "max_workers": self.max_workers,
+                "running": self._running_total,
+                "jobs_tracked": len(self._jobs),
+                "by_status": by_status,
+                "by_crew_type": by_type,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release the worker pool."""
+        self._executor.shutdown(wait=wait)
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    def _dispatch(self):
+        """Start as many pending jobs as global and per-type limits allow."""
+        started = []
+        with self._lock:
+            progress = True
+            while progress and self._running_total < self.max_workers:
+                progress = False
+                for crew_type, queue in self._pending.items():
+                    if self._running_total >= self.max_workers:
+                        break
+                    if not queue or self._running.get(crew_type, 0) >= self.limit_for(crew_type):
+                        continue
+                    job = queue.popleft()
+                    job.status = RUNNING
+                    job.started_at = _now_iso()
+                    self._running[crew_type] = self._running.get(crew_type, 0) + 1
+                    self._running_total += 1
+                    started.append(job)
+                    progress = True
+        for job in started:
+            self._notify(job)
+            self._executor.submit(self._run, job)
+
+    def _run(self, job: CrewJob):
+        """Worker body: execute the crew and record its outcome."""
+        try:
+            body, http_status = self._runner(job.payload)
+            final_state = SUCCEEDED if http_status < 400 else FAILED
+            error = None if final_state == SUCCEEDED else (body or {}).get("error")
+        except Exception as e:
+            logger.error(f"Crew job {job.job_id} failed: {e}", exc_info=True)
+            body, http_status, final_state, error = {"error": str(e)}, 500, FAILED, str(e)
+
+        with self._lock:
+            self._running[job.crew_type] -= 1
+            self._running_total -= 1
+            if job.cancel_requested:
+                self._mark_finished(job, CANCELLED)
+            else:
+                job.result = body
+                job.http_status = http_status
+                job.error = error
+                self._mark_finished(job, final_state)
+
+        logger.info(f"Crew job {job.job_id} finished with status {job.status}")
+        self._notify(job)
+        self._dispatch()
+
+    def _mark_finished(self, job: CrewJob, state: str):
+        job.status = state
+        job.finished_at = _now_iso()
+        job._finished_monotonic = time.monotonic()
+
+    def _purge_expired(self):
+        """Drop finished jobs older than the retention window (lock held)."""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job._finished_monotonic is not None and job._finished_monotonic < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _notify(self, job: CrewJob):
+        if self._notifier is None:
+            return
+        event = job.to_dict()
+        event["queue_position"] = self.position(job)
+        try:
+            self._notifier(event)
+        except Exception as e:
+            logger.warning(f"Crew job notification failed: {e}")
+
+
+# =============================================================================
+# PROCESS-WIDE QUEUE
+# =============================================================================
+
+_queue: Optional[CrewJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def _broadcast_job_update(event: Dict[str, Any]):
+    """Push a job state change to dashboard WebSocket clients."""
+    try:
+        from channels.layers import get_channel_layer
+        from asgiref.sync import async_to_sync
+
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        async_to_sync(channel_layer.group_send)(
+            "dashboard_updates",
+            dict(event, type="crew_job_update", timestamp=_now_iso()),
+        )
+    except Exception as e:
+        logger.warning(f"WebSocket broadcast failed: {e}")
+
+
+def _run_crew_job(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """Default runner: execute the crew via crew_api_views on a worker thread."""
+    from django.db import close_old_connections
+    from .views.crew_api_views import _run_crew_payload
+
+    close_old_connections()
+    try:
+        return _run_crew_payload(payload)
+    finally:
+        close_old_connections()
+
+
+def get_job_queue() -> CrewJobQueue:
+    """Return the process-wide crew job queue, creating it from settings on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                from django.conf import settings
+
+                concurrency = dict(DEFAULT_CONCURRENCY)
+                concurrency.update(getattr(settings, "CREW_JOB_CONCURRENCY", {}) or {})
+                _queue = CrewJobQueue(
+                    runner=_run_crew_job,
+                    max_workers=getattr(settings, "CREW_JOB_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+                    concurrency=concurrency,
+                    default_concurrency=getattr(
+                        settings, "CREW_JOB_DEFAULT_CONCURRENCY", DEFAULT_TYPE_CONCURRENCY
+                    ),
+                    notifier=_broadcast_job_update,
+                    retention_seconds=getattr(
+                        settings, "CREW_JOB_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS
+                    ),
+                )
+    return _queue
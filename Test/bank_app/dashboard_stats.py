@@ -0,0 +1,170 @@
+"""
+Cached aggregates behind the dashboard JSON endpoints.
+
+dashboard_stats_api and dashboard_charts_api used to run one COUNT per
+status and two per region on every poll (the dashboard polls both every
+few seconds per open tab). Each payload is now built from grouped queries:
+
+    - stats:  values('status').annotate(Count, Sum)          -> 1 query
+    - charts: values('status').annotate(Count)
+              values('region').annotate(Count, Count(filter=APPROVED))
+              values(TruncMonth).annotate(Count)             -> 3 queries
+
+and kept in Django's cache for DASHBOARD_CACHE_TTL seconds. Writes bump a
+generation number (LoanApplication.save/delete and the bulk endpoints call
+invalidate()), so the next poll recomputes; the TTL bounds staleness for
+writes that bypass the model (queryset.update, the crews' raw SQL).
+
+Every payload carries an ETag hashed from its JSON, so a dashboard whose
+numbers did not change gets 304 Not Modified even after a recompute.
+"""
+import hashlib
+import json
+import logging
+import os
+from decimal import Decimal
+from typing import Any, Callable, Dict, Tuple
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import LoanApplication
+
+logger = logging.getLogger(__name__)
+
+# Seconds a computed payload may be served (0 = always recompute)
+DASHBOARD_CACHE_TTL = int(os.environ.get("DASHBOARD_CACHE_TTL", "30"))
+
+PENDING_STATUSES = ('SUBMITTED', 'UNDER_REVIEW')
+
+_GENERATION_KEY = 'dashboard:generation'
+
+
+# =============================================================================
+# AGGREGATES
+# =============================================================================
+
+def _status_counts(with_amount: bool = False) -> Dict[str, Dict[str, Any]]:
+    """One grouped query: {status: {'count': n[, 'amount': Decimal]}}."""
+    annotations = {'count': Count('id')}
+    if with_amount:
+        annotations['amount'] = Sum('loan_amount')
+    rows = LoanApplication.objects.order_by().values('status').annotate(**annotations)
+    return {row['status']: row for row in rows}
+
+
+def compute_stats() -> Dict[str, Any]:
+    """Payload of dashboard_stats_api."""
+    counts = _status_counts(with_amount=True)
+
+    by_status = {
+        status: {'count': counts.get(status, {}).get('count', 0), 'label': label}
+        for status, label in LoanApplication.STATUS_CHOICES
+    }
+    total_amount = sum((row['amount'] or Decimal('0') for row in counts.values()), Decimal('0'))
+
+    recent_loans = [{
+        'id': loan['id'],
+        'application_id': loan['application_id'],
+        'applicant_name': loan['applicant_name'],
+        'loan_amount': str(loan['loan_amount']),
+        'status': loan['status'],
+        'created_at': loan['created_at'].isoformat()
+    } for loan in LoanApplication.objects.values(
+        'id', 'application_id', 'applicant_name', 'loan_amount', 'status', 'created_at'
+    )[:10]]
+
+    return {
+        'total_loans': sum(row['count'] for row in counts.values()),
+        'by_status': by_status,
+        'total_amount': str(total_amount),
+        'pending_approvals': sum(counts.get(status, {}).get('count', 0) for status in PENDING_STATUSES),
+        'recent_loans': recent_loans
+    }
+
+
+def compute_charts() -> Dict[str, Any]:
+    """Payload of dashboard_charts_api."""
+    counts = _status_counts()
+    status_data = [
+        {'status': status, 'label': label, 'count': counts[status]['count']}
+        for status, label in LoanApplication.STATUS_CHOICES
+        if counts.get(status, {}).get('count', 0) > 0
+    ]
+
+    monthly = LoanApplication.objects.annotate(
+        month=TruncMonth('created_at')
+    ).order_by().values('month').annotate(
+        count=Count('id')
+    ).order_by('month')
+    monthly_trend = [{
+        'month': m['month'].isoformat(),
+        'count': m['count']
+    } for m in monthly]
+
+    regions = {
+        row['region']: row
+        for row in LoanApplication.objects.order_by().values('region').annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status='APPROVED'))
+        )
+    }
+    region_data = []
+    for region, label in LoanApplication.REGION_CHOICES:
+        row = regions.get(region)
+        if not row or not row['total']:
+            continue
+        region_data.append({
+            'region': region,
+            'label': label,
+            'total': row['total'],
+            'approved': row['approved'],
+            'approval_rate': round(row['approved'] / row['total'] * 100, 2)
+        })
+
+    return {
+        'status_distribution': status_data,
+        'monthly_trend': monthly_trend,
+        'region_performance': region_data
+    }
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def invalidate():
+    """Write hook: the next dashboard poll recomputes its payloads."""
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        # Missing (first write, or evicted): any new value retires old entries
+        cache.set(_GENERATION_KEY, 1, None)
+
+
+def _cached(name: str, compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+    # Read the generation BEFORE computing: a write that lands mid-compute
+    # bumps it, so this (possibly stale) payload is never served after it.
+    generation = cache.get_or_set(_GENERATION_KEY, 0, None)
+    key = f'dashboard:{name}:{generation}'
+    cached = cache.get(key)
+    if cached is None:
+        payload = compute()
+        body = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+        cached = (payload, hashlib.md5(body.encode()).hexdigest())
+        if DASHBOARD_CACHE_TTL > 0:
+            cache.set(key, cached, DASHBOARD_CACHE_TTL)
+        logger.debug(f"Recomputed dashboard {name} (generation {generation})")
+    return cached
+
+
+def get_stats() -> Tuple[Dict[str, Any], str]:
+    """(dashboard stats payload, ETag)"""
+    return _cached('stats', compute_stats)
+
+
+def get_charts() -> Tuple[Dict[str, Any], str]:
+    """(dashboard charts payload, ETag)"""
+    return _cached('charts', compute_charts)
@@ -1,12 +1,22 @@
 """
 Database utility functions for direct SQLite access to legacy bank_poc.db.
 This module bypasses Django ORM and provides direct SQL access to the legacy database.
+
+Connections are pooled: a helper call borrows an open connection (PRAGMAs
+already applied, prepared statements cached) instead of paying
+sqlite3.connect and a cold page cache each time, and nested calls on the
+same thread share the borrowed connection. Read helpers use a read-only
+(mode=ro URI) pool. Every query is timed; see record_queries() and
+get_query_stats().
 """
 import sqlite3
 import logging
+import threading
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +38,128 @@ TABLE_PRIMARY_KEYS = {
     'interest_rates_catalog': 'rate_id',
 }
 
+# Tables whose changes make cached crew responses stale (see response_cache)
+RATE_TABLES = {'interest_rates_catalog'}
+
+# Tables aggregated into the admin analytics rollup (see admin_stats)
+STATS_TABLES = {'loan_applications', 'fixed_deposit'}
+
+# Connection pool settings
+POOL_MAX_IDLE = 8  # idle connections kept per pool (read-write and read-only)
+STATEMENT_CACHE_SIZE = 256  # prepared statements cached per connection
+SLOW_QUERY_MS = 200  # queries slower than this are logged as warnings
+
+# PRAGMAs applied to every pooled connection. The read-write pool also
+# switches the file to WAL, so admin pages read while crews write.
+CONNECTION_PRAGMAS = {
+    'busy_timeout': 5000,  # ms to wait on a locked database instead of failing
+    'synchronous': 'NORMAL',  # durable in WAL mode except on power loss
+    'cache_size': -16000,  # page cache in KiB (16 MB)
+    'mmap_size': 268435456,  # read through a 256 MB memory map
+    'temp_store': 'MEMORY',
+}
+
+
+# =============================================================================
+# CONNECTION POOL
+# =============================================================================
+
+class _ConnectionPool:
+    """Idle connections to one database file, reused across calls and threads."""
+
+    def __init__(self, path: str, read_only: bool):
+        self.path = path
+        self.read_only = read_only
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        if self.read_only:
+            target, uri = f"file:{quote(self.path)}?mode=ro", True
+        else:
+            target, uri = self.path, False
+        conn = sqlite3.connect(
+            target,
+            uri=uri,
+            timeout=CONNECTION_PRAGMAS['busy_timeout'] / 1000,
+            check_same_thread=False,  # a connection serves one thread at a time
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        if not self.read_only:
+            conn.execute("PRAGMA journal_mode=WAL")
+        for name, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        _count('connections_opened')
+        logger.debug(f"Connected to legacy database: {self.path} (read_only={self.read_only})")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            return self._open()
+        _count('connections_reused')
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()  # never hand out a connection mid-transaction
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding legacy database connection: {e}")
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < POOL_MAX_IDLE:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+
+_pools: Dict[Tuple[str, bool], _ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_local = threading.local()  # connections borrowed by this thread, recorders
+
+
+def _get_pool(read_only: bool) -> _ConnectionPool:
+    # Keyed by path too, so pointing LEGACY_DB_PATH elsewhere gets a new pool
+    key = (str(LEGACY_DB_PATH), read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _ConnectionPool(*key)
+    return pool
+
+
+def close_connections():
+    """Close every idle pooled connection (tests, before replacing the file)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
 
 @contextmanager
-def get_legacy_connection():
+def get_legacy_connection(read_only: bool = False):
     """
     Context manager for getting a connection to the legacy SQLite database.
+
+    The connection comes from a pool and goes back to it afterwards
+    (uncommitted work is rolled back). Nested calls on the same thread
+    reuse the connection already borrowed. ``read_only=True`` borrows a
+    mode=ro connection that cannot write.
     
     Usage:
         with get_legacy_connection() as conn:
@@ -40,19 +167,166 @@ def get_legacy_connection():
             cursor.execute("SELECT * FROM loan_applications")
             rows = cursor.fetchall()
     """
-    conn = None
+    borrowed = getattr(_local, 'borrowed', None)
+    if borrowed is None:
+        borrowed = _local.borrowed = {}
+    key = (str(LEGACY_DB_PATH), read_only)
+    if key in borrowed:
+        yield borrowed[key]
+        return
+
+    pool = _get_pool(read_only)
     try:
-        conn = sqlite3.connect(str(LEGACY_DB_PATH))
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        logger.debug(f"Connected to legacy database: {LEGACY_DB_PATH}")
-        yield conn
+        conn = pool.acquire()
     except sqlite3.Error as e:
         logger.error(f"Database connection error: {e}")
         raise
+    borrowed[key] = conn
+    try:
+        yield conn
+    except sqlite3.Error as e:
+        logger.error(f"Database error: {e}")
+        raise
     finally:
-        if conn:
-            conn.close()
-            logger.debug("Database connection closed")
+        del borrowed[key]
+        pool.release(conn)
+
+
+@contextmanager
+def sqlite_transaction(path: Union[str, Path], timeout: float = 10) -> Iterator[sqlite3.Connection]:
+    """
+    One transaction on a standalone SQLite file (not the legacy database):
+    committed (rolled back on error), then the connection is closed.
+
+    For the small side stores (response cache, RAG catalog, keyword index,
+    embedding cache) that open a connection per operation. A bare
+    ``with sqlite3.connect(path) as conn`` only ends the transaction and
+    leaves the handle open until garbage collection.
+
+    Usage:
+        with sqlite_transaction(self.path) as conn:
+            conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+    """
+    conn = sqlite3.connect(str(path), timeout=timeout)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# QUERY TIMING
+# =============================================================================
+
+_query_stats = {
+    'queries': 0,
+    'errors': 0,
+    'slow_queries': 0,
+    'total_ms': 0.0,
+    'connections_opened': 0,
+    'connections_reused': 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, amount: Union[int, float] = 1):
+    with _stats_lock:
+        _query_stats[name] += amount
+
+
+class QueryTimings:
+    """Queries run inside a record_queries() block: (sql, milliseconds, error)."""
+
+    def __init__(self):
+        self.queries: List[Tuple[str, float, Optional[str]]] = []
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(ms for _, ms, _ in self.queries), 3)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+
+@contextmanager
+def record_queries():
+    """
+    Collect the timings of legacy queries run by this thread in the block.
+
+    Usage (audit trail for the admin query interface):
+        with record_queries() as timings:
+            rows = execute_raw_sql(sql)
+        DatabaseQueryLog.objects.create(..., execution_time_ms=int(timings.total_ms))
+    """
+    timings = QueryTimings()
+    recorders = getattr(_local, 'recorders', None)
+    if recorders is None:
+        recorders = _local.recorders = []
+    recorders.append(timings)
+    try:
+        yield timings
+    finally:
+        recorders.remove(timings)
+
+
+@contextmanager
+def _timed(query: str):
+    """Time one query (execution and fetch) into the stats and active recorders."""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except sqlite3.Error as e:
+        error = str(e)
+        raise
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            _query_stats['queries'] += 1
+            _query_stats['total_ms'] += ms
+            if error:
+                _query_stats['errors'] += 1
+            if ms > SLOW_QUERY_MS:
+                _query_stats['slow_queries'] += 1
+        if ms > SLOW_QUERY_MS:
+            logger.warning(f"Slow legacy query ({ms:.0f}ms): {' '.join(query.split())[:200]}")
+        for recorder in getattr(_local, 'recorders', ()):
+            recorder.queries.append((query, round(ms, 3), error))
+
+
+def get_query_stats() -> Dict[str, Any]:
+    """Query counts, latency and connection reuse for this process."""
+    with _stats_lock:
+        stats = dict(_query_stats)
+    stats['total_ms'] = round(stats['total_ms'], 2)
+    stats['avg_ms'] = round(stats['total_ms'] / stats['queries'], 3) if stats['queries'] else 0.0
+    with _pools_lock:
+        stats['idle_connections'] = sum(pool.idle_count() for pool in _pools.values())
+    return stats
+
+
+def _table_changed(table_name: str):
+    """Invalidate caches derived from ``table_name`` after a write to it.
+
+    Rates tables: cached crew responses. Loan / FD tables: the admin
+    analytics rollup (see admin_stats).
+    """
+    if table_name in STATS_TABLES:
+        from .admin_stats import mark_stale
+
+        try:
+            mark_stale(table_name)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not mark admin stats stale for {table_name}: {e}")
+    if table_name not in RATE_TABLES:
+        return
+    try:
+        from response_cache import invalidate_rates
+    except ImportError:
+        return
+    invalidate_rates()
 
 
 def dictfetchall(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
@@ -106,9 +380,8 @@ def count_records(table_name: str, where_clause: str = "", params: Tuple = ()) -
     if where_clause and where_clause.strip():
         query += f" WHERE {where_clause}"
     
-    with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    with get_legacy_connection(read_only=True) as conn, _timed(query):
+        cursor = conn.execute(query, params)
         result = cursor.fetchone()
         return result[0] if result else 0
 
@@ -151,9 +424,8 @@ def get_all_records(
         if offset > 0:
             query += f" OFFSET {offset}"
     
-    with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    with get_legacy_connection(read_only=True) as conn, _timed(query):
+        cursor = conn.execute(query, params)
         return dictfetchall(cursor)
 
 
@@ -174,9 +446,8 @@ def get_record_by_id(table_name: str, record_id: Union[int, str]) -> Optional[Di
     pk_column = TABLE_PRIMARY_KEYS.get(table_name, 'id')
     query = f"SELECT * FROM {table_name} WHERE {pk_column} = ?"
     
-    with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, (int(record_id),))
+    with get_legacy_connection(read_only=True) as conn, _timed(query):
+        cursor = conn.execute(query, (int(record_id),))
         return dictfetchone(cursor)
 
 
@@ -203,9 +474,8 @@ def get_records_by_ids(
     placeholders = ','.join(['?' for _ in ids])
     query = f"SELECT {columns} FROM {table_name} WHERE {pk_column} IN ({placeholders})"
     
-    with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, ids)
+    with get_legacy_connection(read_only=True) as conn, _timed(query):
+        cursor = conn.execute(query, ids)
         return dictfetchall(cursor)
 
 
@@ -234,9 +504,10 @@ def create_record(
     query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
     
     with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, list(data.values()))
-        conn.commit()
+        with _timed(query):
+            cursor = conn.execute(query, list(data.values()))
+            conn.commit()
+        _table_changed(table_name)
         
         # Get the inserted record
         pk_column = TABLE_PRIMARY_KEYS.get(table_name, 'id')
@@ -271,9 +542,10 @@ def update_record(
     query = f"UPDATE {table_name} SET {set_clause} WHERE {pk_column} = ?"
     
     with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, list(data.values()) + [record_id])
-        conn.commit()
+        with _timed(query):
+            cursor = conn.execute(query, list(data.values()) + [record_id])
+            conn.commit()
+        _table_changed(table_name)
         return cursor.rowcount > 0
 
 
@@ -301,9 +573,10 @@ def update_records_where(
         query += f" WHERE {where_clause}"
     
     with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, list(data.values()) + list(params))
-        conn.commit()
+        with _timed(query):
+            cursor = conn.execute(query, list(data.values()) + list(params))
+            conn.commit()
+        _table_changed(table_name)
         return cursor.rowcount
 
 
@@ -326,9 +599,10 @@ def delete_record(table_name: str, record_id: Union[int, str]) -> bool:
     query = f"DELETE FROM {table_name} WHERE {pk_column} = ?"
     
     with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, (record_id,))
-        conn.commit()
+        with _timed(query):
+            cursor = conn.execute(query, (record_id,))
+            conn.commit()
+        _table_changed(table_name)
         return cursor.rowcount > 0
 
 
@@ -353,9 +627,10 @@ def delete_records_where(
         query += f" WHERE {where_clause}"
     
     with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
+        with _timed(query):
+            cursor = conn.execute(query, params)
+            conn.commit()
+        _table_changed(table_name)
         return cursor.rowcount
 
 
@@ -378,13 +653,19 @@ def execute_raw_sql(
         
     Returns:
         Query results based on fetch parameter
+
+    Queries that fetch rows run on a read-only connection; use
+    fetch="none" for statements that write.
     """
-    with get_legacy_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+    with get_legacy_connection(read_only=fetch != "none") as conn, _timed(query):
+        cursor = conn.execute(query, params)
         
         if fetch == "none":
             conn.commit()
+            lowered = query.lower()
+            for table in RATE_TABLES | STATS_TABLES:
+                if table in lowered:
+                    _table_changed(table)
             return cursor.rowcount
         elif fetch == "one":
             return dictfetchone(cursor)
@@ -516,6 +797,8 @@ def get_table_counts() -> Dict[str, int]:
     """
     tables = list(TABLE_PRIMARY_KEYS.keys())
     counts = {}
-    for table in tables:
-        counts[table] = count_records(table)
+    # One borrowed connection for all the counts
+    with get_legacy_connection(read_only=True):
+        for table in tables:
+            counts[table] = count_records(table)
     return counts
@@ -0,0 +1,371 @@
+"""
+Event outbox and batched WebSocket fan-out for dashboard events.
+
+LoanApplication.save used to call ``async_to_sync(group_send)`` inline, so
+every status change blocked the request on the channel layer, and a bulk
+update sent one message per loan. With ``InMemoryChannelLayer`` those
+messages also never left the worker process that made the change, so
+dashboards connected to another worker missed them.
+
+Now ``publish()`` only appends the event to an outbox and returns. A
+dispatcher thread drains the outbox every ``tick_seconds`` and coalesces
+what it read:
+
+    - loan_status_update events for the same group become ONE message,
+      ``{'type': 'loan_status_update', 'updates': [...]}``, with one entry
+      per loan (first old_status, last new_status)
+    - every other event type is forwarded as-is, in order
+
+Outbox backends (settings.EVENT_OUTBOX_BACKEND):
+    memory  in-process deque; the publishing process dispatches. Use with a
+            cross-process channel layer (channels_redis, or any
+            Redis-compatible server via REDIS_URL).
+    sqlite  shared SQLite file (EVENT_OUTBOX_PATH). Every process appends to
+            it and every process serving WebSockets tails it from its own
+            cursor, so InMemoryChannelLayer dashboards in any worker see
+            changes made in any other worker or management command.
+
+Configuration (settings.py, all optional):
+    EVENT_OUTBOX_BACKEND          'memory' or 'sqlite' (default 'memory')
+    EVENT_OUTBOX_PATH             sqlite outbox file
+    EVENT_DISPATCH_TICK_SECONDS   dispatcher tick (default 0.25)
+    EVENT_OUTBOX_RETENTION_SECONDS how long sqlite outbox rows are kept (default 300)
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# DEFAULTS
+# =============================================================================
+
+DEFAULT_TICK_SECONDS = 0.25
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_PENDING = 10000
+DEFAULT_RETENTION_SECONDS = 300
+
+STATUS_EVENT = "loan_status_update"
+
+Event = Tuple[str, Dict[str, Any]]  # (group, event)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# =============================================================================
+# OUTBOX BACKENDS
+# =============================================================================
+
+class MemoryOutbox:
+    """
+    In-process outbox. Holds at most ``max_pending`` events; when the
+    dispatcher falls that far behind the oldest are dropped (and counted).
+    """
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self._events: deque = deque(maxlen=max(1, int(max_pending)))
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, group: str, event: Dict[str, Any]):
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append((group, event))
+
+    def read(self, limit: int = DEFAULT_MAX_BATCH) -> List[Event]:
+        with self._lock:
+            count = min(limit, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+
+class SQLiteOutbox:
+    """
+    Outbox table in a SQLite file shared by every process on the host.
+
+    Rows are never consumed: each reader keeps a cursor (the last id it
+    read, starting at the newest row when it is created), so every process
+    sees every event. Rows older than ``retention_seconds`` are pruned.
+    AUTOINCREMENT keeps ids increasing even after a prune empties the table,
+    and SQLite commits writers one at a time, so ids become visible in order.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS event_outbox (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            group_name TEXT    NOT NULL,
+            payload    TEXT    NOT NULL,
+            created_at REAL    NOT NULL
+        )
+    """
+
+    def __init__(self, path, retention_seconds: float = DEFAULT_RETENTION_SECONDS):
+        self.path = str(path)
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._SCHEMA)
+        self._cursor: Optional[int] = None
+
+    def put(self, group: str, event: Dict[str, Any]):
+        payload = json.dumps(event, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO event_outbox (group_name, payload, created_at) VALUES (?, ?, ?)",
+                (group, payload, time.time()),
+            )
+
+    def read(self, limit: int = DEFAULT_MAX_BATCH) -> List[Event]:
+        with self._lock:
+            if self._cursor is None:
+                self._cursor = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM event_outbox").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT id, group_name, payload FROM event_outbox WHERE id > ? ORDER BY id LIMIT ?",
+                (self._cursor, limit),
+            ).fetchall()
+            if rows:
+                self._cursor = rows[-1][0]
+        return [(group, json.loads(payload)) for _, group, payload in rows]
+
+    def pending(self) -> int:
+        with self._lock:
+            if self._cursor is None:
+                return 0
+            return self._conn.execute("SELECT COUNT(*) FROM event_outbox WHERE id > ?", (self._cursor,)).fetchone()[0]
+
+    def prune(self) -> int:
+        """Delete rows older than the retention window; returns how many."""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM event_outbox WHERE created_at < ?", (time.time() - self.retention_seconds,)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# =============================================================================
+# COALESCING
+# =============================================================================
+
+def coalesce(events: List[Event]) -> List[Event]:
+    """
+    Turn a drained run of events into the messages to send.
+
+    Status updates are merged per group into one batched loan_status_update
+    (placed where the group's first status update was), one entry per loan.
+    Other events keep their order.
+    """
+    messages: List[Any] = []
+    batches: Dict[str, "OrderedDict[Any, Dict[str, Any]]"] = {}
+    for group, event in events:
+        if event.get("type") != STATUS_EVENT:
+            messages.append((group, event))
+            continue
+        updates = batches.get(group)
+        if updates is None:
+            updates = batches[group] = OrderedDict()
+            messages.append(group)  # placeholder for this group's batch
+        # An event that is already a batch merges entry by entry
+        for update in event.get("updates") or [event]:
+            entry = {key: value for key, value in update.items() if key != "type"}
+            previous = updates.get(entry["loan_id"])
+            if previous is not None:
+                entry["old_status"] = previous["old_status"]
+            updates[entry["loan_id"]] = entry
+
+    result = []
+    for message in messages:
+        if isinstance(message, str):
+            updates = list(batches[message].values())
+            result.append((message, {
+                "type": STATUS_EVENT,
+                "updates": updates,
+                "count": len(updates),
+                "timestamp": _now_iso(),
+            }))
+        else:
+            result.append(message)
+    return result
+
+
+# =============================================================================
+# DISPATCHER
+# =============================================================================
+
+class EventDispatcher:
+    """
+    Background thread that drains an outbox every ``tick_seconds``,
+    coalesces the events and hands each message to ``sender(group, message)``.
+
+    Args:
+        outbox: MemoryOutbox or SQLiteOutbox
+        sender: Callable ``(group, message)``; a failure is logged and the
+                message dropped (dashboards are refreshed by the next poll)
+        tick_seconds: How often the outbox is drained
+        max_batch: Most events read per drain
+    """
+
+    # Prune the sqlite outbox every this many ticks
+    PRUNE_EVERY_TICKS = 240
+
+    def __init__(
+        self,
+        outbox,
+        sender: Callable[[str, Dict[str, Any]], None],
+        tick_seconds: float = DEFAULT_TICK_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self.outbox = outbox
+        self._sender = sender
+        self.tick_seconds = max(0.01, float(tick_seconds))
+        self.max_batch = max(1, int(max_batch))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._ticks = 0
+        self.events_read = 0
+        self.messages_sent = 0
+        self.send_failures = 0
+
+    def start(self):
+        """Start the dispatcher thread (no-op if running)."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="event-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop the thread; by default send whatever is still queued first."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """Drain the outbox now; returns the number of messages sent."""
+        sent = 0
+        while True:
+            events = self.outbox.read(self.max_batch)
+            if not events:
+                return sent
+            self.events_read += len(events)
+            for group, message in coalesce(events):
+                try:
+                    self._sender(group, message)
+                    sent += 1
+                    self.messages_sent += 1
+                except Exception as e:
+                    self.send_failures += 1
+                    logger.warning(f"Event dispatch to {group} failed: {e}")
+            if len(events) < self.max_batch:
+                return sent
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.outbox).__name__,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "tick_seconds": self.tick_seconds,
+            "pending": self.outbox.pending(),
+            "events_read": self.events_read,
+            "messages_sent": self.messages_sent,
+            "send_failures": self.send_failures,
+            "dropped": getattr(self.outbox, "dropped", 0),
+        }
+
+    def _loop(self):
+        while not self._stop.wait(self.tick_seconds):
+            try:
+                self.flush()
+                self._ticks += 1
+                if self._ticks % self.PRUNE_EVERY_TICKS == 0 and hasattr(self.outbox, "prune"):
+                    self.outbox.prune()
+            except Exception as e:
+                logger.error(f"Event dispatcher tick failed: {e}", exc_info=True)
+
+
+# =============================================================================
+# PROCESS-WIDE OUTBOX
+# =============================================================================
+
+_dispatcher: Optional[EventDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def _group_send(group: str, message: Dict[str, Any]):
+    """Default sender: the configured channel layer, from the dispatcher thread."""
+    from channels.layers import get_channel_layer
+    from asgiref.sync import async_to_sync
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(group, message)
+
+
+def get_dispatcher() -> EventDispatcher:
+    """Return the process-wide dispatcher, creating it from settings on first use."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                from django.conf import settings
+
+                backend = getattr(settings, "EVENT_OUTBOX_BACKEND", "memory")
+                if backend == "sqlite":
+                    outbox = SQLiteOutbox(
+                        settings.EVENT_OUTBOX_PATH,
+                        retention_seconds=getattr(
+                            settings, "EVENT_OUTBOX_RETENTION_SECONDS", DEFAULT_RETENTION_SECONDS
+                        ),
+                    )
+                else:
+                    outbox = MemoryOutbox()
+                _dispatcher = EventDispatcher(
+                    outbox,
+                    sender=_group_send,
+                    tick_seconds=getattr(settings, "EVENT_DISPATCH_TICK_SECONDS", DEFAULT_TICK_SECONDS),
+                )
+    return _dispatcher
+
+
+def start_dispatcher():
+    """Start dispatching in this process (called by DashboardConsumer.connect)."""
+    get_dispatcher().start()
+
+
+def publish(group: str, event: Dict[str, Any]):
+    """
+    Queue an event for ``group``; never blocks on the channel layer.
+
+    With the memory outbox this process must dispatch it, so the dispatcher
+    is started here. With the sqlite outbox, processes serving WebSockets
+    dispatch; a process that only writes (a WSGI worker, a management
+    command) just appends.
+    """
+    try:
+        dispatcher = get_dispatcher()
+        dispatcher.outbox.put(group, event)
+        if isinstance(dispatcher.outbox, MemoryOutbox):
+            dispatcher.start()
+    except Exception as e:
+        logger.warning(f"Event publish to {group} failed: {e}")
@@ -0,0 +1,114 @@
+"""
+Set-based status transitions for many loan applications at once.
+
+The bulk approve/reject endpoints used to call loan.save() per loan, and
+LoanApplication.save re-fetches the old row, writes its AuditLog rows one
+INSERT at a time and does a synchronous group_send: ~4 queries and one
+channel message per loan, so approving 5,000 loans took ~20,000 queries.
+
+bulk_transition() does the same work per batch instead of per row, inside
+one transaction:
+
+    1. SELECT id, status of the loans that can transition
+       (select_for_update, so on PostgreSQL no other writer moves them)
+    2. UPDATE ... SET status, decided_at, updated_at WHERE id IN (...)
+       AND status IN (...)  (one statement per connection.ops batch; a
+       single one on PostgreSQL, 999 ids each on SQLite)
+    3. AuditLog.objects.bulk_create with the rows save() would have written
+       (LOAN_APPROVED / LOAN_REJECTED, old/new status, actor, IP)
+
+and drops the cached dashboard aggregates. The caller sends ONE
+admin_action WebSocket event for the batch (api_views does) instead of a
+loan_status_update per loan; dashboard clients refresh the listed loans.
+
+Benchmark: benchmarks/bench_bulk_transition.py
+"""
+import logging
+from typing import Any, Dict, Iterable
+
+from django.db import connection, transaction
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import dashboard_stats
+from .middleware import get_current_ip_address, get_current_user_id, get_current_user_type
+from .models import AuditLog, LoanApplication
+
+logger = logging.getLogger(__name__)
+
+# Statuses a loan may be bulk-approved or bulk-rejected from
+PENDING_STATUSES = ('SUBMITTED', 'UNDER_REVIEW')
+
+AUDIT_BATCH_SIZE = 1000
+
+
+def bulk_transition(queryset, new_status: str,
+                    from_statuses: Iterable[str] = PENDING_STATUSES) -> Dict[str, Any]:
+    """
+    Move every loan in ``queryset`` whose status is in ``from_statuses`` to
+    ``new_status``, with the audit trail LoanApplication.save would write.
+
+    Args:
+        queryset: LoanApplication queryset (ids or filter criteria)
+        new_status: Target status, e.g. 'APPROVED'
+        from_statuses: Only loans in these statuses transition; others are skipped
+
+    Returns:
+        {'updated_count': int, 'loan_ids': [ids that transitioned]}
+    """
+    from_statuses = tuple(from_statuses)
+    now = timezone.now()
+    actor_type = get_current_user_type() or 'SYSTEM'
+    actor_id = get_current_user_id() or 'anonymous'
+    ip_address = get_current_ip_address()
+    action = LoanApplication.STATUS_AUDIT_ACTIONS.get(new_status, 'LOAN_UPDATED')
+
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(status__in=from_statuses)
+            .select_for_update()
+            .order_by()
+            .values_list('id', 'status')
+        )
+        ids = [row[0] for row in rows]
+
+        changes = {'status': new_status, 'updated_at': now}
+        if new_status in ('APPROVED', 'REJECTED'):
+            # save() sets decided_at the first time a loan is decided
+            changes['decided_at'] = Coalesce('decided_at', Value(now, output_field=DateTimeField()))
+
+        updated = 0
+        batch_size = max(connection.ops.bulk_batch_size(['id'], ids), 1) if ids else 1
+        for offset in range(0, len(ids), batch_size):
+            updated += LoanApplication.objects.filter(
+                id__in=ids[offset:offset + batch_size], status__in=from_statuses
+            ).update(**changes)
+
+        AuditLog.objects.bulk_create([
+            AuditLog(
+                application_id=loan_id,
+                action=action,
+                actor_type=actor_type,
+                actor_id=actor_id,
+                details={
+                    'old_status': old_status,
+                    'new_status': new_status,
+                    'timestamp': now.isoformat(),
+                    'ip_address': ip_address
+                },
+                ip_address=ip_address
+            )
+            for loan_id, old_status in rows
+        ], batch_size=AUDIT_BATCH_SIZE)
+
+    if updated != len(ids):
+        # Only possible if a writer moved a selected row inside the transaction
+        logger.warning(f"Bulk transition to {new_status}: selected {len(ids)} loans, updated {updated}")
+
+    if ids:
+        dashboard_stats.invalidate()
+    logger.info(f"Bulk transition to {new_status}: {len(ids)} loans")
+
+    return {'updated_count': len(ids), 'loan_ids': ids}
+
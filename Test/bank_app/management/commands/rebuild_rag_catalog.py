@@ -0,0 +1,34 @@
+"""
+Rebuild the RAG document catalog (rag_catalog.sqlite3) and keyword index
+(rag_keyword_index.sqlite3) from ChromaDB, and the per-category partitions
+when RAG_CATEGORY_PARTITIONS=1.
+
+Use after restoring rag_chroma_db from a backup or if the document list /
+stats in the RAG tools disagree with what is actually stored.
+
+    python manage.py rebuild_rag_catalog
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rebuild the RAG document catalog and keyword index from the ChromaDB collection"
+
+    def handle(self, *args, **options):
+        import rag_engine
+        from rag_engine import CATALOG_PATH, KEYWORD_INDEX_PATH, rebuild_catalog, rebuild_keyword_index
+
+        result = rebuild_catalog()
+        self.stdout.write(self.style.SUCCESS(
+            f"Catalogued {result['documents']} documents ({result['chunks']} chunks) in {CATALOG_PATH}"
+        ))
+        result = rebuild_keyword_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {result['chunks']} chunks for keyword search in {KEYWORD_INDEX_PATH}"
+        ))
+        if rag_engine.CATEGORY_PARTITIONS:
+            result = rag_engine.rebuild_partitions()
+            self.stdout.write(self.style.SUCCESS(
+                f"Built {result['partitions']} category partitions ({result['chunks']} chunks)"
+            ))
@@ -37,6 +37,11 @@ class RegionDetectionMiddleware:
             # Manual override already handled by the view
             return self.get_response(request)
 
+        # Health probes carry no session cookie; don't geolocate (and create a
+        # session for) every probe request
+        if request.path.startswith('/healthz/'):
+            return self.get_response(request)
+
         # Detect region on first request if not already set
         if 'user_region' not in request.session:
             region_data = self._detect_region(request)
@@ -1,10 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from decimal import Decimal
 import json
 import threading
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 
 
 # =============================================================================
@@ -30,6 +28,17 @@ class LoanApplication(models.Model):
         ('US', 'United States'),
     ]
     
+    # AuditLog action written when a loan moves to a status
+    STATUS_AUDIT_ACTIONS = {
+        'SUBMITTED': 'LOAN_SUBMITTED',
+        'APPROVED': 'LOAN_APPROVED',
+        'REJECTED': 'LOAN_REJECTED',
+        'UNDER_REVIEW': 'LOAN_UPDATED',
+        'KYC_PENDING': 'LOAN_UPDATED',
+        'COMPLIANCE_CHECK': 'COMPLIANCE_CHECKED',
+        'DISBURSED': 'LOAN_UPDATED',
+    }
+    
     # Application metadata
     application_id = models.CharField(max_length=50, unique=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='DRAFT')
@@ -115,6 +124,7 @@ class LoanApplication(models.Model):
     
         # Call parent save
         super().save(*args, **kwargs)
+        self._invalidate_dashboard()
     
         # AUDIT LOGGING: Track status and compliance changes after save
         if old_instance:
@@ -166,18 +176,19 @@ class LoanApplication(models.Model):
                     }
                 )
     
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate_dashboard()
+        return result
+    
+    def _invalidate_dashboard(self):
+        """Drop the cached dashboard aggregates (see dashboard_stats)."""
+        from .dashboard_stats import invalidate
+        invalidate()
+    
     def _get_action_from_status(self, status):
         """Map status to audit action."""
-        status_to_action = {
-            'SUBMITTED': 'LOAN_SUBMITTED',
-            'APPROVED': 'LOAN_APPROVED',
-            'REJECTED': 'LOAN_REJECTED',
-            'UNDER_REVIEW': 'LOAN_UPDATED',
-            'KYC_PENDING': 'LOAN_UPDATED',
-            'COMPLIANCE_CHECK': 'COMPLIANCE_CHECKED',
-            'DISBURSED': 'LOAN_UPDATED',
-        }
-        return status_to_action.get(status, 'LOAN_UPDATED')
+        return self.STATUS_AUDIT_ACTIONS.get(status, 'LOAN_UPDATED')
     
     def _get_actor_type(self):
         """Get actor type from thread-local storage or default."""
@@ -195,23 +206,22 @@ class LoanApplication(models.Model):
         return get_current_ip_address()
     
     def _broadcast_status_update(self, old_status, new_status):
-        """Broadcast status update via WebSocket."""
-        try:
-            channel_layer = get_channel_layer()
-            async_to_sync(channel_layer.group_send)(
-                'dashboard_updates',
-                {
-                    'type': 'loan_status_update',
-                    'loan_id': self.id,
-                    'application_id': self.application_id,
-                    'old_status': old_status,
-                    'new_status': new_status,
-                    'timestamp': timezone.now().isoformat()
-                }
-            )
-        except Exception as e:
-            # Silently fail if channels not configured
-            pass
+        """
+        Queue a status update for dashboard WebSockets (bank_app.event_outbox).
+
+        Published once the transaction commits; the outbox dispatcher batches
+        it with other updates off the request thread.
+        """
+        from .event_outbox import publish
+        event = {
+            'type': 'loan_status_update',
+            'loan_id': self.id,
+            'application_id': self.application_id,
+            'old_status': old_status,
+            'new_status': new_status,
+            'timestamp': timezone.now().isoformat()
+        }
+        transaction.on_commit(lambda: publish('dashboard_updates', event))
 
 
 # =============================================================================
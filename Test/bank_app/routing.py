@@ -7,5 +7,5 @@ from django.urls import path
 from . import consumers
 
 websocket_urlpatterns = [
-    path('ws/dashboard/', consumers.DashboardConsumer.as_view()),
+    path('ws/dashboard/', consumers.DashboardConsumer.as_asgi()),
 ]
@@ -80,6 +80,90 @@
       return cookieValue || "";
     },
 
+    // =============================================================================
+    // ASYNC CREW JOBS - Queue a crew and poll /api/crew-jobs/<job_id>/
+    // =============================================================================
+
+    /**
+     * Base URL for the async crew job endpoints
+     */
+    jobsUrl: "/api/crew-jobs/",
+
+    /**
+     * Queue a crew for background execution
+     * @param {string} crewType - The type of crew to run
+     * @param {Object} params - Same parameters as runCrew()
+     * @returns {Promise<Object>} - Job description with job_id and status
+     */
+    async submitCrewJob(crewType, params = {}) {
+      const payload = {
+        crew_type: crewType,
+        query: params.query || "",
+        region: params.region || "India",
+        ...(params.additional_params || {}),
+      };
+
+      const response = await fetch(this.jobsUrl, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-CSRFToken": this._getCSRFToken(),
+        },
+        body: JSON.stringify(payload),
+      });
+
+      if (!response.ok) {
+        const error = await response.json().catch(() => ({ error: "Unknown error" }));
+        throw new Error(error.error || `HTTP error! status: ${response.status}`);
+      }
+
+      return response.json();
+    },
+
+    /**
+     * Get the current state of a crew job
+     * @param {string} jobId - The job ID returned by submitCrewJob()
+     */
+    async getCrewJob(jobId) {
+      const response = await fetch(`${this.jobsUrl}${jobId}/`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      return response.json();
+    },
+
+    /**
+     * Cancel a queued or running crew job
+     * @param {string} jobId - The job ID returned by submitCrewJob()
+     */
+    async cancelCrewJob(jobId) {
+      const response = await fetch(`${this.jobsUrl}${jobId}/cancel/`, {
+        method: "POST",
+        headers: { "X-CSRFToken": this._getCSRFToken() },
+      });
+      return response.json();
+    },
+
+    /**
+     * Poll a crew job until it finishes and return its result
+     * @param {string} jobId - The job ID returned by submitCrewJob()
+     * @param {number} intervalMs - Polling interval (default: 2000)
+     * @returns {Promise<Object>} - Same shape as runCrew() on success
+     */
+    async waitForCrewJob(jobId, intervalMs = 2000) {
+      for (;;) {
+        const response = await fetch(`${this.jobsUrl}${jobId}/result/`);
+        if (response.status !== 202) {
+          const job = await response.json().catch(() => ({ error: "Unknown error" }));
+          if (!response.ok) {
+            throw new Error(job.error || `Crew job ${job.status || "failed"} (status: ${response.status})`);
+          }
+          return job.result;
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      }
+    },
+
     // =============================================================================
     // LEGACY WRAPPER METHODS - For backward compatibility during migration
     // These call runCrew() with the appropriate crew_type
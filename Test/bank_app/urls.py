@@ -15,7 +15,10 @@ smart_assistant,
 # API views
 credit_risk_api,
 credit_risk_indian_api,
+credit_risk_indian_batch_api,
 credit_risk_us_api,
+model_registry_stats_api,
+models_ready_api,
 emi_calculator_api,
 kyc_verify_api,
 compliance_check_api,
@@ -39,6 +42,11 @@ fd_template_crew_api,
 visualization_crew_api,
 analysis_crew_api,
 database_crew_api,
+crew_job_submit_api,
+crew_job_status_api,
+crew_job_result_api,
+crew_job_cancel_api,
+crew_job_stats_api,
 smart_assistant_query,
 user_region_api,
 set_region_api,
@@ -67,7 +75,10 @@ urlpatterns = [
     # Credit Risk API endpoints
     path('api/credit-risk/', credit_risk_api, name='credit_risk_api'),
     path('api/credit-risk/indian/', credit_risk_indian_api, name='credit_risk_indian_api'),
+    path('api/credit-risk/indian/batch/', credit_risk_indian_batch_api, name='credit_risk_indian_batch_api'),
     path('api/credit-risk/us/', credit_risk_us_api, name='credit_risk_us_api'),
+    path('api/models/stats/', model_registry_stats_api, name='model_registry_stats_api'),
+    path('healthz/ready', models_ready_api, name='models_ready'),
 
     # EMI Calculator API endpoint
     path('api/emi-calculate/', emi_calculator_api, name='emi_calculator_api'),
@@ -106,6 +117,13 @@ urlpatterns = [
     # NEW: Generic CrewAI execution endpoint (replaces all 11 previous endpoints)
     path('api/run-crew/', run_crew, name='run_crew'),
 
+    # Async crew jobs: submit returns a job ID, poll status/result, cancel
+    path('api/crew-jobs/', crew_job_submit_api, name='crew_job_submit_api'),
+    path('api/crew-jobs/stats/', crew_job_stats_api, name='crew_job_stats_api'),
+    path('api/crew-jobs/<str:job_id>/', crew_job_status_api, name='crew_job_status_api'),
+    path('api/crew-jobs/<str:job_id>/result/', crew_job_result_api, name='crew_job_result_api'),
+    path('api/crew-jobs/<str:job_id>/cancel/', crew_job_cancel_api, name='crew_job_cancel_api'),
+
     # DEPRECATED: Legacy endpoints kept for backward compatibility during migration
     # These will be removed in a future version. Use /api/run-crew/ instead with crew_type parameter.
     path('api/fd-advisor-crew/', fd_advisor_crew_api, name='fd_advisor_crew_api'),
@@ -24,9 +24,6 @@ Module Structure:
 from .base import (
     logger,
     BASE_DIR,
-    INDIAN_MODEL_PATH,
-    INDIAN_SCALER_PATH,
-    US_MODEL_PATH,
     COUNTRYSATECITY_AVAILABLE,
     get_user_region_from_session,
     update_user_session_with_region,
@@ -43,6 +40,9 @@ from .base import (
     UserSession,
 )
 
+# Model paths live with the process-wide model registry (base puts it on sys.path)
+from model_registry import INDIAN_MODEL_PATH, INDIAN_SCALER_PATH, US_MODEL_PATH
+
 # Re-export page views
 from .page_views import (
     home,
@@ -83,14 +83,22 @@ from .crew_api_views import (
     visualization_crew_api,
     analysis_crew_api,
     database_crew_api,
+    crew_job_submit_api,
+    crew_job_status_api,
+    crew_job_result_api,
+    crew_job_cancel_api,
+    crew_job_stats_api,
 )
 
 # Re-export credit risk views
 from .credit_risk_views import (
     credit_risk_indian_api,
+    credit_risk_indian_batch_api,
     credit_risk_us_api,
     credit_risk_api,
     credit_risk_crew_api,  # This overrides the one from crew_api_views
+    model_registry_stats_api,
+    models_ready_api,
 )
 
 # Re-export FD advisor views
@@ -195,11 +203,19 @@ __all__ = [
     'visualization_crew_api',
     'analysis_crew_api',
     'database_crew_api',
+    'crew_job_submit_api',
+    'crew_job_status_api',
+    'crew_job_result_api',
+    'crew_job_cancel_api',
+    'crew_job_stats_api',
     
     # Credit risk views
     'credit_risk_indian_api',
+    'credit_risk_indian_batch_api',
     'credit_risk_us_api',
     'credit_risk_api',
+    'model_registry_stats_api',
+    'models_ready_api',
     
     # FD advisor views
     'fd_rates_api',
@@ -49,14 +49,6 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-# =============================================================================
-# MODEL PATHS
-# =============================================================================
-
-INDIAN_MODEL_PATH = os.path.join(BASE_DIR, "models", "credit_risk", "indian", "loan_model.pkl")
-INDIAN_SCALER_PATH = os.path.join(BASE_DIR, "models", "credit_risk", "indian", "scaler.pkl")
-US_MODEL_PATH = os.path.join(BASE_DIR, "models", "credit_risk", "xgb_model.pkl")
-
 # =============================================================================
 # COUNTRY/STATE/CITY DATA (simplified - in production, use a database)
 # =============================================================================
@@ -8,18 +8,14 @@ import json
 import logging
 import traceback
 import numpy as np
-import joblib
 import markdown
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 
-from .base import (
-    logger,
-    INDIAN_MODEL_PATH,
-    INDIAN_SCALER_PATH,
-    US_MODEL_PATH,
-)
+from model_registry import INDIAN_MODEL_PATH, INDIAN_SCALER_PATH, US_MODEL_PATH, model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +49,8 @@ def credit_risk_indian_api(request):
         if not os.path.exists(INDIAN_MODEL_PATH):
             return JsonResponse({'error': 'Indian model not found'}, status=500)
 
-        model = joblib.load(INDIAN_MODEL_PATH)
-        scaler = joblib.load(INDIAN_SCALER_PATH) if os.path.exists(INDIAN_SCALER_PATH) else None
+        model = model_registry.get("indian_credit_model")
+        scaler = model_registry.get("indian_credit_scaler") if os.path.exists(INDIAN_SCALER_PATH) else None
 
         # Prepare features
         loan_amount = float(data.get('loan_amount', 0))
@@ -93,6 +89,62 @@ def credit_risk_indian_api(request):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@csrf_exempt
+def credit_risk_indian_batch_api(request):
+    """
+    Batch scoring endpoint for the Indian credit risk model.
+
+    POST /api/credit-risk/indian/batch/
+    Body: multipart upload in field "file", or the raw file as the request
+          body. Accepts CSV, Parquet or JSON-lines with one applicant per
+          row/line (same fields as /api/credit-risk/indian/ and the
+          IndianCreditRiskScorerTool).
+    Query params:
+        format: csv | parquet | jsonl (default: from file name / Content-Type)
+        chunk_size: rows scored per model call (default: 5000)
+
+    Response: application/x-ndjson stream, one result per applicant in input
+    order, followed by a {"summary": {...}} line. An unreadable file or a
+    missing required column is a 400; a file that breaks further in ends
+    the stream with an {"error": ...} line.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+    try:
+        import io
+        from credit_risk_batch import FORMATS, detect_format, score_indian_batch, start_batch, to_ndjson
+
+        upload = request.FILES.get('file')
+        if upload is not None:
+            source, name = upload, upload.name
+        elif request.body:
+            source, name = io.BytesIO(request.body), request.content_type
+        else:
+            return JsonResponse({'error': 'Upload a file in field "file" or send it as the request body'}, status=400)
+
+        fmt = request.GET.get('format') or detect_format(name)
+        if fmt not in FORMATS:
+            return JsonResponse({'error': f'Unsupported format: {fmt}. Expected one of {list(FORMATS)}'}, status=400)
+        chunk_size = int(request.GET.get('chunk_size', 5000))
+        if chunk_size <= 0:
+            return JsonResponse({'error': 'chunk_size must be positive'}, status=400)
+
+        if not os.path.exists(INDIAN_MODEL_PATH):
+            return JsonResponse({'error': 'Indian model not found'}, status=500)
+        model = model_registry.get("indian_credit_model")
+
+        # Parse and validate the start of the upload before committing to a 200
+        records = start_batch(score_indian_batch(source, fmt=fmt, chunk_size=chunk_size, model=model))
+        return StreamingHttpResponse(to_ndjson(records), content_type='application/x-ndjson')
+
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.error(f"Indian batch credit risk error: {e}")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 # =============================================================================
 # US CREDIT RISK API
 # =============================================================================
@@ -115,7 +167,7 @@ def credit_risk_us_api(request):
         if not os.path.exists(US_MODEL_PATH):
             return JsonResponse({'error': 'US model not found'}, status=500)
 
-        model = joblib.load(US_MODEL_PATH)
+        model = model_registry.get("us_credit_model")
 
         # Prepare features for US model
         annual_income = float(data.get('annual_income', data.get('applicant_income', 0)))
@@ -440,4 +492,33 @@ def credit_risk_crew_api(request):
         return JsonResponse({
             'error': str(e),
             'detail': 'An unexpected error occurred. Check server logs for details.'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+# =============================================================================
+# MODEL REGISTRY STATS
+# =============================================================================
+
+@require_GET
+def model_registry_stats_api(request):
+    """
+    GET /api/models/stats/ - load time, memory footprint and hit counts
+    for every model in the process-wide model registry.
+    """
+    return JsonResponse({'models': model_registry.stats()})
+
+
+@require_GET
+def models_ready_api(request):
+    """
+    GET /healthz/ready - readiness probe for the ML artifacts.
+
+    With MODEL_REGISTRY_WARM_ON_STARTUP enabled, returns 503 until the
+    startup warm-up has loaded every model and run a synthetic prediction
+    through it, then 200. Without warm-up, models load lazily and the probe
+    always reports ready.
+    """
+    if not getattr(settings, 'MODEL_REGISTRY_WARM_ON_STARTUP', False):
+        return JsonResponse({'ready': True, 'warmup': 'disabled'})
+
+    readiness = model_registry.readiness()
+    return JsonResponse(readiness, status=200 if readiness['ready'] else 503)
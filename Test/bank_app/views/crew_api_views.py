@@ -12,15 +12,22 @@ Body: {
   "region": "India" (optional),
   "additional_params": {} (optional)
 }
+
+Long-running crews can be queued instead of run inline:
+POST /api/crew-jobs/                  -> 202 {"job_id": ...}
+GET  /api/crew-jobs/<job_id>/         -> job status
+GET  /api/crew-jobs/<job_id>/result/  -> crew output once finished
+POST /api/crew-jobs/<job_id>/cancel/  -> cancel a queued/running job
 """
 
 import json
 import logging
 from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt
 
 from .base import get_user_region_from_session
+from agent_pool import agent_pool
 
 logger = logging.getLogger(__name__)
 
@@ -289,14 +296,20 @@ def run_crew(request):
                      "mortgage_analytics" | "aml" | "fd_advisor" | "fd_template",
         "query": "The user's query string",
         "region": "India" (optional, default: "India"),
+        "async": false (optional, queue the crew and return a job ID),
+        "cache": true (optional, set false to bypass the response cache),
         "additional_params": {} (optional, for future extensibility)
     }
 
     Response:
     {
         "result": "The raw output from crew.kickoff()",
-        "crew_type": "the crew type that was executed"
+        "crew_type": "the crew type that was executed",
+        "cache": {"tier", "similarity", "age_seconds"} (only on a cache hit)
     }
+
+    With "async": true the response is 202 with the job description
+    (see crew_job_submit_api).
     """
     if not CREWAI_AVAILABLE:
         return JsonResponse(
@@ -328,6 +341,15 @@ def run_crew(request):
         if not region:
             region_data = get_user_region_from_session(request)
             region = region_data.get("country_name", "India")
+
+        # Async mode: queue the crew and return a pollable job ID right away
+        if data.get("async"):
+            return _submit_crew_job({
+                "crew_type": crew_type,
+                "query": query,
+                "region": region,
+                "cache": data.get("cache", True),
+            })
     
         # Validate crew_type
         if crew_type not in CREW_FUNCTION_MAP:
@@ -351,6 +373,18 @@ def run_crew(request):
                 {"error": f"CrewAI functions not available for {crew_type}"},
                 status=503,
             )
+
+        # Router fast path: classify locally before building the router crew
+        if crew_type == "router" and isinstance(query, str):
+            body, status = _route_query_payload(
+                query, region, {"crew_type": crew_type, "query": query, "region": region}
+            )
+            return JsonResponse(body, status=status)
+
+        forward_data = {"crew_type": crew_type, "query": query, "region": region, "cache": data.get("cache", True)}
+        cached = _cached_crew_response(forward_data)
+        if cached is not None:
+            return JsonResponse(cached)
     
         # Prepare query preview for logging
         if isinstance(query, str):
@@ -361,9 +395,10 @@ def run_crew(request):
             query_preview = str(query)[:50]
         logger.info(f"Executing crew: {crew_type}, query: {query_preview}...")
     
-        # Create agents
+        # Create agents (leased warm from the agent pool when available)
+        agent_kwargs = {"region": region} if region else {}
         try:
-            agents = agent_creator(region=region) if region else agent_creator()
+            agents = agent_pool.acquire(crew_type, agent_creator, **agent_kwargs)
         except Exception as e:
             logger.error(f"Failed to create agents for {crew_type}: {e}")
             return JsonResponse({"error": f"Agent creation failed: {str(e)}"}, status=500)
@@ -401,13 +436,16 @@ def run_crew(request):
         )
 
         output = crew.kickoff()
+        agent_pool.release(crew_type, agents, region=agent_kwargs.get("region"))
 
         # Extract result
         result = output.raw if hasattr(output, "raw") else str(output)
 
         logger.info(f"Crew {crew_type} executed successfully")
 
-        return JsonResponse({"result": result, "crew_type": crew_type})
+        body = {"result": result, "crew_type": crew_type}
+        _store_crew_response(forward_data, body)
+        return JsonResponse(body)
 
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON in request: {e}")
@@ -516,40 +554,149 @@ def _execute_crew(forward_data):
     Returns:
         JsonResponse with result or error
     """
+    body, status = _run_crew_payload(forward_data)
+    return JsonResponse(body, status=status)
+
+
+def _validate_crew_request(forward_data):
+    """
+    Validate crew_type/query before running or queueing a crew.
+
+    Returns:
+        (error_body, status) tuple, or None when the request is valid
+    """
     if not CREWAI_AVAILABLE:
-        return JsonResponse(
+        return (
             {"error": "CrewAI not available. Please install with: pip install crewai crewai-tools"},
-            status=503,
+            503,
         )
 
     crew_type = forward_data.get("crew_type", "").lower()
     query = forward_data.get("query", "")
-    region = forward_data.get("region")
-    if not region:
-        region = "India"
 
-    # Validate crew_type
     if crew_type not in CREW_FUNCTION_MAP:
-        return JsonResponse(
-            {
-                "error": f"Unknown crew_type: {crew_type}. Valid types: {list(CREW_FUNCTION_MAP.keys())}"
-            },
-            status=400,
+        return (
+            {"error": f"Unknown crew_type: {crew_type}. Valid types: {list(CREW_FUNCTION_MAP.keys())}"},
+            400,
         )
 
-    # Validate query
     if not query:
-        return JsonResponse({"error": "query is required"}, status=400)
+        return {"error": "query is required"}, 400
     if isinstance(query, str) and not query.strip():
-        return JsonResponse({"error": "query is required"}, status=400)
+        return {"error": "query is required"}, 400
 
-    # Check if agent/task creators are available
     agent_creator, task_creator = CREW_FUNCTION_MAP[crew_type]
     if not agent_creator or not task_creator:
-        return JsonResponse(
-            {"error": f"CrewAI functions not available for {crew_type}"},
-            status=503,
-        )
+        return {"error": f"CrewAI functions not available for {crew_type}"}, 503
+
+    return None
+
+
+def _response_cache_for(forward_data):
+    """Return the response cache when this request may use it, else None."""
+    from response_cache import cache_enabled, get_response_cache
+
+    if forward_data.get("cache") is False or not cache_enabled():
+        return None
+    query = forward_data.get("query")
+    if not isinstance(query, (str, dict)):
+        return None
+    cache = get_response_cache()
+    return cache if cache.is_cacheable(forward_data.get("crew_type", "").lower()) else None
+
+
+def _cached_crew_response(forward_data):
+    """Return a cached response body for this crew request, or None on a miss."""
+    try:
+        cache = _response_cache_for(forward_data)
+        if cache is None:
+            return None
+        return cache.get(forward_data["crew_type"].lower(), forward_data["query"], forward_data.get("region"))
+    except Exception as e:
+        logger.warning(f"Response cache lookup failed: {e}")
+        return None
+
+
+def _store_crew_response(forward_data, body):
+    """Store a successful crew response body in the response cache."""
+    try:
+        cache = _response_cache_for(forward_data)
+        if cache is not None:
+            cache.set(forward_data["crew_type"].lower(), forward_data["query"], forward_data.get("region"), body)
+    except Exception as e:
+        logger.warning(f"Response cache store failed: {e}")
+
+
+def _route_query_payload(query, region, forward_data):
+    """
+    Route a query with intent_router, using the router crew only as fallback.
+
+    Returns:
+        (dict, int) tuple; the body carries a "routing" dict with intent,
+        confidence and route ("rules", "model" or "llm")
+    """
+    from intent_router import get_intent_router
+
+    llm_response = {}
+
+    def _llm_router():
+        body, status = _run_crew_payload(dict(forward_data, local_routing=False))
+        llm_response.update(body=body, status=status)
+        if status != 200:
+            raise RuntimeError(body.get("error", "Router crew failed"))
+        return body["result"]
+
+    try:
+        routing = get_intent_router().route(query, region=region, llm_router=_llm_router)
+    except RuntimeError:
+        if llm_response:
+            return llm_response["body"], llm_response["status"]
+        raise
+
+    result = llm_response["body"]["result"] if llm_response else routing["intent"]
+    logger.info(
+        f"Routed query to {routing['intent']} via {routing['route']} "
+        f"(confidence={routing['confidence']}, {routing['latency_ms']}ms)"
+    )
+    return {"result": result, "crew_type": "router", "routing": routing}, 200
+
+
+def _run_crew_payload(forward_data):
+    """
+    Build and kick off a crew, returning a plain (body, status) pair.
+
+    Shared by the synchronous endpoints and the background job queue
+    (bank_app.crew_jobs), which cannot return a JsonResponse.
+
+    Args:
+        forward_data: dict with crew_type, query, region and optionally
+            cache (False bypasses the response cache)
+
+    Returns:
+        (dict, int) tuple of response body and HTTP status
+    """
+    invalid = _validate_crew_request(forward_data)
+    if invalid:
+        return invalid
+
+    crew_type = forward_data.get("crew_type", "").lower()
+    query = forward_data.get("query", "")
+    region = forward_data.get("region")
+    if not region:
+        region = "India"
+
+    # Router fast path: classify locally, only kick off the LLM router crew
+    # when the local classifier is not confident
+    if crew_type == "router" and isinstance(query, str) and forward_data.get("local_routing", True):
+        return _route_query_payload(query, region, forward_data)
+
+    # Repeat analysis/research questions are answered from the response cache
+    cache_request = dict(forward_data, crew_type=crew_type, region=region)
+    cached = _cached_crew_response(cache_request)
+    if cached is not None:
+        return cached, 200
+
+    agent_creator, task_creator = CREW_FUNCTION_MAP[crew_type]
 
     # Prepare query preview for logging
     if isinstance(query, str):
@@ -560,33 +707,34 @@ def _execute_crew(forward_data):
         query_preview = str(query)[:50]
     logger.info(f"Executing crew: {crew_type}, query: {query_preview}...")
 
-    # Create agents
+    # Create agents (leased warm from the agent pool when available)
     try:
         # Only pass region to agents that accept it
         # Agents accepting region: analysis, research, credit_risk
         # Agents NOT accepting region: router, database, visualization, loan_creation,
         #                              mortgage_analytics, aml, fd_advisor, fd_template
-        if crew_type in ("analysis", "research", "credit_risk"):
-            agents = agent_creator(region=region) if region else agent_creator()
+        if crew_type in ("analysis", "research", "credit_risk") and region:
+            agent_kwargs = {"region": region}
         else:
-            agents = agent_creator()
+            agent_kwargs = {}
+        agents = agent_pool.acquire(crew_type, agent_creator, **agent_kwargs)
     except Exception as e:
         logger.error(f"Failed to create agents for {crew_type}: {e}")
-        return JsonResponse({"error": f"Agent creation failed: {str(e)}"}, status=500)
+        return {"error": f"Agent creation failed: {str(e)}"}, 500
 
     # Create tasks
     try:
         tasks = task_creator(agents, query, region)
     except Exception as e:
         logger.error(f"Failed to create tasks for {crew_type}: {e}")
-        return JsonResponse({"error": f"Task creation failed: {str(e)}"}, status=500)
+        return {"error": f"Task creation failed: {str(e)}"}, 500
 
     # Ensure tasks is a list
     if not isinstance(tasks, list):
         tasks = [tasks]
 
     if not tasks:
-        return JsonResponse({"error": "No tasks created for this crew"}, status=500)
+        return {"error": "No tasks created for this crew"}, 500
 
     # Prepare agents list
     if isinstance(agents, dict):
@@ -595,7 +743,7 @@ def _execute_crew(forward_data):
         agents_list = agents
 
     if not agents_list:
-        return JsonResponse({"error": "No agents created for this crew"}, status=500)
+        return {"error": "No agents created for this crew"}, 500
 
     # Create and run crew
     crew = Crew(
@@ -607,6 +755,7 @@ def _execute_crew(forward_data):
     )
 
     output = crew.kickoff()
+    agent_pool.release(crew_type, agents, region=agent_kwargs.get("region"))
     
     # Extract result
     result = output.raw if hasattr(output, "raw") else str(output)
@@ -651,15 +800,17 @@ def _execute_crew(forward_data):
         ):
             decision = "FAIL"
         
-        return JsonResponse({
+        return {
             "result": result,
             "crew_type": crew_type,
             "pdf_path": pdf_path,
             "decision": decision,
             "tasks_output": tasks_output_raw,
-        })
-    
-    return JsonResponse({"result": result, "crew_type": crew_type})
+        }, 200
+
+    body = {"result": result, "crew_type": crew_type}
+    _store_crew_response(cache_request, body)
+    return body, 200
 
 
 # Legacy endpoints for backward compatibility - all 11 crew API endpoints
@@ -674,3 +825,138 @@ fd_template_crew_api = _legacy_endpoint_wrapper("fd_template")
 visualization_crew_api = _legacy_endpoint_wrapper("visualization")
 analysis_crew_api = _legacy_endpoint_wrapper("analysis")
 database_crew_api = _legacy_endpoint_wrapper("database")
+
+
+# =============================================================================
+# ASYNC CREW JOB ENDPOINTS
+# Crews run on the bank_app.crew_jobs worker pool; clients poll by job ID or
+# listen for "crew_job_update" events on the dashboard WebSocket.
+# =============================================================================
+
+
+def _job_response(job, status=200, include_result=False):
+    """Serialize a CrewJob with its polling URLs."""
+    from ..crew_jobs import get_job_queue
+
+    data = job.to_dict(include_result=include_result)
+    data["queue_position"] = get_job_queue().position(job)
+    data["status_url"] = f"/api/crew-jobs/{job.job_id}/"
+    data["result_url"] = f"/api/crew-jobs/{job.job_id}/result/"
+    return JsonResponse(data, status=status)
+
+
+def _submit_crew_job(forward_data):
+    """Validate and enqueue a crew job, returning 202 with the job ID."""
+    from ..crew_jobs import get_job_queue
+
+    invalid = _validate_crew_request(forward_data)
+    if invalid:
+        body, status = invalid
+        return JsonResponse(body, status=status)
+
+    crew_type = forward_data["crew_type"].lower()
+    payload = dict(forward_data, crew_type=crew_type, region=forward_data.get("region") or "India")
+    job = get_job_queue().submit(crew_type, payload)
+    return _job_response(job, status=202)
+
+
+@csrf_exempt
+@require_POST
+def crew_job_submit_api(request):
+    """
+    Queue a crew for background execution.
+
+    POST /api/crew-jobs/
+    Body: same as /api/run-crew/
+
+    Response (202):
+    {
+        "job_id": "hex id",
+        "status": "PENDING" | "RUNNING",
+        "queue_position": int | null,
+        "status_url": "/api/crew-jobs/<job_id>/",
+        "result_url": "/api/crew-jobs/<job_id>/result/"
+    }
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+
+    region = data.get("region")
+    if not region:
+        region = get_user_region_from_session(request).get("country_name", "India")
+
+    return _submit_crew_job({
+        "crew_type": data.get("crew_type", ""),
+        "query": data.get("query", ""),
+        "region": region,
+        "cache": data.get("cache", True),
+    })
+
+
+@require_GET
+def crew_job_status_api(request, job_id):
+    """GET /api/crew-jobs/<job_id>/ - job state and queue position."""
+    from ..crew_jobs import get_job_queue
+
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return JsonResponse({"error": f"Unknown job: {job_id}"}, status=404)
+    return _job_response(job)
+
+
+@require_GET
+def crew_job_result_api(request, job_id):
+    """
+    GET /api/crew-jobs/<job_id>/result/
+
+    Returns the crew output once the job has finished. While the job is still
+    pending or running the response is 202 with the current state; failed jobs
+    return the crew's error status, cancelled jobs return 410.
+    """
+    from ..crew_jobs import get_job_queue, SUCCEEDED, FAILED, CANCELLED
+
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return JsonResponse({"error": f"Unknown job: {job_id}"}, status=404)
+    if job.status == SUCCEEDED:
+        return _job_response(job, status=200, include_result=True)
+    if job.status == FAILED:
+        return _job_response(job, status=job.http_status or 500, include_result=True)
+    if job.status == CANCELLED:
+        return _job_response(job, status=410)
+    return _job_response(job, status=202)
+
+
+@csrf_exempt
+@require_POST
+def crew_job_cancel_api(request, job_id):
+    """
+    POST /api/crew-jobs/<job_id>/cancel/
+
+    Pending jobs are dropped from the queue. Running crews cannot be
+    interrupted; they are flagged and their result is discarded on completion.
+    """
+    from ..crew_jobs import get_job_queue
+
+    job = get_job_queue().cancel(job_id)
+    if job is None:
+        return JsonResponse({"error": f"Unknown job: {job_id}"}, status=404)
+    return _job_response(job)
+
+
+@require_GET
+def crew_job_stats_api(request):
+    """GET /api/crew-jobs/stats/ - queue depth, running counts, agent pool and response cache counters."""
+    from ..crew_jobs import get_job_queue
+
+    stats = get_job_queue().stats()
+    stats["agent_pool"] = agent_pool.stats()
+    try:
+        from response_cache import get_response_cache
+
+        stats["response_cache"] = get_response_cache().stats()
+    except Exception as e:
+        logger.warning(f"Response cache stats unavailable: {e}")
+    return JsonResponse(stats)
@@ -82,8 +82,9 @@ def smart_assistant_query(request):
         response = run_crew(mock_request)
         response_data = json.loads(response.content)
 
-        # Extract intent from user query (simple keyword matching)
-        intent = "UNKNOWN"
+        # Intent from the router's decision; keyword matching is only a fallback
+        routing = response_data.get('routing') or {}
+        intent = routing.get('intent') or "UNKNOWN"
         intent_mapping = {
             "CREDIT_RISK": ["credit", "loan approval", "credit score", "loan odds"],
             "LOAN_CREATION": ["apply for loan", "loan application", "get a loan"],
@@ -98,9 +99,10 @@ def smart_assistant_query(request):
 
         query_lower = user_query.lower()
         for intent_name, keywords in intent_mapping.items():
+            if intent != "UNKNOWN":
+                break
             if any(keyword in query_lower for keyword in keywords):
                 intent = intent_name
-                break
 
         # Log the interaction (optional - may fail if models not available)
         try:
@@ -122,6 +124,7 @@ def smart_assistant_query(request):
             'session_id': session_id,
             'region': region,
             'intent': intent,
+            'routing': routing,
             'result': response_data.get('result', ''),
             'crew_type': 'smart_assistant'
         }))
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -74,12 +75,46 @@ TEMPLATES = [
 WSGI_APPLICATION = "bank_poc_django.wsgi.application"
 ASGI_APPLICATION = "bank_poc_django.asgi.application"
 
-# Channel layers configuration (in-memory for development)
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer"
+# Channel layers configuration. InMemoryChannelLayer only reaches WebSockets of
+# its own process; set REDIS_URL (Redis or any Redis-compatible server) to fan
+# out across workers through channels_redis instead
+REDIS_URL = os.environ.get("REDIS_URL", "")
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer"
+        }
     }
+
+# Dashboard event outbox (bank_app.event_outbox). Without Redis, events go
+# through a SQLite file that every local worker tails, so a status change made
+# in one process reaches dashboards connected to any other
+EVENT_OUTBOX_BACKEND = os.environ.get("EVENT_OUTBOX_BACKEND", "memory" if REDIS_URL else "sqlite")
+EVENT_OUTBOX_PATH = BASE_DIR / "event_outbox.sqlite3"
+EVENT_OUTBOX_RETENTION_SECONDS = 300
+EVENT_DISPATCH_TICK_SECONDS = float(os.environ.get("EVENT_DISPATCH_TICK_SECONDS", "0.25"))
+
+# Async CrewAI job queue (bank_app.crew_jobs)
+CREW_JOB_MAX_WORKERS = 4
+CREW_JOB_DEFAULT_CONCURRENCY = 2
+CREW_JOB_CONCURRENCY = {
+    "aml": 1,
+    "loan_creation": 1,
+    "mortgage_analytics": 2,
+    "credit_risk": 2,
 }
+CREW_JOB_RETENTION_SECONDS = 3600
+
+# Load ML model artifacts (model_registry) and run a synthetic prediction through
+# each in a background thread at startup; /healthz/ready returns 503 until done
+MODEL_REGISTRY_WARM_ON_STARTUP = os.environ.get("MODEL_REGISTRY_WARM_ON_STARTUP", "0") == "1"
 
 
 # Database
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+"""
+Benchmark: Fannie Mae categorical encoding and chunked batch inference.
+
+Replicates test_raw_2025.parquet to --rows rows and reports:
+    - encoding rows/sec for the supervised models, over the columns with a
+      stored vocabulary: per-batch astype('category').cat.codes (legacy)
+      vs. stored-vocabulary lookup
+    - consistency of those columns: share of cells whose code for a single
+      row differs from its code inside the full batch (legacy drifts,
+      lookup is 0)
+    - clustering encoding rows/sec: per-cell LabelEncoder.transform via
+      .apply (legacy) vs. one vectorized lookup per column (needs scikit-learn)
+    - FannieMaeInference.predict_batch rows/sec per model over a Parquet file
+      (skipped for models whose artifacts or libraries are unavailable)
+    - prediction consistency per model over --consistency-rows rows, against
+      one predict_batch call over all of them: predictions changed by
+      predict_batch(batch_size=1), and by calling predict row by row (the
+      string columns without a stored vocabulary are encoded per call)
+
+Usage:
+    python benchmarks/bench_fannie_mae_batch.py
+    python benchmarks/bench_fannie_mae_batch.py --rows 1000000 --batch-size 100000 --json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from model_registry import FANNIE_MAE_MODEL_DIR  # noqa: E402
+
+
+def load_inference_helper():
+    spec = importlib.util.spec_from_file_location(
+        "inference_helper", os.path.join(FANNIE_MAE_MODEL_DIR, "inference_helper.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_codes(X):
+    return {col: X[col].astype("category").cat.codes.astype(np.int32) for col in X.columns}
+
+
+def lookup_codes(helper, X, lookups):
+    return {col: helper.encode_with_lookup(X[col], lookups[col]) for col in X.columns}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_clustering(train, test, columns):
+    try:
+        from sklearn.preprocessing import LabelEncoder
+    except ImportError:
+        return None
+
+    encoders = {col: LabelEncoder().fit(train[col].fillna("MISSING").astype(str)) for col in columns}
+    lookups = {col: pd.Index([str(c) for c in le.classes_], dtype=object) for col, le in encoders.items()}
+
+    def legacy():
+        out = {}
+        for col, le in encoders.items():
+            values = test[col].fillna("MISSING").astype(str)
+            out[col] = values.apply(lambda x: le.transform([x])[0] if x in le.classes_ else 0).to_numpy()
+        return out
+
+    def vectorized():
+        out = {}
+        for col, lookup in lookups.items():
+            codes = lookup.get_indexer(test[col].fillna("MISSING").astype(str).to_numpy(dtype=object))
+            out[col] = np.where(codes < 0, 0, codes)
+        return out
+
+    old, old_s = timed(legacy)
+    new, new_s = timed(vectorized)
+    return {
+        "rows": len(test),
+        "legacy_rows_per_sec": round(len(test) / old_s),
+        "lookup_rows_per_sec": round(len(test) / new_s),
+        "identical": all(np.array_equal(old[col], new[col]) for col in columns),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="rows for the encoding benchmark")
+    parser.add_argument("--cluster-rows", type=int, default=20_000, help="rows for the clustering encoding benchmark")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="predict_batch chunk size")
+    parser.add_argument("--consistency-rows", type=int, default=500,
+                        help="rows scored whole / in 1-row chunks / row by row")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    helper = load_inference_helper()
+    with open(os.path.join(FANNIE_MAE_MODEL_DIR, "credit_risk", "credit_risk_metadata.json")) as f:
+        meta = json.load(f)
+    feature_names = meta["features"]["feature_names"]
+    vocabularies = meta["features"].get("category_vocabularies", {})
+    lookups = helper.build_category_lookups(vocabularies)
+    columns = list(lookups)
+
+    test_path = os.path.join(FANNIE_MAE_MODEL_DIR, "test_raw_2025.parquet")
+    test = pd.read_parquet(test_path, columns=feature_names)
+    repeats = -(-args.rows // len(test))
+    big = pd.concat([test] * repeats, ignore_index=True).head(args.rows)
+
+    string_columns = [col for col in feature_names if helper._is_string_dtype(test[col].dtype)]
+    summary = {
+        "rows": len(big),
+        "categorical_columns": len(columns),
+        "string_columns": len(string_columns),
+    }
+    _, old_s = timed(legacy_codes, big[columns])
+    _, new_s = timed(lookup_codes, helper, big[columns], lookups)
+    summary["legacy_rows_per_sec"] = round(len(big) / old_s)
+    summary["lookup_rows_per_sec"] = round(len(big) / new_s)
+
+    # Same rows encoded one at a time vs. inside the batch
+    sample = test[columns].head(200)
+    batch_old, batch_new = legacy_codes(sample), lookup_codes(helper, sample, lookups)
+    drift_old = drift_new = 0
+    for i in range(len(sample)):
+        row = sample.iloc[[i]]
+        single_old, single_new = legacy_codes(row), lookup_codes(helper, row, lookups)
+        drift_old += sum(int(single_old[c].iloc[0] != batch_old[c].iloc[i]) for c in columns)
+        drift_new += sum(int(single_new[c][0] != batch_new[c][i]) for c in columns)
+    cells = len(sample) * len(columns)
+    summary["single_row_drift_legacy"] = round(drift_old / cells, 4)
+    summary["single_row_drift_lookup"] = round(drift_new / cells, 4)
+
+    train = pd.read_parquet(os.path.join(FANNIE_MAE_MODEL_DIR, "train_raw_2023_2024.parquet"), columns=columns)
+    summary["clustering"] = bench_clustering(train, big[columns].head(args.cluster_rows), columns)
+
+    # End-to-end predict_batch over a Parquet file of --rows rows
+    summary["predict_batch"] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "batch.parquet")
+        big.to_parquet(path, index=False)
+        for use_case in helper.FannieMaeModelHub(FANNIE_MAE_MODEL_DIR).available_models:
+            try:
+                model = helper.FannieMaeInference(os.path.join(FANNIE_MAE_MODEL_DIR, use_case))
+                result = model.predict_batch(path, batch_size=args.batch_size)
+                sample = test.head(args.consistency_rows)
+                whole = model.predict_batch(sample, batch_size=len(sample))["predictions"]
+                chunked = model.predict_batch(sample, batch_size=1)["predictions"]
+                per_row = np.concatenate([model.predict(sample.iloc[[i]]) for i in range(len(sample))])
+                summary["predict_batch"][use_case] = {
+                    "rows_per_sec": round(result["rows_per_sec"]),
+                    "chunks": result["n_chunks"],
+                    "consistency_rows": len(sample),
+                    "changed_by_1_row_chunks": int((chunked != whole).sum()),
+                    "changed_by_row_by_row_predict": int((per_row != whole).sum()),
+                }
+            except Exception as e:
+                summary["predict_batch"][use_case] = {"skipped": f"{type(e).__name__}: {e}"}
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("Fannie Mae encoding and batch inference")
+    print("=" * 70)
+    print(f"Rows / stored vocabularies : {summary['rows']:,} / {summary['categorical_columns']} "
+          f"of {summary['string_columns']} string columns")
+    print(f"  legacy cat.codes         : {summary['legacy_rows_per_sec']:>12,} rows/s")
+    print(f"  vocabulary lookup        : {summary['lookup_rows_per_sec']:>12,} rows/s")
+    print(f"  single-row code drift    : legacy {summary['single_row_drift_legacy']:.1%}, "
+          f"lookup {summary['single_row_drift_lookup']:.1%}")
+    if summary["clustering"]:
+        c = summary["clustering"]
+        print(f"Clustering encoding ({c['rows']:,} rows)")
+        print(f"  legacy .apply            : {c['legacy_rows_per_sec']:>12,} rows/s")
+        print(f"  vectorized lookup        : {c['lookup_rows_per_sec']:>12,} rows/s (identical: {c['identical']})")
+    print("predict_batch")
+    for use_case, entry in summary["predict_batch"].items():
+        if "skipped" in entry:
+            print(f"  {use_case:<24} : skipped ({entry['skipped'][:60]})")
+        else:
+            print(f"  {use_case:<24} : {entry['rows_per_sec']:>12,} rows/s in {entry['chunks']} chunks | "
+                  f"changed of {entry['consistency_rows']}: 1-row chunks {entry['changed_by_1_row_chunks']}, "
+                  f"row-by-row predict {entry['changed_by_row_by_row_predict']}")
+    print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
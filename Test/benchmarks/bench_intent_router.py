@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""
+Benchmark: local intent router vs. the LLM router crew.
+
+Replays a JSON-lines file of queries and reports, for the local cascade
+(rules -> TF-IDF centroid model):
+    - routing latency (p50 / p95 / max, microseconds)
+    - coverage: share of queries confident enough to skip the LLM
+    - agreement with the LLM router on the queries it routes locally
+    - end-to-end agreement of the cascade (local when confident, else LLM)
+
+Replay format (one object per line):
+    {"query": "...", "region": "India", "llm_label": "ANALYSIS", "llm_latency_ms": 2140.5}
+
+``llm_label``/``llm_latency_ms`` are written by intent_router for every LLM
+fallback (outputs/routing/llm_router_log.jsonl), so a production log can be
+replayed directly. Hand-labelled files may use ``label`` instead. With
+``--live`` the router crew is called for every query (requires CrewAI and an
+NVIDIA API key) and its answers/latencies replace the recorded ones.
+
+Usage:
+    python benchmarks/bench_intent_router.py
+    python benchmarks/bench_intent_router.py --replay outputs/routing/llm_router_log.jsonl
+    python benchmarks/bench_intent_router.py --live --threshold 0.7
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from intent_router import (  # noqa: E402
+    DEFAULT_THRESHOLD,
+    SEED_EXAMPLES,
+    IntentRouter,
+    load_logged_examples,
+    parse_llm_decision,
+)
+
+DEFAULT_REPLAY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "routing_replay.jsonl")
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_replay(path):
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+def run_live_router(query, region):
+    from crews import run_router_crew
+
+    start = time.perf_counter()
+    output = run_router_crew(query, region=region)
+    latency_ms = (time.perf_counter() - start) * 1000
+    raw = output.raw if hasattr(output, "raw") else str(output)
+    return parse_llm_decision(raw), latency_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replay", default=DEFAULT_REPLAY, help="JSON-lines replay file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="local confidence threshold")
+    parser.add_argument("--train", action="append", default=[],
+                        help="extra JSON-lines files to train the centroid model on (repeatable)")
+    parser.add_argument("--repeat", type=int, default=200, help="local classifications per query for timing")
+    parser.add_argument("--live", action="store_true", help="call the LLM router crew for every query")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    examples = list(SEED_EXAMPLES)
+    for path in args.train:
+        examples.extend(load_logged_examples(path))
+    router = IntentRouter(threshold=args.threshold, examples=examples)
+
+    entries = load_replay(args.replay)
+    local_us, llm_ms = [], []
+    covered = covered_agree = cascade_agree = model_agree = labelled = 0
+    disagreements = []
+
+    for entry in entries:
+        query = entry["query"]
+        region = entry.get("region", "India")
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            decision = router.classify(query)
+        local_us.append((time.perf_counter() - start) / args.repeat * 1e6)
+
+        if args.live:
+            llm_label, latency = run_live_router(query, region)
+            llm_ms.append(latency)
+        else:
+            llm_label = entry.get("llm_label") or entry.get("label")
+            if entry.get("llm_latency_ms") is not None:
+                llm_ms.append(float(entry["llm_latency_ms"]))
+        if not llm_label:
+            continue
+        labelled += 1
+
+        model_label, _ = router.model.predict(query)
+        model_agree += model_label == llm_label
+
+        if decision["accepted"]:
+            covered += 1
+            covered_agree += decision["intent"] == llm_label
+            cascade_agree += decision["intent"] == llm_label
+            if decision["intent"] != llm_label:
+                disagreements.append((query, decision["intent"], decision["route"], llm_label))
+        else:
+            cascade_agree += 1  # fell back to the LLM router
+
+    summary = {
+        "replay": args.replay,
+        "queries": len(entries),
+        "labelled": labelled,
+        "threshold": args.threshold,
+        "local_latency_us": {
+            "p50": round(_percentile(local_us, 50), 2),
+            "p95": round(_percentile(local_us, 95), 2),
+            "max": round(max(local_us), 2) if local_us else 0.0,
+        },
+        "llm_latency_ms": {
+            "p50": round(_percentile(llm_ms, 50), 1),
+            "p95": round(_percentile(llm_ms, 95), 1),
+            "mean": round(statistics.mean(llm_ms), 1) if llm_ms else None,
+        } if llm_ms else None,
+        "coverage": round(covered / labelled, 4) if labelled else 0.0,
+        "local_agreement": round(covered_agree / covered, 4) if covered else None,
+        "cascade_agreement": round(cascade_agree / labelled, 4) if labelled else None,
+        "model_only_agreement": round(model_agree / labelled, 4) if labelled else None,
+    }
+    if llm_ms and labelled:
+        mean_llm = statistics.mean(llm_ms)
+        summary["expected_routing_ms"] = {
+            "llm_only": round(mean_llm, 1),
+            "cascade": round((1 - summary["coverage"]) * mean_llm + statistics.mean(local_us) / 1000, 1),
+        }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("Intent routing benchmark")
+    print("=" * 70)
+    print(f"Replay file        : {args.replay}")
+    print(f"Queries / labelled : {summary['queries']} / {summary['labelled']}")
+    print(f"Threshold          : {args.threshold}")
+    lat = summary["local_latency_us"]
+    print(f"Local latency (us) : p50={lat['p50']}  p95={lat['p95']}  max={lat['max']}")
+    if summary["llm_latency_ms"]:
+        llm = summary["llm_latency_ms"]
+        print(f"LLM latency (ms)   : p50={llm['p50']}  p95={llm['p95']}  mean={llm['mean']}")
+    else:
+        print("LLM latency (ms)   : n/a (no llm_latency_ms in replay; use --live)")
+    print(f"Coverage           : {summary['coverage']:.1%} routed locally")
+    if summary["local_agreement"] is not None:
+        print(f"Local agreement    : {summary['local_agreement']:.1%} on locally routed queries")
+    print(f"Cascade agreement  : {summary['cascade_agreement']:.1%}")
+    print(f"Model-only agreem. : {summary['model_only_agreement']:.1%}")
+    if "expected_routing_ms" in summary:
+        exp = summary["expected_routing_ms"]
+        print(f"Mean routing time  : {exp['llm_only']} ms (LLM only) -> {exp['cascade']} ms (cascade)")
+    if disagreements:
+        print("-" * 70)
+        print("Local decisions that disagree with the LLM router:")
+        for query, local, route, llm_label in disagreements:
+            print(f"  [{route}] {local:<18} vs {llm_label:<18} {query[:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Benchmark: rag_engine.chunk_text on a synthetic policy manual.
+
+Builds a deterministic --pages page policy document (paragraphs, numbered
+rules and a pipe-delimited [TABLE N] block on most pages, the shape
+load_pdf produces) and reports:
+    - linear     chunk_text (table spans computed once, bisect lookup)
+    - legacy     the previous chunk_text, which re-ran the backtracking
+                 _TABLE_BLOCK_RE.finditer over the document for every chunk;
+                 timed on the first --legacy-pages pages of the same manual
+                 (it grows super-linearly: 50 pages already takes minutes)
+
+Legacy and linear output are checked for identical chunks on every legacy
+size.
+
+Usage:
+    python benchmarks/bench_rag_chunker.py
+    python benchmarks/bench_rag_chunker.py --pages 500 --legacy-pages 5 10 20 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import rag_engine  # noqa: E402
+
+WORDS = (
+    "borrower loan credit score income policy approval underwriting collateral "
+    "ratio verification compliance exposure limit threshold applicant risk "
+    "mortgage repayment tenure guarantor documentation exception"
+).split()
+
+
+def policy_manual(pages, seed=0):
+    rng = random.Random(seed)
+
+    def sentence():
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 22))).capitalize() + "."
+
+    out = []
+    for page in range(pages):
+        parts = [f"SECTION {page + 1}. CREDIT POLICY"]
+        for _ in range(rng.randint(3, 5)):
+            parts.append(" ".join(sentence() for _ in range(rng.randint(3, 7))))
+        parts.append("\n".join(f"{i}. {sentence()}" for i in range(1, rng.randint(3, 7))))
+        if rng.random() < 0.7:
+            rows = [f"[TABLE {rng.randint(1, 2)}]", "Grade | Min FICO | Max DTI | Max LTV | Pricing"]
+            for _ in range(rng.randint(5, 20)):
+                rows.append(" | ".join([rng.choice("ABCDE"), str(rng.randint(580, 800)),
+                                        f"{rng.randint(28, 50)}%", f"{rng.randint(60, 97)}%",
+                                        rng.choice(WORDS)]))
+            parts.append("\n".join(rows))
+        out.append("\n\n".join(parts))
+    return "\n\n".join(out)
+
+
+# Previous implementation, kept here as the timing / output reference
+def _legacy_find_table_block(text, start, end):
+    for m in rag_engine._TABLE_BLOCK_RE.finditer(text):
+        if start < m.end() and end > m.start():
+            return m
+    return None
+
+
+def legacy_chunk_text(text, chunk_size=rag_engine.CHUNK_SIZE, chunk_overlap=rag_engine.CHUNK_OVERLAP):
+    if not text or not text.strip():
+        return []
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    if len(text) <= chunk_size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end < len(text):
+            if _legacy_find_table_block(text, start, end):
+                row_break = text.rfind("\n", int(start + chunk_size * 0.3), end)
+                if row_break > start:
+                    end = row_break + 1
+            else:
+                paragraph_break = text.rfind("\n\n", start, end)
+                if paragraph_break > int(start + chunk_size * 0.3):
+                    end = paragraph_break + 2
+                else:
+                    sentence_break = text.rfind(". ", start, end)
+                    if sentence_break > int(start + chunk_size * 0.3):
+                        end = sentence_break + 2
+                    else:
+                        line_break = text.rfind("\n", start, end)
+                        if line_break > int(start + chunk_size * 0.3):
+                            end = line_break + 1
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end - chunk_overlap
+        if start < len(text) and start >= end:
+            start = end
+    return chunks
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="pages in the synthetic manual")
+    parser.add_argument("--legacy-pages", type=int, nargs="+", default=[5, 10, 20],
+                        help="page counts to time the legacy chunker on")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    manual = policy_manual(args.pages)
+    chunks, seconds = timed(rag_engine.chunk_text, manual)
+    summary = {
+        "pages": args.pages,
+        "chars": len(manual),
+        "chunks": len(chunks),
+        "linear_seconds": round(seconds, 4),
+        "linear_mb_per_sec": round(len(manual) / 1e6 / seconds, 2),
+        "legacy": [],
+    }
+
+    for pages in args.legacy_pages:
+        text = policy_manual(pages)
+        new, new_s = timed(rag_engine.chunk_text, text)
+        old, old_s = timed(legacy_chunk_text, text)
+        summary["legacy"].append({
+            "pages": pages,
+            "chars": len(text),
+            "legacy_seconds": round(old_s, 4),
+            "linear_seconds": round(new_s, 4),
+            "identical": old == new,
+        })
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("RAG chunker: linear table-aware chunk_text vs. legacy")
+    print("=" * 70)
+    print(f"Manual: {summary['pages']} pages, {summary['chars']:,} chars -> {summary['chunks']:,} chunks")
+    print(f"  linear chunk_text        : {summary['linear_seconds']:>10.3f} s "
+          f"({summary['linear_mb_per_sec']} MB/s)")
+    for entry in summary["legacy"]:
+        print(f"  {entry['pages']:>4} pages ({entry['chars']:>9,} chars): legacy {entry['legacy_seconds']:>9.3f} s, "
+              f"linear {entry['linear_seconds']:.4f} s, identical: {entry['identical']}")
+    print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
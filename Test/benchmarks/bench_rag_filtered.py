@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""
+Benchmark: category- and tag-filtered vector search on the main collection
+vs. a per-category partition.
+
+Builds a throwaway RAG store (the real rag_chroma_db is never touched) of
+--chunks synthetic chunks with deterministic random vectors, a rare
+category (--rare-fraction of the chunks, "loan_policy") and a few tags,
+then for --queries random query vectors compares against brute-force
+ground truth:
+
+    - where      main collection, where={"category": "loan_policy"}
+    - partition  rag_engine's policy_documents__loan_policy partition
+                 (RAG_CATEGORY_PARTITIONS=1), no filter
+
+A filtered HNSW search over a big collection walks the whole graph and
+drops non-matching neighbours, so for a rare category it is slower and can
+return fewer than k hits; the partition's graph only holds that category.
+
+Tags: the old filter ({"tags": {"$contains": tag}} on the comma-joined
+string) is compared with the normalized tag_<name> keys. On Chroma 1.x
+$contains on a string metadata value matches nothing, so the old filter
+returned no hits at all.
+
+Usage:
+    python benchmarks/bench_rag_filtered.py
+    python benchmarks/bench_rag_filtered.py --chunks 50000 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import rag_engine  # noqa: E402
+
+RARE_CATEGORY = "loan_policy"
+OTHER_CATEGORIES = ["general", "compliance", "underwriting", "servicing"]
+TAGS = ["conforming", "jumbo", "fha", "va"]
+
+
+def use_throwaway_store(workdir: Path):
+    """Point rag_engine at empty stores under ``workdir``."""
+    rag_engine.CHROMA_DIR = workdir / "chroma"
+    rag_engine.CATALOG_PATH = workdir / "rag_catalog.sqlite3"
+    rag_engine.KEYWORD_INDEX_PATH = workdir / "rag_keyword_index.sqlite3"
+    rag_engine._chroma_client = None
+    rag_engine._collection = None
+    rag_engine._catalog = None
+    rag_engine._keyword_index = None
+    rag_engine._partitions.clear()
+
+
+def build_store(chunks: int, dim: int, rare_fraction: float, rng):
+    """Add synthetic chunks to the main collection; returns vectors, categories, tags."""
+    vectors = rng.standard_normal((chunks, dim)).astype(np.float32)
+    categories = np.where(
+        rng.random(chunks) < rare_fraction, RARE_CATEGORY, rng.choice(OTHER_CATEGORIES, chunks)
+    )
+    chunk_tags = [list(rng.choice(TAGS, size=rng.integers(0, 3), replace=False)) for _ in range(chunks)]
+    collection = rag_engine._get_collection()
+    batch_size = 2000
+    start = time.perf_counter()
+    for offset in range(0, chunks, batch_size):
+        rows = range(offset, min(offset + batch_size, chunks))
+        collection.add(
+            ids=[f"bench_{i}" for i in rows],
+            documents=[f"synthetic chunk {i}" for i in rows],
+            embeddings=vectors[offset:offset + len(rows)],
+            metadatas=[
+                {
+                    "file_name": f"doc_{i // 10}.txt",
+                    "file_hash": f"bench{i // 10}",
+                    "category": str(categories[i]),
+                    **rag_engine._tag_metadata(chunk_tags[i]),
+                    "chunk_index": i % 10,
+                }
+                for i in rows
+            ],
+        )
+    return vectors, categories, chunk_tags, time.perf_counter() - start
+
+
+def brute_force(vectors, mask, query, k):
+    candidates = np.flatnonzero(mask)
+    distances = ((vectors[candidates] - query) ** 2).sum(axis=1)
+    return {f"bench_{i}" for i in candidates[np.argsort(distances)[:k]]}
+
+
+def evaluate(collection, queries, truths, k, where=None):
+    recalls, latencies, returned = [], [], []
+    for query, truth in zip(queries, truths):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query], n_results=k, where=where, include=[])
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids = set(result["ids"][0])
+        returned.append(len(ids))
+        recalls.append(len(ids & truth) / len(truth) if truth else 1.0)
+    latencies.sort()
+    return {
+        f"recall@{k}": round(statistics.mean(recalls), 4),
+        "avg_returned": round(statistics.mean(returned), 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000, help="synthetic chunks in the store")
+    parser.add_argument("--dim", type=int, default=384, help="vector dimension (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--rare-fraction", type=float, default=0.02, help="share of chunks in loan_policy")
+    parser.add_argument("--queries", type=int, default=100, help="random query vectors")
+    parser.add_argument("--k", type=int, default=10, help="results per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        use_throwaway_store(Path(tmp))
+        rag_engine.CATEGORY_PARTITIONS = True
+        vectors, categories, chunk_tags, load_seconds = build_store(args.chunks, args.dim, args.rare_fraction, rng)
+        start = time.perf_counter()
+        rag_engine.rebuild_partitions()
+        partition_seconds = time.perf_counter() - start
+
+        queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+        rare = categories == RARE_CATEGORY
+        truths = [brute_force(vectors, rare, q, args.k) for q in queries]
+        main_collection = rag_engine._get_collection()
+        partition = rag_engine._get_partition(RARE_CATEGORY)
+        category_modes = {
+            "where": evaluate(main_collection, queries, truths, args.k, where={"category": RARE_CATEGORY}),
+            "partition": evaluate(partition, queries, truths, args.k),
+        }
+
+        tagged = np.array(["fha" in tags for tags in chunk_tags])
+        tag_truths = [brute_force(vectors, tagged, q, args.k) for q in queries]
+        tag_modes = {
+            "$contains": evaluate(main_collection, queries, tag_truths, args.k, where={"tags": {"$contains": "fha"}}),
+            "tag_key": evaluate(main_collection, queries, tag_truths, args.k, where=rag_engine._where_filter(tags=["fha"])),
+        }
+
+    summary = {
+        "chunks": args.chunks,
+        "dim": args.dim,
+        "rare_chunks": int(rare.sum()),
+        "fha_chunks": int(tagged.sum()),
+        "queries": args.queries,
+        "load_seconds": round(load_seconds, 2),
+        "partition_build_seconds": round(partition_seconds, 2),
+        "category": category_modes,
+        "tag": tag_modes,
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("RAG filtered search: where-filter vs. category partition")
+    print("=" * 70)
+    print(f"Store: {args.chunks} chunks x {args.dim} dims | {summary['rare_chunks']} in {RARE_CATEGORY} | "
+          f"{args.queries} queries, k={args.k}")
+    print(f"Load {summary['load_seconds']}s, partitions built in {summary['partition_build_seconds']}s")
+    for title, modes in (("category=" + RARE_CATEGORY, category_modes), ("tag=fha", tag_modes)):
+        print("-" * 70)
+        print(f"{title}")
+        print(f"  {'mode':<10} {'R@' + str(args.k):>7} {'returned':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for mode, result in modes.items():
+            print(f"  {mode:<10} {result[f'recall@{args.k}']:>7.1%} {result['avg_returned']:>9.2f} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
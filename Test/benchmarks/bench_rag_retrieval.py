@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Benchmark: recall of vector-only vs. hybrid (BM25 + vector, RRF) retrieval.
+
+Ingests the policy documents in --docs into a throwaway RAG store (the real
+rag_chroma_db is never touched) and runs the labeled queries in --queries
+(JSONL: query, file, answer). A query counts as answered at k when one of
+its top-k chunks comes from ``file`` and contains ``answer`` verbatim.
+Reports recall@1/3/5, MRR and per-query latency for:
+    - vector     rag_engine.retrieve(..., hybrid=False)
+    - hybrid     keyword + vector legs fused by reciprocal rank fusion
+    - rerank     hybrid + cross-encoder rerank (only with --rerank and
+                 sentence-transformers installed)
+    - cached     hybrid served from rag_engine's result cache (every query
+                 repeated once the cache is warm)
+
+The result cache is off for the other modes, so their latency is the cost
+of actually searching, not of a cache hit after the warm-up pass.
+
+--embedding default uses the store's real model (Chroma's all-MiniLM-L6-v2,
+downloaded on first use); --embedding lsa fits a TF-IDF + SVD model on the
+corpus chunks, a weaker offline stand-in for machines without the model.
+
+Usage:
+    python benchmarks/bench_rag_retrieval.py
+    python benchmarks/bench_rag_retrieval.py --embedding lsa --rerank --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import rag_engine  # noqa: E402
+
+DEFAULT_QUERIES = os.path.join(BASE_DIR, "benchmarks", "data", "rag_labeled_queries.jsonl")
+KS = (1, 3, 5)
+
+# Configured result cache size, restored for the cached mode
+RESULT_CACHE_SIZE = rag_engine.RESULT_CACHE_SIZE
+
+
+class LSAEmbedding:
+    """TF-IDF + truncated SVD fitted on the corpus (offline stand-in model)."""
+
+    def __init__(self, corpus, dim=128):
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, stop_words="english")
+        matrix = self.vectorizer.fit_transform(corpus)
+        self.svd = TruncatedSVD(n_components=min(dim, matrix.shape[1] - 1, len(corpus) - 1), random_state=0)
+        self.svd.fit(matrix)
+
+    @staticmethod
+    def name():
+        return "bench-lsa"
+
+    def __call__(self, input):
+        vectors = self.svd.transform(self.vectorizer.transform(input))
+        norms = (vectors ** 2).sum(axis=1, keepdims=True) ** 0.5
+        return [list(v) for v in vectors / (norms + 1e-12)]
+
+
+def use_throwaway_store(workdir: Path):
+    """Point rag_engine at empty stores under ``workdir``, result cache off."""
+    rag_engine.CHROMA_DIR = workdir / "chroma"
+    rag_engine.CATALOG_PATH = workdir / "rag_catalog.sqlite3"
+    rag_engine.KEYWORD_INDEX_PATH = workdir / "rag_keyword_index.sqlite3"
+    rag_engine._chroma_client = None
+    rag_engine._collection = None
+    rag_engine._catalog = None
+    rag_engine._keyword_index = None
+    rag_engine.RESULT_CACHE_SIZE = 0
+    rag_engine._result_cache = None
+
+
+def ingest(docs_dir: Path, embedding: str, workdir: Path):
+    paths = sorted(p for p in docs_dir.iterdir() if p.suffix.lower() in rag_engine.SUPPORTED_EXTENSIONS)
+    if embedding == "lsa":
+        corpus = [chunk for p in paths for chunk in rag_engine.chunk_text(rag_engine.load_document(p))]
+        rag_engine.set_embedding_function(LSAEmbedding(corpus), "bench-lsa", cache_dir=workdir / "embeddings")
+    else:
+        from rag_embeddings import default_embedding_function
+
+        rag_engine.set_embedding_function(
+            default_embedding_function(), rag_engine.EMBEDDING_MODEL, cache_dir=workdir / "embeddings"
+        )
+    start = time.perf_counter()
+    for path in paths:
+        rag_engine.ingest_document(path, category="policy")
+    return len(paths), time.perf_counter() - start
+
+
+def first_relevant_rank(hits, labeled):
+    for rank, hit in enumerate(hits, 1):
+        if hit["file_name"] == labeled["file"] and labeled["answer"] in hit["content"]:
+            return rank
+    return None
+
+
+def evaluate(labeled_queries, n_results, **retrieve_kwargs):
+    ranks, latencies, misses = [], [], []
+    for labeled in labeled_queries:
+        start = time.perf_counter()
+        hits = rag_engine.retrieve(labeled["query"], n_results=n_results, **retrieve_kwargs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        rank = first_relevant_rank(hits, labeled)
+        ranks.append(rank)
+        if rank is None:
+            misses.append(labeled["query"])
+    total = len(labeled_queries)
+    latencies.sort()
+    return {
+        **{f"recall@{k}": round(sum(1 for r in ranks if r and r <= k) / total, 4) for k in KS},
+        "mrr": round(sum(1 / r for r in ranks if r) / total, 4),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(0.95 * (total - 1))], 2),
+        "missed": misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", default=os.path.join(os.path.dirname(BASE_DIR), "rag_uploads"),
+                        help="directory of policy documents to ingest")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="labeled queries (JSONL)")
+    parser.add_argument("--embedding", choices=["default", "lsa"], default="default",
+                        help="embedding model for the vector leg")
+    parser.add_argument("--rerank", action="store_true", help="also time hybrid + cross-encoder rerank")
+    parser.add_argument("--budget-ms", type=float, default=rag_engine.RETRIEVAL_BUDGET_MS,
+                        help="latency budget for the rerank mode")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    with open(args.queries) as f:
+        labeled_queries = [json.loads(line) for line in f if line.strip()]
+    n_results = max(KS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        use_throwaway_store(workdir)
+        documents, ingest_seconds = ingest(Path(args.docs), args.embedding, workdir)
+        # Warm the embedding cache and indexes so latency is per-query work
+        for labeled in labeled_queries:
+            rag_engine.retrieve(labeled["query"], n_results=n_results)
+
+        modes = {
+            "vector": evaluate(labeled_queries, n_results, hybrid=False),
+            "hybrid": evaluate(labeled_queries, n_results, hybrid=True),
+        }
+        if args.rerank:
+            rag_engine.RERANK_ENABLED = True
+            rag_engine.RETRIEVAL_BUDGET_MS = args.budget_ms
+            if rag_engine._get_reranker().available:
+                modes["rerank"] = evaluate(labeled_queries, n_results, hybrid=True)
+                modes["rerank"]["skipped_over_budget"] = rag_engine.retrieval_stats()["rerank_skipped_budget"]
+            rag_engine.RERANK_ENABLED = False
+        if RESULT_CACHE_SIZE > 0:
+            rag_engine.RESULT_CACHE_SIZE = RESULT_CACHE_SIZE
+            for labeled in labeled_queries:
+                rag_engine.retrieve(labeled["query"], n_results=n_results, hybrid=True)
+            modes["cached"] = evaluate(labeled_queries, n_results, hybrid=True)
+            rag_engine.RESULT_CACHE_SIZE = 0
+        chunks = rag_engine._get_collection().count()
+
+    summary = {
+        "documents": documents,
+        "chunks": chunks,
+        "queries": len(labeled_queries),
+        "embedding": args.embedding,
+        "ingest_seconds": round(ingest_seconds, 2),
+        "modes": modes,
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("RAG retrieval recall: vector-only vs. hybrid (BM25 + vector, RRF)")
+    print("=" * 70)
+    print(f"Corpus: {documents} documents, {chunks} chunks ({args.embedding} embedding) | "
+          f"{len(labeled_queries)} labeled queries")
+    print(f"  {'mode':<8} " + " ".join(f"{'R@' + str(k):>6}" for k in KS) + f" {'MRR':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for mode, result in modes.items():
+        print(f"  {mode:<8} " + " ".join(f"{result[f'recall@{k}']:>6.1%}" for k in KS)
+              + f" {result['mrr']:>6.3f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+    if args.rerank and "rerank" not in modes:
+        print("  rerank   skipped: cross-encoder unavailable (pip install sentence-transformers)")
+    print("-" * 70)
+    for mode, result in modes.items():
+        if result["missed"]:
+            print(f"{mode} missed {len(result['missed'])} at k={n_results}: " + "; ".join(result["missed"][:5]))
+
+
+if __name__ == "__main__":
+    main()
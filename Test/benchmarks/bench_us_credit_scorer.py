@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Benchmark: scalar USCreditRiskScorerTool vs. the columnar batch scorer.
+
+Generates synthetic borrowers and reports rows/sec for:
+    - scalar     USCreditRiskScorerTool._run per borrower (what a Python loop
+                 over the portfolio does today), timed on --scalar-rows
+                 borrowers and extrapolated
+    - batch      credit_risk_batch.score_credit_risk_batch (DataFrame out)
+    - batch+dict credit_risk_batch.credit_assessments_batch (the tool's
+                 exact result dicts)
+
+A sample of rows is checked for byte-identical JSON against the scalar path.
+The scalar path needs crewai; without it only the batch timings are shown.
+
+Usage:
+    python benchmarks/bench_us_credit_scorer.py
+    python benchmarks/bench_us_credit_scorer.py --rows 10000 1000000 --scalar-rows 20000
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from credit_risk_batch import credit_assessments_batch, score_credit_risk_batch  # noqa: E402
+
+
+def make_borrowers(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "fico_score": rng.integers(300, 851, n),
+        "dti": np.round(rng.uniform(0, 70, n), 1),
+        "annual_inc": rng.integers(10000, 250000, n),
+        "loan_amnt": rng.integers(1000, 100000, n),
+        "delinq_2yrs": rng.integers(0, 8, n),
+        "inq_last_6mths": rng.integers(0, 10, n),
+        "pub_rec": rng.integers(0, 4, n),
+        "revol_util": np.round(rng.uniform(0, 110, n), 1),
+        "emp_length": rng.integers(0, 15, n),
+        "home_ownership": rng.choice(["RENT", "OWN", "MORTGAGE", "OTHER"], n),
+        "purpose": "debt_consolidation",
+    })
+
+
+def load_scalar_tool():
+    # Load the module file directly so tools/__init__ (search, SQL, email
+    # tools and their dependencies) is not imported
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "credit_risk_tool", os.path.join(BASE_DIR, "tools", "credit_risk_tool.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.USCreditRiskScorerTool()
+    except ImportError as e:
+        print(f"Scalar path unavailable ({e}); timing the batch scorer only")
+        return None
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000], help="portfolio sizes")
+    parser.add_argument("--scalar-rows", type=int, default=10_000,
+                        help="borrowers actually run through the scalar path per size")
+    parser.add_argument("--check-rows", type=int, default=2_000, help="rows compared byte-for-byte")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    tool = load_scalar_tool()
+    summary = []
+
+    for n in args.rows:
+        df = make_borrowers(n)
+        records = df.head(args.scalar_rows).to_dict("records")
+        entry = {"rows": n}
+
+        _, batch_s = timed(score_credit_risk_batch, df)
+        entry["batch_rows_per_sec"] = round(n / batch_s)
+        dicts, dict_s = timed(credit_assessments_batch, df)
+        entry["batch_dict_rows_per_sec"] = round(n / dict_s)
+
+        if tool is not None:
+            _, scalar_s = timed(lambda: [tool._run(r) for r in records])
+            scalar_rate = len(records) / scalar_s
+            entry["scalar_rows_per_sec"] = round(scalar_rate)
+            entry["scalar_seconds_estimated"] = round(n / scalar_rate, 2)
+            entry["speedup_batch"] = round(entry["batch_rows_per_sec"] / scalar_rate, 1)
+            entry["speedup_batch_dict"] = round(entry["batch_dict_rows_per_sec"] / scalar_rate, 1)
+
+            check = min(args.check_rows, len(records))
+            entry["identical"] = all(
+                json.dumps(dicts[i], indent=2) == tool._run(records[i]) for i in range(check)
+            )
+            entry["checked_rows"] = check
+        summary.append(entry)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print("=" * 70)
+    print("US credit scorer: scalar vs. columnar batch")
+    print("=" * 70)
+    for entry in summary:
+        print(f"Borrowers          : {entry['rows']:,}")
+        print(f"  batch (frame)    : {entry['batch_rows_per_sec']:>12,} rows/s")
+        print(f"  batch (dicts)    : {entry['batch_dict_rows_per_sec']:>12,} rows/s")
+        if "scalar_rows_per_sec" in entry:
+            print(f"  scalar           : {entry['scalar_rows_per_sec']:>12,} rows/s "
+                  f"(~{entry['scalar_seconds_estimated']}s for the full portfolio)")
+            print(f"  speedup          : {entry['speedup_batch']}x frame, {entry['speedup_batch_dict']}x dicts")
+            print(f"  byte-identical   : {entry['identical']} on {entry['checked_rows']:,} rows")
+        print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
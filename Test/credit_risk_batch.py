@@ -0,0 +1,721 @@
+# credit_risk_batch.py
+"""
+Vectorized batch scoring for the credit-risk scorers.
+
+IndianCreditRiskScorerTool builds the 27-feature vector one field at a time
+and calls predict/predict_proba on a single row, so scoring a portfolio meant
+one Python call chain per applicant. This module encodes whole chunks of
+applicants with NumPy/pandas column operations and makes one predict_proba
+call per chunk.
+
+Input: CSV, Parquet or JSON-lines with the IndianCreditRiskInput fields
+(applicant_income, credit_score, dti_ratio, loan_amount, loan_term required;
+the optional fields get the tool's defaults). Output: one dict per applicant,
+in input order, suitable for NDJSON streaming:
+
+    {"row": 0, "id": "APP-1", "approval_probability": 81.27,
+     "verdict": "Approved", "confidence": "High"}
+
+Rows missing a required field yield {"row": n, "id": ..., "error": "..."}
+instead of failing the chunk.
+
+Usage:
+    from credit_risk_batch import score_indian_batch
+
+    for record in score_indian_batch("applications.parquet"):
+        ...
+
+    python credit_risk_batch.py applications.csv > scores.ndjson
+
+The US rule-based scorer (USCreditRiskScorerTool) has a columnar twin,
+score_credit_risk_batch(df), which computes every component score, the
+composite, grade and top factors as array operations over a DataFrame;
+credit_assessments_batch(df) renders the tool's exact per-borrower output.
+"""
+
+import argparse
+import io
+import itertools
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Column order of the trained model (scaler.pkl feature_names_in_)
+INDIAN_FEATURE_NAMES = [
+    "Applicant_Income",
+    "Coapplicant_Income",
+    "Age",
+    "Dependents",
+    "Existing_Loans",
+    "Savings",
+    "Loan_Amount",
+    "Loan_Term",
+    "Education_Level",
+    "Employment_Status_Salaried",
+    "Employment_Status_Self-employed",
+    "Employment_Status_Unemployed",
+    "Marital_Status_Single",
+    "Loan_Purpose_Car",
+    "Loan_Purpose_Education",
+    "Loan_Purpose_Home",
+    "Loan_Purpose_Personal",
+    "Property_Area_Semiurban",
+    "Property_Area_Urban",
+    "Gender_Male",
+    "Employer_Category_Government",
+    "Employer_Category_MNC",
+    "Employer_Category_Private",
+    "Employer_Category_Unemployed",
+    "Collateral_Ratio",
+    "DTI_Ratio_sq",
+    "Credit_Score_sq",
+]
+
+INDIAN_REQUIRED_FIELDS = ("applicant_income", "credit_score", "dti_ratio", "loan_amount", "loan_term")
+
+# Same defaults as IndianCreditRiskInput / IndianCreditRiskScorerTool._run
+INDIAN_NUMERIC_DEFAULTS = {
+    "coapplicant_income": 0,
+    "collateral_value": 0,
+    "savings": 0,
+    "existing_loans": 0,
+    "age": 30,
+    "dependents": 0,
+}
+INDIAN_CATEGORICAL_DEFAULTS = {
+    "marital_status": "Married",
+    "gender": "Male",
+    "employment_status": "Salaried",
+    "employer_category": "Private",
+    "education_level": "Graduate",
+    "property_area": "Urban",
+    "loan_purpose": "Personal",
+}
+
+EDUCATION_LEVELS = {"Not Graduate": 0, "Graduate": 1, "Post Graduate": 2}
+
+# (input column, lower-cased category) for each one-hot feature, in model order
+_ONE_HOT = [
+    ("employment_status", "salaried"),
+    ("employment_status", "self-employed"),
+    ("employment_status", "unemployed"),
+    ("marital_status", "single"),
+    ("loan_purpose", "car"),
+    ("loan_purpose", "education"),
+    ("loan_purpose", "home"),
+    ("loan_purpose", "personal"),
+    ("property_area", "semiurban"),
+    ("property_area", "urban"),
+    ("gender", "male"),
+    ("employer_category", "government"),
+    ("employer_category", "mnc"),
+    ("employer_category", "private"),
+    ("employer_category", "unemployed"),
+]
+
+ID_COLUMNS = ("id", "application_id", "applicant_id", "loan_id")
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def _numeric(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    if column not in df:
+        return np.full(len(df), float(default))
+    return pd.to_numeric(df[column], errors="coerce").fillna(default).to_numpy(dtype=float)
+
+
+def _category(df: pd.DataFrame, column: str) -> pd.Series:
+    default = INDIAN_CATEGORICAL_DEFAULTS[column]
+    if column not in df:
+        return pd.Series(default, index=df.index)
+    return df[column].fillna(default).astype(str)
+
+
+def encode_indian_features(df: pd.DataFrame) -> np.ndarray:
+    """
+    Build the (n, 27) feature matrix the model expects, column by column.
+
+    Matches the per-row encoding in IndianCreditRiskScorerTool._run.
+    """
+    n = len(df)
+    matrix = np.empty((n, len(INDIAN_FEATURE_NAMES)), dtype=float)
+
+    applicant_income = _numeric(df, "applicant_income", np.nan)
+    loan_amount = _numeric(df, "loan_amount", np.nan)
+    dti_ratio = _numeric(df, "dti_ratio", np.nan)
+    credit_score = _numeric(df, "credit_score", np.nan)
+    collateral_value = _numeric(df, "collateral_value", INDIAN_NUMERIC_DEFAULTS["collateral_value"])
+
+    matrix[:, 0] = applicant_income
+    matrix[:, 1] = _numeric(df, "coapplicant_income", INDIAN_NUMERIC_DEFAULTS["coapplicant_income"])
+    matrix[:, 2] = _numeric(df, "age", INDIAN_NUMERIC_DEFAULTS["age"])
+    matrix[:, 3] = _numeric(df, "dependents", INDIAN_NUMERIC_DEFAULTS["dependents"])
+    matrix[:, 4] = _numeric(df, "existing_loans", INDIAN_NUMERIC_DEFAULTS["existing_loans"])
+    matrix[:, 5] = _numeric(df, "savings", INDIAN_NUMERIC_DEFAULTS["savings"])
+    matrix[:, 6] = loan_amount
+    matrix[:, 7] = _numeric(df, "loan_term", np.nan)
+    matrix[:, 8] = _category(df, "education_level").map(EDUCATION_LEVELS).fillna(0).to_numpy(dtype=float)
+
+    lowered = {column: _category(df, column).str.lower() for column in {c for c, _ in _ONE_HOT}}
+    for offset, (column, value) in enumerate(_ONE_HOT):
+        matrix[:, 9 + offset] = (lowered[column] == value).to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix[:, 24] = np.where(loan_amount > 0, collateral_value / loan_amount, 0.0)
+    matrix[:, 25] = dti_ratio ** 2
+    matrix[:, 26] = credit_score ** 2
+    return matrix
+
+
+def _missing_required(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows lacking any required field."""
+    missing = np.zeros(len(df), dtype=bool)
+    for column in INDIAN_REQUIRED_FIELDS:
+        if column not in df:
+            return np.ones(len(df), dtype=bool)
+        missing |= pd.to_numeric(df[column], errors="coerce").isna().to_numpy()
+    return missing
+
+
+# =============================================================================
+# SCORING
+# =============================================================================
+
+def _positive_class_index(model) -> int:
+    classes = list(getattr(model, "classes_", [0, 1]))
+    return classes.index(1) if 1 in classes else len(classes) - 1
+
+
+def score_indian_frame(df: pd.DataFrame, model=None, row_offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Score one chunk of applicants with a single predict_proba call.
+
+    Args:
+        df: Applicants, one per row
+        model: Fitted classifier (default: model_registry "indian_credit_model")
+        row_offset: Row number of df's first row within the whole input
+
+    Returns:
+        List of result dicts in input order
+    """
+    if model is None:
+        from model_registry import model_registry
+
+        model = model_registry.get("indian_credit_model")
+
+    id_column = next((c for c in ID_COLUMNS if c in df), None)
+    ids = df[id_column].tolist() if id_column else [None] * len(df)
+    missing = _missing_required(df)
+    valid = ~missing
+
+    probabilities = np.full(len(df), np.nan)
+    if valid.any():
+        # Features go to the model unscaled, as in IndianCreditRiskScorerTool._run
+        features = encode_indian_features(df.loc[valid])
+        proba = model.predict_proba(features)
+        probabilities[valid] = proba[:, _positive_class_index(model)] * 100
+
+    approved = probabilities > 50
+    confidence = np.where(
+        (probabilities > 70) | (probabilities < 30), "High", np.where(probabilities > 50, "Medium", "Low")
+    )
+
+    records = []
+    for i in range(len(df)):
+        record = {"row": row_offset + i, "id": ids[i]}
+        if missing[i]:
+            record["error"] = "Missing required fields: " + ", ".join(INDIAN_REQUIRED_FIELDS)
+        else:
+            record["approval_probability"] = round(float(probabilities[i]), 2)
+            record["verdict"] = "Approved" if approved[i] else "Rejected"
+            record["confidence"] = str(confidence[i])
+        records.append(record)
+    return records
+
+
+# =============================================================================
+# INPUT READERS
+# =============================================================================
+
+FORMATS = ("csv", "parquet", "jsonl")
+
+
+def detect_format(name: str) -> str:
+    """Infer the input format from a file name or content type."""
+    lowered = (name or "").lower()
+    if "parquet" in lowered:
+        return "parquet"
+    if lowered.endswith((".jsonl", ".ndjson", ".json")) or "json" in lowered:
+        return "jsonl"
+    return "csv"
+
+
+def iter_applicant_chunks(source: Any, fmt: Optional[str] = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Read applicants in chunks from a path or binary file object.
+
+    Args:
+        source: File path or binary file-like object
+        fmt: "csv", "parquet" or "jsonl" (default: inferred from the path)
+        chunk_size: Rows per chunk
+    """
+    fmt = fmt or detect_format(source if isinstance(source, str) else getattr(source, "name", ""))
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}. Expected one of {FORMATS}")
+
+    if fmt == "csv":
+        yield from pd.read_csv(source, chunksize=chunk_size)
+    elif fmt == "jsonl":
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size)
+    else:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            frame = pd.read_parquet(source)
+            for start in range(0, len(frame), chunk_size):
+                yield frame.iloc[start:start + chunk_size]
+            return
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def score_indian_batch(source: Any, fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       model=None) -> Iterator[Dict[str, Any]]:
+    """
+    Score every applicant in a CSV/Parquet/JSON-lines source, chunk by chunk.
+
+    Yields:
+        One result dict per applicant, in input order
+
+    Raises:
+        ValueError: The source cannot be parsed, or lacks a required column
+                    (raised when iteration reaches the bad part; see start_batch)
+    """
+    if model is None:
+        from model_registry import model_registry
+
+        model = model_registry.get("indian_credit_model")
+
+    offset = 0
+    for chunk in iter_applicant_chunks(source, fmt=fmt, chunk_size=chunk_size):
+        if offset == 0:
+            absent = [column for column in INDIAN_REQUIRED_FIELDS if column not in chunk]
+            if absent:
+                raise ValueError(f"Missing required columns: {', '.join(absent)}")
+        chunk = chunk.reset_index(drop=True)
+        yield from score_indian_frame(chunk, model=model, row_offset=offset)
+        offset += len(chunk)
+
+
+def start_batch(records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Advance a lazy batch to its first record now and return an iterator over
+    all of it.
+
+    score_indian_batch only opens and parses its source once iterated. A
+    streaming view calls this inside its try block, so a corrupt file or a
+    missing column is an exception there (-> 400) rather than a 200 whose
+    body stops early.
+    """
+    records = iter(records)
+    try:
+        first = next(records)
+    except StopIteration:
+        return iter(())
+    return itertools.chain([first], records)
+
+
+def to_ndjson(records: Iterator[Dict[str, Any]], summary: bool = True) -> Iterator[str]:
+    """
+    Serialize result dicts as NDJSON lines, optionally ending with a summary line.
+
+    A failure part-way through (e.g. a malformed row in a later CSV chunk)
+    ends the stream with an ``{"error": ...}`` line and a summary marked
+    ``"complete": false``; the HTTP status is already sent by then.
+    """
+    start = time.perf_counter()
+    scored = errors = 0
+    complete = True
+    try:
+        for record in records:
+            if "error" in record:
+                errors += 1
+            else:
+                scored += 1
+            yield json.dumps(record, default=str) + "\n"
+    except Exception as e:
+        logger.error(f"Batch scoring stopped after {scored + errors} rows: {e}")
+        complete = False
+        yield json.dumps({"error": f"Batch stopped after {scored + errors} rows: {e}"}) + "\n"
+    if summary:
+        elapsed = time.perf_counter() - start
+        yield json.dumps({
+            "summary": {
+                "complete": complete,
+                "rows": scored + errors,
+                "scored": scored,
+                "errors": errors,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round((scored + errors) / elapsed, 1) if elapsed else None,
+            }
+        }) + "\n"
+
+
+# =============================================================================
+# US RULE-BASED SCORER
+# =============================================================================
+
+# Defaults USCreditRiskScorerTool._run uses for missing fields
+US_DEFAULTS = {
+    "fico_score": 680,
+    "dti": 20.0,
+    "annual_inc": 50000,
+    "loan_amnt": 10000,
+    "delinq_2yrs": 0,
+    "inq_last_6mths": 0,
+    "pub_rec": 0,
+    "revol_util": 30.0,
+    "emp_length": 5,
+    "home_ownership": "RENT",
+}
+
+# Component weights, summed in this order (the order affects float rounding)
+US_WEIGHTS = (
+    ("fico", 0.35),
+    ("dti", 0.15),
+    ("delinquency", 0.12),
+    ("inquiries", 0.05),
+    ("pub_rec", 0.08),
+    ("revol_util", 0.10),
+    ("employment", 0.05),
+    ("home_ownership", 0.05),
+    ("lti", 0.05),
+)
+
+# Factors ranked by _identify_top_factors, in its list order
+US_FACTORS = (
+    "FICO Score",
+    "Debt-to-Income Ratio",
+    "Delinquencies (2yr)",
+    "Credit Inquiries (6mo)",
+    "Public Records",
+    "Revolving Utilization",
+    "Employment Length",
+    "Loan-to-Income",
+)
+
+US_GRADE_SCALE = {
+    "A": "Excellent credit (low risk) - Default prob < 5%",
+    "B": "Good credit (moderate-low risk) - Default prob 5-10%",
+    "C": "Fair credit (moderate risk) - Default prob 10-15%",
+    "D": "Poor credit (moderate-high risk) - Default prob 15-25%",
+    "E": "Very poor credit (high risk) - Default prob 25-35%",
+    "F": "Extremely poor credit (very high risk) - Default prob > 35%",
+}
+
+_HOME_OWNERSHIP_SCORES = {"OWN": 100.0, "MORTGAGE": 85.0, "RENT": 60.0}
+
+
+def _us_raw(df: pd.DataFrame, column: str) -> List[Any]:
+    """Column values as Python objects, with the tool's default where missing."""
+    default = US_DEFAULTS[column]
+    if column not in df:
+        return [default] * len(df)
+    values = df[column].tolist()
+    for i in np.flatnonzero(df[column].isna().to_numpy()):
+        values[i] = default
+    return values
+
+
+def _us_numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    default = US_DEFAULTS[column]
+    if column not in df:
+        return np.full(len(df), float(default))
+    return pd.to_numeric(df[column]).fillna(default).to_numpy(dtype=float)
+
+
+def _is_int(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Which values are Python ints (int arithmetic in the tool keeps them ints)."""
+    default_is_int = isinstance(US_DEFAULTS[column], int)
+    if column not in df:
+        return np.full(len(df), default_is_int)
+    series = df[column]
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return np.ones(len(df), dtype=bool)
+    if pd.api.types.is_float_dtype(series.dtype):
+        return series.isna().to_numpy() & default_is_int
+    return np.fromiter(
+        (
+            (isinstance(v, (int, np.integer)) and not isinstance(v, bool)) or (default_is_int and pd.isna(v))
+            for v in series.tolist()
+        ),
+        dtype=bool,
+        count=len(df),
+    )
+
+
+def _piecewise(conditions, choices, floor: float, tail: np.ndarray, is_int: Optional[np.ndarray] = None):
+    """
+    Vector form of the tool's if/elif ladders ending in ``max(floor, tail)``.
+
+    Returns the scores and a mask of rows where the tool returns ``tail`` as an
+    int (int input and tail strictly above the float floor).
+    """
+    fallthrough = ~np.logical_or.reduce(conditions)
+    scores = np.select(conditions, choices, default=np.maximum(floor, tail))
+    int_mask = fallthrough & (tail > floor)
+    if is_int is not None:
+        int_mask &= is_int
+    else:
+        int_mask[:] = False
+    return scores, int_mask
+
+
+def _score_us_columns(df: pd.DataFrame, with_raw: bool = False) -> Dict[str, Any]:
+    """Compute every component, the composite, grade and factor ranking as arrays."""
+    num = {column: _us_numeric(df, column) for column in US_DEFAULTS if column != "home_ownership"}
+    ints = {
+        column: _is_int(df, column)
+        for column in ("dti", "delinq_2yrs", "inq_last_6mths", "pub_rec", "revol_util")
+    }
+
+    fico = num["fico_score"]
+    dti = num["dti"]
+    delinq = num["delinq_2yrs"]
+    inq = num["inq_last_6mths"]
+    pub_rec = num["pub_rec"]
+    util = num["revol_util"]
+    emp = num["emp_length"]
+
+    components, int_masks = {}, {}
+    components["fico"], int_masks["fico"] = _piecewise(
+        [fico >= 800, fico >= 740, fico >= 700, fico >= 670, fico >= 640, fico >= 620, fico >= 580],
+        [100.0, 90.0, 80.0, 70.0, 55.0, 45.0, 30.0], 10.0, fico / 10,
+    )
+    components["dti"], int_masks["dti"] = _piecewise(
+        [dti <= 10, dti <= 20, dti <= 28, dti <= 36, dti <= 43, dti <= 50],
+        [100.0, 90.0, 80.0, 65.0, 45.0, 25.0], 5.0, 50 - dti, ints["dti"],
+    )
+    components["delinquency"], int_masks["delinquency"] = _piecewise(
+        [delinq == 0, delinq == 1, delinq == 2, delinq == 3],
+        [100.0, 70.0, 50.0, 30.0], 10.0, 40 - delinq * 5, ints["delinq_2yrs"],
+    )
+    components["inquiries"], int_masks["inquiries"] = _piecewise(
+        [inq == 0, inq == 1, inq == 2, inq == 3, inq <= 5],
+        [100.0, 90.0, 75.0, 60.0, 40.0], 20.0, 60 - inq * 5, ints["inq_last_6mths"],
+    )
+    components["pub_rec"], int_masks["pub_rec"] = _piecewise(
+        [pub_rec == 0, pub_rec == 1, pub_rec == 2],
+        [100.0, 50.0, 25.0], 5.0, 30 - pub_rec * 10, ints["pub_rec"],
+    )
+    components["revol_util"], int_masks["revol_util"] = _piecewise(
+        [util <= 10, util <= 30, util <= 50, util <= 70, util <= 90],
+        [100.0, 85.0, 65.0, 40.0, 20.0], 5.0, 100 - util, ints["revol_util"],
+    )
+    components["employment"] = np.select(
+        [emp >= 10, emp >= 5, emp >= 3, emp >= 2, emp >= 1], [100.0, 80.0, 65.0, 50.0, 35.0], default=20.0
+    )
+    int_masks["employment"] = np.zeros(len(df), dtype=bool)
+
+    if "home_ownership" in df:
+        ownership = df["home_ownership"].fillna("RENT")
+        ownership = ownership.where(ownership.astype(bool), "RENT").astype(str).str.upper()
+    else:
+        ownership = pd.Series("RENT", index=df.index)
+    components["home_ownership"] = ownership.map(_HOME_OWNERSHIP_SCORES).fillna(40.0).to_numpy(dtype=float)
+    int_masks["home_ownership"] = np.zeros(len(df), dtype=bool)
+
+    lti = (num["loan_amnt"] / np.maximum(num["annual_inc"], 1)) * 100
+    components["lti"], int_masks["lti"] = _piecewise(
+        [lti <= 20, lti <= 40, lti <= 60, lti <= 80], [100.0, 80.0, 60.0, 40.0], 10.0, 100 - lti,
+    )
+
+    composite = np.zeros(len(df))
+    for name, weight in US_WEIGHTS:
+        composite = composite + components[name] * weight
+
+    grade_conditions = [fico < 620, composite >= 85, composite >= 75, composite >= 65, composite >= 50,
+                        composite >= 35]
+    grade = np.select(grade_conditions, ["F", "A", "B", "C", "D", "E"], default="F")
+    risk_level = np.select(grade_conditions, ["CRITICAL", "LOW", "LOW", "MEDIUM", "HIGH", "HIGH"],
+                           default="CRITICAL")
+    default_prob = np.select(grade_conditions, [0.45, 0.03, 0.07, 0.12, 0.20, 0.30], default=0.40)
+
+    factor_keys = ("fico", "dti", "delinquency", "inquiries", "pub_rec", "revol_util", "employment", "lti")
+    factor_scores = np.column_stack([components[key] for key in factor_keys])
+    factor_order = np.argsort(factor_scores, axis=1, kind="stable")
+    impacts = np.column_stack([
+        components["fico"] >= 70,
+        components["dti"] >= 65,
+        delinq == 0,
+        inq <= 2,
+        pub_rec == 0,
+        util <= 30,
+        emp >= 3,
+        lti <= 40,
+    ])
+
+    return {
+        "raw": {column: _us_raw(df, column) for column in US_DEFAULTS} if with_raw else None,
+        "components": components,
+        "int_masks": int_masks,
+        "factor_keys": factor_keys,
+        "factor_order": factor_order,
+        "impacts": impacts,
+        "lti": lti,
+        "composite": composite,
+        "grade": grade,
+        "risk_level": risk_level,
+        "default_prob": default_prob,
+    }
+
+
+def score_credit_risk_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnar USCreditRiskScorerTool: score every borrower in ``df`` at once.
+
+    Args:
+        df: One borrower per row, columns as in the tool's borrower_data
+            (fico_score, dti, annual_inc, loan_amnt, delinq_2yrs, ...)
+
+    Returns:
+        DataFrame (same index) with implied_grade, risk_level,
+        default_probability, composite_score, each *_component, lti_pct and
+        top_factor_1..top_factor_5. Values are unrounded; use
+        credit_assessments_batch for the tool's exact output.
+    """
+    scored = _score_us_columns(df)
+    components = scored["components"]
+    result = pd.DataFrame({
+        "implied_grade": scored["grade"],
+        "risk_level": scored["risk_level"],
+        "default_probability": scored["default_prob"],
+        "composite_score": scored["composite"],
+        "fico_component": components["fico"],
+        "dti_component": components["dti"],
+        "delinquency_component": components["delinquency"],
+        "inquiries_component": components["inquiries"],
+        "public_records_component": components["pub_rec"],
+        "revol_util_component": components["revol_util"],
+        "employment_component": components["employment"],
+        "home_ownership_component": components["home_ownership"],
+        "lti_pct": scored["lti"],
+        "lti_component": components["lti"],
+    }, index=df.index)
+    names = np.array(US_FACTORS, dtype=object)
+    for rank in range(5):
+        result[f"top_factor_{rank + 1}"] = names[scored["factor_order"][:, rank]]
+    return result
+
+
+def credit_assessments_batch(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Score ``df`` and build the tool's result dict for every row.
+
+    ``json.dumps(result, indent=2)`` of each dict is byte-identical to
+    ``USCreditRiskScorerTool._run(row)``, provided the DataFrame holds the
+    same values (mixed int/float columns should use object dtype, since the
+    tool echoes raw values and keeps int arithmetic as int).
+    """
+    scored = _score_us_columns(df, with_raw=True)
+    raw = scored["raw"]
+    components = scored["components"]
+    int_masks = scored["int_masks"]
+    factor_keys = scored["factor_keys"]
+
+    # Convert once to Python scalars; round() on NumPy floats differs from Python's
+    def as_python(name):
+        values = components[name].tolist()
+        for i in np.flatnonzero(int_masks[name]):
+            values[i] = int(values[i])
+        return values
+
+    py = {name: as_python(name) for name in components}
+    composite = scored["composite"].tolist()
+    lti = scored["lti"].tolist()
+    default_prob = scored["default_prob"].tolist()
+    grade = scored["grade"].tolist()
+    risk_level = scored["risk_level"].tolist()
+    order = scored["factor_order"][:, :5].tolist()
+    impacts = scored["impacts"].tolist()
+
+    results = []
+    for i in range(len(df)):
+        fico = raw["fico_score"][i]
+        dti = raw["dti"][i]
+        delinq = raw["delinq_2yrs"][i]
+        inq = raw["inq_last_6mths"][i]
+        pub_rec = raw["pub_rec"][i]
+        util = raw["revol_util"][i]
+        emp = raw["emp_length"][i]
+        factor_values = (fico, f"{dti}%", delinq, inq, pub_rec, f"{util}%", f"{emp} years", f"{lti[i]:.1f}%")
+        top = [
+            {
+                "factor": US_FACTORS[j],
+                "score": py[factor_keys[j]][i],
+                "value": factor_values[j],
+                "impact": "positive" if impacts[i][j] else "negative",
+            }
+            for j in order[i]
+        ]
+        prob = default_prob[i]
+        results.append({
+            "credit_assessment": {
+                "implied_grade": grade[i],
+                "default_probability": round(prob, 4),
+                "default_probability_pct": f"{prob * 100:.2f}%",
+                "risk_level": risk_level[i],
+                "composite_score": round(composite[i], 2),
+                "top_features": top,
+            },
+            "score_breakdown": {
+                "fico_score_raw": fico,
+                "fico_score_component": round(py["fico"][i], 2),
+                "dti_raw": dti,
+                "dti_component": round(py["dti"][i], 2),
+                "delinquency_raw": delinq,
+                "delinquency_component": round(py["delinquency"][i], 2),
+                "inquiries_raw": inq,
+                "inquiries_component": round(py["inquiries"][i], 2),
+                "public_records_raw": pub_rec,
+                "public_records_component": round(py["pub_rec"][i], 2),
+                "revol_util_raw": util,
+                "revol_util_component": round(py["revol_util"][i], 2),
+                "employment_years": emp,
+                "employment_component": round(py["employment"][i], 2),
+                "home_ownership": raw["home_ownership"][i],
+                "home_ownership_component": round(py["home_ownership"][i], 2),
+                "lti_pct": round(lti[i], 2),
+                "lti_component": round(py["lti"][i], 2),
+            },
+            "grade_scale": dict(US_GRADE_SCALE),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score Indian loan applicants in batch (NDJSON to stdout).")
+    parser.add_argument("source", help="CSV, Parquet or JSON-lines file ('-' reads CSV/JSON-lines from stdin)")
+    parser.add_argument("--format", choices=FORMATS, help="input format (default: from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    source = io.BytesIO(sys.stdin.buffer.read()) if args.source == "-" else args.source
+    for line in to_ndjson(score_indian_batch(source, fmt=args.format, chunk_size=args.chunk_size)):
+        sys.stdout.write(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -32,13 +32,17 @@ from tasks import (
 )
 from typing import Dict, Any, Optional
 
+from agent_pool import agent_pool
+from intent_router import get_intent_router
+from response_cache import CachedCrewOutput, cache_enabled, get_response_cache
+
 
 # =============================================================================
 # ROUTER CREW FUNCTION
 # =============================================================================
 def run_router_crew(user_query: str, region: str = "India"):
     """
-    Single-task crew for routing - creates only router agents fresh each time.
+    Single-task crew for routing - router agents are leased warm from agent_pool.
 
     Args:
         user_query: The user's query to route
@@ -47,16 +51,16 @@ def run_router_crew(user_query: str, region: str = "India"):
     Returns:
         CrewOutput object with routing decision
     """
-    agents = create_router_agents()
-    task = create_routing_task(agents, user_query, region=region)
-    crew = Crew(
-        agents=[agents["manager_agent"]],
-        tasks=[task],
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("router", create_router_agents) as agents:
+        task = create_routing_task(agents, user_query, region=region)
+        crew = Crew(
+            agents=[agents["manager_agent"]],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -65,7 +69,8 @@ def run_router_crew(user_query: str, region: str = "India"):
 def create_aml_crew(client_data_json: str):
     """
     Create AML execution crew - created FRESH per execution.
-    Each AML case is unique and compliance requires fresh state.
+    Each AML case is unique and compliance requires fresh state
+    (AML is excluded from agent_pool; see NON_POOLED_CREWS).
 
     Args:
         client_data_json: JSON string containing client data
@@ -165,7 +170,7 @@ def run_aml_crew(client_data_json: str) -> dict:
 # =============================================================================
 def run_analysis_crew(user_query: str, region: str = "India", product_type: str = "FD"):
     """
-    Analysis crew - creates only analysis agents fresh each time.
+    Analysis crew - analysis agents are leased warm from agent_pool.
     OPTIMIZED: Reduced from 6 to 4 agents by merging:
     - query_parser + search → query_search_agent
     - research + safety → research_safety_agent
@@ -178,21 +183,23 @@ def run_analysis_crew(user_query: str, region: str = "India", product_type: str
     Returns:
     CrewOutput object with analysis results
     """
-    agents = create_analysis_agents(region=region, product_type=product_type)
-    tasks = create_analysis_tasks(agents, user_query, region=region, product_type=product_type)
-    crew = Crew(
-    agents=[
-    agents["query_search_agent"],
-    agents["projection_agent"],
-    agents["research_safety_agent"],
-    agents["summary_agent"],
-    ],
-    tasks=tasks,
-    process=Process.sequential,
-    verbose=True,
-    cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease(
+        "analysis", create_analysis_agents, region=region, product_type=product_type
+    ) as agents:
+        tasks = create_analysis_tasks(agents, user_query, region=region, product_type=product_type)
+        crew = Crew(
+        agents=[
+        agents["query_search_agent"],
+        agents["projection_agent"],
+        agents["research_safety_agent"],
+        agents["summary_agent"],
+        ],
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=True,
+        cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -200,7 +207,7 @@ def run_analysis_crew(user_query: str, region: str = "India", product_type: str
 # =============================================================================
 def run_research_crew(user_query: str, region: str = "India"):
     """
-    Research crew - creates only research agents fresh each time.
+    Research crew - research agents are leased warm from agent_pool.
     OPTIMIZED: Reduced from 3 to 2 agents by merging:
     - provider_search + deep_research → provider_research_agent
 
@@ -211,19 +218,19 @@ def run_research_crew(user_query: str, region: str = "India"):
     Returns:
         CrewOutput object with research results
     """
-    agents = create_research_agents(region=region)
-    tasks = create_research_tasks(agents, user_query, region=region)
-    crew = Crew(
-        agents=[
-            agents["provider_research_agent"],
-            agents["research_compilation_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("research", create_research_agents, region=region) as agents:
+        tasks = create_research_tasks(agents, user_query, region=region)
+        crew = Crew(
+            agents=[
+                agents["provider_research_agent"],
+                agents["research_compilation_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -231,7 +238,7 @@ def run_research_crew(user_query: str, region: str = "India"):
 # =============================================================================
 def run_database_crew(user_query: str):
     """
-    Database crew - creates only database agent fresh each time.
+    Database crew - database agent is leased warm from agent_pool.
 
     Args:
         user_query: The user's query for database operations
@@ -239,16 +246,16 @@ def run_database_crew(user_query: str):
     Returns:
         CrewOutput object with database results
     """
-    agents = create_database_agents()
-    tasks = create_database_tasks(agents, user_query)
-    crew = Crew(
-        agents=[agents["db_agent"]],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("database", create_database_agents) as agents:
+        tasks = create_database_tasks(agents, user_query)
+        crew = Crew(
+            agents=[agents["db_agent"]],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -256,7 +263,7 @@ def run_database_crew(user_query: str):
 # =============================================================================
 def run_visualization_crew(user_query: str, data_context: str):
     """
-    Single-agent sequential crew for chart generation - creates fresh each time.
+    Single-agent sequential crew for chart generation - agent leased from agent_pool.
 
     Args:
         user_query: The user's query for visualization
@@ -265,16 +272,16 @@ def run_visualization_crew(user_query: str, data_context: str):
     Returns:
         CrewOutput object with visualization results
     """
-    agents = create_visualization_agents()
-    task = create_visualization_task(agents, user_query, data_context)
-    crew = Crew(
-        agents=[agents["data_visualizer_agent"]],
-        tasks=[task],
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("visualization", create_visualization_agents) as agents:
+        task = create_visualization_task(agents, user_query, data_context)
+        crew = Crew(
+            agents=[agents["data_visualizer_agent"]],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -282,7 +289,7 @@ def run_visualization_crew(user_query: str, data_context: str):
 # =============================================================================
 def run_credit_risk_crew(borrower_json: str = "{}", region: str = "IN"):
     """
-    Credit risk crew - creates only credit risk agents fresh each time.
+    Credit risk crew - credit risk agents are leased warm from agent_pool.
     Routes to region-specific models based on the region parameter.
 
     Args:
@@ -305,19 +312,19 @@ def run_credit_risk_crew(borrower_json: str = "{}", region: str = "IN"):
     logger = logging.getLogger(__name__)
     logger.info(f"run_credit_risk_crew: region={region_code}, is_us={is_us_region}, is_india={is_india_region}")
     
-    agents = create_credit_risk_agents(region=region_code)
-    tasks = create_credit_risk_tasks(agents, borrower_json, region=region_code)
-    crew = Crew(
-        agents=[
-            agents["credit_risk_collector_agent"],
-            agents["credit_risk_analyst_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("credit_risk", create_credit_risk_agents, region=region_code) as agents:
+        tasks = create_credit_risk_tasks(agents, borrower_json, region=region_code)
+        crew = Crew(
+            agents=[
+                agents["credit_risk_collector_agent"],
+                agents["credit_risk_analyst_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -325,8 +332,8 @@ def run_credit_risk_crew(borrower_json: str = "{}", region: str = "IN"):
 # =============================================================================
 def run_loan_creation_crew(borrower_context: str = ""):
     """
-    Loan creation crew - created fresh per underwriting decision.
-    Each loan application is unique.
+    Loan creation crew - a new Crew/Tasks per underwriting decision.
+    Each loan application is unique; agents are reset and reused via agent_pool.
 
     Args:
         borrower_context: Context string about the borrower (default: "")
@@ -334,19 +341,19 @@ def run_loan_creation_crew(borrower_context: str = ""):
     Returns:
         CrewOutput object with loan creation results
     """
-    agents = create_loan_creation_agents()
-    tasks = create_loan_creation_tasks(agents, borrower_context)
-    crew = Crew(
-        agents=[
-            agents["loan_creation_agent"],
-            agents["loan_summary_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("loan_creation", create_loan_creation_agents) as agents:
+        tasks = create_loan_creation_tasks(agents, borrower_context)
+        crew = Crew(
+            agents=[
+                agents["loan_creation_agent"],
+                agents["loan_summary_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -354,7 +361,7 @@ def run_loan_creation_crew(borrower_context: str = ""):
 # =============================================================================
 def run_mortgage_analytics_crew(borrower_json: str = "{}"):
     """
-    Mortgage analytics crew - created fresh per analysis.
+    Mortgage analytics crew - a new Crew/Tasks per analysis, agents from agent_pool.
 
     Args:
         borrower_json: JSON string containing borrower data (default: "{}")
@@ -362,19 +369,19 @@ def run_mortgage_analytics_crew(borrower_json: str = "{}"):
     Returns:
         CrewOutput object with mortgage analytics results
     """
-    agents = create_mortgage_agents()
-    tasks = create_mortgage_analytics_tasks(agents, borrower_json)
-    crew = Crew(
-        agents=[
-            agents["mortgage_data_collector_agent"],
-            agents["mortgage_analyst_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("mortgage_analytics", create_mortgage_agents) as agents:
+        tasks = create_mortgage_analytics_tasks(agents, borrower_json)
+        crew = Crew(
+            agents=[
+                agents["mortgage_data_collector_agent"],
+                agents["mortgage_analyst_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -408,20 +415,20 @@ def run_td_fd_creation(
         )
         print(result.raw)
     """
-    agents = create_td_fd_agents()
-    tasks = create_td_fd_tasks(agents, user_query, user_email, user_id)
-    crew = Crew(
-        agents=[
-            agents["td_fd_provider_selection_agent"],
-            agents["td_fd_creation_agent"],
-            agents["td_fd_notification_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("fd_advisor", create_td_fd_agents) as agents:
+        tasks = create_td_fd_tasks(agents, user_query, user_email, user_id)
+        crew = Crew(
+            agents=[
+                agents["td_fd_provider_selection_agent"],
+                agents["td_fd_creation_agent"],
+                agents["td_fd_notification_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -460,18 +467,18 @@ def generate_fd_template(
         result = generate_fd_template(fd_data, template_type="confirmation")
         print(result.raw)
     """
-    agents = create_fd_template_agents()
-    tasks = create_fd_template_tasks(agents, fd_data, template_type)
-    crew = Crew(
-        agents=[
-            agents["fd_template_generator_agent"],
-        ],
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True,
-        cache=False,
-    )
-    return crew.kickoff()
+    with agent_pool.lease("fd_template", create_fd_template_agents) as agents:
+        tasks = create_fd_template_tasks(agents, fd_data, template_type)
+        crew = Crew(
+            agents=[
+                agents["fd_template_generator_agent"],
+            ],
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True,
+            cache=False,
+        )
+        return crew.kickoff()
 
 
 # =============================================================================
@@ -482,21 +489,31 @@ def run_crew(
     region: str = "India",
     borrower_context: str = "",
     data_context: str = "",
+    return_routing: bool = False,
+    use_cache: bool = True,
 ):
     """
-    Routes the query to the appropriate crew via the LLM-based router agent.
+    Routes the query to the appropriate crew.
 
-    The router agent (manager_agent) classifies the user query into one of six
-    intents: CREDIT_RISK, LOAN_CREATION, MORTGAGE_ANALYTICS, ANALYSIS, RESEARCH,
-    or DATABASE. No keyword matching is used - the LLM decides.
+    The query is first classified locally by intent_router (keyword rules,
+    then a TF-IDF nearest-centroid model). Only when that is not confident
+    does the LLM-based router agent (manager_agent) classify it into one of:
+    CREDIT_RISK, LOAN_CREATION, MORTGAGE_ANALYTICS, ANALYSIS, VISUALIZATION,
+    RESEARCH or DATABASE.
 
     Args:
         user_query: The user's query to route
         region: The region for context (default: "India")
         borrower_context: Context string about the borrower (default: "")
+        return_routing: Also return the routing decision (default: False)
+        use_cache: Serve analysis/research answers from response_cache
+            (default: True)
 
     Returns:
-        CrewOutput object from the routed crew
+        CrewOutput object from the routed crew, or (CrewOutput, routing) when
+        return_routing is True. routing is a dict with intent, confidence and
+        route ("rules", "model" or "llm"), plus "cache" on a cache hit.
+        Cached answers are CachedCrewOutput objects exposing ``raw``.
     """
 
     # Helper to run crew with evaluation
@@ -527,32 +544,56 @@ def run_crew(
             print(f"[Crew] Error running {crew_name}: {e}")
             raise
 
-    # ── LLM-based routing ──
-    # The manager_agent classifies the query - no keyword matching needed.
-    router_result = _run_with_eval(
-        lambda: run_router_crew(user_query, region=region), "router-crew"
+    # Helper to serve repeat questions from the response cache
+    def _run_cached(crew_type, crew_func, crew_name):
+        cache = get_response_cache() if use_cache and cache_enabled() else None
+        if cache is None or not cache.is_cacheable(crew_type):
+            return _run_with_eval(crew_func, crew_name)
+
+        cached = cache.get(crew_type, user_query, region)
+        if cached is not None:
+            routing["cache"] = cached["cache"]
+            return CachedCrewOutput(cached["result"], cached["cache"])
+
+        result = _run_with_eval(crew_func, crew_name)
+        raw = result.raw if hasattr(result, "raw") else str(result)
+        cache.set(crew_type, user_query, region, {"result": raw, "crew_type": crew_type})
+        return result
+
+    # ── Routing ──
+    # Local fast path first; the LLM router crew only runs on low confidence.
+    routing = get_intent_router().route(
+        user_query,
+        region=region,
+        llm_router=lambda: _run_with_eval(
+            lambda: run_router_crew(user_query, region=region), "router-crew"
+        ),
+    )
+    decision = routing["intent"] or ""
+    print(
+        f"[Router] {decision or 'UNKNOWN'} via {routing['route']} "
+        f"(confidence={routing['confidence']})"
     )
-    decision = router_result.raw.strip().upper()
 
     if "CREDIT_RISK" in decision:
-        return _run_with_eval(
+        result = _run_with_eval(
             lambda: run_credit_risk_crew(borrower_context), "credit-risk-crew"
         )
     elif "LOAN_CREATION" in decision:
-        return _run_with_eval(
+        result = _run_with_eval(
             lambda: run_loan_creation_crew(borrower_context), "loan-creation-crew"
         )
     elif "MORTGAGE_ANALYTICS" in decision:
-        return _run_with_eval(
+        result = _run_with_eval(
             lambda: run_mortgage_analytics_crew(borrower_context or "{}"),
             "mortgage-analytics-crew",
         )
     elif "ANALYSIS" in decision:
-        return _run_with_eval(
-            lambda: run_analysis_crew(user_query, region=region), "fd-analysis-crew"
+        result = _run_cached(
+            "analysis", lambda: run_analysis_crew(user_query, region=region), "fd-analysis-crew"
         )
     elif "DATABASE" in decision:
-        return _run_with_eval(lambda: run_database_crew(user_query), "fd-database-crew")
+        result = _run_with_eval(lambda: run_database_crew(user_query), "fd-database-crew")
     elif "VISUALIZATION" in decision:
 
         def _viz_pipeline():
@@ -586,7 +627,7 @@ def run_crew(
                 )
             return run_visualization_crew(user_query, data_context=ctx)
 
-        return _run_with_eval(_viz_pipeline, "visualization-crew")
+        result = _run_with_eval(_viz_pipeline, "visualization-crew")
     else:
         import warnings
 
@@ -595,7 +636,8 @@ def run_crew(
             "Falling back to research crew.",
             stacklevel=2,
         )
-        return _run_with_eval(
-            lambda: run_research_crew(user_query, region=region), "fd-research-crew"
+        result = _run_cached(
+            "research", lambda: run_research_crew(user_query, region=region), "fd-research-crew"
         )
-        
\ No newline at end of file
+
+    return (result, routing) if return_routing else result
@@ -0,0 +1,374 @@
+# intent_router.py
+"""
+Deterministic fast-path intent router.
+
+``crews.run_crew`` used to spend a full LLM round-trip (router crew) on every
+query just to obtain one routing label. This module classifies queries
+locally first and only defers to the LLM router when it is not confident:
+
+    1. rules  - keyword/regex patterns for unambiguous intents
+    2. model  - TF-IDF nearest-centroid classifier trained on seed examples
+                plus queries previously labelled by the LLM router
+    3. llm    - the existing router crew (fallback)
+
+Every LLM fallback is appended to a JSON-lines log so the local model can be
+retrained from real traffic, and the same file doubles as a replay file for
+``benchmarks/bench_intent_router.py``.
+
+Configuration (environment):
+    INTENT_ROUTER_THRESHOLD  minimum confidence for the local route (default 0.6)
+    INTENT_ROUTER_LOG        path of the LLM decision log
+                             (default outputs/routing/llm_router_log.jsonl)
+    INTENT_ROUTER_DISABLED   set to "1" to always use the LLM router
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+INTENT_LABELS = (
+    "CREDIT_RISK",
+    "LOAN_CREATION",
+    "MORTGAGE_ANALYTICS",
+    "ANALYSIS",
+    "VISUALIZATION",
+    "RESEARCH",
+    "DATABASE",
+    "ONBOARDING",
+)
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_LOG_PATH = os.path.join(BASE_DIR, "outputs", "routing", "llm_router_log.jsonl")
+
+# Route names reported alongside the label
+ROUTE_RULES = "rules"
+ROUTE_MODEL = "model"
+ROUTE_LLM = "llm"
+
+
+# =============================================================================
+# STAGE 1: KEYWORD / REGEX RULES
+# =============================================================================
+
+# (label, pattern, weight). Weight 1.0 means the pattern alone is decisive.
+_RULES = [
+    ("VISUALIZATION", r"\b(chart|charts|graph|graphs|plot|visuali[sz]e|visuali[sz]ation|pie|histogram)\b", 1.0),
+    ("MORTGAGE_ANALYTICS", r"\b(mortgage|mortgages|fannie\s*mae|ltv|loan[-\s]to[-\s]value|refinanc\w*)\b", 1.0),
+    ("CREDIT_RISK", r"\b(credit\s*risk|default\s*probability|probability\s*of\s*default|creditworth\w*|credit\s*assessment|risk\s*grade)\b", 1.0),
+    ("CREDIT_RISK", r"\b(credit|cibil|fico)\s*score\b", 0.6),
+    ("LOAN_CREATION", r"\b(underwrit\w*|loan\s*application|apply\s*for\s*(a\s*)?loan|approve\s*(my|the|this)?\s*loan|loan\s*approval|sanction\s*(my|a)?\s*loan)\b", 1.0),
+    ("ONBOARDING", r"\b(open\s*(a|an|my)?\s*(new\s*)?(savings\s*|bank\s*)?account|start\s*onboarding|onboard\w*|(create|book|open)\s*(a|an|my)?\s*(new\s*)?(fd|td|fixed\s*deposit|term\s*deposit))\b", 1.0),
+    ("DATABASE", r"\b(kyc\s*status|my\s*account|my\s*deposits?|existing\s*(users?|customers?|accounts?|records?)|how\s*many\s*(users|customers|accounts|deposits)|list\s*(all\s*)?(users|customers|accounts)|records?\s*(for|of))\b", 1.0),
+    ("ANALYSIS", r"\b(maturity|mature|interest\s*earned|projection|project(ed)?\s*returns?|calculate|calculation|compound\w*)\b", 0.8),
+    ("ANALYSIS", r"\b(best|highest|top|compare|comparison)\b.*\b(fd|td|rd|fixed\s*deposits?|term\s*deposits?|rates?)\b", 0.8),
+    ("RESEARCH", r"\b(research|news|deep[-\s]*dive|detailed\s*report|report\s*on|background\s*on|credit\s*rating\s*of|tell\s*me\s*about)\b", 0.8),
+]
+
+_COMPILED_RULES = [(label, re.compile(pattern, re.IGNORECASE), weight) for label, pattern, weight in _RULES]
+
+
+def _rule_scores(query: str) -> Dict[str, float]:
+    scores: Dict[str, float] = defaultdict(float)
+    for label, pattern, weight in _COMPILED_RULES:
+        if pattern.search(query):
+            scores[label] += weight
+    return dict(scores)
+
+
+def classify_by_rules(query: str) -> Tuple[Optional[str], float]:
+    """
+    Classify with keyword rules.
+
+    Confidence is the winning label's share of all matched rule weight, capped
+    by its own strength, so a query matching two intents equally scores 0.5.
+    """
+    scores = _rule_scores(query)
+    if not scores:
+        return None, 0.0
+    label, top = max(scores.items(), key=lambda kv: kv[1])
+    total = sum(scores.values())
+    return label, round(min(1.0, top) * top / total, 4)
+
+
+# =============================================================================
+# STAGE 2: TF-IDF NEAREST-CENTROID MODEL
+# =============================================================================
+
+_TOKEN_RE = re.compile(r"[a-z0-9%]+")
+_STOPWORDS = frozenset(
+    "a an the is are am be to of in on for and or with my me i you your what which "
+    "how can could would should please show give get do does at by from this that it".split()
+)
+
+# Seed examples so the model works before any LLM decisions have been logged
+SEED_EXAMPLES = [
+    ("What is my credit risk score with a FICO of 680?", "CREDIT_RISK"),
+    ("Assess the default probability for this borrower", "CREDIT_RISK"),
+    ("Check creditworthiness of applicant with 45% DTI", "CREDIT_RISK"),
+    ("Score this borrower's credit risk", "CREDIT_RISK"),
+    ("Underwrite a personal loan for 20000 dollars", "LOAN_CREATION"),
+    ("Should this loan application be approved?", "LOAN_CREATION"),
+    ("Apply for a loan with FICO 720 and DTI 30%", "LOAN_CREATION"),
+    ("Loan approval decision under our FICO and DTI policy", "LOAN_CREATION"),
+    ("Current 30-year mortgage rates and LTV limits", "MORTGAGE_ANALYTICS"),
+    ("Analyze my mortgage with Fannie Mae models", "MORTGAGE_ANALYTICS"),
+    ("What DTI do I need for a home mortgage?", "MORTGAGE_ANALYTICS"),
+    ("Mortgage portfolio risk for a 400k loan", "MORTGAGE_ANALYTICS"),
+    ("Best 1-year FD rates in India", "ANALYSIS"),
+    ("Calculate maturity amount for 5 lakh FD at 7.5% for 2 years", "ANALYSIS"),
+    ("Compare fixed deposit rates of SBI and HDFC", "ANALYSIS"),
+    ("How much interest will I earn on a 12 month term deposit?", "ANALYSIS"),
+    ("Projected returns on a recurring deposit of 5000 per month", "ANALYSIS"),
+    ("Show FD rates as a bar chart", "VISUALIZATION"),
+    ("Plot the interest rate comparison", "VISUALIZATION"),
+    ("Visualize the maturity amounts in a pie chart", "VISUALIZATION"),
+    ("Graph the rates from the previous analysis", "VISUALIZATION"),
+    ("Research the top banks offering term deposits", "RESEARCH"),
+    ("Give me a detailed report on small finance banks", "RESEARCH"),
+    ("Latest news about HDFC Bank", "RESEARCH"),
+    ("Tell me about the safety of NBFC deposits", "RESEARCH"),
+    ("How many customers have active fixed deposits?", "DATABASE"),
+    ("What is the KYC status of user 42?", "DATABASE"),
+    ("List all accounts opened this month", "DATABASE"),
+    ("Show existing records for customer John", "DATABASE"),
+    ("I want to open a new account", "ONBOARDING"),
+    ("Create an FD of 1 lakh for 12 months", "ONBOARDING"),
+    ("Start onboarding for a new customer", "ONBOARDING"),
+    ("Book a fixed deposit with the best bank", "ONBOARDING"),
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase unigram + bigram features with stopwords removed."""
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+def _normalize(vec: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vec.values()))
+    return {k: v / norm for k, v in vec.items()} if norm else {}
+
+
+class CentroidModel:
+    """
+    TF-IDF nearest-centroid text classifier (pure Python, no fitting loop).
+
+    Each label's centroid is the normalized mean of its training vectors;
+    a query is scored by cosine similarity against every centroid and the
+    similarities are turned into a probability with a temperature softmax.
+    """
+
+    def __init__(self, temperature: float = 0.1):
+        self.temperature = temperature
+        self.idf: Dict[str, float] = {}
+        self.centroids: Dict[str, Dict[str, float]] = {}
+        self.n_examples = 0
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "CentroidModel":
+        docs = [(tokenize(text), label) for text, label in examples if label in INTENT_LABELS]
+        self.n_examples = len(docs)
+        df = Counter()
+        for tokens, _ in docs:
+            df.update(set(tokens))
+        n = len(docs)
+        self.idf = {t: math.log((1 + n) / (1 + c)) + 1.0 for t, c in df.items()}
+
+        sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for tokens, label in docs:
+            for term, weight in self._vectorize(tokens).items():
+                sums[label][term] += weight
+        self.centroids = {label: _normalize(vec) for label, vec in sums.items()}
+        return self
+
+    def _vectorize(self, tokens: List[str]) -> Dict[str, float]:
+        tf = Counter(t for t in tokens if t in self.idf)
+        return _normalize({t: c * self.idf[t] for t, c in tf.items()})
+
+    def scores(self, query: str) -> Dict[str, float]:
+        vec = self._vectorize(tokenize(query))
+        return {
+            label: sum(w * centroid.get(t, 0.0) for t, w in vec.items())
+            for label, centroid in self.centroids.items()
+        }
+
+    def predict(self, query: str) -> Tuple[Optional[str], float]:
+        sims = self.scores(query)
+        if not sims or max(sims.values()) <= 0.0:
+            return None, 0.0
+        exps = {label: math.exp(s / self.temperature) for label, s in sims.items()}
+        total = sum(exps.values())
+        label = max(exps, key=exps.get)
+        return label, round(exps[label] / total, 4)
+
+
+# =============================================================================
+# DECISION LOG (training data + replay file)
+# =============================================================================
+
+_log_lock = threading.Lock()
+
+
+def get_log_path() -> str:
+    return os.environ.get("INTENT_ROUTER_LOG", DEFAULT_LOG_PATH)
+
+
+def parse_llm_decision(raw: str) -> str:
+    """Map the router crew's free-text answer to a label (as crews.run_crew does)."""
+    decision = (raw or "").strip().upper()
+    for label in INTENT_LABELS:
+        if label in decision:
+            return label
+    return decision
+
+
+def log_llm_decision(query: str, region: str, label: str, latency_ms: float, path: Optional[str] = None):
+    """Append an LLM routing decision to the JSON-lines log."""
+    path = path or get_log_path()
+    entry = {
+        "query": query,
+        "region": region,
+        "llm_label": label,
+        "llm_latency_ms": round(latency_ms, 2),
+        "timestamp": datetime.now().isoformat(),
+    }
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write routing log {path}: {e}")
+
+
+def load_logged_examples(path: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Read (query, label) pairs from a routing log / replay file."""
+    path = path or get_log_path()
+    examples = []
+    if not os.path.exists(path):
+        return examples
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            label = entry.get("llm_label") or entry.get("label")
+            if entry.get("query") and label in INTENT_LABELS:
+                examples.append((entry["query"], label))
+    return examples
+
+
+# =============================================================================
+# ROUTER
+# =============================================================================
+
+
+class IntentRouter:
+    """
+    Rules -> model -> LLM routing cascade.
+
+    Args:
+        threshold: Minimum confidence for accepting a local (rules/model) route.
+        examples: Training examples for the centroid model (defaults to seeds + log).
+    """
+
+    def __init__(self, threshold: Optional[float] = None, examples: Optional[Iterable[Tuple[str, str]]] = None):
+        if threshold is None:
+            threshold = float(os.environ.get("INTENT_ROUTER_THRESHOLD", DEFAULT_THRESHOLD))
+        self.threshold = threshold
+        if examples is None:
+            examples = SEED_EXAMPLES + load_logged_examples()
+        self.model = CentroidModel().fit(examples)
+
+    def classify(self, query: str) -> Dict[str, Any]:
+        """
+        Classify locally without calling the LLM.
+
+        Returns:
+            dict with intent, confidence, route ("rules" or "model") and
+            accepted (whether confidence met the threshold)
+        """
+        start = time.perf_counter()
+        label, confidence = classify_by_rules(query)
+        route = ROUTE_RULES
+        if label is None or confidence < self.threshold:
+            model_label, model_confidence = self.model.predict(query)
+            if model_label is not None and model_confidence >= confidence:
+                label, confidence, route = model_label, model_confidence, ROUTE_MODEL
+        return {
+            "intent": label,
+            "confidence": confidence,
+            "route": route,
+            "accepted": label is not None and confidence >= self.threshold,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 4),
+        }
+
+    def route(self, query: str, region: str = "India", llm_router: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """
+        Route a query, falling back to ``llm_router`` when not confident.
+
+        Args:
+            query: The user's query
+            region: Region passed to the LLM router (logged for retraining)
+            llm_router: Zero-arg callable returning the router crew output
+
+        Returns:
+            dict with intent, confidence, route ("rules", "model" or "llm"),
+            latency_ms and, for LLM routes, local_intent/local_confidence
+        """
+        decision = self.classify(query)
+        disabled = os.environ.get("INTENT_ROUTER_DISABLED") == "1"
+        if llm_router is None or (decision["accepted"] and not disabled):
+            decision.pop("accepted")
+            return decision
+
+        start = time.perf_counter()
+        output = llm_router()
+        latency_ms = (time.perf_counter() - start) * 1000
+        raw = output.raw if hasattr(output, "raw") else str(output)
+        label = parse_llm_decision(raw)
+        log_llm_decision(query, region, label, latency_ms)
+        return {
+            "intent": label,
+            "confidence": None,
+            "route": ROUTE_LLM,
+            "latency_ms": round(latency_ms, 2),
+            "local_intent": decision["intent"],
+            "local_confidence": decision["confidence"],
+        }
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_intent_router() -> IntentRouter:
+    """Return the process-wide router, training it on first use."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = IntentRouter()
+    return _router
+
+
+def reload_intent_router() -> IntentRouter:
+    """Retrain the process-wide router from seeds plus the current log."""
+    global _router
+    with _router_lock:
+        _router = IntentRouter()
+    return _router
@@ -0,0 +1,375 @@
+# model_registry.py
+"""
+Process-wide registry for ML model artifacts.
+
+The credit-risk views unpickled loan_model.pkl/scaler.pkl on every request,
+and the scorer tools, the mortgage analytics tool and the Streamlit reference
+each kept their own per-instance copy. All of them now share one registry:
+
+    from model_registry import model_registry
+
+    model = model_registry.get("indian_credit_model")
+
+Models are loaded lazily on first use, exactly once even under concurrent
+requests, and reloaded when the mtime of any of their files changes (checked
+at most every ``check_interval`` seconds). ``stats()`` reports load time,
+memory allocated while loading, file size and hit counts per model.
+
+``warm(probe=True)`` loads every model ahead of traffic and runs a synthetic
+prediction through it (the first predict call also pays for lazy imports and
+allocator warm-up). ``readiness()`` reports whether that warm-up has finished
+cleanly; it backs the /healthz/ready endpoint.
+
+Registered models:
+    indian_credit_model   models/credit_risk/indian/loan_model.pkl
+    indian_credit_scaler  models/credit_risk/indian/scaler.pkl
+    us_credit_model       models/credit_risk/USA/xgb_model.pkl
+    fannie_mae_hub        FannieMaeModelHub over models/fannie_mae_models
+"""
+
+import glob
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+
+INDIAN_MODEL_PATH = os.path.join(MODELS_DIR, "credit_risk", "indian", "loan_model.pkl")
+INDIAN_SCALER_PATH = os.path.join(MODELS_DIR, "credit_risk", "indian", "scaler.pkl")
+US_MODEL_PATH = os.path.join(MODELS_DIR, "credit_risk", "USA", "xgb_model.pkl")
+FANNIE_MAE_MODEL_DIR = os.getenv("FANNIE_MAE_MODEL_DIR", os.path.join(MODELS_DIR, "fannie_mae_models"))
+
+DEFAULT_CHECK_INTERVAL = 2.0
+
+# Serializes tracemalloc measurement across concurrent loads
+_measure_lock = threading.Lock()
+
+
+class ModelEntry:
+    """A registered model: how to load it, which files it comes from, and its counters."""
+
+    def __init__(self, name: str, loader: Callable[[], Any], paths: Callable[[], Sequence[str]],
+                 probe: Optional[Callable[[Any], Any]] = None):
+        self.name = name
+        self.loader = loader
+        self.paths = paths
+        self.probe = probe
+        self.lock = threading.Lock()
+        self.model = None
+        self.mtimes: Optional[Tuple] = None
+        self.last_check = 0.0
+        self.loaded_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+        self.file_bytes = 0
+        self.loads = 0
+        self.hits = 0
+        self.errors = 0
+        self.probe_seconds: Optional[float] = None
+        self.probe_error: Optional[str] = None
+
+    def current_mtimes(self) -> Tuple:
+        mtimes = []
+        for path in self.paths():
+            try:
+                mtimes.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                mtimes.append((path, None))
+        return tuple(mtimes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.model is not None,
+            "loads": self.loads,
+            "hits": self.hits,
+            "errors": self.errors,
+            "load_seconds": round(self.load_seconds, 4) if self.load_seconds is not None else None,
+            "memory_bytes": self.memory_bytes,
+            "file_bytes": self.file_bytes,
+            "loaded_at": self.loaded_at,
+            "probe_seconds": round(self.probe_seconds, 4) if self.probe_seconds is not None else None,
+            "probe_error": self.probe_error,
+            "paths": list(self.paths()),
+        }
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily loading registry of named model artifacts.
+
+    Args:
+        check_interval: Minimum seconds between mtime checks per model.
+    """
+
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._entries: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._warmup: Dict[str, Any] = {"state": "idle", "started_at": None, "finished_at": None, "results": {}}
+
+    def register(self, name: str, loader: Callable[[], Any], paths: Any,
+                 probe: Optional[Callable[[Any], Any]] = None):
+        """
+        Register a model.
+
+        Args:
+            name: Registry key.
+            loader: Zero-argument callable returning the loaded model.
+            paths: File path, list of paths, or a callable returning paths;
+                a change in any of their mtimes triggers a reload.
+            probe: Optional callable run with the loaded model by
+                warm(probe=True); should make one synthetic prediction and
+                raise on failure.
+        """
+        if callable(paths):
+            path_fn = paths
+        else:
+            fixed = [paths] if isinstance(paths, str) else list(paths)
+            path_fn = lambda: fixed
+        with self._lock:
+            self._entries[name] = ModelEntry(name, loader, path_fn, probe)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._entries)
+
+    def _entry(self, name: str) -> ModelEntry:
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Unknown model: {name}. Registered: {self.names()}")
+        return entry
+
+    def get(self, name: str) -> Any:
+        """Return the loaded model, loading or hot-reloading it when needed."""
+        entry = self._entry(name)
+        now = time.monotonic()
+
+        if entry.model is not None and now - entry.last_check < self.check_interval:
+            entry.hits += 1
+            return entry.model
+
+        with entry.lock:
+            mtimes = entry.current_mtimes()
+            entry.last_check = now
+            if entry.model is not None and mtimes == entry.mtimes:
+                entry.hits += 1
+                return entry.model
+            if entry.model is not None:
+                logger.info(f"Model files for {name} changed on disk; reloading")
+            self._load(entry, mtimes)
+            return entry.model
+
+    def _load(self, entry: ModelEntry, mtimes: Tuple):
+        with _measure_lock:
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                model = entry.loader()
+            except Exception:
+                entry.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                after = tracemalloc.get_traced_memory()[0]
+                if not was_tracing:
+                    tracemalloc.stop()
+
+        entry.model = model
+        entry.mtimes = mtimes
+        entry.loads += 1
+        entry.loaded_at = time.time()
+        entry.load_seconds = elapsed
+        entry.memory_bytes = max(after - before, 0)
+        entry.file_bytes = sum(os.path.getsize(path) for path, mtime in mtimes if mtime is not None)
+        logger.info(
+            f"Loaded model {entry.name} in {elapsed * 1000:.1f}ms "
+            f"({entry.memory_bytes / 1024:.0f} KiB allocated)"
+        )
+
+    def is_loaded(self, name: str) -> bool:
+        return self._entry(name).model is not None
+
+    def warm(self, names: Optional[Sequence[str]] = None, probe: bool = False) -> Dict[str, Optional[str]]:
+        """
+        Load models ahead of the first request.
+
+        Args:
+            names: Models to warm (default: all registered).
+            probe: Also run each model's synthetic prediction.
+
+        Returns:
+            Dict of model name to None on success or the error message.
+        """
+        with self._lock:
+            self._warmup = {"state": "running", "started_at": time.time(), "finished_at": None, "results": {}}
+
+        results = {}
+        for name in names or self.names():
+            try:
+                model = self.get(name)
+                if probe:
+                    self._probe(self._entry(name), model)
+                results[name] = None
+            except Exception as e:
+                logger.warning(f"Model warm-up failed for {name}: {e}")
+                results[name] = str(e)
+
+        with self._lock:
+            self._warmup.update(state="finished", finished_at=time.time(), results=dict(results))
+        return results
+
+    def _probe(self, entry: ModelEntry, model: Any):
+        if entry.probe is None:
+            return
+        start = time.perf_counter()
+        try:
+            entry.probe(model)
+            entry.probe_error = None
+        except Exception as e:
+            entry.probe_error = str(e)
+            raise
+        finally:
+            entry.probe_seconds = time.perf_counter() - start
+        logger.info(f"Model {entry.name} answered its warm-up prediction in {entry.probe_seconds * 1000:.1f}ms")
+
+    def readiness(self) -> Dict[str, Any]:
+        """
+        Report whether warm-up has finished with every model loaded and probed.
+
+        Returns:
+            Dict with ready flag, warm-up state/timestamps and per-model errors.
+        """
+        with self._lock:
+            warmup = dict(self._warmup)
+            entries = list(self._entries.values())
+        failures = {name: error for name, error in warmup["results"].items() if error}
+        ready = (
+            warmup["state"] == "finished"
+            and not failures
+            and all(entry.model is not None for entry in entries if entry.name in warmup["results"])
+        )
+        return {
+            "ready": ready,
+            "warmup": warmup["state"],
+            "started_at": warmup["started_at"],
+            "finished_at": warmup["finished_at"],
+            "failures": failures,
+        }
+
+    def unload(self, name: Optional[str] = None):
+        """Drop a loaded model (all models when name is None); the next get() reloads it."""
+        with self._lock:
+            entries = [self._entries[name]] if name else list(self._entries.values())
+        for entry in entries:
+            with entry.lock:
+                entry.model = None
+                entry.mtimes = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return load time, memory footprint and hit counts per registered model."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {entry.name: entry.to_dict() for entry in entries}
+
+
+# =============================================================================
+# LOADERS
+# =============================================================================
+
+def _joblib_loader(path: str) -> Callable[[], Any]:
+    def load():
+        import joblib
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+        return joblib.load(path)
+    return load
+
+
+def _load_fannie_mae_hub():
+    # inference_helper lives next to the model artifacts rather than on the
+    # import path, so load it from its file location
+    helper_path = os.path.join(FANNIE_MAE_MODEL_DIR, "inference_helper.py")
+    models_parent = os.path.dirname(FANNIE_MAE_MODEL_DIR)
+    if models_parent not in sys.path:
+        sys.path.insert(0, models_parent)
+
+    spec = importlib.util.spec_from_file_location("inference_helper", helper_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load spec for {helper_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["inference_helper"] = module
+    spec.loader.exec_module(module)
+    return module.FannieMaeModelHub(FANNIE_MAE_MODEL_DIR)
+
+
+def _fannie_mae_paths() -> List[str]:
+    return sorted(
+        glob.glob(os.path.join(FANNIE_MAE_MODEL_DIR, "*", "*_best_model.pkl"))
+        + glob.glob(os.path.join(FANNIE_MAE_MODEL_DIR, "*", "*_metadata.json"))
+    )
+
+
+# =============================================================================
+# WARM-UP PROBES
+# =============================================================================
+
+def _probe_estimator(estimator):
+    """One all-zero row through predict_proba (or predict / transform)."""
+    import numpy as np
+
+    names = getattr(estimator, "feature_names_in_", None)
+    n_features = len(names) if names is not None else getattr(estimator, "n_features_in_", None)
+    if n_features is None:
+        raise ValueError(f"Cannot infer the input width of {type(estimator).__name__}")
+    X = np.zeros((1, int(n_features)))
+    if names is not None:
+        import pandas as pd
+
+        X = pd.DataFrame(X, columns=list(names))
+    for method in ("predict_proba", "predict", "transform"):
+        if hasattr(estimator, method):
+            return getattr(estimator, method)(X)
+    raise TypeError(f"{type(estimator).__name__} has no predict/transform method")
+
+
+def _probe_fannie_mae_hub(hub):
+    """
+    Load every Fannie Mae model that ships a pickle and run one empty-row
+    predict_all (all features missing) through them.
+    """
+    import pandas as pd
+
+    use_cases = [
+        use_case for use_case in hub.available_models
+        if glob.glob(os.path.join(str(hub.base_dir), use_case, "*_best_model.pkl"))
+    ]
+    results = hub.predict_all(pd.DataFrame([{}]), use_cases=use_cases)
+    failures = {use_case: result["error"] for use_case, result in results.items() if "error" in result}
+    if failures:
+        raise RuntimeError(f"Fannie Mae warm-up prediction failed: {failures}")
+    return results
+
+
+# Process-wide registry shared by the views, tools and the Streamlit reference
+model_registry = ModelRegistry()
+model_registry.register("indian_credit_model", _joblib_loader(INDIAN_MODEL_PATH), INDIAN_MODEL_PATH,
+                        probe=_probe_estimator)
+model_registry.register("indian_credit_scaler", _joblib_loader(INDIAN_SCALER_PATH), INDIAN_SCALER_PATH,
+                        probe=_probe_estimator)
+model_registry.register("us_credit_model", _joblib_loader(US_MODEL_PATH), US_MODEL_PATH,
+                        probe=_probe_estimator)
+model_registry.register("fannie_mae_hub", _load_fannie_mae_hub, _fannie_mae_paths,
+                        probe=_probe_fannie_mae_hub)
@@ -28,18 +28,44 @@ Usage:
     # Get predictions with metrics
     results = infer.predict_with_metrics(X_df)
 
+    # Score a Parquet file in chunks (reports rows/sec)
+    batch = infer.predict_batch("fannie_mae_models/test_raw_2025.parquet")
+
     # Load all models
     from inference_helper import FannieMaeModelHub
     hub = FannieMaeModelHub("fannie_mae_models")
     credit_risk = hub.get_model("credit_risk")
     predictions = credit_risk.predict(sample_data)
+
+Categorical encoding:
+    Supervised models were trained on astype('category').cat.codes, whose
+    codes depend on the categories present in the frame being encoded. The
+    pipelines saved no encoders and the 500k-row training extract is not
+    shipped, so training vocabularies can only be recovered for columns with
+    a small, documented code set (CATEGORY_DOMAINS) that the shipped training
+    sample covers completely: training then saw exactly that set, and the
+    sorted codes are the training cat.codes. Those vocabularies are stored
+    in the supervised models' metadata (features.category_vocabularies) and
+    applied through a lookup index built once per model, so a single row
+    gets the same codes as it would inside a large batch. Every other
+    string column (Loan_Identifier, Seller_Name, Zip_Code_Short,
+    MSA_or_MSDA, ...) is encoded against the categories of the input:
+    predict_batch collects them over the whole file first, so its results
+    do not depend on batch_size; predict / predict_with_metrics encode per
+    call and list those columns in "batch_dependent_columns".
+    Regenerate the vocabularies with:
+
+        python inference_helper.py --fit-vocabularies train_raw_2023_2024.parquet
 """
 
 import json
 import pickle
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -47,6 +73,166 @@ import pandas as pd
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
 
+# Rows per chunk when streaming Parquet through predict_batch
+DEFAULT_BATCH_SIZE = 50_000
+
+# Complete code sets from the Single-Family Loan Performance glossary. Only
+# these columns can get a stored vocabulary; columns whose glossary domain
+# includes codes the sample may lack ('U', '7', '9', ...) are left out.
+CATEGORY_DOMAINS: Dict[str, List[str]] = {
+    "Channel": ["B", "C", "R"],
+    "Property_Type": ["CO", "CP", "MH", "PU", "SF"],
+    "Modification_Flag": ["N", "Y"],
+    "Servicing_Activity_Indicator": ["N", "Y"],
+    "Relocation_Mortgage_Indicator": ["N", "Y"],
+    "High_Balance_Loan_Indicator": ["N", "Y"],
+}
+
+# Use cases whose pipelines saved LabelEncoders instead of using cat.codes
+LABEL_ENCODED_USE_CASES = ("customer_segmentation",)
+
+
+def _is_string_dtype(dtype) -> bool:
+    # Object, category, or pandas StringDtype (newer pandas versions)
+    return (
+        dtype == "object"
+        or dtype.name == "category"
+        or str(dtype).startswith("string")
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+
+def _category_strings(series: pd.Series) -> np.ndarray:
+    """
+    Convert a column to the string form used in the vocabularies.
+
+    Numeric input is accepted for code-like columns (e.g. MSA 41620 or
+    Mortgage_Insurance_Type 1.0 for "41620" / "1").
+
+    Returns:
+        Object array of strings
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype) and series.dtype != "bool":
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        integral = np.isfinite(values) & (values == np.floor(values))
+        strings = np.where(
+            integral,
+            np.where(integral, values, 0).astype(np.int64).astype(str),
+            values.astype(str),
+        ).astype(object)
+    else:
+        strings = series.astype(str).to_numpy(dtype=object)
+    return strings
+
+
+def build_category_lookups(vocabularies: Dict[str, List[str]]) -> Dict[str, pd.Index]:
+    """Build the per-column lookup indexes for stored vocabularies (once per model)."""
+    return {col: pd.Index(categories, dtype=object) for col, categories in vocabularies.items()}
+
+
+def encode_with_lookup(series: pd.Series, lookup: pd.Index) -> np.ndarray:
+    """
+    Encode one column against a vocabulary lookup index.
+
+    Same convention as astype('category').cat.codes at training time: the
+    position in the vocabulary, -1 for NaN. Unseen values also map to -1.
+    The column is factorized once and only its distinct values go through
+    the lookup, so the cost matches cat.codes while the codes no longer
+    depend on the other rows in the batch.
+
+    Args:
+        series: Column values
+        lookup: Index built by build_category_lookups
+
+    Returns:
+        int32 array of category codes
+    """
+    positions, uniques = pd.factorize(series)
+    strings = _category_strings(pd.Series(uniques))
+    # Trailing -1 so NaN (factorize position -1) maps to -1
+    codes = np.append(lookup.get_indexer(strings), -1).astype(np.int32)
+    return codes[positions]
+
+
+def build_category_vocabularies(
+    train_df: pd.DataFrame,
+    feature_names: List[str],
+    domains: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Derive the training-time category vocabulary of the verifiable features.
+
+    astype('category') orders categories lexically, so sorted uniques match
+    the training cat.codes only if they are ALL the values training saw. A
+    sample cannot show that in general, so a column is kept only when its
+    sample values equal its documented domain: the full training data lies
+    between the sample and the domain, so it has exactly those values.
+
+    Args:
+        train_df: Training frame (raw, before encoding); a sample is enough
+        feature_names: Model feature names
+        domains: Column -> complete code set (default CATEGORY_DOMAINS)
+
+    Returns:
+        Dictionary mapping column name to its ordered categories
+    """
+    domains = CATEGORY_DOMAINS if domains is None else domains
+    vocabularies = {}
+    for col in feature_names:
+        if col not in domains or col not in train_df.columns:
+            continue
+        if not _is_string_dtype(train_df[col].dtype):
+            continue
+        observed = sorted(train_df[col].dropna().astype(str).unique().tolist())
+        if observed == sorted(domains[col]):
+            vocabularies[col] = observed
+        else:
+            missing = sorted(set(domains[col]) - set(observed))
+            log.warning(
+                f"[FannieMaeInference] {col}: training data lacks {missing}, "
+                f"no vocabulary stored"
+            )
+    return vocabularies
+
+
+def write_category_vocabularies(base_dir: str, train_path: str) -> Dict[str, int]:
+    """
+    Store category vocabularies in the supervised models' metadata JSON.
+
+    Clustering models encode through their saved LabelEncoders, so their
+    metadata gets none (and a stale entry is removed).
+
+    Args:
+        base_dir: Base directory containing model subdirectories
+        train_path: Raw training data (Parquet or CSV)
+
+    Returns:
+        Dictionary mapping use case names to the number of vocabularies written
+    """
+    train_path = str(train_path)
+    if train_path.endswith(".parquet"):
+        train_df = pd.read_parquet(train_path)
+    else:
+        train_df = pd.read_csv(train_path, low_memory=False)
+
+    written = {}
+    for meta_path in sorted(Path(base_dir).glob("*/*_metadata.json")):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["use_case"] in LABEL_ENCODED_USE_CASES:
+            vocabularies = {}
+            meta["features"].pop("category_vocabularies", None)
+        else:
+            vocabularies = build_category_vocabularies(
+                train_df, meta["features"]["feature_names"]
+            )
+            meta["features"]["category_vocabularies"] = vocabularies
+        with open(meta_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        written[meta["use_case"]] = len(vocabularies)
+        log.info(f"[FannieMaeInference] wrote {len(vocabularies)} vocabularies to {meta_path}")
+    return written
+
 
 class FannieMaeInference:
     """
@@ -94,6 +280,27 @@ class FannieMaeInference:
         self.target_column = self.meta["model"]["target_column"]
         self.label_map = self.meta["model"].get("label_map")
 
+        # Lookup indexes built once per model: training vocabularies for the
+        # supervised models, the saved LabelEncoder classes for clustering
+        self.category_lookups = build_category_lookups(
+            self.meta["features"].get("category_vocabularies", {})
+        )
+        self.label_encoder_lookups: Dict[str, pd.Index] = {
+            col: pd.Index([str(c) for c in le.classes_], dtype=object)
+            for col, le in (self.arts.get("label_encoders") or {}).items()
+        }
+        self._warned_batch_encoding = False
+
+        # Models with equal keys produce identical _align/_preprocess_supervised
+        # output, so FannieMaeModelHub encodes a request once for all of them
+        self.encoding_key = (
+            tuple(self.feature_names),
+            tuple(
+                (col, tuple(lookup))
+                for col, lookup in sorted(self.category_lookups.items())
+            ),
+        )
+
         log.info(
             f"[FannieMaeInference] {self.use_case} | task={self.task_type} | "
             f"{len(self.feature_names)} features"
@@ -120,7 +327,26 @@ class FannieMaeInference:
             "description": self.meta.get("description", ""),
         }
 
-    def _preprocess_supervised(self, X: pd.DataFrame) -> pd.DataFrame:
+    def batch_dependent_columns(
+        self, X: pd.DataFrame, lookups: Optional[Dict[str, pd.Index]] = None
+    ) -> List[str]:
+        """
+        String features of aligned X that get per-call cat.codes: no stored
+        vocabulary and none in ``lookups``. Their codes depend on the other
+        rows encoded with them.
+        """
+        lookups = lookups or {}
+        return [
+            col
+            for col in X.columns
+            if col not in self.category_lookups
+            and col not in lookups
+            and _is_string_dtype(X[col].dtype)
+        ]
+
+    def _preprocess_supervised(
+        self, X: pd.DataFrame, lookups: Optional[Dict[str, pd.Index]] = None
+    ) -> pd.DataFrame:
         """
         Preprocess data for supervised models: encode categoricals, fill NaN.
 
@@ -128,42 +354,51 @@ class FannieMaeInference:
         already been encoded to integer codes (astype('category').cat.codes).
         We must replicate that same encoding at inference time so that all
         feature columns are numeric (int/float/bool) before the model sees them.
+        Columns with a stored vocabulary, or one in ``lookups``, are encoded
+        through encode_with_lookup; any other string column falls back to
+        per-batch cat.codes.
 
         Args:
             X: Aligned DataFrame with features
+            lookups: Extra lookup indexes, e.g. the file-wide vocabularies of
+                predict_batch
 
         Returns:
             DataFrame with all columns converted to numeric dtypes
         """
-        X_encoded = X.copy()
-
-        for col in X_encoded.columns:
-            dtype = X_encoded[col].dtype
-            # Check for object, category, or pandas StringDtype (newer pandas versions)
-            is_string_dtype = (
-                dtype == "object"
-                or dtype.name == "category"
-                or str(dtype).startswith("string")
-                or pd.api.types.is_string_dtype(dtype)
-            )
-
-            if is_string_dtype:
+        lookups = {**(lookups or {}), **self.category_lookups}
+        encoded = {}
+        batch_encoded = []
+
+        for col in X.columns:
+            series = X[col]
+            dtype = series.dtype
+
+            if col in lookups:
+                encoded[col] = encode_with_lookup(series, lookups[col])
+            elif _is_string_dtype(dtype):
+                batch_encoded.append(col)
                 # Match GPUTrainer._encode_categoricals():
                 # df[col] = df[col].astype('category').cat.codes.astype(np.int32)
                 # cat.codes maps NaN → -1, which is the convention the model learned
-                X_encoded[col] = (
-                    X_encoded[col].astype("category").cat.codes.astype(np.int32)
-                )
+                encoded[col] = series.astype("category").cat.codes.astype(np.int32)
             elif dtype == "bool":
-                X_encoded[col] = X_encoded[col].astype(np.int32)
+                encoded[col] = series.astype(np.int32)
+            elif series.isna().any():
+                # Fill remaining NaN in numeric columns with 0 (CatBoost / LightGBM
+                # handle NaN natively, but some pipelines like XGBoost may not)
+                encoded[col] = series.fillna(0)
+            else:
+                encoded[col] = series
 
-        # Fill remaining NaN in numeric columns with 0 (CatBoost / LightGBM handle
-        # NaN natively, but some pipelines like XGBoost may not)
-        for col in X_encoded.columns:
-            if X_encoded[col].isna().any():
-                X_encoded[col] = X_encoded[col].fillna(0)
+        if batch_encoded and not self._warned_batch_encoding:
+            log.warning(
+                f"[FannieMaeInference] {self.use_case}: no stored vocabulary for "
+                f"{', '.join(batch_encoded)}; category codes depend on the batch"
+            )
+            self._warned_batch_encoding = True
 
-        return X_encoded
+        return pd.DataFrame(encoded, index=X.index, columns=X.columns)
 
     def _preprocess_clustering(self, X: pd.DataFrame) -> np.ndarray:
         """
@@ -181,18 +416,15 @@ class FannieMaeInference:
         from sklearn.preprocessing import LabelEncoder
 
         X_encoded = X.copy()
-        label_encoders = self.arts.get("label_encoders", {})
 
         for col in X_encoded.columns:
-            if col in label_encoders:
-                # Use the same LabelEncoder from training
-                le = label_encoders[col]
-                # Handle unseen categories by converting to string and using known classes
-                X_encoded[col] = X_encoded[col].fillna("MISSING").astype(str)
-                # Transform, mapping unseen labels to a default (0)
-                X_encoded[col] = X_encoded[col].apply(
-                    lambda x: le.transform([x])[0] if x in le.classes_ else 0
-                )
+            if col in self.label_encoder_lookups:
+                # Same codes as the training LabelEncoder (index into its sorted
+                # classes_), looked up for the whole column at once; unseen
+                # labels map to a default (0)
+                values = X_encoded[col].fillna("MISSING").astype(str).to_numpy(dtype=object)
+                codes = self.label_encoder_lookups[col].get_indexer(values)
+                X_encoded[col] = np.where(codes < 0, 0, codes)
             elif (
                 X_encoded[col].dtype == "object"
                 or X_encoded[col].dtype.name == "category"
@@ -226,6 +458,10 @@ class FannieMaeInference:
         """
         Make predictions.
 
+        String features without a stored vocabulary are encoded with the
+        categories of X alone (see batch_dependent_columns); use
+        predict_batch for results that do not depend on how rows are grouped.
+
         Args:
             X: DataFrame with features (columns should match feature_names)
 
@@ -248,6 +484,155 @@ class FannieMaeInference:
         X = self._preprocess_supervised(X)
         return self.arts["automl"].predict(X)
 
+    def _iter_chunks(
+        self,
+        source: Union[str, Path, pd.DataFrame],
+        batch_size: int,
+        columns: Optional[List[str]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield DataFrame chunks from a Parquet path or an in-memory DataFrame."""
+        if isinstance(source, pd.DataFrame):
+            if columns is not None:
+                source = source[columns]
+            for start in range(0, len(source), batch_size):
+                yield source.iloc[start : start + batch_size]
+            return
+
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(str(source))
+        # Read only the model's features; the raw files carry ~110 columns
+        available = set(parquet.schema_arrow.names)
+        columns = [col for col in (columns or self.feature_names) if col in available]
+        for record_batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            yield record_batch.to_pandas()
+
+    def _string_columns(self, source: Union[str, Path, pd.DataFrame]) -> List[str]:
+        """String features of ``source`` without a stored vocabulary."""
+        if isinstance(source, pd.DataFrame):
+            dtypes = {col: source[col].dtype for col in source.columns}
+            is_string = _is_string_dtype
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = pq.ParquetFile(str(source)).schema_arrow
+            dtypes = {name: schema.field(name).type for name in schema.names}
+
+            def is_string(arrow_type) -> bool:
+                if pa.types.is_dictionary(arrow_type):
+                    arrow_type = arrow_type.value_type
+                return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+        return [
+            col
+            for col in self.feature_names
+            if col in dtypes and col not in self.category_lookups and is_string(dtypes[col])
+        ]
+
+    def source_vocabularies(
+        self, source: Union[str, Path, pd.DataFrame], batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Dict[str, pd.Index]:
+        """
+        Lookup indexes over a whole input for the string features that have
+        no stored vocabulary.
+
+        One pass reads only those columns and collects their distinct values.
+        Sorted, they are the categories astype('category') gives the whole
+        input, so every chunk encoded against them gets the codes of a
+        single-frame encoding, whatever the chunk size.
+
+        Args:
+            source: Path to a Parquet file or a DataFrame
+            batch_size: Rows per chunk read
+
+        Returns:
+            Dictionary mapping column name to lookup index
+        """
+        columns = self._string_columns(source)
+        if not columns:
+            return {}
+        distinct: Dict[str, set] = {col: set() for col in columns}
+        for chunk in self._iter_chunks(source, batch_size, columns=columns):
+            for col in columns:
+                distinct[col].update(_category_strings(chunk[col].dropna()).tolist())
+        return build_category_lookups(
+            {col: sorted(values) for col, values in distinct.items()}
+        )
+
+    def predict_batch(
+        self,
+        source: Union[str, Path, pd.DataFrame],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        with_probabilities: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Score a large input in chunks and report throughput.
+
+        Parquet files are streamed with pyarrow, reading only the feature
+        columns, so memory stays bounded by ``batch_size``. String features
+        without a stored vocabulary are encoded against the categories of
+        the whole input (source_vocabularies, one extra pass over those
+        columns), so results do not depend on the chunking.
+
+        Args:
+            source: Path to a Parquet file (e.g. test_raw_2025.parquet) or a DataFrame
+            batch_size: Rows per chunk
+            with_probabilities: Also return class probabilities (classification only)
+
+        Returns:
+            Dictionary with:
+                predictions: Array of predictions (cluster labels for clustering)
+                probabilities: Array of probabilities (if requested)
+                n_rows, n_chunks: Rows and chunks processed
+                seconds, rows_per_sec: Wall time and throughput (vocabulary pass included)
+                source_vocabulary_columns: Columns encoded with file-wide vocabularies
+        """
+        want_proba = with_probabilities and "classification" in self.task_type
+        predictions, probabilities = [], []
+        n_rows = n_chunks = 0
+        start = time.perf_counter()
+
+        lookups: Dict[str, pd.Index] = {}
+        if "clustering" not in self.task_type:
+            lookups = self.source_vocabularies(source, batch_size)
+
+        for chunk in self._iter_chunks(source, batch_size):
+            if "clustering" in self.task_type:
+                predictions.append(self.predict(chunk))
+            else:
+                if self.arts.get("automl") is None:
+                    raise ValueError("No model loaded")
+                X_prep = self._preprocess_supervised(self._align(chunk), lookups)
+                predictions.append(np.asarray(self.arts["automl"].predict(X_prep)))
+                if want_proba:
+                    probabilities.append(np.asarray(self.arts["automl"].predict_proba(X_prep)))
+            n_rows += len(chunk)
+            n_chunks += 1
+
+        seconds = time.perf_counter() - start
+        rows_per_sec = n_rows / seconds if seconds > 0 else 0.0
+        log.info(
+            f"[FannieMaeInference] {self.use_case} batch: {n_rows:,} rows in "
+            f"{n_chunks} chunks, {seconds:.2f}s ({rows_per_sec:,.0f} rows/s)"
+        )
+
+        result = {
+            "use_case": self.use_case,
+            "task_type": self.task_type,
+            "predictions": np.concatenate(predictions) if predictions else np.array([]),
+            "n_rows": n_rows,
+            "n_chunks": n_chunks,
+            "seconds": seconds,
+            "rows_per_sec": rows_per_sec,
+            "source_vocabulary_columns": list(lookups),
+        }
+        if want_proba:
+            result["probabilities"] = (
+                np.concatenate(probabilities) if probabilities else np.array([])
+            )
+        return result
+
     def predict_with_metrics(
         self, X: pd.DataFrame, actual: Optional[pd.Series] = None
     ) -> Dict[str, Any]:
@@ -257,6 +642,12 @@ class FannieMaeInference:
         This method returns predictions along with additional metrics based on
         the task type, as defined in the metrics configuration.
 
+        Supervised results also carry "batch_dependent_columns": string
+        features encoded with the categories of this call's rows only (see
+        batch_dependent_columns), whose codes, and so predictions, can change
+        with the rows X is sent with. Score files with predict_batch for
+        reproducible results.
+
         Args:
             X: DataFrame with features
             actual: Optional actual values for computing residuals/errors
@@ -292,7 +683,29 @@ class FannieMaeInference:
                     "cluster_confidence": [0.85, 0.72, 0.91, ...],
                 }
         """
-        X_aligned = self._align(X)
+        return self.predict_with_metrics_aligned(self._align(X), actual=actual)
+
+    def predict_with_metrics_aligned(
+        self,
+        X_aligned: pd.DataFrame,
+        actual: Optional[pd.Series] = None,
+        X_prep: Optional[pd.DataFrame] = None,
+    ) -> Dict[str, Any]:
+        """
+        predict_with_metrics for input that has already been through _align.
+
+        Lets FannieMaeModelHub align and encode a request once and share the
+        result between models with the same feature schema.
+
+        Args:
+            X_aligned: Output of _align
+            actual: Optional actual values for computing residuals/errors
+            X_prep: Optional output of _preprocess_supervised for X_aligned
+                (supervised models only; computed here when omitted)
+
+        Returns:
+            Same dictionary as predict_with_metrics
+        """
         result = {"task_type": self.task_type}
 
         if "clustering" in self.task_type:
@@ -318,7 +731,9 @@ class FannieMaeInference:
             if self.arts.get("automl") is None:
                 raise ValueError("No model loaded")
 
-            X_prep = self._preprocess_supervised(X_aligned)
+            if X_prep is None:
+                X_prep = self._preprocess_supervised(X_aligned)
+            result["batch_dependent_columns"] = self.batch_dependent_columns(X_aligned)
             predictions = self.arts["automl"].predict(X_prep)
             probabilities = self.arts["automl"].predict_proba(X_prep)
 
@@ -357,7 +772,9 @@ class FannieMaeInference:
             if self.arts.get("automl") is None:
                 raise ValueError("No model loaded")
 
-            X_prep = self._preprocess_supervised(X_aligned)
+            if X_prep is None:
+                X_prep = self._preprocess_supervised(X_aligned)
+            result["batch_dependent_columns"] = self.batch_dependent_columns(X_aligned)
             predictions = self.arts["automl"].predict(X_prep)
             result["predictions"] = predictions.tolist()
 
@@ -452,6 +869,11 @@ class FannieMaeInference:
                     "items": "float",
                     "description": "Confidence score (max probability)",
                 },
+                "batch_dependent_columns": {
+                    "type": "array",
+                    "items": "string",
+                    "description": "Features encoded with this call's categories (not reproducible across calls)",
+                },
             },
             "multiclass_classification": {
                 "predictions": {
@@ -474,6 +896,11 @@ class FannieMaeInference:
                     "items": "array",
                     "description": "Top K classes with probabilities",
                 },
+                "batch_dependent_columns": {
+                    "type": "array",
+                    "items": "string",
+                    "description": "Features encoded with this call's categories (not reproducible across calls)",
+                },
             },
             "regression": {
                 "predictions": {
@@ -491,6 +918,11 @@ class FannieMaeInference:
                     "items": "array",
                     "description": "Prediction intervals (if available)",
                 },
+                "batch_dependent_columns": {
+                    "type": "array",
+                    "items": "string",
+                    "description": "Features encoded with this call's categories (not reproducible across calls)",
+                },
             },
             "clustering": {
                 "cluster_labels": {
@@ -578,6 +1010,8 @@ class FannieMaeModelHub:
         """
         self.base_dir = Path(base_dir)
         self._models: Dict[str, FannieMaeInference] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         # Discover available models
         self.available_models = self._discover_models()
@@ -606,11 +1040,93 @@ class FannieMaeModelHub:
             )
 
         if use_case not in self._models:
-            model_dir = self.base_dir / use_case
-            self._models[use_case] = FannieMaeInference(str(model_dir))
+            with self._lock:
+                if use_case not in self._models:
+                    model_dir = self.base_dir / use_case
+                    self._models[use_case] = FannieMaeInference(str(model_dir))
 
         return self._models[use_case]
 
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool shared by predict_all calls (one worker per model)."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(len(self.available_models), 1),
+                        thread_name_prefix="fannie-mae-hub",
+                    )
+        return self._executor
+
+    def _predict_shared(
+        self, X: pd.DataFrame, use_cases: List[str], parallel: bool
+    ) -> Tuple[Dict[str, Any], Dict[str, FannieMaeInference]]:
+        """
+        Align and encode X once per feature schema, then run every model on it.
+
+        Returns:
+            Tuple of (results by use case, loaded models by use case)
+        """
+        results: Dict[str, Any] = {}
+        models: Dict[str, FannieMaeInference] = {}
+        for use_case in use_cases:
+            try:
+                models[use_case] = self.get_model(use_case)
+            except Exception as e:
+                results[use_case] = {"error": str(e)}
+
+        # Shared feature matrices, keyed by FannieMaeInference.encoding_key
+        start = time.perf_counter()
+        shared: Dict[Any, Dict[str, Any]] = {}
+        for model in models.values():
+            entry = shared.get(model.encoding_key)
+            if entry is None:
+                entry = shared[model.encoding_key] = {"prep": None, "error": None}
+                try:
+                    entry["aligned"] = model._align(X)
+                except Exception as e:
+                    entry["error"] = e
+                    continue
+            if "clustering" in model.task_type or entry["prep"] is not None or entry["error"]:
+                continue
+            try:
+                entry["prep"] = model._preprocess_supervised(entry["aligned"])
+            except Exception as e:
+                entry["error"] = e
+        prepare_ms = (time.perf_counter() - start) * 1000
+
+        def run(use_case: str) -> Dict[str, Any]:
+            model = models[use_case]
+            entry = shared[model.encoding_key]
+            t0 = time.perf_counter()
+            try:
+                if entry["error"] is not None:
+                    raise entry["error"]
+                # Shallow copy: models must not rename or add columns on the
+                # frame the other threads are reading
+                X_prep = entry["prep"].copy(deep=False) if entry["prep"] is not None else None
+                result = {
+                    **model.predict_with_metrics_aligned(entry["aligned"], X_prep=X_prep),
+                    "task_type": model.task_type,
+                }
+            except Exception as e:
+                result = {"error": str(e)}
+            result["timing"] = {
+                "prepare_ms": round(prepare_ms, 3),
+                "predict_ms": round((time.perf_counter() - t0) * 1000, 3),
+            }
+            return result
+
+        names = list(models)
+        if parallel and len(names) > 1:
+            outputs = list(self._get_executor().map(run, names))
+        else:
+            outputs = [run(name) for name in names]
+        results.update(zip(names, outputs))
+
+        ordered = {use_case: results[use_case] for use_case in use_cases}
+        return ordered, models
+
     def get_all_info(self) -> Dict[str, Dict[str, Any]]:
         """
         Get information about all available models.
@@ -621,38 +1137,40 @@ class FannieMaeModelHub:
         return {name: self.get_model(name).info for name in self.available_models}
 
     def predict_all(
-        self, X: pd.DataFrame, use_cases: Optional[List[str]] = None
+        self,
+        X: pd.DataFrame,
+        use_cases: Optional[List[str]] = None,
+        parallel: bool = True,
     ) -> Dict[str, Any]:
         """
         Make predictions with all models.
 
+        X is aligned and encoded once and the feature matrix is shared by all
+        models with the same schema. With ``parallel`` the models then run
+        concurrently on the hub's thread pool (the tree libraries release the
+        GIL while predicting), so latency is that of the slowest model rather
+        than the sum.
+
         Args:
             X: DataFrame with features
             use_cases: List of use cases to run (None = all)
+            parallel: Run the models concurrently
 
         Returns:
-            Dictionary mapping use case names to predictions
+            Dictionary mapping use case names to predictions; each entry has a
+            "timing" dict with the shared prepare_ms and its own predict_ms
         """
         if use_cases is None:
             use_cases = self.available_models
 
-        results = {}
-        for use_case in use_cases:
-            try:
-                model = self.get_model(use_case)
-                # Use predict_with_metrics for richer output
-                metrics_result = model.predict_with_metrics(X)
-                results[use_case] = {
-                    **metrics_result,
-                    "task_type": model.task_type,
-                }
-            except Exception as e:
-                results[use_case] = {"error": str(e)}
-
+        results, _ = self._predict_shared(X, use_cases, parallel)
         return results
 
     def predict_all_with_schema(
-        self, X: pd.DataFrame, use_cases: Optional[List[str]] = None
+        self,
+        X: pd.DataFrame,
+        use_cases: Optional[List[str]] = None,
+        parallel: bool = True,
     ) -> Dict[str, Any]:
         """
         Make predictions with all models and include output schemas.
@@ -660,6 +1178,7 @@ class FannieMaeModelHub:
         Args:
             X: DataFrame with features
             use_cases: List of use cases to run (None = all)
+            parallel: Run the models concurrently (see predict_all)
 
         Returns:
             Dictionary with predictions and schemas for each model
@@ -667,16 +1186,14 @@ class FannieMaeModelHub:
         if use_cases is None:
             use_cases = self.available_models
 
-        results = {"predictions": {}, "schemas": {}}
+        predictions, models = self._predict_shared(X, use_cases, parallel)
+        results = {"predictions": predictions, "schemas": {}}
 
         for use_case in use_cases:
-            try:
-                model = self.get_model(use_case)
-                results["predictions"][use_case] = model.predict_with_metrics(X)
-                results["schemas"][use_case] = model.get_inference_output_schema()
-            except Exception as e:
-                results["predictions"][use_case] = {"error": str(e)}
-                results["schemas"][use_case] = {"error": str(e)}
+            if use_case in models:
+                results["schemas"][use_case] = models[use_case].get_inference_output_schema()
+            else:
+                results["schemas"][use_case] = predictions[use_case]
 
         return results
 
@@ -709,8 +1226,23 @@ def load_all_models(base_dir: str = "fannie_mae_models") -> FannieMaeModelHub:
 
 # Example usage for LLM integration
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fannie Mae model hub")
+    parser.add_argument("--base-dir", default="fannie_mae_models")
+    parser.add_argument(
+        "--fit-vocabularies",
+        metavar="TRAIN_PATH",
+        help="store verifiable category vocabularies in the supervised models' metadata",
+    )
+    args = parser.parse_args()
+
+    if args.fit_vocabularies:
+        print(write_category_vocabularies(args.base_dir, args.fit_vocabularies))
+        raise SystemExit(0)
+
     # Load all models
-    hub = FannieMaeModelHub("fannie_mae_models")
+    hub = FannieMaeModelHub(args.base_dir)
 
     print("Available models:")
     for name, info in hub.get_all_info().items():
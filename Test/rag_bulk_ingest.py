@@ -0,0 +1,405 @@
+# rag_bulk_ingest.py
+"""
+Bulk ingestion of policy documents into the RAG store.
+
+ingest_document() handles one file end to end: extract, chunk, then add to
+Chroma in batches of 100 with the embedding done inside each add. Onboarding
+a corpus of thousands of documents that way is serial in the slowest step
+(pdfplumber / OCR extraction). bulk_ingest() takes a directory or an archive
+(.zip, .tar, .tar.gz, .tgz) and pipelines it:
+
+    - text extraction runs on a process pool, a bounded number of files in
+      flight, results consumed as they complete
+    - each extracted file is chunked and its chunks join a write buffer
+      shared across files, so chunks are embedded (through the embedding
+      cache) and written in full batches of ``batch_size`` instead of one
+      short batch per small file
+    - a document is recorded in the catalog only after all of its chunks are
+      written (to Chroma and the keyword index); chunk ids are deterministic
+      and written with upsert, so an interrupted run is resumed by simply
+      running it again (catalogued files are skipped, half-written ones are
+      rewritten in place)
+
+Every file gets a report entry (status, chunks, extraction time).
+
+CLI:
+    python rag_bulk_ingest.py /path/to/corpus --category regulatory --workers 8
+    python rag_bulk_ingest.py corpus.zip --batch-size 512 --report report.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import rag_engine
+
+logger = logging.getLogger(__name__)
+
+# Chunks per Chroma upsert (and per embed_texts call)
+DEFAULT_BATCH_SIZE = 256
+# Extraction worker processes
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 8)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+
+# =============================================================================
+# SOURCES
+# =============================================================================
+
+def is_archive(path: Path) -> bool:
+    name = path.name.lower()
+    return path.is_file() and name.endswith(ARCHIVE_SUFFIXES)
+
+
+def expand_archive(archive: Path, dest_root: Path = None) -> Path:
+    """
+    Extract an archive under the upload directory and return the folder.
+
+    Members with absolute paths or ``..`` components are skipped. Re-running
+    on the same archive reuses the folder (existing files are overwritten).
+    """
+    dest_root = Path(dest_root or rag_engine.UPLOAD_DIR)
+    stem = archive.name
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if stem.lower().endswith(suffix):
+            stem = stem[: -len(suffix)]
+            break
+    dest = dest_root / stem
+    dest.mkdir(parents=True, exist_ok=True)
+
+    if archive.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as zf:
+            for member in zf.infolist():
+                parts = Path(member.filename).parts
+                if member.is_dir() or Path(member.filename).is_absolute() or ".." in parts:
+                    continue
+                zf.extract(member, dest)
+    else:
+        with tarfile.open(archive) as tf:
+            tf.extractall(dest, filter="data")
+    return dest
+
+
+def discover_documents(root: Path) -> List[Path]:
+    """Supported documents under ``root`` (recursive, hidden files skipped), sorted."""
+    if root.is_file():
+        return [root] if root.suffix.lower() in rag_engine.SUPPORTED_EXTENSIONS else []
+    return sorted(
+        path
+        for path in root.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in rag_engine.SUPPORTED_EXTENSIONS
+        and not any(part.startswith(".") for part in path.relative_to(root).parts)
+    )
+
+
+# =============================================================================
+# EXTRACTION (runs in worker processes)
+# =============================================================================
+
+def _extract(path: str) -> Tuple[str, Optional[str], Optional[str], float]:
+    """Load one document; returns (path, text, error, seconds)."""
+    start = time.perf_counter()
+    try:
+        text = rag_engine.load_document(Path(path))
+        return path, text, None, time.perf_counter() - start
+    except Exception as e:
+        return path, None, str(e), time.perf_counter() - start
+
+
+def _extract_stream(paths: List[str], workers: int) -> Iterator[Tuple[str, Optional[str], Optional[str], float]]:
+    """Yield extraction results as they complete, keeping ~2 files per worker in flight."""
+    if workers <= 1:
+        for path in paths:
+            yield _extract(path)
+        return
+
+    # spawn: the parent may already hold Chroma / SQLite handles and threads,
+    # which must not be inherited by fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = set()
+        queue = iter(paths)
+        for path in queue:
+            pending.add(executor.submit(_extract, path))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_path = next(queue, None)
+                if next_path is not None:
+                    pending.add(executor.submit(_extract, next_path))
+
+
+# =============================================================================
+# CHROMA WRITER
+# =============================================================================
+
+class _BatchWriter:
+    """
+    Buffers chunks across files and upserts them ``batch_size`` at a time.
+
+    A file is committed to the catalog (and reported as done) once its last
+    chunk has been written.
+    """
+
+    def __init__(
+        self, collection, catalog, batch_size: int, on_done: Callable[[Dict], None], keyword_index=None
+    ):
+        self.collection = collection
+        self.catalog = catalog
+        self.keyword_index = keyword_index
+        self.mirror = rag_engine._partitions_live()
+        self.batch_size = max(1, batch_size)
+        self.on_done = on_done
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._remaining: Dict[str, int] = {}
+        self._entries: Dict[str, Dict] = {}
+        self.batches_written = 0
+
+    def add(self, entry: Dict, chunks: List[str], tag_metadata: Dict):
+        file_hash = entry["file_hash"]
+        ingested_at = datetime.now().isoformat()
+        entry["ingested_at"] = ingested_at
+        self._remaining[file_hash] = len(chunks)
+        self._entries[file_hash] = entry
+        for i, chunk in enumerate(chunks):
+            self._ids.append(f"{file_hash}_{i}")
+            self._documents.append(chunk)
+            self._metadatas.append(
+                {
+                    "file_name": entry["file_name"],
+                    "file_hash": file_hash,
+                    "category": entry["category"],
+                    **tag_metadata,
+                    "chunk_index": i,
+                    "total_chunks": len(chunks),
+                    "chunk_hash": rag_engine._chunk_hash(chunk),
+                    "ingested_at": ingested_at,
+                }
+            )
+        while len(self._ids) >= self.batch_size:
+            self._write(self.batch_size)
+
+    def flush(self):
+        while self._ids:
+            self._write(self.batch_size)
+
+    def _write(self, n: int):
+        ids, self._ids = self._ids[:n], self._ids[n:]
+        documents, self._documents = self._documents[:n], self._documents[n:]
+        metadatas, self._metadatas = self._metadatas[:n], self._metadatas[n:]
+        embeddings = rag_engine.embed_texts(documents)
+        self.collection.upsert(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+        if self.keyword_index is not None:
+            self.keyword_index.add(ids, documents, metadatas)
+        if self.mirror:
+            rag_engine._mirror_add(ids, documents, embeddings, metadatas)
+        rag_engine._bump_corpus_version()
+        self.batches_written += 1
+
+        for metadata in metadatas:
+            file_hash = metadata["file_hash"]
+            self._remaining[file_hash] -= 1
+            if self._remaining[file_hash] == 0:
+                del self._remaining[file_hash]
+                entry = self._entries.pop(file_hash)
+                self.catalog.upsert(
+                    {
+                        "file_hash": file_hash,
+                        "file_name": entry["file_name"],
+                        "category": entry["category"],
+                        "tags": metadata["tags"],
+                        "total_chunks": entry["total_chunks"],
+                        "ingested_at": entry["ingested_at"],
+                    }
+                )
+                entry["status"] = "success"
+                self.on_done(entry)
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def bulk_ingest(
+    source,
+    category: str = "general",
+    tags: List[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    report_path: str = None,
+    progress: Callable[[int, int, Dict], None] = None,
+) -> Dict:
+    """
+    Ingest every supported document in a directory or archive.
+
+    Args:
+        source: Directory, archive (.zip/.tar/.tar.gz/.tgz) or single file.
+        category, tags: Applied to every document, as in ingest_document().
+        workers: Extraction processes; 0 or 1 extracts in this process.
+        batch_size: Chunks per Chroma upsert / embedding batch.
+        report_path: Optional JSON file for the per-file report.
+        progress: Called as progress(done, total, entry) when a file finishes.
+
+    Returns:
+        {"files": [per-file entries in discovery order], "summary": {...}}
+
+    With RAG_SERVICE_URL set the run happens in the retrieval service (the
+    source must be readable there) and ``progress`` is replayed per file once
+    it returns.
+    """
+    remote = rag_engine._remote()
+    if remote:
+        report = remote.call(
+            "bulk_ingest",
+            source=str(Path(source).resolve()),
+            category=category,
+            tags=tags,
+            workers=workers,
+            batch_size=batch_size,
+            report_path=str(Path(report_path).resolve()) if report_path else None,
+        )
+        if progress:
+            for done, entry in enumerate(report["files"], 1):
+                progress(done, len(report["files"]), entry)
+        return report
+
+    started = time.perf_counter()
+    source = Path(source)
+    root = expand_archive(source) if is_archive(source) else source
+    if not root.exists():
+        raise FileNotFoundError(f"Bulk ingest source not found: {source}")
+
+    paths = discover_documents(root)
+    collection = rag_engine._get_collection()
+    catalog = rag_engine._get_catalog()
+    tag_metadata = rag_engine._tag_metadata(tags)
+
+    entries: Dict[str, Dict] = {}
+    done_count = 0
+
+    def finish(entry: Dict):
+        nonlocal done_count
+        done_count += 1
+        if progress:
+            progress(done_count, len(paths), entry)
+
+    # Hash up front: catalogued files and in-run duplicates never reach a worker
+    to_extract: List[str] = []
+    seen: Dict[str, str] = {}
+    for path in paths:
+        file_hash = rag_engine._file_hash(path)
+        entry = {
+            "file_name": path.name,
+            "path": str(path),
+            "file_hash": file_hash,
+            "total_chunks": 0,
+            "category": category,
+            "status": "pending",
+            "extract_seconds": 0.0,
+        }
+        entries[str(path)] = entry
+        existing = catalog.get(file_hash)
+        if existing:
+            entry["total_chunks"] = existing["total_chunks"]
+            entry["status"] = "skipped (already exists)"
+            finish(entry)
+        elif file_hash in seen:
+            entry["status"] = f"skipped (duplicate of {seen[file_hash]})"
+            finish(entry)
+        else:
+            seen[file_hash] = path.name
+            to_extract.append(str(path))
+
+    writer = _BatchWriter(
+        collection, catalog, batch_size, on_done=finish, keyword_index=rag_engine._get_keyword_index()
+    )
+    for path, text, error, seconds in _extract_stream(to_extract, workers):
+        entry = entries[path]
+        entry["extract_seconds"] = round(seconds, 3)
+        if error is not None:
+            entry["status"] = f"error: {error}"
+            finish(entry)
+            continue
+        if not text or len(text.strip()) < 20:
+            entry["status"] = "error: document has too little text content"
+            finish(entry)
+            continue
+        chunks = list(rag_engine.iter_chunks(text))
+        if not chunks:
+            entry["status"] = "error: no chunks created"
+            finish(entry)
+            continue
+        entry["total_chunks"] = len(chunks)
+        writer.add(entry, chunks, tag_metadata)
+    writer.flush()
+
+    files = [entries[str(path)] for path in paths]
+    elapsed = time.perf_counter() - started
+    summary = {
+        "source": str(source),
+        "files": len(files),
+        "ingested": sum(1 for e in files if e["status"] == "success"),
+        "skipped": sum(1 for e in files if e["status"].startswith("skipped")),
+        "errors": sum(1 for e in files if e["status"].startswith("error")),
+        "chunks_written": sum(e["total_chunks"] for e in files if e["status"] == "success"),
+        "batches_written": writer.batches_written,
+        "seconds": round(elapsed, 2),
+        "files_per_sec": round(len(to_extract) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    logger.info(
+        f"Bulk ingest of {source}: {summary['ingested']} ingested, {summary['skipped']} skipped, "
+        f"{summary['errors']} errors, {summary['chunks_written']} chunks in {summary['seconds']}s"
+    )
+
+    report = {"files": files, "summary": summary}
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest policy documents into the RAG store")
+    parser.add_argument("source", help="directory, archive (.zip/.tar/.tar.gz/.tgz) or file")
+    parser.add_argument("--category", default="general", help="category for every document")
+    parser.add_argument("--tags", default="", help="comma-separated tags for every document")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="extraction processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="chunks per Chroma write")
+    parser.add_argument("--report", default=None, help="write the per-file report to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    def print_progress(done, total, entry):
+        print(f"[{done}/{total}] {entry['status']:<28} {entry['file_name']} ({entry['total_chunks']} chunks)")
+
+    result = bulk_ingest(
+        args.source,
+        category=args.category,
+        tags=[t.strip() for t in args.tags.split(",") if t.strip()],
+        workers=args.workers,
+        batch_size=args.batch_size,
+        report_path=args.report,
+        progress=print_progress,
+    )
+    print(json.dumps(result["summary"], indent=2))
@@ -0,0 +1,248 @@
+# rag_catalog.py
+"""
+Document-level catalog for the RAG store.
+
+Chroma holds one record per chunk. list_documents/get_stats used to pull
+every chunk's metadata (and text) out of the collection with an unbounded
+collection.get() and dedupe by file_hash in Python, and the RAG policy tools
+call get_stats() before every search. The catalog keeps one SQLite row per
+document, written by rag_engine on ingest, delete and reset, so listing and
+stats are O(documents) and never touch Chroma.
+
+The catalog file lives beside rag_chroma_db. A store created before the
+catalog existed is indexed automatically on first use. If the two drift
+apart (e.g. a crash between the Chroma write and the catalog write), repair
+the catalog from the collection's metadata with:
+
+    python manage.py rebuild_rag_catalog
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from bank_app.db_utils import sqlite_transaction
+
+logger = logging.getLogger(__name__)
+
+# Chunk metadata fetched per page while rebuilding
+REBUILD_PAGE_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rag_documents (
+    file_hash    TEXT PRIMARY KEY,
+    file_name    TEXT NOT NULL,
+    category     TEXT NOT NULL DEFAULT '',
+    tags         TEXT NOT NULL DEFAULT '',
+    total_chunks INTEGER NOT NULL DEFAULT 0,
+    ingested_at  TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_rag_documents_name ON rag_documents (file_name);
+CREATE TABLE IF NOT EXISTS rag_catalog_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_COLUMNS = ("file_hash", "file_name", "category", "tags", "total_chunks", "ingested_at")
+
+
+class RAGCatalog:
+    """
+    SQLite table of ingested documents (one row per file_hash).
+
+    Args:
+        path: SQLite file; created on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite_transaction(self.path)
+
+    # -------------------------------------------------------------------------
+    # State
+    # -------------------------------------------------------------------------
+
+    def is_built(self) -> bool:
+        """True once the catalog has been populated (by a rebuild or a reset)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM rag_catalog_meta WHERE key = 'built_at'").fetchone()
+        return row is not None
+
+    def _mark_built(self, conn: sqlite3.Connection):
+        conn.execute(
+            "INSERT OR REPLACE INTO rag_catalog_meta (key, value) VALUES ('built_at', ?)",
+            (str(time.time()),),
+        )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM rag_catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]):
+        """Store a store-wide flag (None deletes it)."""
+        with self._lock, self._connect() as conn:
+            if value is None:
+                conn.execute("DELETE FROM rag_catalog_meta WHERE key = ?", (key,))
+            else:
+                conn.execute("INSERT OR REPLACE INTO rag_catalog_meta (key, value) VALUES (?, ?)", (key, value))
+
+    def version(self) -> int:
+        """Corpus version: bumped after every write to the store (0 if never)."""
+        value = self.get_meta("corpus_version")
+        return int(value) if value else 0
+
+    def bump_version(self) -> int:
+        """Increment the corpus version atomically (shared by all processes) and return it."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO rag_catalog_meta (key, value) VALUES ('corpus_version', '1') "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+            row = conn.execute("SELECT value FROM rag_catalog_meta WHERE key = 'corpus_version'").fetchone()
+        return int(row[0])
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def upsert(self, document: Dict[str, Any]):
+        """Insert or replace one document row (keys as in list_documents)."""
+        row = tuple(document.get(col, 0 if col == "total_chunks" else "") for col in _COLUMNS)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO rag_documents ({', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                row,
+            )
+
+    def delete(self, file_hash: str) -> bool:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM rag_documents WHERE file_hash = ?", (file_hash,))
+        return cursor.rowcount > 0
+
+    def replace_all(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Swap the whole catalog for ``documents`` in one transaction."""
+        rows = [tuple(d.get(col, 0 if col == "total_chunks" else "") for col in _COLUMNS) for d in documents]
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM rag_documents")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO rag_documents ({', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._mark_built(conn)
+        return len(rows)
+
+    def clear(self):
+        """Empty the catalog (after a store reset); it stays marked as built."""
+        self.replace_all([])
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def get(self, file_hash: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM rag_documents WHERE file_hash = ?", (file_hash,)
+            ).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def hashes_for_name(self, file_name: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT file_hash FROM rag_documents WHERE file_name = ? ORDER BY ingested_at", (file_name,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """All documents, oldest ingest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM rag_documents ORDER BY ingested_at, rowid"
+            ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            documents, chunks = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_chunks), 0) FROM rag_documents"
+            ).fetchone()
+            categories = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT DISTINCT category FROM rag_documents WHERE category != '' ORDER BY category"
+                )
+            ]
+        return {"total_documents": documents, "total_chunks": chunks, "categories": categories}
+
+
+# =============================================================================
+# REBUILD FROM CHROMA
+# =============================================================================
+
+def documents_from_collection(collection, page_size: int = REBUILD_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Aggregate chunk metadata into one entry per file_hash.
+
+    Pages through the collection fetching metadata only (no documents or
+    embeddings). total_chunks counts the chunks actually present, so a
+    partially written document shows up with its real size.
+    """
+    documents: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        metadatas = page.get("metadatas") or []
+        for metadata in metadatas:
+            metadata = metadata or {}
+            file_hash = metadata.get("file_hash", "")
+            if not file_hash:
+                continue
+            entry = documents.get(file_hash)
+            if entry is None:
+                documents[file_hash] = {
+                    "file_hash": file_hash,
+                    "file_name": metadata.get("file_name", "unknown"),
+                    "category": metadata.get("category", ""),
+                    "tags": metadata.get("tags", ""),
+                    "total_chunks": 1,
+                    "ingested_at": metadata.get("ingested_at", ""),
+                }
+            else:
+                entry["total_chunks"] += 1
+                ingested_at = metadata.get("ingested_at", "")
+                if ingested_at and (not entry["ingested_at"] or ingested_at < entry["ingested_at"]):
+                    entry["ingested_at"] = ingested_at
+        if len(metadatas) < page_size:
+            break
+        offset += page_size
+    return list(documents.values())
+
+
+def rebuild_from_collection(catalog: RAGCatalog, collection, page_size: int = REBUILD_PAGE_SIZE) -> Dict[str, int]:
+    """
+    Repair the catalog from Chroma.
+
+    Returns:
+        Dict with the number of documents and chunks now catalogued.
+    """
+    start = time.perf_counter()
+    documents = documents_from_collection(collection, page_size=page_size)
+    catalog.replace_all(documents)
+    chunks = sum(d["total_chunks"] for d in documents)
+    logger.info(
+        f"Rebuilt RAG catalog: {len(documents)} documents, {chunks} chunks "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return {"documents": len(documents), "chunks": chunks}
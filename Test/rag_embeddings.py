@@ -0,0 +1,259 @@
+# rag_embeddings.py
+"""
+Cached embedding layer for the RAG engine.
+
+Chroma embedded every text itself: each collection.add(documents=...) and
+collection.query(query_texts=...) ran the embedding model again, so the
+fixed default query of RAGPolicyCompleteTool was re-embedded on every crew
+run and re-ingesting a document re-embedded chunks seen before. rag_engine
+now embeds through a CachedEmbedder and hands Chroma the vectors:
+
+    - an in-process LRU answers hot texts (agent queries) without any I/O
+    - a disk cache per model keeps every vector ever computed: float32 rows
+      appended to vectors.f32 and read back through a memory map, with a
+      SQLite index text-hash -> row (WAL, writers serialised with
+      BEGIN IMMEDIATE so the Django and Streamlit processes can share it)
+    - misses are de-duplicated and embedded in batches of ``batch_size``
+
+The wrapped embedding function is pluggable (rag_engine.set_embedding_function);
+the default is Chroma's own default model, so vectors match what Chroma
+computed for existing stores.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bank_app.db_utils import sqlite_transaction
+
+logger = logging.getLogger(__name__)
+
+# Keys per SQLite IN (...) lookup
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    text_hash TEXT PRIMARY KEY,
+    row       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embedding_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def default_embedding_function():
+    """Chroma's default model (all-MiniLM-L6-v2, ONNX), loaded on first call."""
+    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+    return DefaultEmbeddingFunction()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# DISK CACHE
+# =============================================================================
+
+class DiskEmbeddingCache:
+    """
+    Append-only float32 vector file plus a SQLite index, for one model.
+
+    Args:
+        directory: Created on first use; holds vectors.f32 and index.sqlite3.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = str(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.sqlite3")
+        self._lock = threading.Lock()
+        self._map: Optional[np.memmap] = None
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM embedding_meta WHERE key = 'dim'").fetchone()
+        self.dim: Optional[int] = int(row[0]) if row else None
+
+    def _connect(self):
+        return sqlite_transaction(self.index_path, timeout=30)
+
+    def _vectors(self, needed_rows: int) -> np.memmap:
+        """Memory map covering at least ``needed_rows`` rows (remapped as the file grows)."""
+        if self._map is None or self._map.shape[0] < needed_rows:
+            rows = os.path.getsize(self.vectors_path) // (self.dim * 4)
+            self._map = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._map
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        if self.dim is None or not hashes:
+            return {}
+        rows: Dict[str, int] = {}
+        with self._connect() as conn:
+            for start in range(0, len(hashes), _LOOKUP_BATCH):
+                batch = list(hashes[start : start + _LOOKUP_BATCH])
+                placeholders = ",".join("?" * len(batch))
+                rows.update(
+                    conn.execute(
+                        f"SELECT text_hash, row FROM embeddings WHERE text_hash IN ({placeholders})", batch
+                    ).fetchall()
+                )
+        if not rows:
+            return {}
+        with self._lock:
+            vectors = self._vectors(max(rows.values()) + 1)
+            return {h: np.array(vectors[row]) for h, row in rows.items()}
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        """Append vectors for hashes not stored yet (by this or another process)."""
+        if not items:
+            return
+        dim = len(next(iter(items.values())))
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if self.dim is None:
+                row = conn.execute("SELECT value FROM embedding_meta WHERE key = 'dim'").fetchone()
+                self.dim = int(row[0]) if row else dim
+                conn.execute("INSERT OR IGNORE INTO embedding_meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+            if dim != self.dim:
+                raise ValueError(f"Embedding dimension {dim} does not match cache dimension {self.dim}")
+
+            hashes = list(items)
+            present = set()
+            for start in range(0, len(hashes), _LOOKUP_BATCH):
+                batch = hashes[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                present.update(
+                    h for (h,) in conn.execute(
+                        f"SELECT text_hash FROM embeddings WHERE text_hash IN ({placeholders})", batch
+                    )
+                )
+            new = [h for h in hashes if h not in present]
+            if not new:
+                return
+
+            first_row = conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embeddings").fetchone()[0]
+            block = np.asarray([items[h] for h in new], dtype=np.float32)
+            # Vectors are on disk before their index rows commit, so readers
+            # never see a row that points past the written data
+            with open(self.vectors_path, "r+b" if os.path.exists(self.vectors_path) else "wb") as f:
+                f.seek(first_row * self.dim * 4)
+                f.write(block.tobytes())
+            conn.executemany(
+                "INSERT INTO embeddings (text_hash, row) VALUES (?, ?)",
+                [(h, first_row + i) for i, h in enumerate(new)],
+            )
+
+
+# =============================================================================
+# CACHED EMBEDDER
+# =============================================================================
+
+class CachedEmbedder:
+    """
+    Embeds texts through an LRU, then the disk cache, then the model.
+
+    Args:
+        embedding_function: Callable taking a list of texts and returning one
+            vector per text (any Chroma embedding function works).
+        model_name: Cache namespace; vectors of different models never mix.
+        cache_dir: Root directory for disk caches (one subdirectory per
+            model); None keeps only the in-process LRU.
+        lru_size: Vectors kept in memory.
+        batch_size: Texts per embedding_function call on a miss.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Callable[[List[str]], Sequence],
+        model_name: str,
+        cache_dir: str = None,
+        lru_size: int = 1024,
+        batch_size: int = 64,
+    ):
+        self.embedding_function = embedding_function
+        self.model_name = model_name
+        self.lru_size = lru_size
+        self.batch_size = max(1, batch_size)
+        self.disk = None
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+            self.disk = DiskEmbeddingCache(os.path.join(str(cache_dir), safe_name))
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "lru_hits": 0, "disk_hits": 0, "misses": 0, "model_calls": 0}
+
+    def __call__(self, texts: Sequence[str]) -> List[np.ndarray]:
+        return self.embed(texts)
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        hashes = [text_hash(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        lru_hits = 0
+        with self._lock:
+            for h in hashes:
+                vector = self._lru.get(h)
+                if vector is not None:
+                    self._lru.move_to_end(h)
+                    found[h] = vector
+                    lru_hits += 1
+
+        missing = list(dict.fromkeys(h for h in hashes if h not in found))
+        disk_found = self.disk.get_many(missing) if self.disk is not None and missing else {}
+        found.update(disk_found)
+
+        to_embed: Dict[str, str] = {}
+        for h, text in zip(hashes, texts):
+            if h not in found:
+                to_embed.setdefault(h, text)
+        computed: Dict[str, np.ndarray] = {}
+        model_calls = 0
+        pending = list(to_embed.items())
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            vectors = self.embedding_function([text for _, text in batch])
+            model_calls += 1
+            for (h, _), vector in zip(batch, vectors):
+                computed[h] = np.asarray(vector, dtype=np.float32)
+        if computed and self.disk is not None:
+            self.disk.put_many(computed)
+        found.update(computed)
+
+        with self._lock:
+            for h, vector in list(disk_found.items()) + list(computed.items()):
+                self._lru[h] = vector
+                self._lru.move_to_end(h)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+            self._stats["requests"] += len(texts)
+            self._stats["lru_hits"] += lru_hits
+            # Per text, not per unique text: a duplicate inside one call counts as a hit
+            self._stats["misses"] += len(to_embed)
+            self._stats["disk_hits"] += len(texts) - lru_hits - len(to_embed)
+            self._stats["model_calls"] += model_calls
+
+        return [found[h] for h in hashes]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["lru_entries"] = len(self._lru)
+        requests = stats["requests"]
+        stats["hit_rate"] = round((requests - stats["misses"]) / requests, 4) if requests else 0.0
+        stats["model"] = self.model_name
+        stats["disk_entries"] = len(self.disk) if self.disk is not None else 0
+        return stats
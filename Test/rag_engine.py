@@ -7,10 +7,17 @@
 
 import os
 import re
+import time
+import bisect
 import hashlib
+import logging
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -24,6 +31,38 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 CHROMA_DIR = Path(__file__).resolve().parent.parent / "rag_chroma_db"
 CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Document-level catalog (one row per document, see rag_catalog.py)
+CATALOG_PATH = CHROMA_DIR.parent / "rag_catalog.sqlite3"
+
+# Embedding cache (see rag_embeddings.py). EMBEDDING_MODEL names the default
+# model (Chroma's own) and namespaces its cached vectors.
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_CACHE_DIR = CHROMA_DIR.parent / "rag_embedding_cache"
+EMBEDDING_LRU_SIZE = 2048  # vectors kept in memory (hot agent queries)
+EMBEDDING_BATCH_SIZE = 64  # texts per model call on cache misses
+
+# Hybrid retrieval (see rag_hybrid.py): BM25 keyword index fused with the
+# vector search by reciprocal rank fusion, optional cross-encoder rerank
+KEYWORD_INDEX_PATH = CHROMA_DIR.parent / "rag_keyword_index.sqlite3"
+HYBRID_RETRIEVAL = True
+HYBRID_CANDIDATES = 20  # hits per leg fused for each query
+RERANK_ENABLED = False  # needs sentence-transformers (CPU)
+RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RERANK_TOP_K = 10  # fused hits rescored by the cross-encoder
+RETRIEVAL_BUDGET_MS = 500  # rerank only if it fits in what is left of this
+
+# Retrieval result cache: results of repeated queries are served from memory
+# until the corpus changes. Every write bumps a corpus version in the catalog;
+# this process sees its own writes at once and other processes' writes
+# within RESULT_CACHE_RECHECK_SECONDS. 0 entries disables the cache.
+RESULT_CACHE_SIZE = int(os.environ.get("RAG_RESULT_CACHE_SIZE", "2048"))
+RESULT_CACHE_RECHECK_SECONDS = 1.0
+
+# Optional retrieval service (see rag_service.py), e.g. "unix:/tmp/rag.sock"
+# or "http://127.0.0.1:8765". When set, reads and writes go to the one
+# process that owns the store instead of opening it here.
+RAG_SERVICE_URL = os.environ.get("RAG_SERVICE_URL", "")
+
 # Chunking parameters
 CHUNK_SIZE = (
     1500  # characters per chunk (larger = more complete policy rules per chunk)
@@ -33,6 +72,18 @@ CHUNK_OVERLAP = 300  # overlap between consecutive chunks (reduces boundary cuts
 # ChromaDB collection name
 COLLECTION_NAME = "policy_documents"
 
+# Tags are stored normalized: the joined "tags" string for display plus one
+# boolean key per tag (tag_<name>) so tag filters are indexed equality
+# lookups instead of substring scans
+TAG_KEY_PREFIX = "tag_"
+
+# Optional per-category partitions: each category's chunks are mirrored into
+# their own collection (policy_documents__<category>), so a category-filtered
+# search runs on a small HNSW index of that category only. The main
+# collection stays the source of truth for everything else.
+CATEGORY_PARTITIONS = os.environ.get("RAG_CATEGORY_PARTITIONS", "") == "1"
+PARTITION_PREFIX = f"{COLLECTION_NAME}__"
+
 # Supported file extensions
 SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".md", ".docx", ".doc"}
 
@@ -196,10 +247,48 @@ def load_document(file_path: Path) -> str:
 # Text Chunking
 # ---------------------------------------------------------------------------
 
-# Regex to detect table blocks produced by load_pdf / load_docx
+# Regex to detect table blocks produced by load_pdf / load_docx.
+# Reference definition only: its nested DOTALL quantifiers backtrack over the
+# whole remaining document, so _table_spans() computes the same spans in one
+# linear pass instead of running it.
 _TABLE_BLOCK_RE = re.compile(
     r"(\[TABLE \d+\]\n(?:.*\n)*?)(?=\[TABLE \d+\]|\Z)", re.DOTALL
 )
+_TABLE_HEADER_RE = re.compile(r"\[TABLE \d+\]\n")
+_TABLE_LINE_START_RE = re.compile(r"(?<=\n)\[TABLE \d+\]")
+
+
+def _table_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    (start, end) of every _TABLE_BLOCK_RE match, in order, in linear time.
+
+    A block starts at a "[TABLE N]\n" header. Its lazy body can only stop
+    right after a newline where the lookahead holds (a line starting with
+    "[TABLE N]", or the end of text), and the greedy inner ".*" tries those
+    stops from the last one backwards. So a block ends immediately if the
+    next line is another header, otherwise at the last such stop in the
+    document; with no stop after the header there is no block there.
+    """
+    stops = {m.start() for m in _TABLE_LINE_START_RE.finditer(text)}
+    if text.endswith("\n"):
+        stops.add(len(text))
+    last_stop = max(stops, default=-1)
+
+    spans = []
+    pos = 0
+    for header in _TABLE_HEADER_RE.finditer(text):
+        if header.start() < pos:
+            continue
+        body_start = header.end()
+        if body_start in stops:
+            block_end = body_start
+        elif last_stop > body_start:
+            block_end = last_stop
+        else:
+            continue
+        spans.append((header.start(), block_end))
+        pos = block_end
+    return spans
 
 
 def chunk_text(
@@ -212,17 +301,33 @@ def chunk_text(
     Splits between table rows (at newlines within a table block) rather than
     cutting through the middle of a row.
     """
+    return list(iter_chunks(text, chunk_size, chunk_overlap))
+
+
+def iter_chunks(
+    text: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP
+) -> Iterator[str]:
+    """
+    Generator form of chunk_text(); yields chunks as they are cut.
+
+    Table spans are located once and looked up by bisection, so chunking is
+    linear in the document length.
+    """
     if not text or not text.strip():
-        return []
+        return
 
     # Normalize whitespace but preserve single newlines inside tables
     text = re.sub(r"\n{3,}", "\n\n", text)
     text = text.strip()
 
     if len(text) <= chunk_size:
-        return [text]
+        yield text
+        return
+
+    spans = _table_spans(text)
+    span_starts = [s for s, _ in spans]
+    span_ends = [e for _, e in spans]
 
-    chunks = []
     start = 0
 
     while start < len(text):
@@ -230,9 +335,9 @@ def chunk_text(
 
         if end < len(text):
             # --- Check if we're inside a [TABLE ...] block ---
-            table_region = _find_table_block(text, start, end)
+            in_table = _overlaps_table(span_starts, span_ends, start, end)
 
-            if table_region:
+            if in_table:
                 # We're cutting through a table. Find the nearest row boundary.
                 row_break = text.rfind("\n", int(start + chunk_size * 0.3), end)
                 if row_break > start:
@@ -254,26 +359,21 @@ def chunk_text(
 
         chunk = text[start:end].strip()
         if chunk:
-            chunks.append(chunk)
+            yield chunk
 
         start = end - chunk_overlap
         if start < len(text) and start >= end:
             start = end
 
-    return chunks
 
+def _overlaps_table(span_starts: List[int], span_ends: List[int], start: int, end: int) -> bool:
+    """Check if the text region [start:end] overlaps any table span.
 
-def _find_table_block(text: str, start: int, end: int) -> Optional[re.Match]:
-    """Check if the text region [start:end] overlaps with any [TABLE N] block.
-    Returns the Match object if found, None otherwise.
+    Spans are sorted and disjoint, so the only candidate is the first span
+    ending after `start`.
     """
-    for m in _TABLE_BLOCK_RE.finditer(text):
-        block_start = m.start()
-        block_end = m.end()
-        # Overlap if the chunk window intersects the table block
-        if start < block_end and end > block_start:
-            return m
-    return None
+    i = bisect.bisect_right(span_ends, start)
+    return i < len(span_starts) and span_starts[i] < end
 
 
 # ---------------------------------------------------------------------------
@@ -282,6 +382,28 @@ def _find_table_block(text: str, start: int, end: int) -> Optional[re.Match]:
 
 _chroma_client = None
 _collection = None
+_catalog = None
+_embedder = None
+_keyword_index = None
+_reranker = None
+_service_client = None
+_partitions: Dict[str, object] = {}
+_partitions_lock = threading.RLock()  # one (re)build at a time, re-checked by lazy callers
+_result_cache = None
+_in_service = threading.local()  # set on the service's own request threads
+_retrieval_stats = {"searches": 0, "reranked": 0, "rerank_skipped_budget": 0, "over_budget": 0, "total_ms": 0.0}
+
+
+def _remote():
+    """Retrieval service client when RAG_SERVICE_URL is set (None inside the service)."""
+    global _service_client
+    if not RAG_SERVICE_URL or getattr(_in_service, "active", False):
+        return None
+    if _service_client is None or _service_client.url != RAG_SERVICE_URL:
+        from rag_service import RAGServiceClient
+
+        _service_client = RAGServiceClient(RAG_SERVICE_URL)
+    return _service_client
 
 
 def _get_chroma_client():
@@ -306,6 +428,300 @@ def _get_collection():
     return _collection
 
 
+def _get_embedder():
+    """Get the cached embedder (default model, disk cache under EMBEDDING_CACHE_DIR)."""
+    if _embedder is None:  # set_embedding_function assigns it
+        from rag_embeddings import default_embedding_function
+
+        set_embedding_function(default_embedding_function(), EMBEDDING_MODEL)
+    return _embedder
+
+
+def set_embedding_function(embedding_function, model_name: str, cache_dir: Path = None):
+    """Plug in a different embedding function (any Chroma embedding function).
+
+    ``model_name`` namespaces the disk cache. Vectors must match the ones the
+    collection was built with, so switching models on an existing store
+    requires re-ingesting it.
+    """
+    from rag_embeddings import CachedEmbedder
+
+    global _embedder
+    _embedder = CachedEmbedder(
+        embedding_function,
+        model_name=model_name,
+        cache_dir=str(cache_dir or EMBEDDING_CACHE_DIR),
+        lru_size=EMBEDDING_LRU_SIZE,
+        batch_size=EMBEDDING_BATCH_SIZE,
+    )
+    return _embedder
+
+
+def embed_texts(texts: List[str]) -> List:
+    """Embed texts through the cache (one float32 vector per text)."""
+    return _get_embedder().embed(texts)
+
+
+def _get_catalog():
+    """Get the document catalog, indexing an existing Chroma store on first use."""
+    global _catalog
+    if _catalog is None:
+        from rag_catalog import RAGCatalog, rebuild_from_collection
+
+        catalog = RAGCatalog(CATALOG_PATH)
+        if not catalog.is_built():
+            rebuild_from_collection(catalog, _get_collection())
+        _catalog = catalog
+        if catalog.get_meta("tag_keys") is None:
+            migrate_tag_metadata()
+    return _catalog
+
+
+def rebuild_catalog() -> Dict:
+    """Repair the document catalog from the Chroma collection's metadata."""
+    if _remote():
+        return _remote().call("rebuild_catalog")
+    from rag_catalog import RAGCatalog, rebuild_from_collection
+
+    global _catalog
+    catalog = _catalog or RAGCatalog(CATALOG_PATH)
+    result = rebuild_from_collection(catalog, _get_collection())
+    _catalog = catalog
+    return result
+
+
+def _get_keyword_index():
+    """Get the BM25 keyword index, indexing an existing Chroma store on first use."""
+    global _keyword_index
+    if _keyword_index is None:
+        from rag_hybrid import KeywordIndex, rebuild_from_collection
+
+        index = KeywordIndex(KEYWORD_INDEX_PATH)
+        if not index.is_built():
+            rebuild_from_collection(index, _get_collection())
+        _keyword_index = index
+    return _keyword_index
+
+
+def rebuild_keyword_index() -> Dict:
+    """Re-index all chunk text in the Chroma collection for keyword search."""
+    if _remote():
+        return _remote().call("rebuild_keyword_index")
+    from rag_hybrid import KeywordIndex, rebuild_from_collection
+
+    global _keyword_index
+    index = _keyword_index or KeywordIndex(KEYWORD_INDEX_PATH)
+    result = rebuild_from_collection(index, _get_collection())
+    _keyword_index = index
+    _bump_corpus_version()
+    return result
+
+
+def _get_reranker():
+    """Get the cross-encoder reranker (None unless RERANK_ENABLED)."""
+    global _reranker
+    if not RERANK_ENABLED:
+        return None
+    if _reranker is None:
+        from rag_hybrid import CrossEncoderReranker
+
+        _reranker = CrossEncoderReranker(RERANK_MODEL)
+    return _reranker
+
+
+# ---------------------------------------------------------------------------
+# Tags and Category Partitions
+# ---------------------------------------------------------------------------
+
+
+def normalize_tags(tags) -> List[str]:
+    """Lower-case, trimmed, de-duplicated tags ("Home Equity" -> "home_equity").
+
+    Accepts a list or the comma-joined string stored in chunk metadata.
+    """
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    normalized = []
+    for tag in tags or []:
+        tag = re.sub(r"[^a-z0-9_-]+", "_", str(tag).strip().lower()).strip("_")
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def _tag_metadata(tags) -> Dict:
+    """Chunk metadata for ``tags``: the joined string plus one indexed key per tag."""
+    normalized = normalize_tags(tags)
+    metadata = {"tags": ",".join(normalized)}
+    metadata.update({TAG_KEY_PREFIX + tag: True for tag in normalized})
+    return metadata
+
+
+def _retag(metadata: Dict, tag_metadata: Dict) -> Dict:
+    """Metadata update setting ``tag_metadata`` and unsetting tag keys no longer present."""
+    update = dict(tag_metadata)
+    for key in metadata:
+        if key.startswith(TAG_KEY_PREFIX) and key not in tag_metadata:
+            update[key] = None  # Chroma deletes keys updated to None
+    return update
+
+
+def migrate_tag_metadata(page_size: int = 1000) -> Dict:
+    """
+    Normalize tags of chunks stored before tag keys existed.
+
+    Runs once per store (when the catalog is first loaded); chunks already
+    normalized are left alone. Chroma, the keyword index and the catalog
+    are updated.
+    """
+    if _remote():
+        return _remote().call("migrate_tag_metadata")
+    collection = _get_collection()
+    updated = 0
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        ids, metadatas = page["ids"], page["metadatas"] or []
+        changed_ids, changes = [], []
+        for chunk_id, metadata in zip(ids, metadatas):
+            metadata = metadata or {}
+            tag_metadata = _tag_metadata(metadata.get("tags", ""))
+            if any(metadata.get(key) != value for key, value in tag_metadata.items()):
+                changed_ids.append(chunk_id)
+                changes.append(_retag(metadata, tag_metadata))
+        if changed_ids:
+            collection.update(ids=changed_ids, metadatas=changes)
+            _get_keyword_index().update_metadata(
+                changed_ids, [{**metadata, **change} for metadata, change in zip(metadatas, changes)]
+            )
+            updated += len(changed_ids)
+        if len(ids) < page_size:
+            break
+        offset += page_size
+
+    catalog = _get_catalog()
+    if updated:
+        from rag_catalog import rebuild_from_collection
+
+        rebuild_from_collection(catalog, collection)
+        _bump_corpus_version()
+        logger.info(f"Normalized tags on {updated} RAG chunks")
+    catalog.set_meta("tag_keys", datetime.now().isoformat())
+    return {"chunks_updated": updated}
+
+
+def _partition_name(category: str) -> str:
+    slug = re.sub(r"[^a-z0-9_-]+", "_", category.lower()).strip("_-") or "uncategorized"
+    return PARTITION_PREFIX + slug
+
+
+def _partition_names() -> List[str]:
+    collections = _get_chroma_client().list_collections()
+    names = [getattr(c, "name", c) for c in collections]
+    return [name for name in names if name.startswith(PARTITION_PREFIX)]
+
+
+def _get_partition(category: str):
+    """The partition collection for ``category`` (same distance space as the main one)."""
+    name = _partition_name(category)
+    if name not in _partitions:
+        metadata = {"description": f"Category partition of {COLLECTION_NAME}"}
+        space = (_get_collection().metadata or {}).get("hnsw:space")
+        if space:
+            metadata["hnsw:space"] = space
+        _partitions[name] = _get_chroma_client().get_or_create_collection(name=name, metadata=metadata)
+    return _partitions[name]
+
+
+def _drop_partitions():
+    for name in _partition_names():
+        _get_chroma_client().delete_collection(name)
+    _partitions.clear()
+    _get_catalog().set_meta("partitions_built", None)
+
+
+def rebuild_partitions(page_size: int = 1000) -> Dict:
+    """(Re)build the category partitions from the main collection (stored embeddings, no model)."""
+    if _remote():
+        return _remote().call("rebuild_partitions")
+    with _partitions_lock:
+        start = time.perf_counter()
+        _drop_partitions()
+        collection = _get_collection()
+        chunks = 0
+        offset = 0
+        while True:
+            page = collection.get(
+                include=["documents", "metadatas", "embeddings"], limit=page_size, offset=offset
+            )
+            if len(page["ids"]):
+                _mirror_add(page["ids"], page["documents"], page["embeddings"], page["metadatas"])
+                chunks += len(page["ids"])
+            if len(page["ids"]) < page_size:
+                break
+            offset += page_size
+        _get_catalog().set_meta("partitions_built", datetime.now().isoformat())
+    logger.info(
+        f"Built {len(_partition_names())} RAG category partitions ({chunks} chunks) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return {"partitions": len(_partition_names()), "chunks": chunks}
+
+
+def _partitions_live() -> bool:
+    """
+    True if writes must be mirrored into the partitions.
+
+    Partitions are built lazily by the first category-filtered search. A
+    write made while CATEGORY_PARTITIONS is off leaves them stale, so it
+    drops the built flag and the next enabled search rebuilds them.
+    """
+    catalog = _get_catalog()
+    if catalog.get_meta("partitions_built") is None:
+        return False
+    if not CATEGORY_PARTITIONS:
+        catalog.set_meta("partitions_built", None)
+        return False
+    return True
+
+
+def _mirror_add(ids, documents, embeddings, metadatas):
+    by_category: Dict[str, List[int]] = {}
+    for i, metadata in enumerate(metadatas):
+        by_category.setdefault((metadata or {}).get("category", ""), []).append(i)
+    for category, rows in by_category.items():
+        _get_partition(category).upsert(
+            ids=[ids[i] for i in rows],
+            documents=[documents[i] for i in rows],
+            embeddings=[embeddings[i] for i in rows],
+            metadatas=[metadatas[i] for i in rows],
+        )
+
+
+def _mirror_delete(ids: List[str] = None, where: Dict = None):
+    for name in _partition_names():
+        partition = _partitions.get(name) or _get_chroma_client().get_collection(name)
+        partition.delete(ids=ids, where=where)
+
+
+def partitions_pending() -> bool:
+    """True if the next category-filtered search would (re)build the partitions."""
+    return CATEGORY_PARTITIONS and _get_catalog().get_meta("partitions_built") is None
+
+
+def _search_collection(category: str = None):
+    """Collection a search runs on: the category's partition when enabled, else the main one."""
+    if not (CATEGORY_PARTITIONS and category):
+        return _get_collection()
+    if partitions_pending():
+        # A rebuild drops the partitions first: concurrent searches wait for
+        # the one that got the lock instead of dropping them again
+        with _partitions_lock:
+            if partitions_pending():
+                rebuild_partitions()
+    return _get_partition(category)
+
+
 # ---------------------------------------------------------------------------
 # Document Ingestion
 # ---------------------------------------------------------------------------
@@ -320,10 +736,25 @@ def _file_hash(file_path: Path) -> str:
     return h.hexdigest()
 
 
+def _chunk_hash(chunk: str) -> str:
+    """SHA-256 of a chunk's text, stored as chunk metadata for incremental updates."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
 def ingest_document(
-    file_path: Path, category: str = "general", tags: List[str] = None
+    file_path: Path, category: str = "general", tags: List[str] = None, update: bool = False
 ) -> Dict:
-    """Ingest a document into the RAG system (file path based)."""
+    """Ingest a document into the RAG system (file path based).
+
+    With ``update=True`` a document already ingested under the same file name
+    (an earlier revision) is updated in place instead of added alongside:
+    see _update_document().
+    """
+    if _remote():
+        # The service reads the file itself: same machine, same paths
+        return _remote().call(
+            "ingest_document", file_path=str(Path(file_path).resolve()), category=category, tags=tags, update=update
+        )
     collection = _get_collection()
     file_hash = _file_hash(file_path)
 
@@ -368,6 +799,12 @@ def ingest_document(
             "status": "error: no chunks created",
         }
 
+    if update:
+        previous = _get_catalog().hashes_for_name(file_path.name)
+        if previous:
+            return _update_document(file_path, file_hash, chunks, category, tags, previous)
+
+    tag_metadata = _tag_metadata(tags)
     ids, documents, metadatas = [], [], []
     for i, chunk in enumerate(chunks):
         ids.append(f"{file_hash}_{i}")
@@ -377,32 +814,167 @@ def ingest_document(
                 "file_name": file_path.name,
                 "file_hash": file_hash,
                 "category": category,
-                "tags": ",".join(tags) if tags else "",
+                **tag_metadata,
                 "chunk_index": i,
                 "total_chunks": len(chunks),
+                "chunk_hash": _chunk_hash(chunk),
                 "ingested_at": datetime.now().isoformat(),
             }
         )
 
+    keyword_index = _get_keyword_index()
+    mirror = _partitions_live()
     batch_size = 100
     for start_idx in range(0, len(ids), batch_size):
+        batch = slice(start_idx, start_idx + batch_size)
+        embeddings = embed_texts(documents[batch])
+        collection.add(ids=ids[batch], documents=documents[batch], embeddings=embeddings, metadatas=metadatas[batch])
+        keyword_index.add(ids[batch], documents[batch], metadatas[batch])
+        if mirror:
+            _mirror_add(ids[batch], documents[batch], embeddings, metadatas[batch])
+
+    _get_catalog().upsert(
+        {
+            "file_hash": file_hash,
+            "file_name": file_path.name,
+            "category": category,
+            "tags": metadatas[0]["tags"],
+            "total_chunks": len(chunks),
+            "ingested_at": metadatas[0]["ingested_at"],
+        }
+    )
+    _bump_corpus_version()
+
+    return {
+        "file_name": file_path.name,
+        "file_hash": file_hash,
+        "total_chunks": len(chunks),
+        "category": category,
+        "status": "success",
+    }
+
+
+def _update_document(
+    file_path: Path,
+    file_hash: str,
+    chunks: List[str],
+    category: str,
+    tags: List[str],
+    previous_hashes: List[str],
+) -> Dict:
+    """
+    Replace earlier revisions of a document, re-embedding only changed chunks.
+
+    Old and new chunks are matched by content hash. Unchanged chunks keep
+    their Chroma ids and embeddings and only get their metadata rewritten
+    (new file_hash, position, category, tags); new chunks are embedded and
+    added; chunks no longer present are deleted. Chunks stored before
+    chunk_hash metadata existed are hashed from their stored text.
+    """
+    collection = _get_collection()
+    old = collection.get(
+        where={"file_hash": {"$in": previous_hashes}}, include=["metadatas", "documents"]
+    )
+    reusable: Dict[str, List[str]] = {}
+    old_metadata: Dict[str, Dict] = {}
+    for chunk_id, metadata, document in zip(old["ids"], old["metadatas"], old["documents"]):
+        chunk_hash = (metadata or {}).get("chunk_hash") or _chunk_hash(document or "")
+        reusable.setdefault(chunk_hash, []).append(chunk_id)
+        old_metadata[chunk_id] = metadata or {}
+    for ids_for_hash in reusable.values():
+        ids_for_hash.sort()
+
+    ingested_at = datetime.now().isoformat()
+    tag_metadata = _tag_metadata(tags)
+    kept_ids, kept_documents, kept_metadatas, kept_updates = [], [], [], []
+    new_ids, new_documents, new_metadatas = [], [], []
+    for i, chunk in enumerate(chunks):
+        chunk_hash = _chunk_hash(chunk)
+        metadata = {
+            "file_name": file_path.name,
+            "file_hash": file_hash,
+            "category": category,
+            **tag_metadata,
+            "chunk_index": i,
+            "total_chunks": len(chunks),
+            "chunk_hash": chunk_hash,
+            "ingested_at": ingested_at,
+        }
+        if reusable.get(chunk_hash):
+            kept_ids.append(reusable[chunk_hash].pop(0))
+            kept_documents.append(chunk)
+            kept_metadatas.append(metadata)
+            kept_updates.append({**metadata, **_retag(old_metadata[kept_ids[-1]], tag_metadata)})
+        else:
+            new_ids.append(f"{file_hash}_{i}")
+            new_documents.append(chunk)
+            new_metadatas.append(metadata)
+    removed_ids = [chunk_id for ids_for_hash in reusable.values() for chunk_id in ids_for_hash]
+
+    keyword_index = _get_keyword_index()
+    mirror = _partitions_live()
+    batch_size = 100
+    for start_idx in range(0, len(new_ids), batch_size):
+        batch = slice(start_idx, start_idx + batch_size)
+        embeddings = embed_texts(new_documents[batch])
         collection.add(
-            ids=ids[start_idx : start_idx + batch_size],
-            documents=documents[start_idx : start_idx + batch_size],
-            metadatas=metadatas[start_idx : start_idx + batch_size],
+            ids=new_ids[batch], documents=new_documents[batch], embeddings=embeddings, metadatas=new_metadatas[batch]
         )
+        keyword_index.add(new_ids[batch], new_documents[batch], new_metadatas[batch])
+        if mirror:
+            _mirror_add(new_ids[batch], new_documents[batch], embeddings, new_metadatas[batch])
+    for start_idx in range(0, len(kept_ids), batch_size):
+        batch = slice(start_idx, start_idx + batch_size)
+        # Metadata only - no documents passed, so nothing is re-embedded
+        collection.update(ids=kept_ids[batch], metadatas=kept_updates[batch])
+        keyword_index.update_metadata(kept_ids[batch], kept_metadatas[batch])
+        if mirror:
+            # The category may have changed: move the chunk (vectors come from the cache)
+            _mirror_delete(ids=kept_ids[batch])
+            _mirror_add(
+                kept_ids[batch], kept_documents[batch], embed_texts(kept_documents[batch]), kept_metadatas[batch]
+            )
+    if removed_ids:
+        collection.delete(ids=removed_ids)
+        keyword_index.delete_ids(removed_ids)
+        if mirror:
+            _mirror_delete(ids=removed_ids)
+
+    catalog = _get_catalog()
+    for previous_hash in previous_hashes:
+        catalog.delete(previous_hash)
+    catalog.upsert(
+        {
+            "file_hash": file_hash,
+            "file_name": file_path.name,
+            "category": category,
+            "tags": tag_metadata["tags"],
+            "total_chunks": len(chunks),
+            "ingested_at": ingested_at,
+        }
+    )
+    _bump_corpus_version()
 
     return {
         "file_name": file_path.name,
         "file_hash": file_hash,
         "total_chunks": len(chunks),
         "category": category,
-        "status": "success",
+        "status": "updated",
+        "chunks_unchanged": len(kept_ids),
+        "chunks_added": len(new_ids),
+        "chunks_removed": len(removed_ids),
+        "embeddings_saved": len(kept_ids),
+        "replaced_file_hashes": previous_hashes,
     }
 
 
 def ingest_from_bytes(
-    file_bytes: bytes, file_name: str, category: str = "general", tags: List[str] = None
+    file_bytes: bytes,
+    file_name: str,
+    category: str = "general",
+    tags: List[str] = None,
+    update: bool = False,
 ) -> Dict:
     """Ingest a document from raw bytes (e.g., from Streamlit file uploader)."""
     ext = Path(file_name).suffix.lower()
@@ -416,7 +988,104 @@ def ingest_from_bytes(
         }
     file_path = UPLOAD_DIR / file_name
     file_path.write_bytes(file_bytes)
-    return ingest_document(file_path, category=category, tags=tags)
+    return ingest_document(file_path, category=category, tags=tags, update=update)
+
+
+# ---------------------------------------------------------------------------
+# Retrieval Result Cache
+# ---------------------------------------------------------------------------
+
+
+class _ResultCache:
+    """
+    LRU of retrieval results (hit lists and formatted text) for one corpus version.
+
+    ``sync`` empties the cache when the corpus version moves on; a result
+    computed against an older version than the current one is not stored.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.version = None
+        self.checked_at = 0.0
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def sync(self, version):
+        with self._lock:
+            self.checked_at = time.monotonic()
+            if version != self.version:
+                if self.version is not None:
+                    self._stats["invalidations"] += 1
+                self._entries.clear()
+                self.version = version
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key, value, version):
+        with self._lock:
+            if version != self.version:
+                return  # the corpus changed while this result was computed
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["corpus_version"] = self.version[1] if self.version else None
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+def _get_result_cache() -> Optional[_ResultCache]:
+    """The result cache, synced with the store's corpus version (None if disabled)."""
+    global _result_cache
+    if RESULT_CACHE_SIZE <= 0:
+        return None
+    if _result_cache is None or _result_cache.max_entries != RESULT_CACHE_SIZE:
+        _result_cache = _ResultCache(RESULT_CACHE_SIZE)
+    if (
+        _result_cache.version is None
+        or time.monotonic() - _result_cache.checked_at >= RESULT_CACHE_RECHECK_SECONDS
+    ):
+        catalog = _get_catalog()
+        # The catalog path makes a switch to another store count as a change
+        _result_cache.sync((catalog.path, catalog.version()))
+    return _result_cache
+
+
+def _bump_corpus_version():
+    """Record a write to the store: cached results in every process go stale."""
+    catalog = _get_catalog()
+    version = catalog.bump_version()
+    if _result_cache is not None:
+        _result_cache.sync((catalog.path, version))
+
+
+def _result_key(kind: str, query: str, n_results: int, category: str, tags: List[str], hybrid: bool) -> tuple:
+    return (kind, query, n_results, category or None, tuple(normalize_tags(tags)), hybrid, RERANK_ENABLED)
+
+
+def result_cache_stats() -> Dict:
+    """Hit/miss/eviction counts of this process's result cache."""
+    if RESULT_CACHE_SIZE <= 0 or _result_cache is None:
+        return {"enabled": RESULT_CACHE_SIZE > 0, "entries": 0}
+    return {"enabled": True, **_result_cache.stats()}
 
 
 # ---------------------------------------------------------------------------
@@ -424,80 +1093,282 @@ def ingest_from_bytes(
 # ---------------------------------------------------------------------------
 
 
-def retrieve(
-    query: str, n_results: int = 5, category: str = None, tags: List[str] = None
-) -> List[Dict]:
-    """Retrieve relevant document chunks for a given query."""
-    collection = _get_collection()
-    where_filter = None
+def _where_filter(category: str = None, tags: List[str] = None) -> Optional[Dict]:
+    """Build the Chroma metadata filter for a category / tag restriction."""
     conditions = []
     if category:
         conditions.append({"category": category})
     if tags:
-        tag_conditions = [{"tags": {"$contains": tag}} for tag in tags]
+        tag_conditions = [{TAG_KEY_PREFIX + tag: True} for tag in normalize_tags(tags)]
         if len(tag_conditions) == 1:
             conditions.append(tag_conditions[0])
         elif len(tag_conditions) > 1:
             conditions.append({"$or": tag_conditions})
     if len(conditions) == 1:
-        where_filter = conditions[0]
-    elif len(conditions) > 1:
-        where_filter = {"$and": conditions}
+        return conditions[0]
+    if len(conditions) > 1:
+        return {"$and": conditions}
+    return None
+
+
+def _retrieval_error(e: Exception) -> Dict:
+    return {
+        "content": f"RAG retrieval error: {str(e)}",
+        "file_name": "",
+        "category": "",
+        "chunk_index": -1,
+        "relevance_score": 0,
+        "distance": 1.0,
+    }
+
+
+def _rank_score(hit: Dict) -> float:
+    """
+    The score a hit was ordered by: cross-encoder, then RRF, then vector
+    similarity. ``relevance_score`` always stays the vector similarity.
+    """
+    for field in ("rerank_score", "rrf_score"):
+        if hit.get(field) is not None:
+            return hit[field]
+    return hit["relevance_score"]
+
+
+def _format_results(results: Dict, query_index: int = 0) -> List[Dict]:
+    """Format one query's rows of a collection.query() response."""
+    formatted = []
+    if not results or not results["documents"] or not results["documents"][query_index]:
+        return formatted
+    ids = results["ids"][query_index] if results.get("ids") else []
+    metadatas = results["metadatas"][query_index] if results["metadatas"] else []
+    distances = results["distances"][query_index] if results["distances"] else []
+    for i, doc in enumerate(results["documents"][query_index]):
+        metadata = (metadatas[i] if metadatas else None) or {}
+        distance = distances[i] if distances else 1.0
+        relevance_score = max(0, 1 - distance)
+        formatted.append(
+            {
+                "content": doc,
+                "file_name": metadata.get("file_name", "unknown"),
+                "category": metadata.get("category", ""),
+                "tags": metadata.get("tags", ""),
+                "chunk_index": metadata.get("chunk_index", i),
+                "chunk_id": ids[i] if ids else "",
+                "relevance_score": round(relevance_score, 4),
+                "distance": round(distance, 4),
+            }
+        )
+    return formatted
+
 
+def _keyword_hits(query: str, limit: int, category: str = None, tags: List[str] = None) -> List[Dict]:
+    """Keyword leg of a hybrid search; an unreadable index degrades to vector-only."""
+    try:
+        return _get_keyword_index().search(query, limit=limit, category=category, tags=tags)
+    except Exception as e:
+        logger.warning(f"Keyword search failed, using vector results only: {e}")
+        return []
+
+
+def _rerank(queries: List[str], per_query: List[List[Dict]], started: float) -> List[List[Dict]]:
+    """Rescore fused hits with the cross-encoder if it fits in RETRIEVAL_BUDGET_MS."""
+    reranker = _get_reranker()
+    if reranker is None or not reranker.available:
+        return per_query
+    pairs = [(query, hit["content"]) for query, hits in zip(queries, per_query) for hit in hits]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms + reranker.estimate_ms(len(pairs)) > RETRIEVAL_BUDGET_MS:
+        _retrieval_stats["rerank_skipped_budget"] += 1
+        logger.info(
+            f"Skipping rerank of {len(pairs)} hits: {elapsed_ms:.0f}ms spent of a {RETRIEVAL_BUDGET_MS}ms budget"
+        )
+        return per_query
+    scores = iter(reranker.score(pairs))
+    for hits in per_query:
+        for hit in hits:
+            hit["rerank_score"] = round(next(scores), 4)
+        hits.sort(key=lambda h: -h["rerank_score"])
+    _retrieval_stats["reranked"] += 1
+    return per_query
+
+
+def _search(
+    queries: List[str],
+    n_results: int,
+    category: str = None,
+    tags: List[str] = None,
+    hybrid: bool = None,
+) -> List[List[Dict]]:
+    """
+    Ranked hits per query, served from the result cache where possible;
+    the remaining queries are searched together (see _search_uncached).
+    Callers get their own copies of the hits.
+    """
+    hybrid = HYBRID_RETRIEVAL if hybrid is None else hybrid
+    cache = _get_result_cache()
+    if cache is None:
+        return _search_uncached(queries, n_results, category, tags, hybrid)
+    version = cache.version
+    keys = [_result_key("hits", query, n_results, category, tags, hybrid) for query in queries]
+    per_query = [cache.get(key) for key in keys]
+    missing = [qi for qi, hits in enumerate(per_query) if hits is None]
+    if missing:
+        searched = _search_uncached([queries[qi] for qi in missing], n_results, category, tags, hybrid)
+        for qi, hits in zip(missing, searched):
+            cache.put(keys[qi], hits, version)
+            per_query[qi] = hits
+    return [[dict(hit) for hit in hits] for hits in per_query]
+
+
+def _search_uncached(
+    queries: List[str],
+    n_results: int,
+    category: str = None,
+    tags: List[str] = None,
+    hybrid: bool = None,
+) -> List[List[Dict]]:
+    """
+    Ranked hits per query: one embedding batch and one collection.query()
+    call for all queries.
+
+    Hybrid search (the default, HYBRID_RETRIEVAL) fetches HYBRID_CANDIDATES
+    hits per leg, fuses the vector and BM25 rankings by reciprocal rank
+    fusion (rag_hybrid.fuse) and, with RERANK_ENABLED, reranks the top
+    RERANK_TOP_K with the cross-encoder unless the latency budget is spent.
+    Raises on vector search errors (callers format them).
+    """
+    started = time.perf_counter()
+    hybrid = HYBRID_RETRIEVAL if hybrid is None else hybrid
+    if tags:
+        _get_catalog()  # loading it migrates tags of older stores to tag keys
+    collection = _search_collection(category)
+    candidates = max(n_results, HYBRID_CANDIDATES) if hybrid else n_results
     kwargs = {
-        "query_texts": [query],
-        "n_results": min(n_results, collection.count() or 1),
+        "n_results": min(candidates, collection.count() or 1),
     }
+    where_filter = _where_filter(category, tags)
     if where_filter:
         kwargs["where"] = where_filter
+    kwargs["query_embeddings"] = embed_texts(list(queries))
+    results = collection.query(**kwargs)
+    per_query = [_format_results(results, qi) for qi in range(len(queries))]
 
-    try:
-        results = collection.query(**kwargs)
-    except Exception as e:
-        return [
-            {
-                "content": f"RAG retrieval error: {str(e)}",
-                "file_name": "",
-                "category": "",
-                "chunk_index": -1,
-                "relevance_score": 0,
-                "distance": 1.0,
-            }
+    if hybrid:
+        from rag_hybrid import fuse
+
+        depth = max(n_results, RERANK_TOP_K) if _get_reranker() else n_results
+        per_query = [
+            fuse(vector_hits, _keyword_hits(query, candidates, category, normalize_tags(tags)), depth)
+            for query, vector_hits in zip(queries, per_query)
         ]
+        per_query = _rerank(queries, per_query, started)
+    per_query = [hits[:n_results] for hits in per_query]
 
-    formatted = []
-    if results and results["documents"] and results["documents"][0]:
-        for i, doc in enumerate(results["documents"][0]):
-            metadata = (
-                results["metadatas"][0][i]
-                if results["metadatas"] and results["metadatas"][0]
-                else {}
-            )
-            distance = (
-                results["distances"][0][i]
-                if results["distances"] and results["distances"][0]
-                else 1.0
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    _retrieval_stats["searches"] += 1
+    _retrieval_stats["total_ms"] += elapsed_ms
+    if elapsed_ms > RETRIEVAL_BUDGET_MS:
+        _retrieval_stats["over_budget"] += 1
+    return per_query
+
+
+def retrieval_stats() -> Dict:
+    """Search counts and latency for this process (see _search)."""
+    stats = dict(_retrieval_stats)
+    stats["avg_ms"] = round(stats["total_ms"] / stats["searches"], 2) if stats["searches"] else 0.0
+    stats["total_ms"] = round(stats["total_ms"], 2)
+    stats["hybrid"] = HYBRID_RETRIEVAL
+    stats["rerank"] = bool(_reranker and _reranker.available) if RERANK_ENABLED else False
+    stats["budget_ms"] = RETRIEVAL_BUDGET_MS
+    stats["result_cache"] = result_cache_stats()
+    return stats
+
+
+def retrieve(
+    query: str,
+    n_results: int = 5,
+    category: str = None,
+    tags: List[str] = None,
+    hybrid: bool = None,
+) -> List[Dict]:
+    """Retrieve relevant document chunks for a given query.
+
+    Hybrid keyword + vector search unless ``hybrid=False`` (see _search).
+    """
+    try:
+        if _remote():
+            return _remote().call(
+                "retrieve", query=query, n_results=n_results, category=category, tags=tags, hybrid=hybrid
             )
-            relevance_score = max(0, 1 - distance)
-            formatted.append(
-                {
-                    "content": doc,
-                    "file_name": metadata.get("file_name", "unknown"),
-                    "category": metadata.get("category", ""),
-                    "tags": metadata.get("tags", ""),
-                    "chunk_index": metadata.get("chunk_index", i),
-                    "relevance_score": round(relevance_score, 4),
-                    "distance": round(distance, 4),
-                }
+        return _search([query], n_results, category, tags, hybrid)[0]
+    except Exception as e:
+        return [_retrieval_error(e)]
+
+
+def retrieve_many(
+    queries: List[str],
+    n_results: int = 5,
+    category: str = None,
+    tags: List[str] = None,
+    dedupe: bool = True,
+    merge: bool = False,
+    hybrid: bool = None,
+) -> List:
+    """
+    Retrieve chunks for several queries with one embedding batch and one
+    collection.query() call (plus one keyword search per query when hybrid).
+
+    Returns one result list per query (same order as ``queries``). With
+    ``dedupe`` a chunk retrieved by several queries is kept only under the
+    query it matched best; every kept chunk carries ``matched_queries``
+    (indexes of all queries that retrieved it). With ``merge`` a single list
+    of unique chunks is returned instead, ranked by best rank score (rerank,
+    RRF or vector similarity, see _rank_score) and then by how many queries
+    matched it.
+    """
+    if not queries:
+        return []
+    try:
+        if _remote():
+            return _remote().call(
+                "retrieve_many",
+                queries=list(queries),
+                n_results=n_results,
+                category=category,
+                tags=tags,
+                dedupe=dedupe,
+                merge=merge,
+                hybrid=hybrid,
             )
-    return formatted
+        per_query = _search(list(queries), n_results, category, tags, hybrid)
+    except Exception as e:
+        error = _retrieval_error(e)
+        return [error] if merge else [[dict(error)] for _ in queries]
+
+    # Best (highest rank score, earliest query) hit for every chunk
+    best: Dict[str, Tuple[int, Dict]] = {}
+    matched: Dict[str, List[int]] = {}
+    for qi, hits in enumerate(per_query):
+        for hit in hits:
+            key = hit["chunk_id"] or f"{hit['file_name']}#{hit['chunk_index']}"
+            matched.setdefault(key, []).append(qi)
+            if key not in best or _rank_score(hit) > _rank_score(best[key][1]):
+                best[key] = (qi, hit)
+    for key, (_, hit) in best.items():
+        hit["matched_queries"] = matched[key]
+
+    if merge:
+        return sorted(
+            (hit for _, hit in best.values()),
+            key=lambda h: (-_rank_score(h), -len(h["matched_queries"])),
+        )
+    if not dedupe:
+        return per_query
+    kept = {id(hit) for _, hit in best.values()}
+    return [[hit for hit in hits if id(hit) in kept] for hits in per_query]
 
 
-def retrieve_as_text(
-    query: str, n_results: int = 5, category: str = None, tags: List[str] = None
-) -> str:
-    """Retrieve relevant chunks formatted for LLM prompts."""
-    results = retrieve(query, n_results=n_results, category=category, tags=tags)
+def format_results_as_text(results: List[Dict]) -> str:
+    """Format retrieved chunks for LLM prompts."""
     if not results:
         return "No relevant policy documents found for this query."
     output_parts = [f"=== RELEVANT POLICY DOCUMENTS (top {len(results)} results) ===\n"]
@@ -511,69 +1382,142 @@ def retrieve_as_text(
     return "\n".join(output_parts)
 
 
+def retrieve_as_text(
+    query: str, n_results: int = 5, category: str = None, tags: List[str] = None
+) -> str:
+    """Retrieve relevant chunks formatted for LLM prompts.
+
+    The formatted text is cached alongside the hits, so a repeated policy
+    question costs one dictionary lookup until the corpus changes.
+    """
+    cache = None
+    if not _remote():
+        try:
+            cache = _get_result_cache()
+        except Exception as e:
+            logger.warning(f"RAG result cache unavailable: {e}")
+    if cache is not None:
+        version = cache.version
+        key = _result_key("text", query, n_results, category, tags, HYBRID_RETRIEVAL)
+        text = cache.get(key)
+        if text is not None:
+            return text
+    results = retrieve(query, n_results=n_results, category=category, tags=tags)
+    text = format_results_as_text(results)
+    if cache is not None and not any(r["chunk_index"] == -1 for r in results):
+        cache.put(key, text, version)
+    return text
+
+
+def retrieve_many_as_text(
+    queries: List[str], n_results: int = 5, category: str = None, tags: List[str] = None
+) -> List[str]:
+    """
+    retrieve_many() formatted per query for LLM prompts.
+
+    A chunk is shown once, under the query it matched best; the other
+    queries note how many of their matches are listed elsewhere.
+    """
+    per_query = retrieve_many(queries, n_results=n_results, category=category, tags=tags)
+    texts = []
+    for qi, results in enumerate(per_query):
+        shared = sum(
+            1
+            for other, hits in enumerate(per_query)
+            if other != qi
+            for hit in hits
+            if qi in hit.get("matched_queries", [])
+        )
+        if not results and shared:
+            texts.append(
+                f"All {shared} matching policy excerpt(s) for this query are listed under the other queries."
+            )
+            continue
+        text = format_results_as_text(results)
+        if shared:
+            text += f"\n({shared} more matching excerpt(s) listed under the other queries.)"
+        texts.append(text)
+    return texts
+
+
 # ---------------------------------------------------------------------------
 # Document Management
 # ---------------------------------------------------------------------------
 
 
 def list_documents() -> List[Dict]:
-    """List all unique documents in the RAG system."""
-    collection = _get_collection()
-    if collection.count() == 0:
-        return []
-    all_data = collection.get()
-    if not all_data or not all_data["metadatas"]:
-        return []
-    docs = {}
-    for metadata in all_data["metadatas"]:
-        fh = metadata.get("file_hash", "")
-        if fh and fh not in docs:
-            docs[fh] = {
-                "file_name": metadata.get("file_name", "unknown"),
-                "file_hash": fh,
-                "category": metadata.get("category", ""),
-                "tags": metadata.get("tags", ""),
-                "total_chunks": metadata.get("total_chunks", 0),
-                "ingested_at": metadata.get("ingested_at", ""),
-            }
-    return list(docs.values())
+    """List all unique documents in the RAG system (served from the catalog)."""
+    if _remote():
+        return _remote().call("list_documents")
+    return _get_catalog().list_documents()
 
 
 def delete_document(file_hash: str) -> Dict:
+    if _remote():
+        return _remote().call("delete_document", file_hash=file_hash)
     collection = _get_collection()
     collection.delete(where={"file_hash": file_hash})
+    _get_keyword_index().delete_file(file_hash)
+    if _partitions_live():
+        _mirror_delete(where={"file_hash": file_hash})
+    _get_catalog().delete(file_hash)
+    _bump_corpus_version()
     return {"file_hash": file_hash, "status": "deleted"}
 
 
 def delete_document_by_name(file_name: str) -> Dict:
-    collection = _get_collection()
-    results = collection.get(where={"file_name": file_name}, limit=1)
-    if not results or not results["metadatas"]:
-        return {"file_name": file_name, "status": "not found"}
-    return delete_document(results["metadatas"][0].get("file_hash", ""))
+    if _remote():
+        return _remote().call("delete_document_by_name", file_name=file_name)
+    file_hashes = _get_catalog().hashes_for_name(file_name)
+    if not file_hashes:
+        # Not catalogued (e.g. catalog out of sync) - fall back to Chroma
+        collection = _get_collection()
+        results = collection.get(where={"file_name": file_name}, limit=1)
+        if not results or not results["metadatas"]:
+            return {"file_name": file_name, "status": "not found"}
+        file_hashes = [results["metadatas"][0].get("file_hash", "")]
+    return delete_document(file_hashes[0])
 
 
 def get_stats() -> Dict:
-    collection = _get_collection()
-    docs = list_documents()
+    """Document/chunk counts and categories from the catalog (no Chroma scan),
+    plus embedding cache hit rates and search latency for this process
+    (for the service process when RAG_SERVICE_URL is set)."""
+    if _remote():
+        return _remote().call("get_stats")
+    stats = _get_catalog().stats()
     return {
-        "total_chunks": collection.count(),
-        "total_documents": len(docs),
-        "categories": list(set(d["category"] for d in docs if d.get("category"))),
+        "total_chunks": stats["total_chunks"],
+        "total_documents": stats["total_documents"],
+        "categories": stats["categories"],
         "storage_dir": str(CHROMA_DIR),
         "upload_dir": str(UPLOAD_DIR),
+        "embedding_cache": _get_embedder().stats(),
+        "retrieval": retrieval_stats(),
     }
 
 
 def reset_rag():
-    global _chroma_client, _collection
-    _chroma_client = None
-    _collection = None
-    import shutil
+    """Delete every document.
 
-    if CHROMA_DIR.exists():
-        shutil.rmtree(CHROMA_DIR)
-    CHROMA_DIR.mkdir(parents=True, exist_ok=True)
+    Drops the collection through the client rather than deleting rag_chroma_db
+    from disk, which broke the open store of every other process reading it.
+    """
+    if _remote():
+        return _remote().call("reset_rag")
+    global _collection
+    try:
+        _get_chroma_client().delete_collection(COLLECTION_NAME)
+    except Exception as e:
+        # Never created yet
+        logger.info(f"No RAG collection to delete: {e}")
+    _collection = None
+    _drop_partitions()
+    _get_catalog().clear()
+    _get_keyword_index().clear()
+    if CATEGORY_PARTITIONS:
+        _get_catalog().set_meta("partitions_built", datetime.now().isoformat())
+    _bump_corpus_version()
     return {"status": "RAG system reset complete"}
     
     
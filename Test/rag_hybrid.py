@@ -0,0 +1,405 @@
+# rag_hybrid.py
+"""
+Keyword index, rank fusion and reranking for hybrid RAG retrieval.
+
+Pure vector search ranks exact terms poorly: "DTI 43%", "Regulation Z" or a
+clause number like "3.2" embed close to every other ratio, regulation or
+section, so agents retried with reworded queries (and more LLM turns). The
+hybrid retriever in rag_engine now runs two legs per query and fuses them:
+
+    - vector leg: the Chroma similarity search, unchanged
+    - keyword leg: BM25 over chunk text, from a SQLite FTS5 index kept
+      beside rag_chroma_db and maintained incrementally by rag_engine on
+      ingest, update, delete and reset (no rebuild per write)
+    - reciprocal rank fusion (RRF) of the two rankings, which needs no score
+      calibration between cosine distances and BM25
+    - optionally, a CPU cross-encoder rerank of the fused top-k, skipped
+      when the latency budget is already spent
+
+A store that predates the index is indexed from the collection on first
+use; repair it at any time with ``python manage.py rebuild_rag_catalog``.
+"""
+
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bank_app.db_utils import sqlite_transaction
+
+logger = logging.getLogger(__name__)
+
+# Chunks fetched per page while rebuilding from Chroma
+REBUILD_PAGE_SIZE = 1000
+
+# RRF constant from Cormack et al.; dampens the weight of the very top ranks
+RRF_K = 60
+
+# Query terms kept per keyword search (long agent queries are truncated)
+MAX_QUERY_TERMS = 32
+
+# '%' is a token character so "43%" is matched as a whole, not as "43"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rag_chunks (
+    id          INTEGER PRIMARY KEY,
+    chunk_id    TEXT NOT NULL UNIQUE,
+    file_hash   TEXT NOT NULL,
+    file_name   TEXT NOT NULL DEFAULT '',
+    category    TEXT NOT NULL DEFAULT '',
+    tags        TEXT NOT NULL DEFAULT '',
+    chunk_index INTEGER NOT NULL DEFAULT 0,
+    content     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rag_chunks_file ON rag_chunks (file_hash);
+CREATE VIRTUAL TABLE IF NOT EXISTS rag_chunks_fts USING fts5 (
+    content, content='rag_chunks', content_rowid='id',
+    tokenize="unicode61 tokenchars '%'"
+);
+CREATE TRIGGER IF NOT EXISTS rag_chunks_ai AFTER INSERT ON rag_chunks BEGIN
+    INSERT INTO rag_chunks_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS rag_chunks_ad AFTER DELETE ON rag_chunks BEGIN
+    INSERT INTO rag_chunks_fts (rag_chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS rag_chunks_au AFTER UPDATE OF content ON rag_chunks BEGIN
+    INSERT INTO rag_chunks_fts (rag_chunks_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    INSERT INTO rag_chunks_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TABLE IF NOT EXISTS rag_keyword_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_METADATA_COLUMNS = ("file_hash", "file_name", "category", "tags", "chunk_index")
+
+# Words, numbers with decimal points ("3.2", "0.125%") and percentages
+_TERM_RE = re.compile(r"\w+(?:[.,]\w+)*%?")
+
+
+def keyword_query(text: str) -> str:
+    """FTS5 MATCH expression OR-ing the quoted terms of ``text`` ('' if none)."""
+    terms = list(dict.fromkeys(t.lower() for t in _TERM_RE.findall(text)))[:MAX_QUERY_TERMS]
+    # Quoted, so FTS5 operators in user text (AND, NEAR, *, ^) are plain terms;
+    # "3.2" becomes the phrase "3 2"
+    return " OR ".join('"' + t.replace('"', "") + '"' for t in terms)
+
+
+# =============================================================================
+# KEYWORD INDEX
+# =============================================================================
+
+class KeywordIndex:
+    """
+    BM25 index over chunk text (SQLite FTS5, external-content table).
+
+    Rows mirror Chroma chunk records: same ids, text and the metadata needed
+    to filter and display a hit, so keyword-only hits need no Chroma lookup.
+
+    Args:
+        path: SQLite file; created on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite_transaction(self.path)
+
+    # -------------------------------------------------------------------------
+    # State
+    # -------------------------------------------------------------------------
+
+    def is_built(self) -> bool:
+        """True once the index has been populated (by a rebuild or a reset)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM rag_keyword_meta WHERE key = 'built_at'").fetchone()
+        return row is not None
+
+    def _mark_built(self, conn: sqlite3.Connection):
+        conn.execute(
+            "INSERT OR REPLACE INTO rag_keyword_meta (key, value) VALUES ('built_at', ?)",
+            (str(time.time()),),
+        )
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM rag_chunks").fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _rows(ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict]) -> List[Tuple]:
+        rows = []
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            metadata = metadata or {}
+            rows.append(
+                (
+                    chunk_id,
+                    metadata.get("file_hash", ""),
+                    metadata.get("file_name", ""),
+                    metadata.get("category", ""),
+                    metadata.get("tags", ""),
+                    metadata.get("chunk_index", 0),
+                    document or "",
+                )
+            )
+        return rows
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, rows: List[Tuple]):
+        # Explicit delete: rows removed by INSERT OR REPLACE would skip the
+        # FTS delete trigger (recursive_triggers is off) and leave stale postings
+        conn.executemany("DELETE FROM rag_chunks WHERE chunk_id = ?", [(row[0],) for row in rows])
+        conn.executemany(
+            "INSERT INTO rag_chunks "
+            "(chunk_id, file_hash, file_name, category, tags, chunk_index, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def add(self, ids: Sequence[str], documents: Sequence[str], metadatas: Sequence[Dict]):
+        """Index chunks (replacing any with the same ids), as passed to collection.add/upsert."""
+        rows = self._rows(ids, documents, metadatas)
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            self._insert(conn, rows)
+
+    def update_metadata(self, ids: Sequence[str], metadatas: Sequence[Dict]):
+        """Rewrite metadata of indexed chunks; their text (and postings) are untouched."""
+        rows = [
+            tuple((metadata or {}).get(col, 0 if col == "chunk_index" else "") for col in _METADATA_COLUMNS)
+            + (chunk_id,)
+            for chunk_id, metadata in zip(ids, metadatas)
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE rag_chunks SET file_hash = ?, file_name = ?, category = ?, tags = ?, chunk_index = ? "
+                "WHERE chunk_id = ?",
+                rows,
+            )
+
+    def delete_ids(self, ids: Sequence[str]):
+        with self._lock, self._connect() as conn:
+            conn.executemany("DELETE FROM rag_chunks WHERE chunk_id = ?", [(chunk_id,) for chunk_id in ids])
+
+    def delete_file(self, file_hash: str) -> int:
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM rag_chunks WHERE file_hash = ?", (file_hash,))
+        return cursor.rowcount
+
+    def replace_all(self, pages: Iterable[Tuple[Sequence[str], Sequence[str], Sequence[Dict]]]) -> int:
+        """Swap the whole index for the chunks in ``pages`` in one transaction."""
+        count = 0
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM rag_chunks")
+            for ids, documents, metadatas in pages:
+                rows = self._rows(ids, documents, metadatas)
+                self._insert(conn, rows)
+                count += len(rows)
+            conn.execute("INSERT INTO rag_chunks_fts (rag_chunks_fts) VALUES ('optimize')")
+            self._mark_built(conn)
+        return count
+
+    def clear(self):
+        """Empty the index (after a store reset); it stays marked as built."""
+        self.replace_all([])
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def search(
+        self, query: str, limit: int = 20, category: str = None, tags: List[str] = None
+    ) -> List[Dict]:
+        """
+        BM25-ranked chunks matching any term of ``query``.
+
+        ``category`` and ``tags`` filter like rag_engine's Chroma filter (exact
+        category, any of ``tags`` among the stored comma-joined tags). Hits are in the
+        rag_engine result format plus ``bm25`` (higher is better).
+        """
+        match = keyword_query(query)
+        if not match or limit <= 0:
+            return []
+        sql = (
+            "SELECT c.chunk_id, c.file_name, c.category, c.tags, c.chunk_index, c.content, "
+            "bm25(rag_chunks_fts) AS score "
+            "FROM rag_chunks_fts JOIN rag_chunks c ON c.id = rag_chunks_fts.rowid "
+            "WHERE rag_chunks_fts MATCH ?"
+        )
+        params: List = [match]
+        if category:
+            sql += " AND c.category = ?"
+            params.append(category)
+        if tags:
+            sql += " AND (" + " OR ".join("instr(',' || c.tags || ',', ?) > 0" for _ in tags) + ")"
+            params.extend(f",{tag}," for tag in tags)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {
+                "content": content,
+                "file_name": file_name,
+                "category": category_value,
+                "tags": tags_value,
+                "chunk_index": chunk_index,
+                "chunk_id": chunk_id,
+                # FTS5's bm25() is negated so that ORDER BY ascending ranks best first
+                "bm25": round(-score, 4),
+            }
+            for chunk_id, file_name, category_value, tags_value, chunk_index, content, score in rows
+        ]
+
+
+# =============================================================================
+# REBUILD FROM CHROMA
+# =============================================================================
+
+def _collection_pages(collection, page_size: int):
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        ids = page.get("ids") or []
+        if ids:
+            yield ids, page.get("documents") or [""] * len(ids), page.get("metadatas") or [{}] * len(ids)
+        if len(ids) < page_size:
+            break
+        offset += page_size
+
+
+def rebuild_from_collection(index: KeywordIndex, collection, page_size: int = REBUILD_PAGE_SIZE) -> Dict[str, int]:
+    """
+    Re-index every chunk of the collection (text and metadata, no embeddings).
+
+    Returns:
+        Dict with the number of chunks now indexed.
+    """
+    start = time.perf_counter()
+    chunks = index.replace_all(_collection_pages(collection, page_size))
+    logger.info(f"Rebuilt RAG keyword index: {chunks} chunks in {time.perf_counter() - start:.2f}s")
+    return {"chunks": chunks}
+
+
+# =============================================================================
+# FUSION
+# =============================================================================
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> Dict[str, float]:
+    """Sum of 1 / (k + rank) over every ranking a key appears in (rank from 1)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+def fuse(vector_hits: List[Dict], keyword_hits: List[Dict], n_results: int, k: int = RRF_K) -> List[Dict]:
+    """
+    Merge the two legs' hits by reciprocal rank fusion.
+
+    Each fused hit keeps its vector ``distance`` and ``relevance_score``
+    (1.0 and 0.0 if only the keyword leg found it) and records
+    ``vector_rank`` / ``keyword_rank`` (None when absent). The fused value,
+    which sets the order, is ``rrf_score``: it only compares hits of the
+    same fusion and is not a similarity.
+    """
+    hits: Dict[str, Dict] = {}
+    rankings: List[List[str]] = []
+    for leg, leg_hits in (("vector_rank", vector_hits), ("keyword_rank", keyword_hits)):
+        ranking = []
+        for rank, hit in enumerate(leg_hits, 1):
+            key = hit.get("chunk_id") or f"{hit['file_name']}#{hit['chunk_index']}"
+            fused = hits.get(key)
+            if fused is None:
+                fused = dict(hit)
+                fused.pop("bm25", None)
+                fused.setdefault("distance", 1.0)
+                fused.setdefault("relevance_score", 0.0)
+                fused["vector_rank"] = fused["keyword_rank"] = None
+                hits[key] = fused
+            fused[leg] = rank
+            ranking.append(key)
+        rankings.append(ranking)
+
+    scores = reciprocal_rank_fusion(rankings, k=k)
+    ranked = sorted(hits, key=lambda key: -scores[key])[:n_results]
+    fused_hits = []
+    for key in ranked:
+        hit = hits[key]
+        hit["rrf_score"] = round(scores[key], 6)
+        fused_hits.append(hit)
+    return fused_hits
+
+
+# =============================================================================
+# CROSS-ENCODER RERANKER
+# =============================================================================
+
+class CrossEncoderReranker:
+    """
+    Optional CPU cross-encoder (sentence-transformers), loaded on first use.
+
+    If sentence-transformers or the model is unavailable the reranker
+    disables itself after one warning and hybrid retrieval returns the fused
+    order. ``ms_per_pair`` is a running estimate used for budget checks.
+
+    Args:
+        model_name: Hugging Face cross-encoder id.
+        max_length: Token limit per (query, chunk) pair.
+    """
+
+    def __init__(self, model_name: str, max_length: int = 512):
+        self.model_name = model_name
+        self.max_length = max_length
+        self._model = None
+        self._failed = False
+        self._lock = threading.Lock()
+        self.ms_per_pair: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        return self._load() is not None
+
+    def _load(self):
+        if self._model is None and not self._failed:
+            with self._lock:
+                if self._model is None and not self._failed:
+                    try:
+                        from sentence_transformers import CrossEncoder
+
+                        self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+                    except Exception as e:
+                        self._failed = True
+                        logger.warning(f"Cross-encoder reranking disabled ({self.model_name}): {e}")
+        return self._model
+
+    def estimate_ms(self, pairs: int) -> float:
+        """Expected cost of scoring ``pairs`` pairs (0 until a first measurement)."""
+        return (self.ms_per_pair or 0.0) * pairs
+
+    def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Relevance probability (sigmoid of the model logit) per (query, text) pair."""
+        model = self._load()
+        if model is None or not pairs:
+            return []
+        start = time.perf_counter()
+        logits = model.predict(pairs, show_progress_bar=False)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        per_pair = elapsed_ms / len(pairs)
+        self.ms_per_pair = per_pair if self.ms_per_pair is None else 0.8 * self.ms_per_pair + 0.2 * per_pair
+        return [1.0 / (1.0 + math.exp(-float(logit))) for logit in logits]
@@ -0,0 +1,438 @@
+# rag_service.py
+"""
+Optional retrieval service: one process owns the RAG store.
+
+Every Django worker, the Streamlit upload app and each crew tool call used
+to open rag_chroma_db with its own PersistentClient: one copy of the HNSW
+index in memory per process, SQLite lock contention between them under
+load, and reset_rag deleting the store under other processes' readers.
+With RAG_SERVICE_URL set, rag_engine's public functions (retrieve,
+retrieve_many, ingest_document, delete_*, list_documents, get_stats,
+reset_rag, rebuild_*, migrate_tag_metadata) and rag_bulk_ingest.bulk_ingest
+forward to this service instead of touching the store:
+
+    - the service is the only process with Chroma, the catalog, the keyword
+      index and the embedding model loaded
+    - queries run concurrently; ingest, delete and reset take an exclusive
+      lock, so no query ever sees a half-reset store
+    - JSON over HTTP/1.1 (keep-alive) on a Unix socket or localhost TCP,
+      standard library only
+
+Unset (the default), everything stays in-process as before.
+
+The RPC has no authentication, so the service only listens on a Unix
+socket or a loopback address (127.0.0.1, ::1, localhost), and it only
+reads or writes files under rag_engine.UPLOAD_DIR for ingest_document and
+bulk_ingest.
+
+Configuration (environment):
+    RAG_SERVICE_URL      unix:/path/to/rag.sock or http://127.0.0.1:8765
+    RAG_SERVICE_TIMEOUT  client timeout in seconds (default 300, ingest can be slow)
+
+Run:
+    python rag_service.py --url unix:/tmp/rag_service.sock
+    RAG_SERVICE_URL=unix:/tmp/rag_service.sock python manage.py runserver
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+DEFAULT_TIMEOUT = 300.0
+
+# The only TCP hosts the service may listen on or be reached at
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+
+# method -> path arguments the service opens on the caller's behalf
+_PATH_ARGUMENTS = {
+    "ingest_document": ("file_path",),
+    "bulk_ingest": ("source", "report_path"),
+}
+
+# method -> (module, function, exclusive). Exclusive methods write the store.
+_METHODS = {
+    "retrieve": ("rag_engine", "retrieve", False),
+    "retrieve_many": ("rag_engine", "retrieve_many", False),
+    "list_documents": ("rag_engine", "list_documents", False),
+    "get_stats": ("rag_engine", "get_stats", False),
+    "ingest_document": ("rag_engine", "ingest_document", True),
+    "delete_document": ("rag_engine", "delete_document", True),
+    "delete_document_by_name": ("rag_engine", "delete_document_by_name", True),
+    "reset_rag": ("rag_engine", "reset_rag", True),
+    "rebuild_catalog": ("rag_engine", "rebuild_catalog", True),
+    "rebuild_keyword_index": ("rag_engine", "rebuild_keyword_index", True),
+    "rebuild_partitions": ("rag_engine", "rebuild_partitions", True),
+    "migrate_tag_metadata": ("rag_engine", "migrate_tag_metadata", True),
+    "bulk_ingest": ("rag_bulk_ingest", "bulk_ingest", True),
+}
+
+
+# Read methods whose category-filtered searches may need the partitions built
+_SEARCH_METHODS = ("retrieve", "retrieve_many")
+
+
+class RAGServiceError(RuntimeError):
+    """The service could not be reached or the call failed inside it."""
+
+
+def _json_default(value):
+    # numpy scalars (Chroma distances) and paths
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def parse_url(url: str) -> Tuple[str, Any]:
+    """("unix", socket_path) or ("tcp", (host, port)) for a RAG_SERVICE_URL."""
+    if url.startswith("unix:"):
+        path = url[len("unix:"):]
+        if path.startswith("//"):
+            path = path[2:]
+        if not path:
+            raise ValueError(f"No socket path in RAG service URL: {url}")
+        return "unix", path
+    parsed = urlparse(url)
+    if parsed.scheme != "http" or not parsed.hostname:
+        raise ValueError(f"RAG service URL must be unix:/path or http://host:port, got {url!r}")
+    if parsed.hostname not in LOOPBACK_HOSTS:
+        raise ValueError(
+            f"RAG service has no authentication and only uses loopback hosts "
+            f"({', '.join(LOOPBACK_HOSTS)}), got {parsed.hostname!r}"
+        )
+    return "tcp", (parsed.hostname, parsed.port or 80)
+
+
+def check_upload_path(path) -> Path:
+    """``path`` resolved, if it lies under rag_engine.UPLOAD_DIR; PermissionError otherwise."""
+    import rag_engine
+
+    root = Path(rag_engine.UPLOAD_DIR).resolve()
+    resolved = Path(path).resolve()
+    if resolved != root and root not in resolved.parents:
+        raise PermissionError(f"RAG service only accesses files under {root}, got {path}")
+    return resolved
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class ReadWriteLock:
+    """Any number of readers or one writer; a waiting writer blocks new readers."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "RAGService/1.0"
+
+    def log_message(self, format, *args):
+        # address_string() fails on Unix sockets (no client address)
+        logger.debug("rag_service: " + format % args)
+
+    def _send(self, status: int, payload: Dict):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        self._send(200, self.server.service.health())
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            kwargs = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        method = self.path[len("/rpc/"):] if self.path.startswith("/rpc/") else ""
+        if method not in _METHODS:
+            self._send(404, {"error": f"Unknown RAG service method {method!r}"})
+            return
+        try:
+            result = self.server.service.dispatch(method, kwargs)
+        except PermissionError as e:
+            self._send(403, {"error": f"{method}: {e}"})
+        except TypeError as e:
+            self._send(400, {"error": f"{method}: {e}"})
+        except Exception as e:
+            logger.exception(f"RAG service call {method} failed")
+            self._send(500, {"error": f"{method}: {type(e).__name__}: {e}"})
+        else:
+            self._send(200, {"result": result})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _IPv6HTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_INET6
+
+
+class RAGService:
+    """
+    Serves rag_engine calls to other processes.
+
+    Args:
+        url: Where to listen (see parse_url); a stale socket file is replaced.
+    """
+
+    def __init__(self, url: str = DEFAULT_URL):
+        self.url = url
+        self.lock = ReadWriteLock()
+        self.started_at = time.time()
+        self._counts = {"requests": 0, "errors": 0}
+        self._counts_lock = threading.Lock()
+        kind, address = parse_url(url)
+        if kind == "unix":
+            if os.path.exists(address):
+                os.unlink(address)
+            self.server = _UnixHTTPServer(address, _Handler)
+        else:
+            server_class = _IPv6HTTPServer if ":" in address[0] else ThreadingHTTPServer
+            self.server = server_class(address, _Handler)
+            self.server.daemon_threads = True
+        self.server.service = self
+        self._thread = None
+
+    def dispatch(self, method: str, kwargs: Dict) -> Any:
+        import importlib
+
+        import rag_engine
+
+        module_name, function_name, exclusive = _METHODS[method]
+        function = getattr(importlib.import_module(module_name), function_name)
+        for name in _PATH_ARGUMENTS.get(method, ()):
+            if kwargs.get(name) is not None:
+                kwargs[name] = check_upload_path(kwargs[name])
+
+        # Calls made by this thread run against the local store, never back
+        # through RAG_SERVICE_URL
+        rag_engine._in_service.active = True
+
+        # The lazy partition rebuild of a category-filtered search drops and
+        # recreates collections, so it runs under the write lock rather than
+        # beside other readers
+        if method in _SEARCH_METHODS and rag_engine.partitions_pending():
+            self.lock.acquire_write()
+            try:
+                if rag_engine.partitions_pending():
+                    rag_engine.rebuild_partitions()
+            finally:
+                self.lock.release_write()
+
+        acquire, release = (
+            (self.lock.acquire_write, self.lock.release_write)
+            if exclusive
+            else (self.lock.acquire_read, self.lock.release_read)
+        )
+        acquire()
+        try:
+            return function(**kwargs)
+        except Exception:
+            with self._counts_lock:
+                self._counts["errors"] += 1
+            raise
+        finally:
+            release()
+            with self._counts_lock:
+                self._counts["requests"] += 1
+
+    def health(self) -> Dict:
+        with self._counts_lock:
+            counts = dict(self._counts)
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "url": self.url,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            **counts,
+        }
+
+    def warm_up(self):
+        """Open the store, catalog, keyword index and embedding model up front."""
+        import rag_engine
+
+        rag_engine._in_service.active = True
+        start = time.perf_counter()
+        rag_engine._get_collection()
+        rag_engine._get_catalog()
+        rag_engine._get_keyword_index()
+        try:
+            rag_engine.embed_texts(["warm-up"])
+        except Exception as e:
+            logger.warning(f"RAG service: embedding model not loaded at startup: {e}")
+        logger.info(f"RAG service warm-up took {time.perf_counter() - start:.2f}s")
+
+    def serve_forever(self):
+        logger.info(f"RAG service listening on {self.url} (pid {os.getpid()})")
+        self.server.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """Serve from a daemon thread (tests, or embedding in another server)."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="rag-service", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        kind, address = parse_url(self.url)
+        if kind == "unix" and os.path.exists(address):
+            os.unlink(address)
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.unix_path)
+        self.sock = sock
+
+
+class RAGServiceClient:
+    """
+    Thin client used by rag_engine when RAG_SERVICE_URL is set.
+
+    Keeps one keep-alive connection per thread.
+
+    Args:
+        url: Service address (see parse_url).
+        timeout: Seconds per call.
+    """
+
+    def __init__(self, url: str, timeout: float = None):
+        self.url = url
+        self.timeout = timeout or float(os.environ.get("RAG_SERVICE_TIMEOUT", DEFAULT_TIMEOUT))
+        self._kind, self._address = parse_url(url)
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._kind == "unix":
+                conn = _UnixHTTPConnection(self._address, self.timeout)
+            else:
+                conn = http.client.HTTPConnection(*self._address, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, verb: str, path: str, body: bytes = None) -> Dict:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in (1, 2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request(verb, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException, OSError) as e:
+                conn.close()
+                self._local.conn = None
+                # A kept-alive connection the service already closed: retry once
+                if attempt == 1 and reused and isinstance(
+                    e, (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+                ):
+                    continue
+                raise RAGServiceError(f"RAG service unreachable at {self.url}: {e}") from e
+        try:
+            data = json.loads(payload or b"{}")
+        except ValueError as e:
+            raise RAGServiceError(f"Invalid response from RAG service: {e}") from e
+        if response.status != 200:
+            raise RAGServiceError(data.get("error") or f"RAG service returned HTTP {response.status}")
+        return data
+
+    def call(self, method: str, **kwargs) -> Any:
+        body = json.dumps(kwargs, default=_json_default).encode("utf-8")
+        return self._request("POST", f"/rpc/{method}", body)["result"]
+
+    def health(self) -> Dict:
+        return self._request("GET", "/health")
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the RAG store to other processes")
+    parser.add_argument(
+        "--url",
+        default=os.environ.get("RAG_SERVICE_URL") or DEFAULT_URL,
+        help="unix:/path/to/socket or http://127.0.0.1:port",
+    )
+    parser.add_argument("--no-warm-up", action="store_true", help="load the store on the first request instead")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    service = RAGService(args.url)
+    if not args.no_warm_up:
+        service.warm_up()
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
@@ -5,6 +5,7 @@
 # Run: streamlit run rag_upload_app.py
 # ---------------------------------------------------------------------------
 
+import json
 import streamlit as st
 from pathlib import Path
 from datetime import datetime
@@ -21,6 +22,7 @@ from rag_engine import (
     SUPPORTED_EXTENSIONS,
     UPLOAD_DIR,
 )
+from rag_bulk_ingest import bulk_ingest, DEFAULT_WORKERS
 
 st.set_page_config(
     page_title="RAG Policy Document Manager",
@@ -125,6 +127,11 @@ with tab1:
             "Tags (comma-separated)",
             placeholder="e.g., FICO, DTI, mortgage, personal-loan",
         )
+        update_existing = st.checkbox(
+            "Replace earlier revisions (same file name)",
+            value=True,
+            help="Re-embeds only the chunks that changed since the previous upload of this file.",
+        )
 
     if uploaded_files and st.button(
         "🚀 Ingest Documents", type="primary", use_container_width=True
@@ -142,13 +149,19 @@ with tab1:
                 i / len(uploaded_files), text=f"Ingesting: {file.name}..."
             )
             result = ingest_from_bytes(
-                file_bytes=file_bytes, file_name=file.name, category=category, tags=tags
+                file_bytes=file_bytes,
+                file_name=file.name,
+                category=category,
+                tags=tags,
+                update=update_existing,
             )
             results.append(result)
         progress_bar.progress(1.0, text="Complete!")
 
         st.markdown("---")
-        success_count = sum(1 for r in results if r["status"].startswith("success"))
+        success_count = sum(
+            1 for r in results if r["status"].startswith(("success", "updated"))
+        )
         skipped_count = sum(1 for r in results if r["status"].startswith("skipped"))
         error_count = sum(1 for r in results if r["status"].startswith("error"))
 
@@ -158,6 +171,13 @@ with tab1:
                     f'<div class="success-box">✅ <strong>{result["file_name"]}</strong> — {result["total_chunks"]} chunks ingested</div>',
                     unsafe_allow_html=True,
                 )
+            elif result["status"] == "updated":
+                st.markdown(
+                    f'<div class="success-box">🔄 <strong>{result["file_name"]}</strong> — updated: '
+                    f'{result["chunks_added"]} new, {result["chunks_removed"]} removed, '
+                    f'{result["embeddings_saved"]} unchanged chunks not re-embedded</div>',
+                    unsafe_allow_html=True,
+                )
             elif result["status"].startswith("skipped"):
                 st.markdown(
                     f'<div class="info-box">⏭️ <strong>{result["file_name"]}</strong> — {result["status"]}</div>',
@@ -174,6 +194,81 @@ with tab1:
         )
         st.rerun()
 
+    # Bulk import: a whole corpus as an archive or a folder on the server
+    with st.expander("📦 Bulk import (archive or server folder)"):
+        st.caption(
+            "Ingests every supported document in a .zip / .tar.gz archive or a folder, "
+            "extracting in parallel. Re-running resumes: documents already in the "
+            "database are skipped. Uses the category and tags selected above."
+        )
+        archive = st.file_uploader(
+            "Archive", type=["zip", "tar", "gz", "tgz"], key="bulk_archive"
+        )
+        folder = st.text_input(
+            "...or server folder path", placeholder="/data/regulator_corpus"
+        )
+        bcol1, bcol2 = st.columns(2)
+        with bcol1:
+            workers = st.number_input(
+                "Extraction workers", min_value=1, max_value=32, value=DEFAULT_WORKERS
+            )
+        with bcol2:
+            batch_size = st.number_input(
+                "Chunks per write", min_value=16, max_value=4096, value=256, step=16
+            )
+
+        if (archive or folder.strip()) and st.button(
+            "🚀 Bulk Ingest", type="primary", use_container_width=True
+        ):
+            tags = (
+                [t.strip() for t in tags_input.split(",") if t.strip()]
+                if tags_input
+                else []
+            )
+            if archive:
+                source = UPLOAD_DIR / archive.name
+                source.write_bytes(archive.read())
+            else:
+                source = Path(folder.strip())
+
+            bulk_progress = st.progress(0, text="Scanning...")
+
+            def on_progress(done, total, entry):
+                bulk_progress.progress(
+                    done / max(total, 1), text=f"[{done}/{total}] {entry['file_name']}"
+                )
+
+            try:
+                report = bulk_ingest(
+                    source,
+                    category=category,
+                    tags=tags,
+                    workers=int(workers),
+                    batch_size=int(batch_size),
+                    progress=on_progress,
+                )
+            except FileNotFoundError as e:
+                st.error(str(e))
+            else:
+                bulk_progress.progress(1.0, text="Complete!")
+                summary = report["summary"]
+                st.markdown(
+                    f"**Summary:** {summary['ingested']} ingested, {summary['skipped']} skipped, "
+                    f"{summary['errors']} errors — {summary['chunks_written']} chunks in {summary['seconds']}s"
+                )
+                for entry in report["files"]:
+                    if entry["status"].startswith("error"):
+                        st.markdown(
+                            f'<div class="error-box">❌ <strong>{entry["file_name"]}</strong> — {entry["status"]}</div>',
+                            unsafe_allow_html=True,
+                        )
+                st.download_button(
+                    "⬇️ Download report (JSON)",
+                    data=json.dumps(report, indent=2),
+                    file_name="bulk_ingest_report.json",
+                    mime="application/json",
+                )
+
 # Tab 2: Document Library
 with tab2:
     st.markdown(
@@ -283,5 +378,7 @@ with tab3:
                             st.markdown(
                                 f"**Relevance Score:** {result['relevance_score']:.1%}"
                             )
+                            if result.get("rrf_score") is not None:
+                                st.markdown(f"**Fused Rank Score (RRF):** {result['rrf_score']:.4f}")
                             st.markdown("---")
                             st.markdown(result["content"])
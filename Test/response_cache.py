@@ -0,0 +1,425 @@
+# response_cache.py
+"""
+Two-tier response cache for crew outputs.
+
+FD/TD analysis and research questions repeat a lot ("best 1-year FD rates in
+India"), and every repeat used to redo all search, scraping and LLM work.
+Crew results are cached on local disk (SQLite) keyed on
+(crew_type, region, normalized query):
+
+    1. exact    - SHA-256 of the normalized key
+    2. semantic - cosine similarity between query embeddings, within the same
+                  crew type and region, above RESPONSE_CACHE_SIMILARITY
+
+Entries expire after a per-crew-type TTL and the store is bounded: the least
+recently used entries are evicted once it holds more than
+RESPONSE_CACHE_MAX_ENTRIES rows. Rate-dependent entries are dropped whenever
+interest_rates_catalog changes (see invalidate_rates).
+
+Crews with side effects are never cached: AML (case files, compliance
+decisions), loan creation (writes applications) and the FD advisor (creates
+deposits and sends emails).
+
+Configuration (environment):
+    RESPONSE_CACHE_PATH         SQLite file (default outputs/cache/crew_response_cache.sqlite3)
+    RESPONSE_CACHE_MAX_ENTRIES  LRU bound (default 1000)
+    RESPONSE_CACHE_SIMILARITY   semantic tier threshold (default 0.92)
+    RESPONSE_CACHE_TTLS         JSON object overriding TTL seconds per crew type
+    RESPONSE_CACHE_DISABLED     set to "1" to bypass the cache
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from bank_app.db_utils import sqlite_transaction
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, "outputs", "cache", "crew_response_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_SIMILARITY = 0.92
+
+# TTL in seconds per cacheable crew type; crew types not listed are not cached
+DEFAULT_CREW_TTLS = {
+    "analysis": 15 * 60,
+    "research": 30 * 60,
+    "fd_template": 60 * 60,
+}
+
+# Crews with side effects; never cached even if a TTL is configured
+NEVER_CACHED_CREWS = frozenset({"aml", "loan_creation", "fd_advisor"})
+
+# Crews whose free-text queries are matched by embedding similarity
+SEMANTIC_CREWS = frozenset({"analysis", "research"})
+
+# Crews whose answers depend on interest_rates_catalog
+RATE_DEPENDENT_CREWS = frozenset({"analysis", "research", "fd_template"})
+
+TIER_EXACT = "exact"
+TIER_SEMANTIC = "semantic"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crew_response_cache (
+    cache_key   TEXT PRIMARY KEY,
+    crew_type   TEXT NOT NULL,
+    region      TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    numbers     TEXT NOT NULL,
+    embedding   BLOB,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_crc_scope ON crew_response_cache (crew_type, region, expires_at);
+CREATE INDEX IF NOT EXISTS idx_crc_lru ON crew_response_cache (last_access);
+"""
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+# =============================================================================
+# KEYS
+# =============================================================================
+
+def normalize_query(query: Any) -> str:
+    """Lower-case, collapse whitespace and drop trailing punctuation; dicts are serialized sorted."""
+    if isinstance(query, dict):
+        return json.dumps(query, sort_keys=True, default=str)
+    text = re.sub(r"\s+", " ", str(query or "").lower()).strip()
+    return text.rstrip("?.! ")
+
+
+def make_cache_key(crew_type: str, query: Any, region: Optional[str]) -> str:
+    raw = "\x1f".join([crew_type.lower(), (region or "").upper(), normalize_query(query)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _numbers(normalized: str) -> str:
+    # "1-year" and "2-year" embed almost identically; never let the semantic
+    # tier match queries that mention different figures
+    return " ".join(sorted(_NUMBER_RE.findall(normalized)))
+
+
+# =============================================================================
+# EMBEDDINGS
+# =============================================================================
+
+def _unit(vector: List[float]) -> Optional[array]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if not norm:
+        return None
+    return array("f", (v / norm for v in vector))
+
+
+def _dot(a: array, b: array) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def default_embedder() -> Optional[Callable[[str], List[float]]]:
+    """
+    Embedding function used by the semantic tier.
+
+    Uses ChromaDB's default (all-MiniLM-L6-v2, ONNX) embedding function, the
+    same model rag_engine's collections use. Returns None when chromadb is not
+    installed, in which case only the exact tier is active.
+    """
+    try:
+        from chromadb.utils import embedding_functions
+    except ImportError:
+        logger.info("chromadb not installed; response cache runs exact-match only")
+        return None
+
+    embedding_function = embedding_functions.DefaultEmbeddingFunction()
+    return lambda text: [float(v) for v in embedding_function([text])[0]]
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class CachedCrewOutput:
+    """Stand-in for a CrewOutput served from the cache (exposes ``raw``)."""
+
+    def __init__(self, raw: str, cache_info: Optional[Dict[str, Any]] = None):
+        self.raw = raw
+        self.cache_info = cache_info or {}
+        self.tasks_output = []
+
+    def __str__(self):
+        return self.raw
+
+
+class ResponseCache:
+    """
+    SQLite-backed exact + semantic cache of crew responses.
+
+    Args:
+        path: SQLite file; created on first use.
+        max_entries: LRU bound on stored responses.
+        similarity: Minimum cosine similarity for a semantic hit.
+        ttls: TTL seconds per crew type; crew types not listed are not cached.
+        embedder: ``text -> vector`` callable, or None for exact-match only.
+            Defaults to default_embedder(), created lazily on first use.
+    """
+
+    _EMBEDDER_UNSET = object()
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        similarity: float = DEFAULT_SIMILARITY,
+        ttls: Optional[Dict[str, int]] = None,
+        embedder: Any = _EMBEDDER_UNSET,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.ttls = dict(DEFAULT_CREW_TTLS if ttls is None else ttls)
+        self._embedder = embedder
+        self._lock = threading.Lock()
+        self._vectors: "OrderedDict[str, Optional[array]]" = OrderedDict()
+        self._counters = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "invalidated": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite_transaction(self.path)
+
+    def is_cacheable(self, crew_type: str) -> bool:
+        return crew_type not in NEVER_CACHED_CREWS and self.ttls.get(crew_type, 0) > 0
+
+    def _embed(self, crew_type: str, normalized: str) -> Optional[array]:
+        if crew_type not in SEMANTIC_CREWS:
+            return None
+        if self._embedder is self._EMBEDDER_UNSET:
+            try:
+                self._embedder = default_embedder()
+            except Exception as e:
+                logger.warning(f"Response cache embedder unavailable: {e}")
+                self._embedder = None
+        if self._embedder is None:
+            return None
+
+        # The same query is embedded on lookup and again on store after a miss
+        with self._lock:
+            if normalized in self._vectors:
+                self._vectors.move_to_end(normalized)
+                return self._vectors[normalized]
+        try:
+            vector = _unit(self._embedder(normalized))
+        except Exception as e:
+            logger.warning(f"Response cache embedding failed: {e}")
+            return None
+        with self._lock:
+            self._vectors[normalized] = vector
+            if len(self._vectors) > 256:
+                self._vectors.popitem(last=False)
+        return vector
+
+    def get(self, crew_type: str, query: Any, region: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            The stored response dict with a "cache" entry (tier, similarity,
+            age_seconds) added, or None on a miss.
+        """
+        crew_type = crew_type.lower()
+        if not self.is_cacheable(crew_type):
+            return None
+
+        now = time.time()
+        key = make_cache_key(crew_type, query, region)
+        similarity = 1.0
+        tier = TIER_EXACT
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT cache_key, response, created_at FROM crew_response_cache "
+                "WHERE cache_key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+
+        if row is None:
+            row, similarity = self._semantic_lookup(crew_type, query, region, now)
+            tier = TIER_SEMANTIC
+
+        with self._lock:
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters[f"{tier}_hits"] += 1
+
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE crew_response_cache SET last_access = ?, hits = hits + 1 WHERE cache_key = ?",
+                (now, row[0]),
+            )
+
+        response = json.loads(row[1])
+        response["cache"] = {
+            "tier": tier,
+            "similarity": round(similarity, 4),
+            "age_seconds": round(now - row[2], 1),
+        }
+        logger.info(f"Response cache {tier} hit for {crew_type} (similarity={similarity:.3f})")
+        return response
+
+    def _semantic_lookup(self, crew_type, query, region, now):
+        normalized = normalize_query(query)
+        vector = self._embed(crew_type, normalized)
+        if vector is None:
+            return None, 0.0
+
+        with self._connect() as conn:
+            candidates = conn.execute(
+                "SELECT cache_key, response, created_at, embedding FROM crew_response_cache "
+                "WHERE crew_type = ? AND region = ? AND numbers = ? AND expires_at > ? "
+                "AND embedding IS NOT NULL",
+                (crew_type, (region or "").upper(), _numbers(normalized), now),
+            ).fetchall()
+
+        best, best_score = None, self.similarity
+        for cache_key, response, created_at, blob in candidates:
+            stored = array("f")
+            stored.frombytes(blob)
+            score = _dot(vector, stored)
+            if score >= best_score:
+                best, best_score = (cache_key, response, created_at), score
+        return best, best_score
+
+    def set(self, crew_type: str, query: Any, region: Optional[str], response: Dict[str, Any]) -> bool:
+        """Store a response; returns False when the crew type is not cacheable."""
+        crew_type = crew_type.lower()
+        if not self.is_cacheable(crew_type):
+            return False
+
+        now = time.time()
+        normalized = normalize_query(query)
+        vector = self._embed(crew_type, normalized)
+        payload = {k: v for k, v in response.items() if k != "cache"}
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO crew_response_cache "
+                "(cache_key, crew_type, region, query, numbers, embedding, response, "
+                " created_at, expires_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (
+                    make_cache_key(crew_type, query, region),
+                    crew_type,
+                    (region or "").upper(),
+                    normalized,
+                    _numbers(normalized),
+                    vector.tobytes() if vector is not None else None,
+                    json.dumps(payload, default=str),
+                    now,
+                    now + self.ttls[crew_type],
+                    now,
+                ),
+            )
+            self._evict(conn, now)
+
+        with self._lock:
+            self._counters["stores"] += 1
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM crew_response_cache WHERE expires_at <= ?", (now,))
+        overflow = conn.execute("SELECT COUNT(*) FROM crew_response_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM crew_response_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM crew_response_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def invalidate(self, crew_types: Optional[List[str]] = None) -> int:
+        """Drop entries for the given crew types (all entries when None)."""
+        with self._connect() as conn:
+            if crew_types is None:
+                removed = conn.execute("DELETE FROM crew_response_cache").rowcount
+            else:
+                placeholders = ", ".join("?" for _ in crew_types)
+                removed = conn.execute(
+                    f"DELETE FROM crew_response_cache WHERE crew_type IN ({placeholders})",
+                    list(crew_types),
+                ).rowcount
+        with self._lock:
+            self._counters["invalidated"] += removed
+        if removed:
+            logger.info(f"Response cache invalidated {removed} entries ({crew_types or 'all'})")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this process and the stored entry count."""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM crew_response_cache").fetchone()[0]
+        with self._lock:
+            lookups = self._counters["exact_hits"] + self._counters["semantic_hits"] + self._counters["misses"]
+            hits = lookups - self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "max_entries": self.max_entries,
+            }
+
+
+# =============================================================================
+# PROCESS-WIDE CACHE
+# =============================================================================
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("RESPONSE_CACHE_DISABLED", "").lower() not in ("1", "true", "yes")
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache configured from the environment."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttls = dict(DEFAULT_CREW_TTLS)
+                try:
+                    ttls.update(json.loads(os.environ.get("RESPONSE_CACHE_TTLS", "") or "{}"))
+                except ValueError:
+                    logger.warning("Ignoring invalid RESPONSE_CACHE_TTLS (expected a JSON object)")
+                _cache = ResponseCache(
+                    path=os.environ.get("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    max_entries=int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                    similarity=float(os.environ.get("RESPONSE_CACHE_SIMILARITY", DEFAULT_SIMILARITY)),
+                    ttls=ttls,
+                )
+    return _cache
+
+
+def invalidate_rates() -> int:
+    """Drop rate-dependent responses; call whenever interest_rates_catalog changes."""
+    try:
+        return get_response_cache().invalidate(sorted(RATE_DEPENDENT_CREWS))
+    except Exception as e:
+        logger.warning(f"Response cache invalidation failed: {e}")
+        return 0
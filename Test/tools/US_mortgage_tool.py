@@ -37,6 +37,8 @@ from crewai.tools import BaseTool
 import pandas as pd
 import numpy as np
 
+from model_registry import model_registry
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger(__name__)
@@ -172,40 +174,10 @@ class US_Mortgage_Analytics_Tool(BaseTool):
         "Output: Credit risk prediction, customer segmentation, and portfolio risk assessment."
     )
 
-    _hub_cache = None
-
     def _load_model_hub(self):
-        """Lazy load the FannieMaeModelHub."""
-        if self._hub_cache is not None:
-            return self._hub_cache
-
+        """Return the FannieMaeModelHub from the shared model registry."""
         try:
-            # Add the models directory to sys.path for local import
-            import sys
-
-            models_dir = str(MODEL_DIR.parent)  # Get parent of fannie_mae_models
-            if models_dir not in sys.path:
-                sys.path.insert(0, models_dir)
-
-            # Import using the local path
-            import importlib.util
-
-            spec = importlib.util.spec_from_file_location(
-                "inference_helper", MODEL_DIR / "inference_helper.py"
-            )
-            if spec is None or spec.loader is None:
-                raise ImportError(
-                    f"Could not load spec for {MODEL_DIR / 'inference_helper.py'}"
-                )
-
-            inference_module = importlib.util.module_from_spec(spec)
-            sys.modules["inference_helper"] = inference_module
-            spec.loader.exec_module(inference_module)
-
-            FannieMaeModelHub = inference_module.FannieMaeModelHub
-            self._hub_cache = FannieMaeModelHub(str(MODEL_DIR))
-            log.info(f"Loaded FannieMaeModelHub from {MODEL_DIR}")
-            return self._hub_cache
+            return model_registry.get("fannie_mae_hub")
         except Exception as e:
             log.error(f"Failed to import FannieMaeModelHub: {e}")
             raise ImportError(
@@ -328,6 +300,14 @@ class US_Mortgage_Analytics_Tool(BaseTool):
             ),
         }
 
+    @staticmethod
+    def _model_output(predictions: Dict[str, Any], use_case: str) -> Dict[str, Any]:
+        """Return one model's predict_all output, raising its error if it failed."""
+        output = predictions.get(use_case, {"error": f"{use_case} was not run"})
+        if "error" in output:
+            raise RuntimeError(output["error"])
+        return output
+
     def _run_analytics(self, borrower_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run mortgage analytics on borrower data.
@@ -349,14 +329,26 @@ class US_Mortgage_Analytics_Tool(BaseTool):
             "analyses": {},
         }
 
-        # Run credit risk model
+        # Run the three models concurrently on one shared feature matrix
+        predictions = hub.predict_all(
+            X_df, use_cases=["credit_risk", "customer_segmentation", "portfolio_risk"]
+        )
+        results["timing"] = {
+            use_case: prediction.get("timing")
+            for use_case, prediction in predictions.items()
+        }
+
+        # Credit risk model
         try:
-            credit_risk_model = hub.get_model("credit_risk")
-            credit_preds = credit_risk_model.predict(X_df)
-            credit_probs = credit_risk_model.predict_proba(X_df)
+            credit = self._model_output(predictions, "credit_risk")
+            probabilities = credit["probabilities"][0]
+            if isinstance(probabilities, list):
+                probability = probabilities[1] if len(probabilities) > 1 else 0.0
+            else:
+                probability = probabilities
 
             results["analyses"]["credit_risk"] = self._interpret_credit_risk(
-                credit_preds[0], credit_probs[0][1] if len(credit_probs[0]) > 1 else 0.0
+                credit["predictions"][0], probability
             )
         except Exception as e:
             log.warning(f"Credit risk model failed: {e}")
@@ -365,13 +357,12 @@ class US_Mortgage_Analytics_Tool(BaseTool):
                 "status": "unavailable",
             }
 
-        # Run customer segmentation model
+        # Customer segmentation model
         try:
-            segmentation_model = hub.get_model("customer_segmentation")
-            seg_preds = segmentation_model.predict(X_df)
+            segmentation = self._model_output(predictions, "customer_segmentation")
 
             results["analyses"]["customer_segmentation"] = self._interpret_segmentation(
-                seg_preds[0]
+                segmentation["cluster_labels"][0]
             )
         except Exception as e:
             log.warning(f"Segmentation model failed: {e}")
@@ -380,18 +371,17 @@ class US_Mortgage_Analytics_Tool(BaseTool):
                 "status": "unavailable",
             }
 
-        # Run portfolio risk model (if available)
+        # Portfolio risk model (if available)
         try:
-            portfolio_model = hub.get_model("portfolio_risk")
-            portfolio_preds = portfolio_model.predict(X_df)
+            portfolio_pred = self._model_output(predictions, "portfolio_risk")["predictions"][0]
 
             results["analyses"]["portfolio_risk"] = {
                 "model": MODEL_DESCRIPTIONS["portfolio_risk"]["title"],
                 "description": MODEL_DESCRIPTIONS["portfolio_risk"]["description"],
                 "prediction": (
-                    float(portfolio_preds[0])
-                    if hasattr(portfolio_preds[0], "__float__")
-                    else str(portfolio_preds[0])
+                    float(portfolio_pred)
+                    if hasattr(portfolio_pred, "__float__")
+                    else str(portfolio_pred)
                 ),
             }
         except Exception as e:
@@ -9,11 +9,12 @@ This tool uses a Logistic Regression model trained on 975,000+ Indian loan recor
 
 import json
 import os
-import joblib
 from typing import Dict, Any, Optional, List
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from model_registry import model_registry
+
 
 class USCreditRiskScorerInput(BaseModel):
     """Input schema for US Credit Risk Scorer tool."""
@@ -585,19 +586,19 @@ class IndianCreditRiskScorerTool(BaseTool):
     )
 
     def _load_models(self):
-        """Load the Indian credit risk model and scaler."""
-        if self._model is None or self._scaler is None:
-            model_path = os.path.join(self._model_path, "loan_model.pkl")
-            scaler_path = os.path.join(self._model_path, "scaler.pkl")
-
-            if not os.path.exists(model_path) or not os.path.exists(scaler_path):
-                raise FileNotFoundError(
-                    "Indian credit risk models not found. Please download loan_model.pkl and scaler.pkl "
-                    "from the CreditWise repository to Test/models/credit_risk/indian/"
-                )
+        """Fetch the Indian credit risk model and scaler from the shared model registry."""
+        model_path = os.path.join(self._model_path, "loan_model.pkl")
+        scaler_path = os.path.join(self._model_path, "scaler.pkl")
+
+        if not os.path.exists(model_path) or not os.path.exists(scaler_path):
+            raise FileNotFoundError(
+                "Indian credit risk models not found. Please download loan_model.pkl and scaler.pkl "
+                "from the CreditWise repository to Test/models/credit_risk/indian/"
+            )
 
-            self._model = joblib.load(model_path)
-            self._scaler = joblib.load(scaler_path)
+        # Re-read on every run so a hot-reloaded artifact is picked up
+        self._model = model_registry.get("indian_credit_model")
+        self._scaler = model_registry.get("indian_credit_scaler")
 
     def _run(
         self,
@@ -1050,6 +1051,26 @@ def score_credit_risk(borrower_data: Dict[str, Any]) -> Dict[str, Any]:
     return json.loads(result_json)
 
 
+# Batch scoring for portfolios (US region)
+def score_credit_risk_batch(borrowers):
+    """
+    Score a whole portfolio with the US rule-based scorer in one vectorized pass.
+
+    Args:
+        borrowers: pandas DataFrame (one borrower per row, same fields as
+            score_credit_risk) or a list of borrower dicts
+
+    Returns:
+        List of assessment dicts identical to score_credit_risk per borrower
+    """
+    import pandas as pd
+    from credit_risk_batch import credit_assessments_batch
+
+    if not isinstance(borrowers, pd.DataFrame):
+        borrowers = pd.DataFrame(list(borrowers), dtype=object)
+    return credit_assessments_batch(borrowers)
+
+
 # Convenience function for direct usage (India region)
 def score_indian_credit_risk_from_dict(borrower_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -157,6 +157,11 @@ class RatesCacheSQLTool(BaseTool):
     def _run(self, query: str) -> str:
         try:
             result = langchain_db.run(query)
+            if not query.lstrip().upper().startswith("SELECT"):
+                # Fresh rates make cached analysis/research answers stale
+                from response_cache import invalidate_rates
+
+                invalidate_rates()
             if len(result) > 3000:
                 result = result[:3000] + "\n... [truncated]"
             return (
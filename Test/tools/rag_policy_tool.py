@@ -5,7 +5,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Type, Dict
 import threading
 
-from rag_engine import retrieve_as_text, get_stats
+from rag_engine import retrieve_as_text, retrieve_many_as_text, get_stats
 
 # Global state to track RAG tool usage (thread-safe)
 _rag_call_tracker: Dict[str, bool] = {
@@ -115,15 +115,15 @@ class RAGPolicySearchTool(BaseTool):
             )
             return results
         else:
-            # Multiple queries - run each and combine results
+            # Multiple queries - one batched retrieval, overlapping chunks shown once
             all_results = []
-            for i, q in enumerate(queries, 1):
+            texts = retrieve_many_as_text(
+                queries,
+                n_results=max_results,
+                category=category,
+            )
+            for i, (q, results) in enumerate(zip(queries, texts), 1):
                 all_results.append(f"### Query {i}: {q}\n")
-                results = retrieve_as_text(
-                    query=q,
-                    n_results=max_results,
-                    category=category,
-                )
                 all_results.append(results)
                 all_results.append("\n")
 
@@ -350,14 +350,14 @@ class RAGPolicyCompleteTool(BaseTool):
         queries = [q.strip() for q in query.split(";") if q.strip()]
         search_output = ["\n", "=" * 60, "POLICY SEARCH RESULTS", "=" * 60]
 
-        for i, q in enumerate(queries, 1):
+        texts = retrieve_many_as_text(
+            queries,
+            n_results=max_results,
+            category=category,
+        )
+        for i, (q, results) in enumerate(zip(queries, texts), 1):
             search_output.append(f"\n### Query {i}: {q}")
             search_output.append("-" * 40)
-            results = retrieve_as_text(
-                query=q,
-                n_results=max_results,
-                category=category,
-            )
             search_output.append(results)
 
         # Add compliance footer
@@ -212,7 +212,9 @@ def append_assistant(text: str, chart_options=None):
 # MODEL FUNCTIONS
 # =============================================================================
 def _cr_model_available():
-    return (MODEL_DIR / "xgb_model.pkl").exists()
+    from model_registry import US_MODEL_PATH
+
+    return os.path.exists(US_MODEL_PATH)
 
 
 def _cr_predict(data):
@@ -295,14 +297,12 @@ def _cr_predict(data):
 
 
 def _load_model():
-    """Load XGBoost model from disk."""
-    import pickle
+    """Get the XGBoost model from the shared model registry."""
+    from model_registry import model_registry
 
-    model_path = MODEL_DIR / "xgb_model.pkl"
     fi_path = MODEL_DIR / "feature_importance.csv"
 
-    with open(model_path, "rb") as f:
-        model = pickle.load(f)
+    model = model_registry.get("us_credit_model")
 
     fi_df = None
     if fi_path.exists():
@@ -0,0 +1,52 @@
+"""
+Django setup shared by the bank_app unit tests.
+
+Loads the project settings with an in-memory SQLite database (tools/bank_poc.db
+is never opened), the in-memory channel layer and the memory event outbox,
+and builds bank_app's tables from the current models: its migration history
+does not replay on an empty database.
+"""
+
+import os
+import sys
+
+import pytest
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+if TEST_DIR not in sys.path:
+    sys.path.insert(0, TEST_DIR)
+
+TEST_DATABASE = ":memory:"
+
+
+def setup_test_django():
+    """Configure and set up Django once per test process."""
+    import django
+    from django.apps import apps
+    from django.conf import settings
+
+    if not apps.ready:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bank_poc_django.settings")
+        settings.DATABASES["default"]["NAME"] = TEST_DATABASE
+        settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+        settings.EVENT_OUTBOX_BACKEND = "memory"
+        settings.MIGRATION_MODULES = {"bank_app": None}
+        django.setup()
+
+        from django.core.management import call_command
+        call_command("migrate", run_syncdb=True, verbosity=0)
+
+    if settings.DATABASES["default"]["NAME"] != TEST_DATABASE:
+        pytest.skip("Django was already set up against a real database")
+
+
+@pytest.fixture
+def db():
+    """Empty dashboard cache; every write of the test is rolled back."""
+    from django.core.cache import cache
+    from django.db import transaction
+
+    cache.clear()
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
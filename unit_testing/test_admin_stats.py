@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Unit tests for the admin analytics rollup (bank_app/admin_stats.py): the
+aggregates match direct scans of the source tables, db_utils writes mark
+the rollup stale, and writes made elsewhere show up after the max age.
+
+Runs against a throwaway database, never tools/bank_poc.db.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+from bank_app import admin_stats, db_utils
+
+TODAY = date(2026, 3, 31)
+
+_SCHEMA = """
+CREATE TABLE users (user_id INTEGER PRIMARY KEY AUTOINCREMENT, first_name TEXT);
+CREATE TABLE address (address_id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, country_code TEXT);
+CREATE TABLE loan_applications (
+    application_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    loan_decision TEXT NOT NULL DEFAULT 'NEEDS_VERIFY',
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE TABLE fixed_deposit (
+    fd_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fd_status TEXT NOT NULL DEFAULT 'ACTIVE',
+    region TEXT NOT NULL DEFAULT 'IN',
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+"""
+
+
+def days_ago(n):
+    return f"{(TODAY - timedelta(days=n)).isoformat()} 10:30:00"
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    path = tmp_path / "bank_poc.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+        conn.executemany("INSERT INTO users (first_name) VALUES (?)", [("ada",), ("grace",), ("alan",)])
+        conn.executemany(
+            "INSERT INTO address (user_id, country_code) VALUES (?, ?)",
+            [(1, "US"), (1, "GB"), (2, "IN")],  # ada has two addresses; alan none
+        )
+        conn.executemany(
+            "INSERT INTO loan_applications (user_id, loan_decision, created_at) VALUES (?, ?, ?)",
+            [
+                (1, "APPROVED", days_ago(1)),
+                (1, "REJECTED", days_ago(10)),
+                (2, "APPROVED", days_ago(7)),
+                (2, "NEEDS_VERIFY", days_ago(40)),
+                (3, "APPROVED", days_ago(3)),
+                (None, "NEEDS_VERIFY", days_ago(100)),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO fixed_deposit (fd_status, created_at) VALUES (?, ?)",
+            [("ACTIVE", days_ago(2)), ("ACTIVE", days_ago(20)), ("MATURED", days_ago(8))],
+        )
+    monkeypatch.setattr(db_utils, "LEGACY_DB_PATH", path)
+    monkeypatch.setattr(admin_stats, "ADMIN_STATS_MAX_AGE_SECONDS", 300)
+    yield path
+    db_utils.close_connections()
+
+
+def test_aggregates_match_the_source_tables(legacy_db):
+    stats = admin_stats.get_analytics_stats(today=TODAY)
+
+    assert stats["total_loans"] == 6
+    assert stats["loans_last_7_days"] == 3  # the 7-day cutoff day is included
+    assert stats["loans_last_30_days"] == 4
+    assert stats["approval_rate"] == 50.0
+    assert {r["loan_decision"]: r["count"] for r in stats["status_breakdown"]} == {
+        "APPROVED": 3, "REJECTED": 1, "NEEDS_VERIFY": 2,
+    }
+    # Each loan counted once, under its user's first address
+    assert {r["country_code"]: r["count"] for r in stats["regional_loans"]} == {"US": 2, "IN": 2, "": 2}
+    assert stats["total_fds"] == 3 and stats["fds_last_7_days"] == 1
+    assert {r["fd_status"]: r["count"] for r in stats["fd_status_breakdown"]} == {"ACTIVE": 2, "MATURED": 1}
+
+
+def test_reads_do_not_rescan_until_stale(legacy_db):
+    admin_stats.get_analytics_stats(today=TODAY)
+    assert admin_stats.ensure_fresh() == []
+
+    with db_utils.record_queries() as timings:
+        admin_stats.get_analytics_stats(today=TODAY)
+    assert timings.count > 0
+    assert all("admin_stats_" in sql for sql, _, _ in timings.queries)
+
+
+def test_db_utils_writes_mark_the_rollup_stale(legacy_db):
+    admin_stats.get_analytics_stats(today=TODAY)
+
+    db_utils.create_record("loan_applications", {"user_id": 2, "loan_decision": "APPROVED", "created_at": days_ago(0)})
+    db_utils.execute_raw_sql("UPDATE fixed_deposit SET fd_status = 'MATURED' WHERE fd_id = 1", fetch="none")
+
+    assert admin_stats._stale_sources() == ["fixed_deposit", "loan_applications"]
+    stats = admin_stats.get_analytics_stats(today=TODAY)
+    assert stats["total_loans"] == 7 and stats["loans_last_7_days"] == 4
+    assert {r["fd_status"]: r["count"] for r in stats["fd_status_breakdown"]} == {"ACTIVE": 1, "MATURED": 2}
+
+
+def test_outside_writes_show_up_after_max_age(legacy_db, monkeypatch):
+    admin_stats.get_analytics_stats(today=TODAY)
+    with sqlite3.connect(legacy_db) as conn:  # e.g. a crew tool writing directly
+        conn.execute("INSERT INTO fixed_deposit (fd_status, created_at) VALUES ('ACTIVE', ?)", (days_ago(0),))
+
+    assert admin_stats.get_analytics_stats(today=TODAY)["total_fds"] == 3
+
+    monkeypatch.setattr(admin_stats, "ADMIN_STATS_MAX_AGE_SECONDS", 0)
+    assert admin_stats.get_analytics_stats(today=TODAY)["total_fds"] == 4
+
+
+def test_empty_tables(legacy_db):
+    with sqlite3.connect(legacy_db) as conn:
+        conn.execute("DELETE FROM loan_applications")
+    stats = admin_stats.get_analytics_stats(today=TODAY)
+    assert stats["total_loans"] == 0 and stats["approval_rate"] == 0
+    assert stats["status_breakdown"] == [] and stats["regional_loans"] == []
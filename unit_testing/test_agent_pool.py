@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Unit tests for the warm agent pool (agent_pool.py).
+
+Uses plain objects in place of CrewAI agents, so no crewai install is needed.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from agent_pool import AgentPool, reset_agent_state
+
+
+class FakeAgent:
+    def __init__(self):
+        self.crew = None
+        self.tools_results = []
+        self._times_executed = 0
+
+
+def make_factory(calls):
+    def factory(region="India", product_type="FD"):
+        calls.append((region, product_type))
+        return {"agent": FakeAgent()}
+    return factory
+
+
+def test_lease_reuses_agents_for_same_key():
+    pool = AgentPool()
+    calls = []
+    factory = make_factory(calls)
+
+    with pool.lease("analysis", factory, region="India", product_type="FD") as first:
+        pass
+    with pool.lease("analysis", factory, region="india", product_type="fd") as second:
+        pass
+
+    assert first is second
+    assert len(calls) == 1
+    stats = pool.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_different_keys_build_separate_agents():
+    pool = AgentPool()
+    calls = []
+    factory = make_factory(calls)
+
+    with pool.lease("analysis", factory, region="India", product_type="FD") as india:
+        pass
+    with pool.lease("analysis", factory, region="US", product_type="FD") as us:
+        pass
+
+    assert india is not us
+    assert calls == [("India", "FD"), ("US", "FD")]
+
+
+def test_concurrent_leases_do_not_share_agents():
+    pool = AgentPool()
+    factory = make_factory([])
+
+    with pool.lease("research", factory, region="India") as a:
+        with pool.lease("research", factory, region="India") as b:
+            assert a is not b
+    assert pool.stats()["idle"]["research/INDIA/None"] == 2
+
+
+def test_run_state_is_reset_on_release():
+    pool = AgentPool()
+    factory = make_factory([])
+
+    with pool.lease("database", factory) as agents:
+        agent = agents["agent"]
+        agent.crew = object()
+        agent.tools_results.append({"tool": "x"})
+        agent._times_executed = 3
+
+    assert agent.crew is None
+    assert agent.tools_results == []
+    assert agent._times_executed == 0
+
+
+def test_failed_run_discards_agents():
+    pool = AgentPool()
+    calls = []
+    factory = make_factory(calls)
+
+    with pytest.raises(RuntimeError):
+        with pool.lease("router", factory):
+            raise RuntimeError("kickoff failed")
+    with pool.lease("router", factory):
+        pass
+
+    assert len(calls) == 2
+    assert pool.stats()["discarded"] == 1
+
+
+def test_aml_is_never_pooled():
+    pool = AgentPool()
+    calls = []
+    factory = make_factory(calls)
+
+    for _ in range(2):
+        with pool.lease("aml", factory):
+            pass
+
+    assert len(calls) == 2
+    assert pool.stats()["bypassed"] == 2
+
+
+def test_idle_sets_are_bounded():
+    pool = AgentPool(max_idle_per_key=1)
+    factory = make_factory([])
+    a = pool.acquire("database", factory)
+    b = pool.acquire("database", factory)
+    pool.release("database", a)
+    pool.release("database", b)
+    assert pool.stats()["discarded"] == 1
+
+
+def test_reset_agent_state_ignores_missing_attributes():
+    reset_agent_state(object())
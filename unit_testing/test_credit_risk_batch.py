@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Unit tests for vectorized Indian credit-risk batch scoring (credit_risk_batch.py).
+
+A stub classifier stands in for loan_model.pkl, so scikit-learn is not needed.
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from credit_risk_batch import (
+    encode_indian_features,
+    score_indian_batch,
+    score_indian_frame,
+    start_batch,
+    to_ndjson,
+)
+
+APPLICANT = {
+    "id": "APP-1",
+    "applicant_income": 600000,
+    "coapplicant_income": 100000,
+    "credit_score": 720,
+    "dti_ratio": 0.35,
+    "collateral_value": 250000,
+    "loan_amount": 500000,
+    "loan_term": 36,
+    "savings": 50000,
+    "existing_loans": 1,
+    "employment_status": "Self-employed",
+    "marital_status": "Single",
+    "loan_purpose": "Home",
+    "property_area": "Semiurban",
+    "gender": "Female",
+    "employer_category": "MNC",
+    "education_level": "Post Graduate",
+}
+
+
+class StubModel:
+    """Approves when credit_score >= 700; counts predict_proba calls."""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, features):
+        self.calls += 1
+        approve = np.where(np.sqrt(features[:, 26]) >= 700, 0.9, 0.2)
+        return np.column_stack([1 - approve, approve])
+
+
+def test_encoding_matches_tool_feature_order():
+    row = encode_indian_features(pd.DataFrame([APPLICANT]))[0]
+    expected = [
+        600000, 100000, 30, 0, 1, 50000, 500000, 36, 2,
+        0, 1, 0,        # employment: salaried, self-employed, unemployed
+        1,              # marital single
+        0, 0, 1, 0,     # purpose: car, education, home, personal
+        1, 0,           # area: semiurban, urban
+        0,              # gender male
+        0, 1, 0, 0,     # employer: government, mnc, private, unemployed
+        0.5, 0.35 ** 2, 720 ** 2,
+    ]
+    assert row.tolist() == pytest.approx(expected)
+
+
+def test_defaults_fill_optional_columns():
+    row = encode_indian_features(pd.DataFrame([{
+        "applicant_income": 1, "credit_score": 700, "dti_ratio": 0.1, "loan_amount": 0, "loan_term": 12,
+    }]))[0]
+    assert row[2] == 30                   # age
+    assert row[8] == 1                    # Graduate
+    assert row[9] == 1 and row[19] == 1   # Salaried, Male
+    assert row[16] == 1 and row[18] == 1  # Personal, Urban
+    assert row[22] == 1                   # Private employer
+    assert row[24] == 0                   # zero loan amount -> no collateral ratio
+
+
+def test_chunk_scored_with_one_model_call_and_errors_reported():
+    model = StubModel()
+    frame = pd.DataFrame([APPLICANT, dict(APPLICANT, id="APP-2", credit_score=600), {"id": "APP-3"}])
+    records = score_indian_frame(frame, model=model)
+
+    assert model.calls == 1
+    assert records[0] == {"row": 0, "id": "APP-1", "approval_probability": 90.0,
+                          "verdict": "Approved", "confidence": "High"}
+    assert records[1]["verdict"] == "Rejected"
+    assert "error" in records[2] and records[2]["id"] == "APP-3"
+
+
+def test_batch_streams_csv_and_jsonl_in_chunks():
+    rows = [dict(APPLICANT, id=f"APP-{i}", credit_score=650 + i * 10) for i in range(7)]
+    csv_source = io.StringIO(pd.DataFrame(rows).to_csv(index=False))
+    jsonl_source = io.StringIO("\n".join(json.dumps(r) for r in rows))
+
+    model = StubModel()
+    from_csv = list(score_indian_batch(csv_source, fmt="csv", chunk_size=3, model=model))
+    assert model.calls == 3
+    assert [r["row"] for r in from_csv] == list(range(7))
+    assert list(score_indian_batch(jsonl_source, fmt="jsonl", model=StubModel())) == from_csv
+
+
+def test_ndjson_output_ends_with_summary():
+    lines = list(to_ndjson(iter([{"row": 0, "verdict": "Approved"}, {"row": 1, "error": "x"}])))
+    summary = json.loads(lines[-1])["summary"]
+    assert len(lines) == 3
+    assert summary["scored"] == 1 and summary["errors"] == 1
+
+
+@pytest.mark.parametrize("fmt, body", [
+    ("parquet", b"PAR1 this is not a parquet file"),
+    ("csv", b'id,credit_score\n"APP-1,720\n'),
+    ("csv", b"id,credit_score\nAPP-1,720\n"),  # required columns missing
+])
+def test_bad_upload_fails_before_streaming(fmt, body):
+    records = score_indian_batch(io.BytesIO(body), fmt=fmt, model=StubModel())
+    with pytest.raises(ValueError):
+        start_batch(records)
+
+
+def test_file_breaking_mid_stream_ends_with_error_line():
+    header = ",".join(APPLICANT)
+    good = ",".join(str(v) for v in APPLICANT.values())
+    body = "\n".join([header, good, good, good, good + ",extra,fields"]) + "\n"
+
+    records = start_batch(score_indian_batch(io.StringIO(body), fmt="csv", chunk_size=2, model=StubModel()))
+    lines = [json.loads(line) for line in to_ndjson(records)]
+
+    assert [line.get("verdict") for line in lines[:2]] == ["Approved", "Approved"]
+    assert "error" in lines[-2] and "summary" not in lines[-2]
+    assert lines[-1]["summary"]["complete"] is False and lines[-1]["summary"]["rows"] == 2
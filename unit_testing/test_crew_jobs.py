@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Unit tests for the async crew job queue (bank_app.crew_jobs).
+
+Runs without Django or CrewAI: the queue is driven with a fake runner.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from bank_app.crew_jobs import (
+    CrewJobQueue,
+    PENDING,
+    RUNNING,
+    SUCCEEDED,
+    FAILED,
+    CANCELLED,
+)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class BlockingRunner:
+    """Fake crew runner that blocks each job until released."""
+
+    def __init__(self):
+        self.gates = {}
+        self.lock = threading.Lock()
+
+    def gate(self, query):
+        with self.lock:
+            return self.gates.setdefault(query, threading.Event())
+
+    def __call__(self, payload):
+        self.gate(payload["query"]).wait(5)
+        if payload["query"].startswith("fail"):
+            return {"error": "boom"}, 500
+        return {"result": payload["query"], "crew_type": payload["crew_type"]}, 200
+
+
+def test_job_succeeds_and_notifies():
+    runner = BlockingRunner()
+    events = []
+    queue = CrewJobQueue(runner, max_workers=2, notifier=events.append)
+    job = queue.submit("analysis", {"crew_type": "analysis", "query": "fd rates"})
+    runner.gate("fd rates").set()
+
+    assert _wait_for(lambda: job.status == SUCCEEDED)
+    assert job.result == {"result": "fd rates", "crew_type": "analysis"}
+    assert [e["status"] for e in events] == [PENDING, RUNNING, SUCCEEDED]
+    queue.shutdown()
+
+
+def test_failed_runner_marks_job_failed():
+    runner = BlockingRunner()
+    queue = CrewJobQueue(runner, max_workers=1)
+    job = queue.submit("analysis", {"crew_type": "analysis", "query": "fail please"})
+    runner.gate("fail please").set()
+
+    assert _wait_for(lambda: job.status == FAILED)
+    assert job.error == "boom"
+    assert job.http_status == 500
+    queue.shutdown()
+
+
+def test_per_type_limit_does_not_block_other_crews():
+    runner = BlockingRunner()
+    queue = CrewJobQueue(runner, max_workers=3, concurrency={"aml": 1})
+    aml_1 = queue.submit("aml", {"crew_type": "aml", "query": "aml-1"})
+    aml_2 = queue.submit("aml", {"crew_type": "aml", "query": "aml-2"})
+    fd = queue.submit("fd_advisor", {"crew_type": "fd_advisor", "query": "fd"})
+
+    assert _wait_for(lambda: aml_1.status == RUNNING and fd.status == RUNNING)
+    assert aml_2.status == PENDING
+    assert queue.position(aml_2) == 1
+
+    runner.gate("fd").set()
+    assert _wait_for(lambda: fd.status == SUCCEEDED)
+    assert aml_2.status == PENDING
+
+    runner.gate("aml-1").set()
+    runner.gate("aml-2").set()
+    assert _wait_for(lambda: aml_2.status == SUCCEEDED)
+    queue.shutdown()
+
+
+def test_cancel_pending_and_running_jobs():
+    runner = BlockingRunner()
+    queue = CrewJobQueue(runner, max_workers=1)
+    running = queue.submit("analysis", {"crew_type": "analysis", "query": "first"})
+    pending = queue.submit("analysis", {"crew_type": "analysis", "query": "second"})
+    assert _wait_for(lambda: running.status == RUNNING)
+
+    queue.cancel(pending.job_id)
+    assert pending.status == CANCELLED
+
+    queue.cancel(running.job_id)
+    assert running.status == RUNNING and running.cancel_requested
+    runner.gate("first").set()
+    assert _wait_for(lambda: running.status == CANCELLED)
+    assert running.result is None
+    assert queue.stats()["running"] == 0
+    queue.shutdown()
+
+
+def test_finished_jobs_expire_after_retention():
+    runner = BlockingRunner()
+    runner.gate("old").set()
+    queue = CrewJobQueue(runner, max_workers=1, retention_seconds=0)
+    old = queue.submit("research", {"crew_type": "research", "query": "old"})
+    assert _wait_for(lambda: old.status == SUCCEEDED)
+
+    runner.gate("new").set()
+    queue.submit("research", {"crew_type": "research", "query": "new"})
+    assert queue.get(old.job_id) is None
+    queue.shutdown()
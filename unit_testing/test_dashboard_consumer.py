@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Unit tests for dashboard event delivery through Django and Channels:
+LoanApplication.save publishing to the event outbox on commit, and
+DashboardConsumer (via bank_app.routing) receiving the coalesced batch.
+
+Runs the project's Django settings against an in-memory database and the
+in-memory channel layer (see django_test_env.py). The outbox is drained
+with flush() from the test's event loop rather than by the dispatcher thread.
+"""
+
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("django")
+pytest.importorskip("channels")
+
+from django_test_env import db, setup_test_django  # noqa: F401 (db is a fixture)
+
+setup_test_django()
+
+from asgiref.sync import sync_to_async  # noqa: E402
+from asgiref.testing import ApplicationCommunicator  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from django.test import TestCase  # noqa: E402
+
+from bank_app import event_outbox, routing  # noqa: E402
+from bank_app.models import LoanApplication  # noqa: E402
+
+GROUP = "dashboard_updates"
+
+# channels.testing.WebsocketCommunicator needs daphne; drive the ASGI app directly
+SCOPE = {"type": "websocket", "path": "/ws/dashboard/", "headers": [], "subprotocols": []}
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """A memory outbox whose thread never ticks during the test."""
+    dispatcher = event_outbox.EventDispatcher(
+        event_outbox.MemoryOutbox(), sender=event_outbox._group_send, tick_seconds=3600
+    )
+    monkeypatch.setattr(event_outbox, "_dispatcher", dispatcher)
+    yield dispatcher
+    dispatcher.stop(flush=False)
+
+
+def status_event(loan_id, old, new):
+    return {
+        "type": "loan_status_update",
+        "loan_id": loan_id,
+        "application_id": f"APP{loan_id}",
+        "old_status": old,
+        "new_status": new,
+        "timestamp": f"2025-01-01T00:00:0{loan_id}",
+    }
+
+
+def test_status_change_is_published_on_commit(db, dispatcher):
+    loan = LoanApplication.objects.create(
+        application_id="APPWS0001", status="SUBMITTED", applicant_name="A", loan_amount=Decimal("1000")
+    )
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        loan.status = "APPROVED"
+        loan.save()
+        assert dispatcher.outbox.pending() == 0  # nothing before commit
+
+    [(group, event)] = dispatcher.outbox.read()
+    assert group == GROUP
+    assert (event["loan_id"], event["old_status"], event["new_status"]) == (loan.id, "SUBMITTED", "APPROVED")
+
+
+def test_consumer_receives_coalesced_batch(dispatcher):
+    async def scenario():
+        communicator = ApplicationCommunicator(URLRouter(routing.websocket_urlpatterns), dict(SCOPE))
+        await communicator.send_input({"type": "websocket.connect"})
+        assert (await communicator.receive_output())["type"] == "websocket.accept"
+        welcome = await communicator.receive_output()
+        assert json.loads(welcome["text"])["type"] == "connection_established"
+        assert dispatcher.stats()["running"]
+
+        for event in (status_event(1, "SUBMITTED", "UNDER_REVIEW"), status_event(2, "SUBMITTED", "REJECTED"),
+                      status_event(1, "UNDER_REVIEW", "APPROVED")):
+            event_outbox.publish(GROUP, event)
+        assert await sync_to_async(dispatcher.flush)() == 1
+
+        message = json.loads((await communicator.receive_output())["text"])
+        await communicator.send_input({"type": "websocket.disconnect", "code": 1000})
+        await communicator.wait()
+        return message
+
+    message = asyncio.run(scenario())
+
+    assert message["type"] == "loan_status_update" and message["count"] == 2
+    assert [(u["loan_id"], u["old_status"], u["new_status"]) for u in message["updates"]] == [
+        (1, "SUBMITTED", "APPROVED"),
+        (2, "SUBMITTED", "REJECTED"),
+    ]
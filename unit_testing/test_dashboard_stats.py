@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Unit tests for the cached dashboard aggregates (bank_app/dashboard_stats.py)
+and the ETag / 304 handling of the dashboard JSON endpoints (api_views).
+
+Runs the project's Django settings against an in-memory database
+(see django_test_env.py).
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("django")
+pytest.importorskip("channels")
+
+from django_test_env import db, setup_test_django  # noqa: F401 (db is a fixture)
+
+setup_test_django()
+
+from django.test import RequestFactory  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from bank_app import api_views, dashboard_stats  # noqa: E402
+from bank_app.models import LoanApplication  # noqa: E402
+
+LOANS = [
+    # (status, region, amount)
+    ("SUBMITTED", "IN", "100000"),
+    ("SUBMITTED", "US", "250000"),
+    ("UNDER_REVIEW", "IN", "50000"),
+    ("APPROVED", "IN", "300000"),
+    ("APPROVED", "US", "75000"),
+    ("APPROVED", "US", "125000"),
+    ("REJECTED", "IN", "40000"),
+    ("DRAFT", "US", "10000"),
+]
+
+
+def create_loans():
+    now = timezone.now()
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(
+            application_id=f"APPTEST{i:04d}",
+            status=status,
+            region=region,
+            applicant_name=f"Applicant {i}",
+            loan_amount=Decimal(amount),
+        )
+        for i, (status, region, amount) in enumerate(LOANS)
+    ])
+    # Two months, so the monthly trend has more than one bucket
+    LoanApplication.objects.filter(application_id="APPTEST0000").update(created_at=now - timedelta(days=62))
+    return loans
+
+
+def get(view, **headers):
+    return view(RequestFactory().get("/api/dashboard/", **headers))
+
+
+def test_grouped_counts_match_per_status_counts(db):
+    create_loans()
+    stats = dashboard_stats.compute_stats()
+
+    for status, _ in LoanApplication.STATUS_CHOICES:
+        assert stats["by_status"][status]["count"] == LoanApplication.objects.filter(status=status).count()
+    assert stats["total_loans"] == LoanApplication.objects.count() == len(LOANS)
+    assert stats["pending_approvals"] == LoanApplication.objects.filter(
+        status__in=["SUBMITTED", "UNDER_REVIEW"]
+    ).count()
+    assert Decimal(stats["total_amount"]) == sum(Decimal(amount) for _, _, amount in LOANS)
+    assert len(stats["recent_loans"]) == len(LOANS)
+
+    charts = dashboard_stats.compute_charts()
+    assert {row["status"]: row["count"] for row in charts["status_distribution"]} == {
+        status: LoanApplication.objects.filter(status=status).count()
+        for status in {status for status, _, _ in LOANS}
+    }
+    for row in charts["region_performance"]:
+        total = LoanApplication.objects.filter(region=row["region"]).count()
+        approved = LoanApplication.objects.filter(region=row["region"], status="APPROVED").count()
+        assert (row["total"], row["approved"]) == (total, approved)
+        assert row["approval_rate"] == round(approved / total * 100, 2)
+    assert sum(row["count"] for row in charts["monthly_trend"]) == len(LOANS)
+    assert len(charts["monthly_trend"]) == 2
+
+
+def test_model_writes_change_the_etag(db):
+    create_loans()
+    _, first = dashboard_stats.get_stats()
+
+    # queryset.update bypasses the model: the cached payload is still served
+    LoanApplication.objects.filter(status="DRAFT").update(status="SUBMITTED")
+    assert dashboard_stats.get_stats()[1] == first
+
+    loan = LoanApplication.objects.get(application_id="APPTEST0002")
+    loan.status = "APPROVED"
+    loan.save()
+    payload, saved = dashboard_stats.get_stats()
+    assert saved != first
+    assert payload["by_status"]["APPROVED"]["count"] == 4
+    assert payload["by_status"]["SUBMITTED"]["count"] == 3  # the update above is picked up too
+
+    LoanApplication.objects.get(application_id="APPTEST0006").delete()
+    payload, deleted = dashboard_stats.get_stats()
+    assert deleted not in (first, saved)
+    assert payload["by_status"]["REJECTED"]["count"] == 0
+
+
+def test_unchanged_payload_keeps_its_etag_after_invalidate(db):
+    create_loans()
+    _, before = dashboard_stats.get_charts()
+    dashboard_stats.invalidate()
+    assert dashboard_stats.get_charts()[1] == before
+
+
+@pytest.mark.parametrize("view", [api_views.dashboard_stats_api, api_views.dashboard_charts_api])
+def test_if_none_match_returns_304(db, view):
+    create_loans()
+    response = get(view)
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "private, no-cache"
+    etag = response["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    for header in (etag, f"W/{etag}", "*", f'"stale", {etag}'):
+        not_modified = get(view, HTTP_IF_NONE_MATCH=header)
+        assert not_modified.status_code == 304, header
+        assert not_modified["ETag"] == etag
+        assert not_modified.content == b""
+
+    assert get(view, HTTP_IF_NONE_MATCH='"stale"').status_code == 200
+
+    LoanApplication.objects.get(application_id="APPTEST0000").delete()
+    changed = get(view, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200 and changed["ETag"] != etag
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Unit tests for the pooled legacy SQLite access in bank_app/db_utils.py:
+connection reuse, PRAGMAs, the read-only pool, rollback of abandoned
+transactions and per-query timing, plus the sqlite_transaction helper used
+by the standalone side stores.
+
+Runs against a throwaway database, never tools/bank_poc.db.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+from bank_app import db_utils
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    path = tmp_path / "bank_poc.db"
+    with sqlite3.connect(path) as conn:
+        for table, pk in db_utils.TABLE_PRIMARY_KEYS.items():
+            conn.execute(f"CREATE TABLE {table} ({pk} INTEGER PRIMARY KEY, name TEXT)")
+        conn.executemany("INSERT INTO users (name) VALUES (?)", [("ada",), ("grace",)])
+    monkeypatch.setattr(db_utils, "LEGACY_DB_PATH", path)
+    yield path
+    db_utils.close_connections()
+
+
+def test_connections_are_reused(legacy_db):
+    before = db_utils.get_query_stats()
+    counts = db_utils.get_table_counts()
+    assert counts["users"] == 2 and counts["accounts"] == 0
+
+    for _ in range(5):
+        db_utils.get_table_counts()
+    stats = db_utils.get_query_stats()
+    assert stats["connections_opened"] - before["connections_opened"] == 1
+    assert stats["queries"] - before["queries"] == 6 * len(db_utils.TABLE_PRIMARY_KEYS)
+    assert stats["idle_connections"] == 1
+
+
+def test_nested_calls_share_the_borrowed_connection(legacy_db):
+    with db_utils.get_legacy_connection(read_only=True) as outer:
+        with db_utils.get_legacy_connection(read_only=True) as inner:
+            assert inner is outer
+        with db_utils.get_legacy_connection() as writer:
+            assert writer is not outer
+
+
+def test_pragmas_are_applied(legacy_db):
+    with db_utils.get_legacy_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -16000
+
+
+def test_read_only_pool_cannot_write(legacy_db):
+    with db_utils.get_legacy_connection(read_only=True) as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("INSERT INTO users (name) VALUES ('mallory')")
+    assert db_utils.execute_raw_sql("SELECT COUNT(*) FROM users", fetch="count") == 2
+    assert db_utils.execute_raw_sql("UPDATE users SET name = 'ada l' WHERE user_id = 1", fetch="none") == 1
+    assert db_utils.get_record_by_id("users", 1)["name"] == "ada l"
+
+
+def test_writes_are_visible_to_reads(legacy_db):
+    created = db_utils.create_record("users", {"name": "alan"})
+    assert created["name"] == "alan"
+    assert db_utils.update_record("users", created["user_id"], {"name": "alan t"})
+    assert [r["name"] for r in db_utils.get_all_records("users", order_by="user_id")] == ["ada", "grace", "alan t"]
+    assert db_utils.delete_records_where("users", "name LIKE ?", ("a%",)) == 2
+    assert db_utils.count_records("users") == 1
+
+
+def test_abandoned_transaction_is_rolled_back(legacy_db):
+    with pytest.raises(RuntimeError):
+        with db_utils.get_legacy_connection() as conn:
+            conn.execute("INSERT INTO users (name) VALUES ('uncommitted')")
+            raise RuntimeError("request failed")
+    with db_utils.get_legacy_connection() as conn:
+        assert not conn.in_transaction
+    assert db_utils.count_records("users") == 2
+
+
+def test_record_queries_times_this_thread(legacy_db):
+    with db_utils.record_queries() as timings:
+        db_utils.count_records("users")
+        with pytest.raises(sqlite3.OperationalError):
+            db_utils.execute_raw_sql("SELECT * FROM no_such_table")
+        other = threading.Thread(target=db_utils.count_records, args=("accounts",))
+        other.start()
+        other.join()
+
+    assert timings.count == 2
+    (count_sql, count_ms, count_error), (_, _, error) = timings.queries
+    assert count_sql.startswith("SELECT COUNT(*)") and count_ms >= 0 and count_error is None
+    assert "no such table" in error
+    assert timings.total_ms >= count_ms
+
+
+def test_concurrent_readers(legacy_db):
+    results, errors = [], []
+
+    def read():
+        try:
+            for _ in range(20):
+                results.append(db_utils.count_records("users"))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and results == [2] * 80
+    assert db_utils.get_query_stats()["idle_connections"] <= db_utils.POOL_MAX_IDLE
+
+
+def test_sqlite_transaction_commits_rolls_back_and_closes(tmp_path):
+    path = tmp_path / "side_store.sqlite3"
+    with db_utils.sqlite_transaction(path) as conn:
+        conn.execute("CREATE TABLE entries (key TEXT)")
+        conn.execute("INSERT INTO entries VALUES ('kept')")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    with pytest.raises(RuntimeError):
+        with db_utils.sqlite_transaction(path) as conn:
+            conn.execute("INSERT INTO entries VALUES ('dropped')")
+            raise RuntimeError("abort")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    with db_utils.sqlite_transaction(path) as conn:
+        assert conn.execute("SELECT key FROM entries").fetchall() == [("kept",)]
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Unit tests for the dashboard event outbox (bank_app.event_outbox):
+coalescing of loan status updates, the dispatcher thread, and cross-process
+delivery through the shared SQLite outbox.
+
+Runs without Django or Channels: the dispatcher is given a recording sender.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from bank_app.event_outbox import (
+    EventDispatcher,
+    MemoryOutbox,
+    SQLiteOutbox,
+    coalesce,
+)
+
+GROUP = "dashboard_updates"
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def status_event(loan_id, old, new):
+    return {
+        "type": "loan_status_update",
+        "loan_id": loan_id,
+        "application_id": f"APP{loan_id}",
+        "old_status": old,
+        "new_status": new,
+        "timestamp": f"2026-03-31T10:00:0{loan_id}",
+    }
+
+
+class RecordingSender:
+    def __init__(self):
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def __call__(self, group, message):
+        with self.lock:
+            self.messages.append((group, message))
+
+
+def test_status_updates_coalesce_per_loan():
+    admin = {"type": "admin_action", "action": "BULK_APPROVE", "affected_loans": [1, 2]}
+    messages = coalesce([
+        (GROUP, status_event(1, "SUBMITTED", "UNDER_REVIEW")),
+        (GROUP, status_event(2, "SUBMITTED", "APPROVED")),
+        (GROUP, admin),
+        (GROUP, status_event(1, "UNDER_REVIEW", "APPROVED")),
+        ("other_group", status_event(3, "DRAFT", "SUBMITTED")),
+    ])
+
+    assert [(group, m["type"]) for group, m in messages] == [
+        (GROUP, "loan_status_update"), (GROUP, "admin_action"), ("other_group", "loan_status_update"),
+    ]
+    batch = messages[0][1]
+    assert batch["count"] == 2
+    assert [(u["loan_id"], u["old_status"], u["new_status"]) for u in batch["updates"]] == [
+        (1, "SUBMITTED", "APPROVED"), (2, "SUBMITTED", "APPROVED"),
+    ]
+    assert "type" not in batch["updates"][0]
+    assert messages[1][1] is admin
+
+
+def test_dispatcher_batches_each_tick():
+    outbox = MemoryOutbox()
+    sender = RecordingSender()
+    dispatcher = EventDispatcher(outbox, sender, tick_seconds=0.05)
+    for loan_id in range(1, 101):
+        outbox.put(GROUP, status_event(loan_id, "SUBMITTED", "APPROVED"))
+
+    dispatcher.start()
+    assert _wait_for(lambda: dispatcher.events_read == 100)
+    dispatcher.stop()
+
+    assert len(sender.messages) == 1
+    assert sender.messages[0][1]["count"] == 100
+    stats = dispatcher.stats()
+    assert stats["messages_sent"] == 1 and stats["pending"] == 0 and not stats["running"]
+
+
+def test_flush_reads_in_max_batch_chunks():
+    outbox = MemoryOutbox()
+    sender = RecordingSender()
+    dispatcher = EventDispatcher(outbox, sender, max_batch=10)
+    for loan_id in range(25):
+        outbox.put(GROUP, status_event(loan_id, "SUBMITTED", "APPROVED"))
+
+    assert dispatcher.flush() == 3
+    assert [m["count"] for _, m in sender.messages] == [10, 10, 5]
+
+
+def test_send_failures_are_counted_not_raised():
+    outbox = MemoryOutbox()
+
+    def failing(group, message):
+        raise ConnectionError("channel layer down")
+
+    dispatcher = EventDispatcher(outbox, failing)
+    outbox.put(GROUP, {"type": "admin_action", "action": "BULK_REJECT", "affected_loans": []})
+    assert dispatcher.flush() == 0
+    assert dispatcher.send_failures == 1 and outbox.pending() == 0
+
+
+def test_memory_outbox_drops_oldest_when_full():
+    outbox = MemoryOutbox(max_pending=3)
+    for loan_id in range(5):
+        outbox.put(GROUP, status_event(loan_id, "SUBMITTED", "APPROVED"))
+    assert outbox.dropped == 2
+    assert [event["loan_id"] for _, event in outbox.read()] == [2, 3, 4]
+
+
+def test_sqlite_outbox_fans_out_to_every_reader(tmp_path):
+    path = tmp_path / "event_outbox.sqlite3"
+    writer = SQLiteOutbox(path)  # e.g. a WSGI worker or management command
+    writer.put(GROUP, status_event(1, "SUBMITTED", "APPROVED"))  # before any reader: not replayed
+
+    readers = [SQLiteOutbox(path), SQLiteOutbox(path)]  # two ASGI workers
+    senders = [RecordingSender(), RecordingSender()]
+    dispatchers = [EventDispatcher(outbox, sender) for outbox, sender in zip(readers, senders)]
+    for dispatcher in dispatchers:
+        dispatcher.flush()
+
+    writer.put(GROUP, status_event(2, "SUBMITTED", "APPROVED"))
+    writer.put(GROUP, status_event(3, "SUBMITTED", "REJECTED"))
+    for dispatcher in dispatchers:
+        dispatcher.flush()
+        assert dispatcher.flush() == 0  # each reader sees each event once
+
+    for sender in senders:
+        [(group, batch)] = sender.messages
+        assert group == GROUP
+        assert [u["loan_id"] for u in batch["updates"]] == [2, 3]
+
+    for outbox in [writer] + readers:
+        outbox.close()
+
+
+def test_sqlite_outbox_prunes_old_rows_without_reusing_ids(tmp_path):
+    outbox = SQLiteOutbox(tmp_path / "event_outbox.sqlite3", retention_seconds=0)
+    outbox.read()
+    outbox.put(GROUP, status_event(1, "SUBMITTED", "APPROVED"))
+    assert [e["loan_id"] for _, e in outbox.read()] == [1]
+
+    time.sleep(0.01)
+    assert outbox.prune() == 1
+    outbox.put(GROUP, status_event(2, "SUBMITTED", "APPROVED"))
+    assert [e["loan_id"] for _, e in outbox.read()] == [2]
+    outbox.close()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Unit tests for Fannie Mae categorical vocabularies, predict_batch and the
+hub's shared, parallel predict_all (models/fannie_mae_models/inference_helper.py).
+
+Model directories are written to a temp dir with a stub estimator, so the
+MLJAR / CatBoost / LightGBM stack is not needed.
+"""
+
+import importlib.util
+import json
+import os
+import pickle
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+HELPER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Test", "models", "fannie_mae_models", "inference_helper.py",
+)
+
+spec = importlib.util.spec_from_file_location("inference_helper", HELPER_PATH)
+inference_helper = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(inference_helper)
+
+FEATURES = ["Channel", "Property_State", "MSA_or_MSDA", "Original_UPB"]
+
+# Treat the fixture's columns as fully documented, so all three get vocabularies
+DOMAINS = {
+    "Channel": ["B", "C", "R"],
+    "Property_State": ["CA", "OH", "TX"],
+    "MSA_or_MSDA": ["10900", "17460", "41620"],
+}
+
+TRAIN = pd.DataFrame({
+    "Channel": ["R", "C", "B", "R"],
+    "Property_State": ["TX", "CA", None, "OH"],
+    "MSA_or_MSDA": ["41620", "17460", "10900", "41620"],
+    "Original_UPB": [100000.0, 250000.0, 300000.0, 150000.0],
+})
+
+
+class StubAutoML:
+    """Returns the encoded Channel code as the prediction; counts calls."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.seen = []
+        self.delay = delay
+
+    def predict(self, X):
+        self.calls += 1
+        self.seen.append(X)
+        time.sleep(self.delay)
+        return X["Channel"].to_numpy()
+
+    def predict_proba(self, X):
+        p = (X["Channel"].to_numpy() + 1) / 10
+        return np.column_stack([1 - p, p])
+
+
+def make_model(tmp_path, vocabularies=True, use_case="credit_risk",
+               task_type="binary_classification", delay=0.0):
+    model_dir = tmp_path / use_case
+    model_dir.mkdir()
+    features = {"feature_names": FEATURES, "categorical_features": FEATURES[:3]}
+    if vocabularies:
+        features["category_vocabularies"] = inference_helper.build_category_vocabularies(TRAIN, FEATURES, DOMAINS)
+    meta = {
+        "use_case": use_case,
+        "model": {"task_type": task_type, "target_column": "target"},
+        "features": features,
+    }
+    (model_dir / f"{use_case}_metadata.json").write_text(json.dumps(meta))
+    with open(model_dir / f"{use_case}_best_model.pkl", "wb") as f:
+        pickle.dump({"automl": None}, f)
+
+    model = inference_helper.FannieMaeInference(str(model_dir))
+    model.arts["automl"] = StubAutoML(delay=delay)
+    return model
+
+
+def make_hub(tmp_path, delay=0.0):
+    models = [
+        make_model(tmp_path, use_case="credit_risk", delay=delay),
+        make_model(tmp_path, use_case="portfolio_risk", task_type="regression", delay=delay),
+        make_model(tmp_path, use_case="regional_performance", delay=delay),
+    ]
+    hub = inference_helper.FannieMaeModelHub(str(tmp_path))
+    hub._models = {model.use_case: model for model in models}
+    return hub
+
+
+def test_vocabularies_are_sorted_training_categories():
+    vocabularies = inference_helper.build_category_vocabularies(TRAIN, FEATURES, DOMAINS)
+    assert vocabularies == DOMAINS
+
+
+def test_only_complete_documented_domains_get_vocabularies():
+    # Default domains: Property_State / MSA_or_MSDA are open-ended -> no vocabulary
+    assert inference_helper.build_category_vocabularies(TRAIN, FEATURES) == {"Channel": ["B", "C", "R"]}
+
+    # A sample missing a documented code cannot fix the training codes
+    partial = TRAIN.assign(Channel=["R", "C", "R", "R"])
+    assert inference_helper.build_category_vocabularies(partial, FEATURES) == {}
+
+
+def test_fit_vocabularies_skips_label_encoded_models(tmp_path):
+    train_path = tmp_path / "train.csv"
+    TRAIN.to_csv(train_path, index=False)
+    for use_case in ("credit_risk", "customer_segmentation"):
+        (tmp_path / use_case).mkdir()
+        meta = {"use_case": use_case, "features": {"feature_names": FEATURES, "category_vocabularies": {"x": []}}}
+        (tmp_path / use_case / f"{use_case}_metadata.json").write_text(json.dumps(meta))
+
+    written = inference_helper.write_category_vocabularies(str(tmp_path), str(train_path))
+
+    assert written == {"credit_risk": 1, "customer_segmentation": 0}
+    segmentation = json.loads((tmp_path / "customer_segmentation" / "customer_segmentation_metadata.json").read_text())
+    assert "category_vocabularies" not in segmentation["features"]
+
+
+def test_single_row_codes_match_batch_codes(tmp_path):
+    model = make_model(tmp_path)
+    batch = model._preprocess_supervised(model._align(TRAIN))
+    for i in range(len(TRAIN)):
+        single = model._preprocess_supervised(model._align(TRAIN.iloc[[i]]))
+        assert single.iloc[0].tolist() == batch.iloc[i].tolist()
+
+    # Training-time cat.codes of the full training frame
+    expected = TRAIN["Channel"].astype("category").cat.codes.tolist()
+    assert batch["Channel"].tolist() == expected
+    assert batch["Property_State"].tolist() == [2, 0, -1, 1]
+
+
+def test_unseen_missing_and_numeric_codes(tmp_path):
+    model = make_model(tmp_path)
+    X = pd.DataFrame({"Channel": ["Z", None], "MSA_or_MSDA": [17460, np.nan]})
+    encoded = model._preprocess_supervised(model._align(X))
+
+    assert encoded["Channel"].tolist() == [-1, -1]
+    assert encoded["MSA_or_MSDA"].tolist() == [1, -1]
+    # Features missing from the input are NaN after _align -> treated as missing
+    assert encoded["Property_State"].tolist() == [-1, -1]
+    assert encoded["Original_UPB"].tolist() == [0, 0]
+
+
+def test_without_vocabularies_falls_back_to_batch_codes(tmp_path):
+    model = make_model(tmp_path, vocabularies=False)
+    encoded = model._preprocess_supervised(model._align(TRAIN.iloc[[0]]))
+    assert encoded["Channel"].tolist() == [0]
+
+
+def test_predict_batch_streams_parquet_in_chunks(tmp_path):
+    pytest.importorskip("pyarrow")
+    model = make_model(tmp_path)
+    frame = pd.concat([TRAIN] * 5, ignore_index=True)
+    frame["Unused_Column"] = "x"
+    path = tmp_path / "batch.parquet"
+    frame.to_parquet(path, index=False)
+
+    result = model.predict_batch(str(path), batch_size=6, with_probabilities=True)
+
+    assert model.arts["automl"].calls == 4
+    assert result["n_rows"] == 20 and result["n_chunks"] == 4
+    assert result["predictions"].tolist() == [2, 1, 0, 2] * 5
+    assert result["probabilities"].shape == (20, 2)
+    assert result["rows_per_sec"] > 0
+    assert list(model.arts["automl"].seen[0].columns) == FEATURES
+
+
+class StateModel:
+    """Predicts the encoded Property_State code (a column without a stored vocabulary)."""
+
+    def predict(self, X):
+        return X["Property_State"].to_numpy()
+
+
+@pytest.mark.parametrize("as_parquet", [False, True])
+def test_predict_batch_codes_do_not_depend_on_batch_size(tmp_path, as_parquet):
+    if as_parquet:
+        pytest.importorskip("pyarrow")
+    model = make_model(tmp_path, vocabularies=False)
+    model.arts["automl"] = StateModel()
+    source = pd.concat([TRAIN] * 3, ignore_index=True)
+    if as_parquet:
+        source.to_parquet(tmp_path / "batch.parquet", index=False)
+        source = str(tmp_path / "batch.parquet")
+
+    results = [model.predict_batch(source, batch_size=size) for size in (1, 5, 12)]
+
+    whole = [2, 0, -1, 1] * 3  # cat.codes of Property_State over the whole input
+    assert all(result["predictions"].tolist() == whole for result in results)
+    assert results[0]["source_vocabulary_columns"] == ["Channel", "Property_State", "MSA_or_MSDA"]
+
+
+def test_predict_with_metrics_reports_batch_dependent_columns(tmp_path):
+    model = make_model(tmp_path)
+    assert model.predict_with_metrics(TRAIN.iloc[[0]])["batch_dependent_columns"] == []
+
+    # Default domains: a stored vocabulary for Channel only
+    model.category_lookups = inference_helper.build_category_lookups(
+        inference_helper.build_category_vocabularies(TRAIN, FEATURES)
+    )
+    result = model.predict_with_metrics(TRAIN.iloc[[0]])
+    assert result["batch_dependent_columns"] == ["Property_State", "MSA_or_MSDA"]
+
+
+def test_clustering_lookup_matches_label_encoder(tmp_path):
+    preprocessing = pytest.importorskip("sklearn.preprocessing")
+    model = make_model(tmp_path)
+    le = preprocessing.LabelEncoder().fit(["B", "C", "MISSING", "R"])
+    model.label_encoder_lookups = {"Channel": pd.Index(list(le.classes_), dtype=object)}
+
+    X = pd.DataFrame({"Channel": ["R", None, "Z", "B"]})
+    values = X["Channel"].fillna("MISSING").astype(str)
+    expected = values.apply(lambda x: le.transform([x])[0] if x in le.classes_ else 0).tolist()
+    assert model._preprocess_clustering(X).tolist() == [[v] for v in expected]
+
+
+def test_predict_all_encodes_once_and_reports_timing(tmp_path, monkeypatch):
+    hub = make_hub(tmp_path)
+    calls = []
+    original = inference_helper.FannieMaeInference._preprocess_supervised
+    monkeypatch.setattr(
+        inference_helper.FannieMaeInference, "_preprocess_supervised",
+        lambda self, X, lookups=None: calls.append(self.use_case) or original(self, X, lookups),
+    )
+
+    results = hub.predict_all(TRAIN)
+
+    assert len(calls) == 1
+    assert list(results) == ["credit_risk", "portfolio_risk", "regional_performance"]
+    assert results["credit_risk"]["predictions"] == [2, 1, 0, 2]
+    assert results["portfolio_risk"]["task_type"] == "regression"
+    for result in results.values():
+        assert set(result["timing"]) == {"prepare_ms", "predict_ms"}
+
+
+def test_parallel_matches_sequential_and_overlaps(tmp_path):
+    hub = make_hub(tmp_path, delay=0.2)
+
+    start = time.perf_counter()
+    parallel = hub.predict_all(TRAIN)
+    elapsed = time.perf_counter() - start
+    sequential = hub.predict_all(TRAIN, parallel=False)
+
+    strip = lambda results: {k: {f: v for f, v in r.items() if f != "timing"} for k, r in results.items()}
+    assert strip(parallel) == strip(sequential)
+    assert elapsed < 0.5  # three 0.2s models
+
+
+def test_model_errors_are_isolated(tmp_path):
+    hub = make_hub(tmp_path)
+    hub._models["portfolio_risk"].arts["automl"] = None
+
+    results = hub.predict_all_with_schema(TRAIN, use_cases=["credit_risk", "portfolio_risk", "missing"])
+
+    assert results["predictions"]["portfolio_risk"]["error"] == "No model loaded"
+    assert "error" in results["predictions"]["missing"]
+    assert results["predictions"]["credit_risk"]["predictions"] == [2, 1, 0, 2]
+    assert results["schemas"]["credit_risk"]["use_case"] == "credit_risk"
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Unit tests for the deterministic fast-path intent router (intent_router.py).
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from intent_router import (
+    SEED_EXAMPLES,
+    IntentRouter,
+    classify_by_rules,
+    load_logged_examples,
+    parse_llm_decision,
+)
+
+
+class FakeCrewOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+
+def make_router(threshold=0.6):
+    return IntentRouter(threshold=threshold, examples=SEED_EXAMPLES)
+
+
+def test_rules_route_unambiguous_queries():
+    assert classify_by_rules("Show me a bar chart of FD rates")[0] == "VISUALIZATION"
+    assert classify_by_rules("What is the max LTV for a condo?")[0] == "MORTGAGE_ANALYTICS"
+    assert classify_by_rules("I want to open a new account") == ("ONBOARDING", 1.0)
+    assert classify_by_rules("hello") == (None, 0.0)
+
+
+def test_conflicting_rules_lower_confidence():
+    label, confidence = classify_by_rules("chart the mortgage rates")
+    assert confidence == 0.5
+
+
+def test_high_confidence_query_skips_llm(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTENT_ROUTER_LOG", str(tmp_path / "log.jsonl"))
+    calls = []
+    routing = make_router().route(
+        "Best 1-year FD rates in India", llm_router=lambda: calls.append(1) or FakeCrewOutput("RESEARCH")
+    )
+    assert routing["intent"] == "ANALYSIS"
+    assert routing["route"] == "rules"
+    assert routing["confidence"] >= 0.6
+    assert calls == []
+
+
+def test_low_confidence_falls_back_to_llm_and_logs(tmp_path, monkeypatch):
+    log_path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("INTENT_ROUTER_LOG", str(log_path))
+    routing = make_router().route(
+        "good morning", region="India", llm_router=lambda: FakeCrewOutput(" research\n")
+    )
+    assert routing["route"] == "llm"
+    assert routing["intent"] == "RESEARCH"
+    assert routing["confidence"] is None
+
+    entry = json.loads(log_path.read_text().strip())
+    assert entry["query"] == "good morning"
+    assert entry["llm_label"] == "RESEARCH"
+    assert load_logged_examples(str(log_path)) == [("good morning", "RESEARCH")]
+
+
+def test_disabled_router_always_uses_llm(tmp_path, monkeypatch):
+    monkeypatch.setenv("INTENT_ROUTER_LOG", str(tmp_path / "log.jsonl"))
+    monkeypatch.setenv("INTENT_ROUTER_DISABLED", "1")
+    routing = make_router().route("Show me a chart", llm_router=lambda: FakeCrewOutput("VISUALIZATION"))
+    assert routing["route"] == "llm"
+
+
+def test_logged_queries_train_the_model():
+    query = "park my money somewhere safe"
+    trained = IntentRouter(examples=SEED_EXAMPLES + [(query, "RESEARCH")] * 3)
+    assert trained.model.predict(query)[0] == "RESEARCH"
+
+
+def test_parse_llm_decision():
+    assert parse_llm_decision("Decision: MORTGAGE_ANALYTICS.") == "MORTGAGE_ANALYTICS"
+    assert parse_llm_decision("maybe") == "MAYBE"
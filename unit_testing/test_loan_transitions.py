@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Unit tests for set-based loan status transitions (bank_app/loan_transitions.py):
+which loans move, decided_at, the audit trail and dashboard invalidation.
+
+Runs the project's Django settings against an in-memory database
+(see django_test_env.py).
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("django")
+pytest.importorskip("channels")
+
+from django_test_env import db, setup_test_django  # noqa: F401 (db is a fixture)
+
+setup_test_django()
+
+from django.core.cache import cache  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from bank_app.loan_transitions import bulk_transition  # noqa: E402
+from bank_app.models import AuditLog, LoanApplication  # noqa: E402
+
+EARLIER = timezone.now() - timedelta(days=30)
+
+
+def create_loans():
+    """One loan per case, keyed by application_id (bulk_create: no save() side effects)."""
+    loans = LoanApplication.objects.bulk_create([
+        LoanApplication(application_id="DRAFT", status="DRAFT", applicant_name="A", loan_amount=Decimal("1000")),
+        LoanApplication(application_id="SUBMITTED", status="SUBMITTED", applicant_name="B",
+                        loan_amount=Decimal("1000")),
+        LoanApplication(application_id="UNDER_REVIEW", status="UNDER_REVIEW", applicant_name="C",
+                        loan_amount=Decimal("1000")),
+        # Sent back for review after an earlier decision
+        LoanApplication(application_id="REOPENED", status="UNDER_REVIEW", applicant_name="D",
+                        loan_amount=Decimal("1000"), decided_at=EARLIER),
+        LoanApplication(application_id="APPROVED", status="APPROVED", applicant_name="E",
+                        loan_amount=Decimal("1000"), decided_at=EARLIER),
+    ])
+    return {loan.application_id: loan for loan in LoanApplication.objects.filter(
+        id__in=[loan.id for loan in loans]
+    )}
+
+
+def statuses():
+    return dict(LoanApplication.objects.values_list("application_id", "status"))
+
+
+def test_only_pending_loans_transition(db):
+    loans = create_loans()
+    before = timezone.now()
+
+    result = bulk_transition(LoanApplication.objects.all(), "APPROVED")
+
+    moved = ["SUBMITTED", "UNDER_REVIEW", "REOPENED"]
+    assert result["updated_count"] == 3
+    assert sorted(result["loan_ids"]) == sorted(loans[name].id for name in moved)
+    assert statuses() == {
+        "DRAFT": "DRAFT", "SUBMITTED": "APPROVED", "UNDER_REVIEW": "APPROVED",
+        "REOPENED": "APPROVED", "APPROVED": "APPROVED",
+    }
+    updated_at = dict(LoanApplication.objects.values_list("application_id", "updated_at"))
+    assert all(updated_at[name] >= before for name in moved)
+    assert updated_at["APPROVED"] == loans["APPROVED"].updated_at
+
+
+def test_decided_at_is_only_set_when_empty(db):
+    create_loans()
+    before = timezone.now()
+
+    bulk_transition(LoanApplication.objects.all(), "REJECTED")
+
+    decided_at = dict(LoanApplication.objects.values_list("application_id", "decided_at"))
+    assert decided_at["SUBMITTED"] >= before and decided_at["UNDER_REVIEW"] >= before
+    assert decided_at["REOPENED"] == EARLIER
+    assert decided_at["APPROVED"] == EARLIER
+    assert decided_at["DRAFT"] is None
+
+
+def test_one_audit_row_per_loan_with_old_and_new_status(db):
+    loans = create_loans()
+
+    bulk_transition(LoanApplication.objects.filter(application_id__in=["SUBMITTED", "REOPENED", "DRAFT"]),
+                    "APPROVED")
+
+    rows = AuditLog.objects.order_by("application_id").values_list("application_id", "action", "details")
+    assert [(loan_id, action, details["old_status"], details["new_status"]) for loan_id, action, details in rows] == [
+        (loans["SUBMITTED"].id, "LOAN_APPROVED", "SUBMITTED", "APPROVED"),
+        (loans["REOPENED"].id, "LOAN_APPROVED", "UNDER_REVIEW", "APPROVED"),
+    ]
+    assert {row.actor_type for row in AuditLog.objects.all()} == {"SYSTEM"}
+
+
+def test_nothing_to_transition(db):
+    create_loans()
+    bulk_transition(LoanApplication.objects.all(), "APPROVED")
+    audit_rows = AuditLog.objects.count()
+    generation = cache.get("dashboard:generation")
+
+    result = bulk_transition(LoanApplication.objects.all(), "REJECTED")
+
+    assert result == {"updated_count": 0, "loan_ids": []}
+    assert AuditLog.objects.count() == audit_rows
+    assert cache.get("dashboard:generation") == generation
+    assert bulk_transition(LoanApplication.objects.none(), "APPROVED")["updated_count"] == 0
+
+
+def test_invalidates_the_dashboard_cache(db):
+    from bank_app import dashboard_stats
+
+    create_loans()
+    stats, _ = dashboard_stats.get_stats()
+    assert stats["pending_approvals"] == 3
+
+    bulk_transition(LoanApplication.objects.all(), "APPROVED")
+
+    stats, _ = dashboard_stats.get_stats()
+    assert stats["pending_approvals"] == 0
+    assert stats["by_status"]["APPROVED"]["count"] == 4
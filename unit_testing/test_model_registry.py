@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Unit tests for the process-wide model registry (model_registry.py).
+
+Registers pickle files written to a temp directory, so no model artifacts
+or joblib install are needed.
+"""
+
+import os
+import pickle
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from model_registry import ModelRegistry
+
+
+def write_model(path, payload, mtime=None):
+    with open(path, "wb") as f:
+        pickle.dump(payload, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def make_registry(path, calls, check_interval=0.0):
+    def load():
+        calls.append(1)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    registry = ModelRegistry(check_interval=check_interval)
+    registry.register("scorer", load, str(path))
+    return registry
+
+
+def test_model_is_loaded_once_and_counted(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, {"weights": list(range(1000))})
+    calls = []
+    registry = make_registry(path, calls)
+
+    first = registry.get("scorer")
+    assert registry.get("scorer") is first
+    assert calls == [1]
+
+    stats = registry.stats()["scorer"]
+    assert stats["loaded"] and stats["loads"] == 1 and stats["hits"] == 1
+    assert stats["file_bytes"] == path.stat().st_size
+    assert stats["memory_bytes"] > 0
+    assert stats["load_seconds"] >= 0
+
+
+def test_concurrent_first_requests_load_once(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, "v1")
+    calls = []
+    registry = make_registry(path, calls)
+
+    threads = [threading.Thread(target=registry.get, args=("scorer",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1]
+
+
+def test_changed_mtime_triggers_reload(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, "v1", mtime=1_000_000)
+    calls = []
+    registry = make_registry(path, calls)
+    assert registry.get("scorer") == "v1"
+
+    write_model(path, "v2", mtime=2_000_000)
+    assert registry.get("scorer") == "v2"
+    assert registry.stats()["scorer"]["loads"] == 2
+
+
+def test_mtime_checks_are_throttled(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, "v1", mtime=1_000_000)
+    registry = make_registry(path, [], check_interval=3600)
+    registry.get("scorer")
+
+    write_model(path, "v2", mtime=2_000_000)
+    assert registry.get("scorer") == "v1"
+
+
+def test_failed_load_is_reported_and_retried(tmp_path):
+    path = tmp_path / "missing.pkl"
+    calls = []
+    registry = make_registry(path, calls)
+
+    assert "missing.pkl" in registry.warm()["scorer"]
+    assert registry.stats()["scorer"]["errors"] == 1
+
+    write_model(path, "v1")
+    assert registry.get("scorer") == "v1"
+    assert len(calls) == 2
+
+
+def test_unknown_model_raises_key_error():
+    with pytest.raises(KeyError):
+        ModelRegistry().get("nope")
+
+
+def test_warm_with_probe_reports_readiness(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, "v1")
+    probed = []
+    registry = ModelRegistry(check_interval=0.0)
+    registry.register("scorer", lambda: pickle.loads(path.read_bytes()), str(path), probe=probed.append)
+
+    assert registry.readiness()["ready"] is False
+    assert registry.warm(probe=True) == {"scorer": None}
+
+    assert probed == ["v1"]
+    assert registry.readiness()["ready"] is True
+    assert registry.stats()["scorer"]["probe_seconds"] >= 0
+
+
+def test_failed_probe_keeps_registry_not_ready(tmp_path):
+    path = tmp_path / "model.pkl"
+    write_model(path, "v1")
+
+    def probe(model):
+        raise ValueError("bad input width")
+
+    registry = ModelRegistry(check_interval=0.0)
+    registry.register("scorer", lambda: pickle.loads(path.read_bytes()), str(path), probe=probe)
+
+    assert registry.warm(probe=True) == {"scorer": "bad input width"}
+    readiness = registry.readiness()
+    assert readiness["ready"] is False and readiness["warmup"] == "finished"
+    assert readiness["failures"] == {"scorer": "bad input width"}
+    assert registry.stats()["scorer"]["probe_error"] == "bad input width"
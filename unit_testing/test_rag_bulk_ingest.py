@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Unit tests for bulk RAG ingestion (rag_bulk_ingest.py).
+
+Uses a throwaway Chroma store with a deterministic hash embedding, so no
+embedding model is downloaded.
+"""
+
+import hashlib
+import os
+import sys
+import zipfile
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_bulk_ingest
+import rag_engine
+
+
+class HashEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        self.batches = []
+
+    @staticmethod
+    def name():
+        return "test-hash"
+
+    def __call__(self, input):
+        self.batches.append(len(input))
+        return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:16]] for text in input]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    embedding = HashEmbedding()
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.get_or_create_collection("policy_documents", embedding_function=embedding)
+    monkeypatch.setattr(rag_engine, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    rag_engine.set_embedding_function(embedding, "test", cache_dir=tmp_path / "embeddings")
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    return collection, embedding
+
+
+def policy(topic, paragraphs):
+    return "\n\n".join(f"{topic} rule {i}. " + "Applicants must meet the limit. " * 25 for i in range(paragraphs))
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "corpus"
+    (root / "nested").mkdir(parents=True)
+    (root / "fico.txt").write_text(policy("FICO", 4))
+    (root / "nested" / "dti.md").write_text(policy("DTI", 3))
+    (root / "ltv.txt").write_text(policy("LTV", 2))
+    (root / "ltv_copy.txt").write_text(policy("LTV", 2))
+    (root / "blank.txt").write_text("too short")
+    (root / "notes.csv").write_text("ignored")
+    (root / ".hidden").mkdir()
+    (root / ".hidden" / "draft.txt").write_text(policy("Draft", 2))
+    return root
+
+
+def test_directory_ingest_batches_across_files(store, corpus):
+    collection, embedding = store
+    finished = []
+
+    report = rag_bulk_ingest.bulk_ingest(
+        corpus, category="lending", workers=0, batch_size=8,
+        progress=lambda done, total, entry: finished.append((done, total, entry["file_name"])),
+    )
+
+    statuses = {e["file_name"]: e["status"] for e in report["files"]}
+    assert statuses == {
+        "blank.txt": "error: document has too little text content",
+        "fico.txt": "success",
+        "ltv.txt": "success",
+        "ltv_copy.txt": "skipped (duplicate of ltv.txt)",
+        "dti.md": "success",
+    }
+    summary = report["summary"]
+    assert summary["ingested"] == 3 and summary["skipped"] == 1 and summary["errors"] == 1
+    assert collection.count() == summary["chunks_written"]
+    # Every embedding batch but the last is full, regardless of file boundaries
+    assert all(size == 8 for size in embedding.batches[:-1])
+    assert summary["batches_written"] == len(embedding.batches)
+    assert [done for done, _, _ in finished] == [1, 2, 3, 4, 5]
+
+    stats = rag_engine.get_stats()
+    assert stats["total_documents"] == 3 and stats["total_chunks"] == collection.count()
+    # Same chunks and metadata as single-file ingestion
+    fico = next(e for e in report["files"] if e["file_name"] == "fico.txt")
+    stored = collection.get(where={"file_hash": fico["file_hash"]})
+    assert sorted(stored["documents"]) == sorted(rag_engine.chunk_text(policy("FICO", 4)))
+    assert {m["category"] for m in stored["metadatas"]} == {"lending"}
+
+
+def test_rerun_resumes_uncatalogued_files(store, corpus, tmp_path):
+    collection, _ = store
+    first = rag_bulk_ingest.bulk_ingest(corpus, workers=0, batch_size=5)
+    chunks = collection.count()
+    # Simulate a crash after fico.txt's chunks were written but before its catalog row
+    fico_hash = next(e["file_hash"] for e in first["files"] if e["file_name"] == "fico.txt")
+    rag_engine._get_catalog().delete(fico_hash)
+
+    report_path = tmp_path / "report.json"
+    second = rag_bulk_ingest.bulk_ingest(corpus, workers=0, batch_size=5, report_path=str(report_path))
+
+    statuses = {e["file_name"]: e["status"] for e in second["files"]}
+    assert statuses["fico.txt"] == "success"
+    assert statuses["ltv.txt"] == statuses["dti.md"] == "skipped (already exists)"
+    assert collection.count() == chunks
+    assert rag_engine.get_stats()["total_documents"] == 3
+    assert report_path.exists()
+
+
+def test_zip_archive_with_process_pool(store, corpus, tmp_path):
+    collection, _ = store
+    archive = tmp_path / "regulator.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in corpus.rglob("*"):
+            if path.is_file():
+                zf.write(path, path.relative_to(corpus))
+        zf.writestr("../escape.txt", policy("Escape", 2))
+
+    report = rag_bulk_ingest.bulk_ingest(archive, workers=2, batch_size=16)
+
+    assert report["summary"]["ingested"] == 3
+    assert (rag_engine.UPLOAD_DIR / "regulator" / "fico.txt").exists()
+    assert not (rag_engine.UPLOAD_DIR / "escape.txt").exists()
+    assert collection.count() == report["summary"]["chunks_written"]
+
+
+def test_missing_source_raises(store, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        rag_bulk_ingest.bulk_ingest(tmp_path / "nope")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Unit tests for the RAG document catalog (rag_catalog.py) and its wiring in
+rag_engine (ingest / delete / reset keep it in sync; list_documents and
+get_stats read from it).
+
+Uses a throwaway Chroma store with a deterministic hash embedding, so no
+embedding model is downloaded.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+from rag_catalog import RAGCatalog, documents_from_collection
+
+POLICY_TEXT = (
+    "Loan approval policy. Applicants need a minimum credit score of 650. "
+    "Debt to income ratio must stay below 40 percent for unsecured loans. "
+) * 40
+
+
+class HashEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name():
+        return "test-hash"
+
+    def __call__(self, input):
+        return [
+            [b / 255 for b in hashlib.sha256(text.encode()).digest()[:16]]
+            for text in input
+        ]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    embedding = HashEmbedding()
+    collection = client.get_or_create_collection("policy_documents", embedding_function=embedding)
+    monkeypatch.setattr(rag_engine, "CHROMA_DIR", tmp_path / "chroma")
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    rag_engine.set_embedding_function(embedding, "test", cache_dir=tmp_path / "embeddings")
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    return collection
+
+
+def write_doc(tmp_path, name, text=POLICY_TEXT):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_ingest_and_delete_keep_catalog_in_sync(store, tmp_path):
+    a = rag_engine.ingest_document(write_doc(tmp_path, "loans.txt"), category="lending", tags=["loan"])
+    b = rag_engine.ingest_document(write_doc(tmp_path, "kyc.txt", "KYC rules. " * 300), category="compliance")
+
+    docs = rag_engine.list_documents()
+    assert [d["file_name"] for d in docs] == ["loans.txt", "kyc.txt"]
+    assert docs[0]["tags"] == "loan"
+
+    stats = rag_engine.get_stats()
+    assert stats["total_documents"] == 2
+    assert stats["total_chunks"] == store.count() == a["total_chunks"] + b["total_chunks"]
+    assert stats["categories"] == ["compliance", "lending"]
+
+    rag_engine.delete_document_by_name("kyc.txt")
+    assert [d["file_name"] for d in rag_engine.list_documents()] == ["loans.txt"]
+    assert rag_engine.get_stats()["total_chunks"] == store.count()
+
+
+def test_list_and_stats_do_not_scan_chroma(store, tmp_path, monkeypatch):
+    rag_engine.ingest_document(write_doc(tmp_path, "loans.txt"), category="lending")
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("collection scanned")
+
+    monkeypatch.setattr(store, "get", no_scan)
+    monkeypatch.setattr(store, "count", no_scan)
+    assert rag_engine.get_stats()["total_documents"] == 1
+    assert len(rag_engine.list_documents()) == 1
+
+
+def test_existing_store_is_catalogued_on_first_use(store, tmp_path):
+    result = rag_engine.ingest_document(write_doc(tmp_path, "loans.txt"), category="lending")
+    os.remove(rag_engine.CATALOG_PATH)
+    rag_engine._catalog = None
+
+    docs = rag_engine.list_documents()
+    assert len(docs) == 1
+    assert docs[0]["file_hash"] == result["file_hash"]
+    assert docs[0]["total_chunks"] == result["total_chunks"]
+
+
+def test_rebuild_repairs_drift_and_pages(store, tmp_path):
+    rag_engine.ingest_document(write_doc(tmp_path, "loans.txt"), category="lending")
+    rag_engine.ingest_document(write_doc(tmp_path, "kyc.txt", "KYC rules. " * 300), category="compliance")
+    # Catalog loses a row and gains a stale one
+    catalog = rag_engine._get_catalog()
+    catalog.delete(catalog.hashes_for_name("kyc.txt")[0])
+    catalog.upsert({"file_hash": "stale", "file_name": "gone.pdf", "total_chunks": 3})
+
+    result = rag_engine.rebuild_catalog()
+
+    assert result == {"documents": 2, "chunks": store.count()}
+    assert sorted(d["file_name"] for d in rag_engine.list_documents()) == ["kyc.txt", "loans.txt"]
+    # Paging yields the same aggregate as a single page
+    assert sorted(map(str, documents_from_collection(store, page_size=2))) == \
+        sorted(map(str, documents_from_collection(store)))
+
+
+def test_clear_empties_but_keeps_catalog_built(tmp_path):
+    catalog = RAGCatalog(str(tmp_path / "catalog.sqlite3"))
+    assert not catalog.is_built()
+    catalog.upsert({"file_hash": "h1", "file_name": "a.pdf", "category": "kyc", "total_chunks": 4})
+    catalog.clear()
+    assert catalog.is_built()
+    assert catalog.stats() == {"total_documents": 0, "total_chunks": 0, "categories": []}
+
+
+def test_connections_are_closed_after_each_call(tmp_path):
+    catalog = RAGCatalog(str(tmp_path / "catalog.sqlite3"))
+    with catalog._connect() as conn:
+        conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    catalog.upsert({"file_hash": "h1", "file_name": "a.pdf", "category": "kyc", "total_chunks": 4})
+    assert catalog.stats()["total_chunks"] == 4
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Golden tests for rag_engine.chunk_text / iter_chunks.
+
+unit_testing/golden/chunk_text_golden.json holds the chunk count and a
+SHA-256 of the chunk list produced by the original (per-chunk table scan)
+chunker for the uploaded policy documents and for seeded synthetic
+documents with [TABLE N] blocks. The linear-time chunker must reproduce
+them exactly.
+
+Regenerate (only when chunking is meant to change):
+    python unit_testing/test_rag_chunker.py --regenerate
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = os.path.join(ROOT_DIR, "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "chunk_text_golden.json")
+UPLOAD_DIR = os.path.join(ROOT_DIR, "rag_uploads")
+
+# (pages, seed, chunk_size, chunk_overlap)
+SYNTHETIC_CASES = {
+    "synthetic_default": (4, 1, rag_engine.CHUNK_SIZE, rag_engine.CHUNK_OVERLAP),
+    "synthetic_small_chunks": (3, 2, 600, 150),
+    "synthetic_no_overlap": (3, 3, 900, 0),
+    "synthetic_long_rows": (2, 4, 500, 100),
+}
+
+WORDS = (
+    "borrower loan credit score income policy approval underwriting collateral "
+    "ratio verification compliance exposure limit threshold applicant risk"
+).split()
+
+
+def synthetic_policy(pages, seed, long_rows=False):
+    """Deterministic policy-like text: paragraphs, sentences and [TABLE N] blocks."""
+    rng = random.Random(seed)
+    out = []
+    for page in range(pages):
+        parts = [f"Section {page + 1}. Lending policy"]
+        for _ in range(rng.randint(2, 5)):
+            sentences = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 20))).capitalize() + "."
+                for _ in range(rng.randint(2, 8))
+            ]
+            sep = "\n" if rng.random() < 0.3 else " "
+            parts.append(sep.join(sentences))
+        if rng.random() < 0.6:
+            rows = [f"[TABLE {rng.randint(1, 3)}]", "Grade | FICO | Max DTI | Max LTV"]
+            for _ in range(rng.randint(3, 25)):
+                width = rng.randint(40, 200) if long_rows else 4
+                rows.append(" | ".join(rng.choice(WORDS) for _ in range(width)))
+            parts.append("\n".join(rows))
+        out.append("\n\n".join(parts))
+        if rng.random() < 0.2:
+            out.append("\n\n\n\n")
+    return "\n\n".join(out)
+
+
+EDGE_TEXT = (
+    "Intro paragraph about lending limits.\n\n[TABLE 1]\n[TABLE 2]\nGrade | FICO\nA | 760\n"
+    "Narrative mentioning [TABLE 9]\ninline and [TABLE x] markers.\n\n"
+    + "Policy sentence number one. " * 30
+    + "\n[TABLE 3]\nTier | DTI\n1 | 36\n2 | 43\n\nClosing remarks.\n[TABLE 4]"
+)
+
+
+def golden_cases():
+    cases = {"edge_headers": (EDGE_TEXT, 300, 60)}
+    for name, (pages, seed, size, overlap) in SYNTHETIC_CASES.items():
+        cases[name] = (synthetic_policy(pages, seed, long_rows=name.endswith("long_rows")), size, overlap)
+    if os.path.isdir(UPLOAD_DIR):
+        for file_name in sorted(os.listdir(UPLOAD_DIR)):
+            if file_name.endswith(".txt"):
+                text = rag_engine.load_txt(rag_engine.Path(UPLOAD_DIR, file_name))
+                cases[f"upload:{file_name}"] = (text, rag_engine.CHUNK_SIZE, rag_engine.CHUNK_OVERLAP)
+                cases[f"upload_small:{file_name}"] = (text, 400, 100)
+    return cases
+
+
+def digest(chunks):
+    return {"chunks": len(chunks), "sha256": hashlib.sha256(json.dumps(chunks).encode()).hexdigest()}
+
+
+with open(GOLDEN_PATH) as f:
+    GOLDEN = json.load(f)
+
+CASES = golden_cases()
+
+
+@pytest.mark.parametrize("name", sorted(set(GOLDEN) & set(CASES)))
+def test_chunk_text_matches_golden(name):
+    text, size, overlap = CASES[name]
+    assert digest(rag_engine.chunk_text(text, size, overlap)) == GOLDEN[name]
+
+
+def test_pdf_manual_matches_golden():
+    pytest.importorskip("pdfplumber")
+    text = rag_engine.load_pdf(rag_engine.Path(UPLOAD_DIR, "Bank_Lending_Policy_Manual.pdf"))
+    assert digest(rag_engine.chunk_text(text)) == GOLDEN["upload:Bank_Lending_Policy_Manual.pdf"]
+
+
+def test_table_spans_match_reference_regex():
+    # Short random texts built from header / newline / word fragments, where
+    # running the backtracking regex itself is still cheap
+    rng = random.Random(11)
+    pieces = ["[TABLE 1]", "[TABLE 22]", "[TABLE x]", "\n", "\n", "row | a", " text. ", "["]
+    for _ in range(3000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 14)))
+        expected = [m.span() for m in rag_engine._TABLE_BLOCK_RE.finditer(text)]
+        assert rag_engine._table_spans(text) == expected, repr(text)
+
+
+def test_iter_chunks_streams_same_chunks():
+    text, size, overlap = CASES["synthetic_small_chunks"]
+    stream = rag_engine.iter_chunks(text, size, overlap)
+    first = next(stream)
+    assert [first] + list(stream) == rag_engine.chunk_text(text, size, overlap)
+
+
+def test_short_and_empty_text():
+    assert rag_engine.chunk_text("   ") == []
+    assert list(rag_engine.iter_chunks("")) == []
+    assert rag_engine.chunk_text("\n\n\n\nshort policy\n") == ["short policy"]
+
+
+if __name__ == "__main__" and "--regenerate" in sys.argv:
+    golden = {name: digest(rag_engine.chunk_text(*case)) for name, case in CASES.items()}
+    try:
+        pdf_text = rag_engine.load_pdf(rag_engine.Path(UPLOAD_DIR, "Bank_Lending_Policy_Manual.pdf"))
+        golden["upload:Bank_Lending_Policy_Manual.pdf"] = digest(rag_engine.chunk_text(pdf_text))
+    except Exception as e:
+        print(f"PDF skipped: {e}")
+    with open(GOLDEN_PATH, "w") as f:
+        json.dump(golden, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(golden)} golden cases to {GOLDEN_PATH}")
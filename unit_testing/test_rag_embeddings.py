@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Unit tests for the cached embedding layer (rag_embeddings.py) and its use
+by rag_engine (queries and ingestion embed through the cache; get_stats
+reports hit rates).
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+from rag_embeddings import CachedEmbedder, DiskEmbeddingCache
+
+
+class FakeModel:
+    """Deterministic 8-d vectors; records every batch it is asked to embed."""
+
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def name():
+        return "fake"
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97)] + [float(i) for i in range(6)] for text in input]
+
+
+def test_lru_disk_and_batched_misses(tmp_path):
+    model = FakeModel()
+    embedder = CachedEmbedder(model, "fake", cache_dir=str(tmp_path), lru_size=2, batch_size=2)
+
+    first = embedder.embed(["a", "bb", "a", "ccc"])
+    assert model.calls == [["a", "bb"], ["ccc"]]  # duplicate embedded once, batches of 2
+    assert first[0].dtype == np.float32 and np.array_equal(first[0], first[2])
+
+    embedder.embed(["ccc", "bb"])  # both still in the LRU (size 2)
+    assert len(model.calls) == 2
+    embedder.embed(["a"])  # evicted from the LRU, served from disk
+    assert len(model.calls) == 2
+
+    stats = embedder.stats()
+    assert stats["requests"] == 7 and stats["misses"] == 3
+    assert stats["lru_hits"] == 2 and stats["disk_hits"] == 2
+    assert stats["hit_rate"] == round(4 / 7, 4)
+    assert stats["disk_entries"] == 3 and stats["model"] == "fake"
+
+
+def test_disk_cache_is_shared_and_model_scoped(tmp_path):
+    model = FakeModel()
+    vectors = CachedEmbedder(model, "fake", cache_dir=str(tmp_path)).embed(["policy text", "other"])
+
+    # A new embedder (e.g. another process) reads the memory-mapped store
+    again = CachedEmbedder(model, "fake", cache_dir=str(tmp_path))
+    assert all(np.array_equal(a, b) for a, b in zip(again.embed(["policy text", "other"]), vectors))
+    assert len(model.calls) == 1
+
+    # A different model name never sees those vectors
+    CachedEmbedder(model, "fake-v2", cache_dir=str(tmp_path)).embed(["policy text"])
+    assert len(model.calls) == 2
+
+
+def test_disk_cache_appends_and_rejects_other_dimensions(tmp_path):
+    cache = DiskEmbeddingCache(str(tmp_path))
+    cache.put_many({"h1": np.ones(4), "h2": np.zeros(4)})
+    reader = DiskEmbeddingCache(str(tmp_path))
+    assert set(reader.get_many(["h1", "h2", "missing"])) == {"h1", "h2"}
+
+    cache.put_many({"h1": np.full(4, 5.0), "h3": np.full(4, 3.0)})  # h1 already stored: kept
+    got = reader.get_many(["h1", "h3"])  # reader remaps the grown file
+    assert got["h1"].tolist() == [1.0] * 4 and got["h3"].tolist() == [3.0] * 4
+    assert len(reader) == 3
+
+    with pytest.raises(ValueError):
+        cache.put_many({"h4": np.ones(3)})
+
+
+def test_repeated_agent_queries_skip_the_model(tmp_path, monkeypatch):
+    chromadb = pytest.importorskip("chromadb")
+    import rag_engine
+
+    model = FakeModel()
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.get_or_create_collection("policy_documents")
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    monkeypatch.setattr(rag_engine, "RESULT_CACHE_SIZE", 0)  # exercise the embedding cache itself
+    rag_engine.set_embedding_function(model, "fake", cache_dir=tmp_path / "embeddings")
+
+    path = tmp_path / "policy.txt"
+    path.write_text("Minimum FICO score is 620 for conventional loans. " * 80)
+    rag_engine.ingest_document(path)
+    queries = ["minimum FICO score", "maximum DTI ratio"]
+    rag_engine.retrieve_many(queries)
+    calls = len(model.calls)
+
+    for _ in range(3):
+        rag_engine.retrieve_many(queries)
+    assert len(model.calls) == calls
+
+    cache = rag_engine.get_stats()["embedding_cache"]
+    assert cache["lru_hits"] == 6 and cache["hit_rate"] > 0
+
+
+def test_index_connections_are_closed_after_each_call(tmp_path):
+    cache = DiskEmbeddingCache(str(tmp_path))
+    with cache._connect() as conn:
+        conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    cache.put_many({"h1": np.ones(4)})
+    assert set(cache.get_many(["h1"])) == {"h1"}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Unit tests for hybrid retrieval: the FTS5 keyword index (rag_hybrid.py),
+reciprocal rank fusion, its upkeep by rag_engine on ingest / update /
+delete, and the budgeted rerank.
+
+Uses a throwaway Chroma store and a keyword-counting embedding, so no
+embedding or cross-encoder model is downloaded.
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+from rag_hybrid import KeywordIndex, fuse, keyword_query, reciprocal_rank_fusion
+
+WORDS = ["ratio", "income", "score"]
+
+POLICIES = {
+    "dti.txt": "Maximum DTI of 43% applies whatever the credit score; compensating factors may raise it.",
+    "ratios.txt": "Every ratio matters: the ratio of debt, the ratio of payments, the housing ratio.",
+    "income.txt": "Income ratio rules: stable income, documented income, ratio reviews each year.",
+    "fico.txt": "Minimum FICO score of 620, score overrides need committee approval per clause 3.2.",
+}
+
+
+class WordEmbedding(chromadb.EmbeddingFunction):
+    """One axis per word in WORDS: blind to numbers, percentages and clauses."""
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name():
+        return "test-word"
+
+    def __call__(self, input):
+        return [[float(text.lower().count(word)) + 0.01 for word in WORDS] for text in input]
+
+
+class FakeReranker:
+    """Prefers texts containing ``favourite``; records the pairs it scored."""
+
+    def __init__(self, favourite, ms_per_pair=0.0):
+        self.favourite = favourite
+        self.ms_per_pair = ms_per_pair
+        self.available = True
+        self.scored = []
+
+    def estimate_ms(self, pairs):
+        return self.ms_per_pair * pairs
+
+    def score(self, pairs):
+        self.scored.extend(pairs)
+        return [0.9 if self.favourite in text else 0.1 for _, text in pairs]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.get_or_create_collection("policy_documents", metadata={"hnsw:space": "cosine"})
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    monkeypatch.setattr(rag_engine, "_reranker", None)
+    monkeypatch.setattr(rag_engine, "RERANK_ENABLED", False)
+    rag_engine.set_embedding_function(WordEmbedding(), "test-word", cache_dir=tmp_path / "embeddings")
+    for name, text in POLICIES.items():
+        path = tmp_path / name
+        path.write_text(text)
+        assert rag_engine.ingest_document(path, category="loan_policy")["status"] == "success"
+    return collection
+
+
+def test_keyword_query_quotes_terms():
+    assert keyword_query("DTI 43% NEAR clause 3.2*") == '"dti" OR "43%" OR "near" OR "clause" OR "3.2"'
+    assert keyword_query("?? --") == ""
+
+
+def test_keyword_index_upkeep(tmp_path):
+    index = KeywordIndex(tmp_path / "index.sqlite3")
+    meta = {"file_hash": "h1", "file_name": "a.txt", "category": "loan_policy", "tags": "dti,conforming"}
+    index.add(["h1_0", "h1_1"], ["DTI limit 43%", "LTV limit 80%"], [dict(meta, chunk_index=0), dict(meta, chunk_index=1)])
+
+    assert [h["chunk_id"] for h in index.search("43%")] == ["h1_0"]
+    assert index.search("43") == []
+    assert index.search("43%", category="other") == []
+    assert [h["chunk_id"] for h in index.search("limit", tags=["conforming"])] == ["h1_0", "h1_1"]
+
+    # Re-adding an id replaces its postings
+    index.add(["h1_0"], ["DTI limit 45%"], [dict(meta, chunk_index=0)])
+    assert index.search("43%") == [] and len(index) == 2
+
+    index.update_metadata(["h1_1"], [dict(meta, file_hash="h2", category="mortgage", chunk_index=5)])
+    [hit] = index.search("80%", category="mortgage")
+    assert hit["chunk_index"] == 5
+
+    assert index.delete_file("h1") == 1
+    index.delete_ids(["h1_1"])
+    assert len(index) == 0 and index.search("limit") == []
+
+
+def test_rrf_rewards_agreement():
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+    assert scores["a"] == pytest.approx(1 / 61 + 1 / 62)
+    assert max(scores, key=scores.get) == "a"
+
+    vector = [
+        {"chunk_id": "a", "content": "", "distance": 0.1, "relevance_score": 0.9},
+        {"chunk_id": "b", "content": "", "distance": 0.2, "relevance_score": 0.8},
+    ]
+    keyword = [{"chunk_id": "c", "content": "", "bm25": 3.0}, {"chunk_id": "a", "content": "", "bm25": 1.0}]
+    fused = fuse(vector, keyword, n_results=3)
+    assert [h["chunk_id"] for h in fused] == ["a", "c", "b"]
+    assert fused[0]["vector_rank"] == 1 and fused[0]["keyword_rank"] == 2
+    assert fused[1]["distance"] == 1.0 and fused[1]["vector_rank"] is None and "bm25" not in fused[1]
+    assert fused[0]["rrf_score"] > fused[1]["rrf_score"] > fused[2]["rrf_score"]
+    # relevance_score stays the vector similarity
+    assert [h["relevance_score"] for h in fused] == [0.9, 0.0, 0.8]
+
+
+def test_hybrid_finds_exact_terms_vector_search_misses(store):
+    vector_only = rag_engine.retrieve("DTI ratio 43%", n_results=2, hybrid=False)
+    hybrid = rag_engine.retrieve("DTI ratio 43%", n_results=2)
+    assert "dti.txt" not in [h["file_name"] for h in vector_only]
+    assert "dti.txt" in [h["file_name"] for h in hybrid]
+
+    [clause] = rag_engine.retrieve("clause 3.2", n_results=1)
+    assert clause["file_name"] == "fico.txt"
+
+    per_query = rag_engine.retrieve_many(["DTI 43%", "clause 3.2"], n_results=1)
+    assert [hits[0]["file_name"] for hits in per_query] == ["dti.txt", "fico.txt"]
+
+
+def test_hybrid_hits_keep_vector_similarity(store):
+    merged = rag_engine.retrieve_many(["DTI 43%", "clause 3.2"], n_results=2, merge=True)
+
+    rrf = [hit["rrf_score"] for hit in merged]
+    assert rrf == sorted(rrf, reverse=True)
+    for hit in merged:
+        assert hit["relevance_score"] == round(max(0, 1 - hit["distance"]), 4)
+
+
+def test_index_follows_updates_and_deletes(store, tmp_path):
+    path = tmp_path / "dti.txt"
+    path.write_text("Maximum DTI of 45% applies whatever the credit score; compensating factors may raise it.")
+    assert rag_engine.ingest_document(path, category="loan_policy", update=True)["status"] == "updated"
+
+    index = rag_engine._get_keyword_index()
+    assert index.search("43%") == []
+    [hit] = index.search("45%")
+    assert hit["file_name"] == "dti.txt"
+
+    rag_engine.delete_document_by_name("dti.txt")
+    assert index.search("45%") == []
+    assert len(index) == store.count() == 3
+
+
+def test_existing_store_is_indexed_on_first_use(store, monkeypatch, tmp_path):
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "fresh_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+
+    index = rag_engine._get_keyword_index()
+
+    assert index.is_built() and len(index) == store.count()
+    assert rag_engine.retrieve("DTI 43%", n_results=1)[0]["file_name"] == "dti.txt"
+
+
+def test_rerank_reorders_within_budget(store, monkeypatch):
+    reranker = FakeReranker("FICO")
+    monkeypatch.setattr(rag_engine, "RERANK_ENABLED", True)
+    monkeypatch.setattr(rag_engine, "_reranker", reranker)
+    before = rag_engine.retrieval_stats()["reranked"]
+
+    hits = rag_engine.retrieve("DTI 43%", n_results=2)
+
+    assert hits[0]["file_name"] == "fico.txt" and hits[0]["rerank_score"] == 0.9
+    assert hits[0]["relevance_score"] < 0.9  # still the vector similarity
+    assert len(reranker.scored) == store.count()  # top RERANK_TOP_K of the fused hits
+    assert rag_engine.retrieval_stats()["reranked"] == before + 1
+
+
+def test_rerank_skipped_when_over_budget(store, monkeypatch):
+    reranker = FakeReranker("FICO", ms_per_pair=1000.0)
+    monkeypatch.setattr(rag_engine, "RERANK_ENABLED", True)
+    monkeypatch.setattr(rag_engine, "_reranker", reranker)
+    before = rag_engine.retrieval_stats()["rerank_skipped_budget"]
+
+    hits = rag_engine.retrieve("DTI 43%", n_results=1)
+
+    assert reranker.scored == [] and hits[0]["file_name"] == "dti.txt"
+    assert "rerank_score" not in hits[0]
+    assert rag_engine.retrieval_stats()["rerank_skipped_budget"] == before + 1
+
+
+def test_connections_are_closed_after_each_call(tmp_path):
+    index = KeywordIndex(tmp_path / "index.sqlite3")
+    with index._connect() as conn:
+        conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    index.add(["h1_0"], ["DTI limit 43%"], [{"file_hash": "h1", "file_name": "a.txt", "chunk_index": 0}])
+    assert [h["chunk_id"] for h in index.search("43%")] == ["h1_0"]
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Unit tests for incremental re-ingestion (rag_engine.ingest_document(update=True)).
+
+Uses a throwaway Chroma store with a deterministic hash embedding that
+counts the texts it embeds, so no embedding model is downloaded.
+"""
+
+import hashlib
+import os
+import sys
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+
+
+class CountingEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        self.embedded = 0
+
+    @staticmethod
+    def name():
+        return "test-counting"
+
+    def __call__(self, input):
+        self.embedded += len(input)
+        return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:16]] for text in input]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    embedding = CountingEmbedding()
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.get_or_create_collection("policy_documents", embedding_function=embedding)
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    rag_engine.set_embedding_function(embedding, "test", cache_dir=tmp_path / "embeddings")
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    return collection, embedding
+
+
+def sections(*numbers):
+    return "\n\n".join(
+        f"Section {n}. " + f"Rule {n} requires verified income and a credit review. " * 22 for n in numbers
+    )
+
+
+def stored_chunks(collection):
+    data = collection.get()
+    return {cid: (doc, meta) for cid, doc, meta in zip(data["ids"], data["documents"], data["metadatas"])}
+
+
+def revise(tmp_path, text):
+    path = tmp_path / "policy.txt"
+    path.write_text(text)
+    return path
+
+
+def test_update_embeds_only_changed_chunks(store, tmp_path):
+    collection, embedding = store
+    first = rag_engine.ingest_document(revise(tmp_path, sections(1, 2, 3, 4, 5)), category="lending")
+    before = stored_chunks(collection)
+    embedding.embedded = 0
+
+    # Section 3 reworded, section 5 dropped, section 6 added
+    revised = sections(1, 2, 3, 4).replace("Rule 3 requires", "Rule 3 now requires") + "\n\n" + sections(6)
+    result = rag_engine.ingest_document(revise(tmp_path, revised), category="lending", update=True)
+
+    expected = rag_engine.chunk_text(revised)
+    assert result["status"] == "updated"
+    assert result["replaced_file_hashes"] == [first["file_hash"]]
+    assert result["chunks_added"] == embedding.embedded
+    assert result["embeddings_saved"] == result["chunks_unchanged"] > 0
+    assert result["chunks_added"] + result["chunks_unchanged"] == len(expected)
+    assert result["chunks_removed"] == first["total_chunks"] - result["chunks_unchanged"]
+
+    after = stored_chunks(collection)
+    ordered = sorted(after.values(), key=lambda item: item[1]["chunk_index"])
+    assert [doc for doc, _ in ordered] == expected
+    assert {meta["file_hash"] for _, meta in ordered} == {result["file_hash"]}
+    # Unchanged chunks keep their ids (and therefore their embeddings)
+    kept = [cid for cid in after if cid in before]
+    assert len(kept) == result["chunks_unchanged"]
+    assert all(after[cid][0] == before[cid][0] for cid in kept)
+
+    docs = rag_engine.list_documents()
+    assert [(d["file_hash"], d["total_chunks"]) for d in docs] == [(result["file_hash"], len(expected))]
+
+
+def test_update_matches_chunks_stored_without_hashes(store, tmp_path):
+    collection, embedding = store
+    rag_engine.ingest_document(revise(tmp_path, sections(1, 2, 3)))
+    # Chunks written before chunk_hash metadata existed
+    data = collection.get()
+    collection.update(
+        ids=data["ids"],
+        metadatas=[{k: v for k, v in m.items() if k != "chunk_hash"} for m in data["metadatas"]],
+    )
+    embedding.embedded = 0
+
+    result = rag_engine.ingest_document(revise(tmp_path, sections(1, 2, 3, 4)), update=True)
+
+    assert result["embeddings_saved"] > 0
+    assert embedding.embedded == result["chunks_added"]
+    assert all("chunk_hash" in m for m in collection.get()["metadatas"])
+
+
+def test_without_update_revisions_accumulate(store, tmp_path):
+    rag_engine.ingest_document(revise(tmp_path, sections(1, 2)))
+    result = rag_engine.ingest_document(revise(tmp_path, sections(1, 2, 3)))
+    assert result["status"] == "success"
+    assert rag_engine.get_stats()["total_documents"] == 2
+
+    fresh = rag_engine.ingest_document(revise(tmp_path, sections(7)).rename(tmp_path / "new.txt"), update=True)
+    assert fresh["status"] == "success"
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Unit tests for normalized tag metadata (one indexed tag_<name> key per tag)
+and the optional per-category partition collections in rag_engine.py.
+
+Uses a throwaway Chroma store and a keyword-counting embedding, so no
+embedding model is downloaded.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+
+TOPICS = ["fico", "ltv", "dti"]
+
+
+class TopicEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name():
+        return "test-topic"
+
+    def __call__(self, input):
+        return [[float(text.lower().count(topic)) + 0.01 for topic in TOPICS] for text in input]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", None)
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    monkeypatch.setattr(rag_engine, "_partitions", {})
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", False)
+    rag_engine.set_embedding_function(TopicEmbedding(), "test", cache_dir=tmp_path / "embeddings")
+    return client
+
+
+def ingest(tmp_path, name, text, category="loan_policy", tags=None, update=False):
+    path = tmp_path / name
+    path.write_text(text)
+    result = rag_engine.ingest_document(path, category=category, tags=tags, update=update)
+    assert result["status"] in ("success", "updated")
+    return result
+
+
+def stored_metadata(file_name):
+    page = rag_engine._get_collection().get(where={"file_name": file_name}, include=["metadatas"])
+    return page["metadatas"]
+
+
+def test_normalize_tags():
+    assert rag_engine.normalize_tags([" Home Equity ", "FHA", "fha", ""]) == ["home_equity", "fha"]
+    assert rag_engine.normalize_tags("Jumbo,  VA Loan,") == ["jumbo", "va_loan"]
+    assert rag_engine.normalize_tags(None) == []
+
+
+def test_tags_are_stored_as_keys_and_filtered_exactly(store, tmp_path):
+    ingest(tmp_path, "fha.txt", "FHA FICO floor of 580 for FHA loans.", tags=["FHA", "Government"])
+    ingest(tmp_path, "fha_plus.txt", "FHA plus program FICO floor of 600.", tags=["fha_plus"])
+
+    [metadata] = stored_metadata("fha.txt")
+    assert metadata["tags"] == "fha,government"
+    assert metadata["tag_fha"] is True and metadata["tag_government"] is True
+
+    for hybrid in (False, True):
+        hits = rag_engine.retrieve("FICO floor", n_results=5, tags=["fha"], hybrid=hybrid)
+        assert [h["file_name"] for h in hits] == ["fha.txt"]  # no substring match on fha_plus
+    hits = rag_engine.retrieve("FICO floor", n_results=5, tags=["Government", "FHA_Plus"])
+    assert sorted(h["file_name"] for h in hits) == ["fha.txt", "fha_plus.txt"]
+
+
+def test_legacy_tag_strings_are_migrated(store, tmp_path):
+    collection = rag_engine._get_collection()
+    collection.add(
+        ids=["old_0"],
+        documents=["Legacy DTI policy: DTI up to 45%."],
+        embeddings=rag_engine.embed_texts(["Legacy DTI policy: DTI up to 45%."]),
+        metadatas=[{
+            "file_name": "legacy.txt", "file_hash": "old", "category": "loan_policy",
+            "tags": "Conforming,DTI", "chunk_index": 0, "total_chunks": 1,
+        }],
+    )
+
+    rag_engine._get_catalog()  # first load migrates
+
+    [metadata] = stored_metadata("legacy.txt")
+    assert metadata["tags"] == "conforming,dti" and metadata["tag_conforming"] is True
+    assert rag_engine._get_catalog().get_meta("tag_keys") is not None
+    assert [h["file_name"] for h in rag_engine.retrieve("DTI", tags=["conforming"])] == ["legacy.txt"]
+    assert rag_engine.migrate_tag_metadata() == {"chunks_updated": 0}
+
+
+def test_update_removes_stale_tag_keys(store, tmp_path):
+    text = "LTV limit of 80% for conventional loans. " * 3
+    ingest(tmp_path, "ltv.txt", text, tags=["conventional", "jumbo"])
+    ingest(tmp_path, "ltv.txt", text + "Updated.", tags=["conventional"], update=True)
+
+    for metadata in stored_metadata("ltv.txt"):
+        assert metadata["tags"] == "conventional" and "tag_jumbo" not in metadata
+    assert rag_engine.retrieve("LTV", tags=["jumbo"]) == []
+
+
+def test_partitions_mirror_writes(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", True)
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for loans.", category="loan_policy")
+    ingest(tmp_path, "ltv.txt", "Maximum LTV of 80% for mortgages.", category="Mortgage Rules")
+
+    # The first category-filtered search builds the partitions
+    [hit] = rag_engine.retrieve("FICO", category="loan_policy", n_results=3)
+    assert hit["file_name"] == "fico.txt"
+    assert sorted(rag_engine._partition_names()) == [
+        "policy_documents__loan_policy", "policy_documents__mortgage_rules",
+    ]
+    assert rag_engine._get_partition("Mortgage Rules").count() == 1
+
+    # Later writes are mirrored: new document, category change on update, delete
+    ingest(tmp_path, "dti.txt", "Maximum DTI of 43% for loans.", category="loan_policy")
+    assert rag_engine._get_partition("loan_policy").count() == 2
+    ingest(tmp_path, "ltv.txt", "Maximum LTV of 80% for mortgages. ", category="loan_policy", update=True)
+    assert rag_engine._get_partition("loan_policy").count() == 3
+    assert rag_engine._get_partition("Mortgage Rules").count() == 0
+    rag_engine.delete_document_by_name("dti.txt")
+    assert rag_engine._get_partition("loan_policy").count() == 2
+
+    hits = rag_engine.retrieve("LTV", category="loan_policy", n_results=3)
+    assert {h["file_name"] for h in hits} == {"fico.txt", "ltv.txt"}
+
+    rag_engine.reset_rag()
+    assert rag_engine._partition_names() == []
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for loans.", category="loan_policy")
+    assert rag_engine._get_partition("loan_policy").count() == 1
+
+
+def test_partitions_rebuilt_after_writes_while_disabled(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", True)
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for loans.")
+    rag_engine.retrieve("FICO", category="loan_policy")
+    assert rag_engine._get_partition("loan_policy").count() == 1
+
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", False)
+    ingest(tmp_path, "dti.txt", "Maximum DTI of 43% for loans.")
+    assert rag_engine._get_catalog().get_meta("partitions_built") is None
+
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", True)
+    hits = rag_engine.retrieve("DTI", category="loan_policy", n_results=2, hybrid=False)
+    assert hits[0]["file_name"] == "dti.txt"
+    assert rag_engine._get_partition("loan_policy").count() == 2
+
+
+def test_concurrent_searches_rebuild_partitions_once(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", True)
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for loans.")
+    rag_engine._get_catalog().set_meta("partitions_built", None)
+
+    rebuilds = []
+    original = rag_engine.rebuild_partitions
+
+    def slow_rebuild(*args, **kwargs):
+        rebuilds.append(threading.current_thread().name)
+        time.sleep(0.05)  # widen the check-then-rebuild window
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(rag_engine, "rebuild_partitions", slow_rebuild)
+    counts, errors = [], []
+
+    def search():
+        try:
+            counts.append(rag_engine._search_collection("loan_policy").count())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and len(rebuilds) == 1
+    assert counts == [1] * 8
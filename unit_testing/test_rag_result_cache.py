@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Unit tests for the retrieval result cache in rag_engine.py: repeated
+queries served from memory, invalidation by the corpus version on ingest /
+delete / reset (including writes by another process), and the size bound.
+
+Uses a throwaway Chroma store and a keyword-counting embedding that counts
+its calls, so no embedding model is downloaded.
+"""
+
+import os
+import sys
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+from rag_catalog import RAGCatalog
+
+TOPICS = ["fico", "ltv", "dti"]
+
+
+class CountingEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        self.calls = 0
+
+    @staticmethod
+    def name():
+        return "test-counting"
+
+    def __call__(self, input):
+        self.calls += 1
+        return [[float(text.lower().count(topic)) + 0.01 for topic in TOPICS] for text in input]
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", None)
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    monkeypatch.setattr(rag_engine, "_result_cache", None)
+    monkeypatch.setattr(rag_engine, "RESULT_CACHE_SIZE", 2048)
+    embedding = CountingEmbedding()
+    # No embedding LRU, so every search that reaches the store embeds its query
+    rag_engine.set_embedding_function(embedding, "test", cache_dir=None)
+    rag_engine._embedder.lru_size = 0
+    rag_engine._embedder.disk = None
+    return embedding
+
+
+def ingest(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    assert rag_engine.ingest_document(path, category="loan_policy")["status"] == "success"
+
+
+def test_repeated_queries_skip_the_search(model, tmp_path):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    first = rag_engine.retrieve("fico", n_results=1)
+    calls = model.calls
+    searches = rag_engine.retrieval_stats()["searches"]
+
+    for _ in range(3):
+        assert rag_engine.retrieve("fico", n_results=1) == first
+    assert model.calls == calls and rag_engine.retrieval_stats()["searches"] == searches
+
+    # Different arguments are different entries
+    rag_engine.retrieve("fico", n_results=2)
+    rag_engine.retrieve("fico", n_results=1, category="other")
+    assert model.calls == calls + 2
+
+    stats = rag_engine.result_cache_stats()
+    assert stats["hits"] == 3 and stats["misses"] == 3 and stats["entries"] == 3
+
+
+def test_callers_get_copies(model, tmp_path):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    [hit] = rag_engine.retrieve("fico", n_results=1)
+    hit["content"] = "edited by a caller"
+    assert rag_engine.retrieve("fico", n_results=1)[0]["content"].startswith("Minimum FICO")
+
+    # retrieve_many annotates its hits; the cached hits stay clean
+    rag_engine.retrieve_many(["fico", "ltv"], n_results=1)
+    assert "matched_queries" not in rag_engine.retrieve("fico", n_results=1)[0]
+
+
+def test_retrieve_many_searches_only_missing_queries(model, tmp_path):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    rag_engine.retrieve("fico", n_results=1)
+    searches = rag_engine.retrieval_stats()["searches"]
+
+    per_query = rag_engine.retrieve_many(["fico", "ltv"], n_results=1, dedupe=False)
+
+    assert [h["chunk_id"] for h in per_query[0]] == [h["chunk_id"] for h in rag_engine.retrieve("fico", n_results=1)]
+    assert rag_engine.retrieval_stats()["searches"] == searches + 1
+    assert rag_engine.result_cache_stats()["entries"] == 2
+
+
+def test_text_is_cached(model, tmp_path):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    text = rag_engine.retrieve_as_text("fico", n_results=1)
+    calls = model.calls
+    assert rag_engine.retrieve_as_text("fico", n_results=1) == text
+    assert model.calls == calls and "fico.txt" in text
+
+
+def test_writes_invalidate(model, tmp_path):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    assert [h["file_name"] for h in rag_engine.retrieve("fico", n_results=2)] == ["fico.txt"]
+
+    ingest(tmp_path, "fico2.txt", "FICO overrides: FICO below 620 needs committee approval.")
+    assert len(rag_engine.retrieve("fico", n_results=2)) == 2
+
+    rag_engine.delete_document_by_name("fico2.txt")
+    assert [h["file_name"] for h in rag_engine.retrieve("fico", n_results=2)] == ["fico.txt"]
+
+    rag_engine.reset_rag()
+    assert rag_engine.retrieve_as_text("fico") == "No relevant policy documents found for this query."
+    assert rag_engine.result_cache_stats()["invalidations"] == 3
+
+
+def test_other_process_writes_invalidate_after_recheck(model, tmp_path, monkeypatch):
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    rag_engine.retrieve("fico", n_results=1)
+    calls = model.calls
+
+    # Another process bumps the shared version (its own catalog connection)
+    RAGCatalog(rag_engine.CATALOG_PATH).bump_version()
+    rag_engine.retrieve("fico", n_results=1)
+    assert model.calls == calls  # not rechecked yet
+
+    monkeypatch.setattr(rag_engine, "RESULT_CACHE_RECHECK_SECONDS", 0.0)
+    rag_engine.retrieve("fico", n_results=1)
+    assert model.calls == calls + 1
+
+
+def test_cache_is_bounded_and_drops_stale_results(model, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "RESULT_CACHE_SIZE", 2)
+    ingest(tmp_path, "fico.txt", "Minimum FICO score of 620 for conventional loans.")
+    for query in ["fico", "ltv", "dti"]:
+        rag_engine.retrieve(query, n_results=1)
+    stats = rag_engine.result_cache_stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+
+    cache = rag_engine._get_result_cache()
+    stale_version = cache.version
+    rag_engine._bump_corpus_version()
+    cache.put(("hits", "late"), [], stale_version)
+    assert cache.get(("hits", "late")) is None
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Unit tests for batched multi-query retrieval (rag_engine.retrieve_many).
+
+Uses a throwaway Chroma store with a deterministic embedding that counts
+its calls, so no embedding model is downloaded.
+"""
+
+import os
+import sys
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+
+TOPICS = ["fico", "ltv", "dti", "underwriting"]
+
+
+class TopicEmbedding(chromadb.EmbeddingFunction):
+    """One axis per topic word; counts how many batches it embedded."""
+
+    def __init__(self):
+        self.batches = []
+
+    @staticmethod
+    def name():
+        return "test-topic"
+
+    def __call__(self, input):
+        self.batches.append(len(input))
+        return [
+            [float(text.lower().count(topic)) + 0.01 for topic in TOPICS]
+            for text in input
+        ]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    embedding = TopicEmbedding()
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    collection = client.get_or_create_collection(
+        "policy_documents", embedding_function=embedding, metadata={"hnsw:space": "cosine"}
+    )
+    texts = [
+        "fico fico minimum score",
+        "ltv ltv limits",
+        "dti dti thresholds",
+        "fico and ltv combined rule",
+        "underwriting underwriting checklist",
+    ]
+    collection.add(
+        ids=[f"doc_{i}" for i in range(len(texts))],
+        documents=texts,
+        metadatas=[
+            {"file_name": "policy.pdf", "category": "loan_policy", "chunk_index": i, "tags": ""}
+            for i in range(len(texts))
+        ],
+    )
+    embedding.batches.clear()
+    monkeypatch.setattr(rag_engine, "_collection", collection)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    # Vector ranking only; hybrid fusion is covered in test_rag_hybrid.py
+    monkeypatch.setattr(rag_engine, "HYBRID_RETRIEVAL", False)
+    rag_engine.set_embedding_function(embedding, "test", cache_dir=tmp_path / "embeddings")
+    return collection, embedding
+
+
+def test_one_embedding_batch_and_one_query(store, monkeypatch):
+    collection, embedding = store
+    calls = []
+    original = collection.query
+    monkeypatch.setattr(collection, "query", lambda **kw: calls.append(kw) or original(**kw))
+
+    per_query = rag_engine.retrieve_many(["fico score", "ltv ratio", "dti"], n_results=2, dedupe=False)
+
+    assert len(calls) == 1 and embedding.batches == [3]
+    for query, hits in zip(["fico score", "ltv ratio", "dti"], per_query):
+        single = rag_engine.retrieve(query, n_results=2)
+        assert [{k: v for k, v in hit.items() if k != "matched_queries"} for hit in hits] == single
+
+
+def test_dedupe_keeps_each_chunk_under_its_best_query(store):
+    per_query = rag_engine.retrieve_many(["fico", "ltv"], n_results=2)
+
+    ids = [[hit["chunk_id"] for hit in hits] for hits in per_query]
+    assert ids == [["doc_0"], ["doc_1", "doc_3"]] or ids == [["doc_0", "doc_3"], ["doc_1"]]
+    shared = next(hit for hits in per_query for hit in hits if hit["chunk_id"] == "doc_3")
+    assert shared["matched_queries"] == [0, 1]
+
+
+def test_merge_ranks_unique_chunks(store):
+    merged = rag_engine.retrieve_many(["fico", "ltv"], n_results=2, merge=True)
+
+    assert sorted(hit["chunk_id"] for hit in merged) == ["doc_0", "doc_1", "doc_3"]
+    scores = [hit["relevance_score"] for hit in merged]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_as_text_notes_overlap_and_category_filter(store):
+    texts = rag_engine.retrieve_many_as_text(["fico", "fico score"], n_results=1)
+    assert len(texts) == 2
+    assert "Source: policy.pdf" in texts[0] or "Source: policy.pdf" in texts[1]
+    assert any("listed under the other queries" in text for text in texts)
+
+    assert rag_engine.retrieve_many(["fico"], category="compliance") == [[]]
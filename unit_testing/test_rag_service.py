@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+Unit tests for the optional retrieval service (rag_service.py): rag_engine
+calls forwarded over a Unix socket / localhost HTTP to the process owning
+the store, the readers-writer lock, and error reporting.
+
+The service runs on a daemon thread of the test process against a
+throwaway Chroma store; the client side sets RAG_SERVICE_URL.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test")
+sys.path.insert(0, TEST_DIR)
+
+import rag_engine
+from rag_service import RAGService, RAGServiceClient, RAGServiceError, ReadWriteLock, parse_url
+
+TOPICS = ["fico", "ltv", "dti"]
+
+
+class TopicEmbedding(chromadb.EmbeddingFunction):
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def name():
+        return "test-topic"
+
+    def __call__(self, input):
+        return [[float(text.lower().count(topic)) + 0.01 for topic in TOPICS] for text in input]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def service(request, tmp_path, monkeypatch):
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(rag_engine, "UPLOAD_DIR", tmp_path / "uploads")
+    monkeypatch.setattr(rag_engine, "CATALOG_PATH", tmp_path / "rag_catalog.sqlite3")
+    monkeypatch.setattr(rag_engine, "KEYWORD_INDEX_PATH", tmp_path / "rag_keyword_index.sqlite3")
+    monkeypatch.setattr(rag_engine, "_chroma_client", client)
+    monkeypatch.setattr(rag_engine, "_collection", None)
+    monkeypatch.setattr(rag_engine, "_catalog", None)
+    monkeypatch.setattr(rag_engine, "_keyword_index", None)
+    monkeypatch.setattr(rag_engine, "_embedder", None)
+    monkeypatch.setattr(rag_engine, "_service_client", None)
+    (tmp_path / "uploads").mkdir()
+    rag_engine.set_embedding_function(TopicEmbedding(), "test", cache_dir=tmp_path / "embeddings")
+
+    if request.param == "unix":
+        # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can be longer
+        url = f"unix:/tmp/rag_service_test_{os.getpid()}.sock"
+    else:
+        url = f"http://127.0.0.1:{free_port()}"
+    server = RAGService(url)
+    server.start()
+    monkeypatch.setattr(rag_engine, "RAG_SERVICE_URL", url)
+    yield server
+    server.shutdown()
+
+
+def write_policy(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_parse_url():
+    assert parse_url("unix:/tmp/rag.sock") == ("unix", "/tmp/rag.sock")
+    assert parse_url("unix:///tmp/rag.sock") == ("unix", "/tmp/rag.sock")
+    assert parse_url("http://127.0.0.1:8765") == ("tcp", ("127.0.0.1", 8765))
+    assert parse_url("http://localhost:8765") == ("tcp", ("localhost", 8765))
+    assert parse_url("http://[::1]:8765") == ("tcp", ("::1", 8765))
+    with pytest.raises(ValueError):
+        parse_url("tcp://localhost")
+    for exposed in ("http://0.0.0.0:8765", "http://192.168.1.10:8765", "http://rag.example.com:8765"):
+        with pytest.raises(ValueError, match="loopback"):
+            parse_url(exposed)
+
+
+def test_service_refuses_files_outside_the_upload_dir(service, tmp_path):
+    secret = write_policy(tmp_path, "secret.txt", "FICO secret outside the upload directory.")
+    client = RAGServiceClient(service.url)
+
+    with pytest.raises(RAGServiceError, match="only accesses files under"):
+        client.call("ingest_document", file_path=str(secret))
+    with pytest.raises(RAGServiceError, match="only accesses files under"):
+        client.call("ingest_document", file_path=str(tmp_path / "uploads" / ".." / "secret.txt"))
+    with pytest.raises(RAGServiceError, match="only accesses files under"):
+        client.call("bulk_ingest", source=str(tmp_path))
+    with pytest.raises(RAGServiceError, match="only accesses files under"):
+        client.call("bulk_ingest", source=str(tmp_path / "uploads"), report_path=str(tmp_path / "report.json"))
+    assert client.call("list_documents") == []
+
+
+def test_calls_are_served_by_the_service(service, tmp_path, monkeypatch):
+    served = []
+    original = service.dispatch
+    monkeypatch.setattr(service, "dispatch", lambda method, kwargs: served.append(method) or original(method, kwargs))
+
+    path = write_policy(tmp_path / "uploads", "fico.txt", "Minimum FICO score of 620; FICO overrides need approval.")
+    assert rag_engine.ingest_document(path, category="loan_policy")["status"] == "success"
+    rag_engine.ingest_from_bytes(b"Maximum LTV of 80% for conventional LTV limits.", "ltv.txt")
+
+    [hit] = rag_engine.retrieve("fico", n_results=1)
+    assert hit["file_name"] == "fico.txt"
+    per_query = rag_engine.retrieve_many(["fico", "ltv"], n_results=1)
+    assert [hits[0]["file_name"] for hits in per_query] == ["fico.txt", "ltv.txt"]
+    assert [d["file_name"] for d in rag_engine.list_documents()] == ["fico.txt", "ltv.txt"]
+    assert rag_engine.get_stats()["total_documents"] == 2
+
+    assert rag_engine.delete_document_by_name("ltv.txt")["status"] == "deleted"
+    assert rag_engine.reset_rag()["status"] == "RAG system reset complete"
+    assert rag_engine.list_documents() == []
+
+    assert served == [
+        "ingest_document", "ingest_document", "retrieve", "retrieve_many", "list_documents",
+        "get_stats", "delete_document_by_name", "reset_rag", "list_documents",
+    ]
+    health = RAGServiceClient(service.url).health()
+    assert health["status"] == "ok" and health["requests"] == len(served) and health["errors"] == 0
+
+
+def test_bulk_ingest_runs_in_the_service(service, tmp_path):
+    from rag_bulk_ingest import bulk_ingest
+
+    corpus = tmp_path / "uploads" / "corpus"
+    corpus.mkdir()
+    write_policy(corpus, "a.txt", "FICO rules for personal loans and FICO exceptions.")
+    write_policy(corpus, "b.txt", "DTI rules for mortgages and DTI exceptions apply.")
+    seen = []
+
+    report = bulk_ingest(corpus, workers=0, progress=lambda done, total, entry: seen.append((done, total)))
+
+    assert report["summary"]["ingested"] == 2 and seen == [(1, 2), (2, 2)]
+    assert rag_engine.get_stats()["total_chunks"] == 2
+
+
+def test_errors_are_reported(service, monkeypatch):
+    client = RAGServiceClient(service.url)
+    with pytest.raises(RAGServiceError, match="Unknown RAG service method"):
+        client.call("drop_everything")
+    with pytest.raises(RAGServiceError, match="delete_document"):
+        client.call("delete_document", wrong_argument=1)
+
+    monkeypatch.setattr(rag_engine, "RAG_SERVICE_URL", "unix:/tmp/no_rag_service_here.sock")
+    [error] = rag_engine.retrieve("fico")
+    assert "RAG service unreachable" in error["content"] and error["chunk_index"] == -1
+    with pytest.raises(RAGServiceError):
+        rag_engine.list_documents()
+
+
+def test_partition_rebuild_runs_under_the_write_lock(service, tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_engine, "CATEGORY_PARTITIONS", True)
+    monkeypatch.setattr(rag_engine, "_partitions", {})
+    rag_engine.ingest_document(
+        write_policy(tmp_path / "uploads", "fico.txt", "Minimum FICO score of 620."), category="loan_policy"
+    )
+    rag_engine._get_catalog().set_meta("partitions_built", None)
+
+    writer_held = []
+    original = rag_engine.rebuild_partitions
+
+    def rebuild(*args, **kwargs):
+        writer_held.append(service.lock._writer)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(rag_engine, "rebuild_partitions", rebuild)
+    [hit] = rag_engine.retrieve("fico", category="loan_policy")
+    assert hit["file_name"] == "fico.txt"
+    rag_engine.retrieve("fico", category="loan_policy")
+    assert writer_held == [True]
+
+
+def test_service_survives_dropped_keepalive(service):
+    client = RAGServiceClient(service.url)
+    assert client.call("list_documents") == []
+    client._local.conn.sock.close()  # as if the service had closed the idle connection
+    client._local.conn.sock = None
+    assert client.call("list_documents") == []
+
+
+def test_read_write_lock_excludes_writers():
+    lock = ReadWriteLock()
+    events = []
+
+    def reader(name):
+        lock.acquire_read()
+        events.append(f"{name}+")
+        time.sleep(0.1)
+        events.append(f"{name}-")
+        lock.release_read()
+
+    def writer():
+        lock.acquire_write()
+        events.append("w+")
+        time.sleep(0.05)
+        events.append("w-")
+        lock.release_write()
+
+    readers = [threading.Thread(target=reader, args=(f"r{i}",)) for i in range(2)]
+    for thread in readers:
+        thread.start()
+    time.sleep(0.02)
+    write = threading.Thread(target=writer)
+    write.start()
+    late = threading.Thread(target=reader, args=("late",))
+    time.sleep(0.02)
+    late.start()
+    for thread in readers + [write, late]:
+        thread.join()
+
+    # Both readers overlapped; the writer waited for them; the late reader waited for the writer
+    assert events[:2] == ["r0+", "r1+"] or events[:2] == ["r1+", "r0+"]
+    assert events.index("w+") == 4 and events[5] == "w-"
+    assert events[6:] == ["late+", "late-"]
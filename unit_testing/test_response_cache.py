@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Unit tests for the two-tier crew response cache (response_cache.py).
+
+Uses a bag-of-words embedder in place of the ONNX model, so no chromadb
+install is needed.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test"))
+
+from response_cache import ResponseCache, make_cache_key
+
+VOCAB = ["best", "top", "fd", "rates", "india", "year", "1", "2", "news", "hdfc"]
+
+
+def bag_of_words(text):
+    words = text.replace("-", " ").split()
+    return [float(words.count(term)) for term in VOCAB]
+
+
+def make_cache(tmp_path, **kwargs):
+    kwargs.setdefault("embedder", bag_of_words)
+    return ResponseCache(path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_exact_hit_ignores_case_whitespace_and_punctuation(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("analysis", "Best 1-year FD rates in India?", "India", {"result": "HDFC 7.1%"})
+
+    hit = cache.get("analysis", "  best 1-year fd RATES in india ", "india")
+    assert hit["result"] == "HDFC 7.1%"
+    assert hit["cache"]["tier"] == "exact"
+    assert make_cache_key("analysis", "A  b?", "us") == make_cache_key("ANALYSIS", "a b", "US")
+
+
+def test_semantic_hit_within_threshold(tmp_path):
+    cache = make_cache(tmp_path, similarity=0.8)
+    cache.set("analysis", "best 1-year fd rates india", "India", {"result": "cached"})
+
+    hit = cache.get("analysis", "top 1-year fd rates india", "India")
+    assert hit["cache"]["tier"] == "semantic"
+    assert 0.8 <= hit["cache"]["similarity"] < 1.0
+    assert cache.get("analysis", "hdfc news", "India") is None
+
+
+def test_semantic_tier_requires_matching_numbers_and_scope(tmp_path):
+    cache = make_cache(tmp_path, similarity=0.5)
+    cache.set("analysis", "best 1-year fd rates india", "India", {"result": "one year"})
+
+    assert cache.get("analysis", "best 2-year fd rates india", "India") is None
+    assert cache.get("analysis", "top 1-year fd rates india", "US") is None
+    assert cache.get("research", "top 1-year fd rates india", "India") is None
+
+
+def test_side_effect_crews_are_never_cached(tmp_path):
+    cache = make_cache(tmp_path, ttls={"aml": 3600, "loan_creation": 3600, "analysis": 60})
+    for crew_type in ("aml", "loan_creation", "fd_advisor", "database"):
+        assert cache.set(crew_type, "q", "India", {"result": "x"}) is False
+        assert cache.get(crew_type, "q", "India") is None
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = make_cache(tmp_path, ttls={"research": 1})
+    cache.set("research", "hdfc news", "India", {"result": "x"})
+    assert cache.get("research", "hdfc news", "India") is not None
+
+    time.sleep(1.1)
+    assert cache.get("research", "hdfc news", "India") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2, embedder=None)
+    cache.set("analysis", "q1", "India", {"result": "1"})
+    cache.set("analysis", "q2", "India", {"result": "2"})
+    time.sleep(0.01)
+    assert cache.get("analysis", "q1", "India") is not None  # q2 is now least recent
+    cache.set("analysis", "q3", "India", {"result": "3"})
+
+    assert cache.get("analysis", "q2", "India") is None
+    assert cache.get("analysis", "q1", "India") is not None
+    assert cache.stats()["entries"] == 2
+
+
+def test_invalidate_by_crew_type(tmp_path):
+    cache = make_cache(tmp_path, ttls={"analysis": 60, "credit_risk": 60})
+    cache.set("analysis", "best fd rates", "India", {"result": "a"})
+    cache.set("credit_risk", {"income": 1}, "India", {"result": "b"})
+
+    assert cache.invalidate(["analysis", "research", "fd_template"]) == 1
+    assert cache.get("analysis", "best fd rates", "India") is None
+    assert cache.get("credit_risk", {"income": 1}, "India")["result"] == "b"
+
+    stats = cache.stats()
+    assert stats["exact_hits"] == 1 and stats["misses"] == 1
+    assert stats["invalidated"] == 1
+
+
+def test_connections_are_closed_after_each_call(tmp_path):
+    cache = make_cache(tmp_path)
+    with cache._connect() as conn:
+        conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+    cache.set("analysis", "best fd rates", "India", {"result": "a"})
+    assert cache.get("analysis", "best fd rates", "India")["result"] == "a"